@@ -0,0 +1,147 @@
+"""partition weather_records by fetched_at
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-18 00:00:00.000000
+
+Turns weather_records into a RANGE-partitioned table on fetched_at with one
+partition per UTC day (weather_records_pYYYYMMDD) plus a DEFAULT partition.
+Old days can then be dropped as whole partitions by RetentionService instead
+of DELETE-ing millions of rows.  Postgres requires the partition key in the
+primary key, so the table's PK becomes (id, fetched_at); the ORM keeps
+mapping ``id`` alone as the identity, which is still unique via the sequence.
+
+"""
+from datetime import date, datetime, timedelta, timezone
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "002"
+down_revision: Union[str, None] = "001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Daily partitions created up front (back-filled days come from the data)
+DAYS_AHEAD = 7
+
+_COLUMNS = """
+    id INTEGER NOT NULL DEFAULT nextval('weather_records_id_seq'),
+    city_id INTEGER NOT NULL REFERENCES cities (id),
+    source_id INTEGER NOT NULL REFERENCES weather_sources (id),
+    record_type VARCHAR(10) NOT NULL,
+    forecast_dt TIMESTAMP WITH TIME ZONE,
+    temperature DOUBLE PRECISION,
+    feels_like DOUBLE PRECISION,
+    wind_speed DOUBLE PRECISION,
+    wind_direction INTEGER,
+    humidity INTEGER,
+    pressure DOUBLE PRECISION,
+    precipitation_type VARCHAR(20),
+    precipitation_amount DOUBLE PRECISION,
+    cloudiness INTEGER,
+    description VARCHAR(500),
+    icon_code VARCHAR(50),
+    fetched_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now()
+"""
+
+
+def _create_day_partition(day: date) -> None:
+    op.execute(
+        f"CREATE TABLE IF NOT EXISTS weather_records_p{day:%Y%m%d} "
+        f"PARTITION OF weather_records "
+        f"FOR VALUES FROM ('{day.isoformat()} 00:00:00+00') "
+        f"TO ('{(day + timedelta(days=1)).isoformat()} 00:00:00+00')"
+    )
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+
+    op.execute("ALTER TABLE weather_records RENAME TO weather_records_legacy")
+    op.execute(
+        "ALTER INDEX ix_weather_records_city_type RENAME TO ix_weather_records_legacy_city_type"
+    )
+    op.execute(
+        "ALTER INDEX ix_weather_records_city_source_dt "
+        "RENAME TO ix_weather_records_legacy_city_source_dt"
+    )
+    op.execute(
+        "ALTER TABLE weather_records_legacy "
+        "RENAME CONSTRAINT weather_records_pkey TO weather_records_legacy_pkey"
+    )
+
+    op.execute(
+        f"CREATE TABLE weather_records ({_COLUMNS}, PRIMARY KEY (id, fetched_at)) "
+        f"PARTITION BY RANGE (fetched_at)"
+    )
+    op.execute("CREATE TABLE weather_records_default PARTITION OF weather_records DEFAULT")
+
+    # One partition per day that has data, plus the coming week
+    days = {
+        row[0]
+        for row in conn.exec_driver_sql(
+            "SELECT DISTINCT (fetched_at AT TIME ZONE 'UTC')::date FROM weather_records_legacy"
+        )
+    }
+    today = datetime.now(timezone.utc).date()
+    days.update(today + timedelta(days=offset) for offset in range(DAYS_AHEAD + 1))
+    for day in sorted(days):
+        _create_day_partition(day)
+
+    op.execute(
+        "INSERT INTO weather_records SELECT "
+        "id, city_id, source_id, record_type, forecast_dt, temperature, feels_like, "
+        "wind_speed, wind_direction, humidity, pressure, precipitation_type, "
+        "precipitation_amount, cloudiness, description, icon_code, fetched_at "
+        "FROM weather_records_legacy"
+    )
+    op.execute("ALTER SEQUENCE weather_records_id_seq OWNED BY weather_records.id")
+    op.execute("DROP TABLE weather_records_legacy")
+
+    # Indexes on the parent are created on every partition
+    op.create_index(
+        "ix_weather_records_city_type", "weather_records", ["city_id", "record_type"]
+    )
+    op.create_index(
+        "ix_weather_records_city_source_dt",
+        "weather_records",
+        ["city_id", "source_id", "forecast_dt"],
+    )
+    op.create_index(
+        "ix_weather_records_city_type_fetched",
+        "weather_records",
+        ["city_id", "record_type", "fetched_at"],
+    )
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE weather_records RENAME TO weather_records_partitioned")
+    op.execute(
+        "ALTER TABLE weather_records_partitioned "
+        "RENAME CONSTRAINT weather_records_pkey TO weather_records_partitioned_pkey"
+    )
+    op.execute(
+        f"CREATE TABLE weather_records ({_COLUMNS}, "
+        f"CONSTRAINT weather_records_pkey PRIMARY KEY (id))"
+    )
+    op.execute(
+        "INSERT INTO weather_records SELECT "
+        "id, city_id, source_id, record_type, forecast_dt, temperature, feels_like, "
+        "wind_speed, wind_direction, humidity, pressure, precipitation_type, "
+        "precipitation_amount, cloudiness, description, icon_code, fetched_at "
+        "FROM weather_records_partitioned"
+    )
+    op.execute("ALTER SEQUENCE weather_records_id_seq OWNED BY weather_records.id")
+    # Dropping the parent drops all of its partitions
+    op.execute("DROP TABLE weather_records_partitioned")
+
+    op.create_index(
+        "ix_weather_records_city_type", "weather_records", ["city_id", "record_type"]
+    )
+    op.create_index(
+        "ix_weather_records_city_source_dt",
+        "weather_records",
+        ["city_id", "source_id", "forecast_dt"],
+    )
@@ -0,0 +1,31 @@
+"""index for newest-snapshot-per-source reads
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-18 00:00:00.000000
+
+Backs RecordReader: for each source the newest fetched_at of a
+(city, record_type) is a single descending probe on this index.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "003"
+down_revision: Union[str, None] = "002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_weather_records_latest",
+        "weather_records",
+        ["city_id", "record_type", "source_id", "fetched_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_weather_records_latest", table_name="weather_records")
@@ -0,0 +1,46 @@
+"""indexes for forecast windows
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-18 00:00:00.000000
+
+Forecast reads filter on forecast_dt between now and now + days in SQL:
+- ix_weather_records_latest gains forecast_dt as a trailing column, so the
+  newest snapshot's points inside the window are found in the index;
+- ix_weather_records_city_type_forecast serves forecast_dt range scans
+  (hourly and daily charts).
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "004"
+down_revision: Union[str, None] = "003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.drop_index("ix_weather_records_latest", table_name="weather_records")
+    op.create_index(
+        "ix_weather_records_latest",
+        "weather_records",
+        ["city_id", "record_type", "source_id", "fetched_at", "forecast_dt"],
+    )
+    op.create_index(
+        "ix_weather_records_city_type_forecast",
+        "weather_records",
+        ["city_id", "record_type", "forecast_dt"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_weather_records_city_type_forecast", table_name="weather_records")
+    op.drop_index("ix_weather_records_latest", table_name="weather_records")
+    op.create_index(
+        "ix_weather_records_latest",
+        "weather_records",
+        ["city_id", "record_type", "source_id", "fetched_at"],
+    )
@@ -0,0 +1,41 @@
+"""precomputed weather aggregates
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-18 00:00:00.000000
+
+weather_aggregates holds the aggregated current / forecast / chart responses
+of every city as serialized JSON.  They are written after each refresh and
+read with one primary key lookup (app/services/aggregate_store.py).
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "005"
+down_revision: Union[str, None] = "004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "weather_aggregates",
+        sa.Column("city_id", sa.Integer(), nullable=False),
+        sa.Column("endpoint", sa.String(32), nullable=False),
+        sa.Column("sources_hash", sa.String(16), nullable=False),
+        sa.Column("version", sa.SmallInteger(), nullable=False),
+        sa.Column("payload", sa.LargeBinary(), nullable=False),
+        sa.Column("fetched_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("valid_until", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("computed_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.ForeignKeyConstraint(["city_id"], ["cities.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("city_id", "endpoint", "sources_hash", "version"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("weather_aggregates")
@@ -0,0 +1,225 @@
+"""SQL-side weather aggregation.
+
+Alternative to :func:`app.aggregator.engine.aggregate` for endpoints that
+aggregate many time buckets (forecasts, charts).  Instead of loading every
+``WeatherRecord`` into Python, the weighted averages
+Σ(value × priority) / Σ(priority) are computed by the database in one
+``GROUP BY`` that returns a single row per time bucket.  Python only picks
+the categorical values, from per-bucket value counts.
+
+The result matches ``aggregate`` for the same records and priorities:
+
+- numeric fields: weighted average over non-NULL values, sources missing
+  from *priorities* weigh 1, integer fields are rounded;
+- categorical fields: most frequent value, ties broken by the highest
+  priority among the tied values;
+- ``icon_code``: taken from the first source (lowest source_id) that has one.
+
+The records to aggregate are given as a SELECT of ``WeatherRecord`` rows
+(e.g. ``RecordReader.latest_query``), so filtering stays with the caller.
+"""
+
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Any
+
+from sqlalchemy import (
+    DateTime,
+    Float,
+    Select,
+    case,
+    cast,
+    func,
+    literal,
+    literal_column,
+    select,
+    type_coerce,
+    union_all,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.aggregator.engine import CATEGORICAL_FIELDS, NUMERIC_FIELDS, PASSTHROUGH_FIELDS
+from app.schemas.weather import AggregatedWeather
+
+# Numeric fields returned as integers by ``aggregate``
+_INTEGER_FIELDS = ("wind_direction", "humidity", "cloudiness")
+
+# Supported time buckets
+BUCKETS = ("forecast_dt", "hour")
+
+# Rendered inline (not as bind parameters) so that the same expression in the
+# SELECT list and in GROUP BY is recognised as equal by Postgres
+_UTC = literal_column("'UTC'")
+
+
+class SqlAggregator:
+    """Aggregates weather records per time bucket inside the database."""
+
+    def __init__(self, db: AsyncSession) -> None:
+        self.db = db
+
+    @property
+    def _is_postgres(self) -> bool:
+        return self.db.bind.dialect.name == "postgresql"
+
+    async def aggregate(
+        self,
+        records: Select,
+        priorities: dict[int, int],
+        bucket: str = "forecast_dt",
+        fields: list[str] | None = None,
+        categorical: bool = True,
+        limit: int | None = None,
+    ) -> list[tuple[datetime, AggregatedWeather]]:
+        """Aggregate *records* per time bucket.
+
+        Args:
+            records: SELECT of WeatherRecord rows to aggregate
+            priorities: Dictionary mapping source_id to priority value
+            bucket: "forecast_dt" (exact time point) or "hour" (truncated to the hour)
+            fields: Numeric fields to compute (default: all)
+            categorical: Also select categorical and passthrough fields
+            limit: Return at most this many (earliest) buckets
+
+        Returns:
+            (bucket time, aggregated weather) tuples ordered by time
+        """
+        if bucket not in BUCKETS:
+            raise ValueError(f"Unknown aggregation bucket: {bucket}")
+        fields = NUMERIC_FIELDS if fields is None else fields
+
+        rows = records.subquery("records")
+        bucket_expr = self._bucket(rows.c.forecast_dt, bucket).label("bucket")
+        weight = self._weight(rows.c.source_id, priorities)
+
+        numeric = (
+            select(
+                bucket_expr,
+                *(self._weighted_average(rows.c[field], weight).label(field) for field in fields),
+            )
+            .where(rows.c.forecast_dt.is_not(None))
+            .group_by(bucket_expr)
+            .order_by(bucket_expr)
+            .limit(limit)
+        )
+        result = await self.db.execute(numeric)
+
+        buckets: dict[datetime, dict[str, Any]] = {}
+        for row in result.all():
+            values = {}
+            for field in fields:
+                value = row._mapping[field]
+                if value is not None and field in _INTEGER_FIELDS:
+                    value = round(value)
+                values[field] = value
+            buckets[_as_utc(row.bucket)] = values
+
+        if categorical and buckets:
+            for key, values in (await self._categorical(rows, bucket, weight)).items():
+                if key in buckets:
+                    buckets[key].update(values)
+
+        return [(key, AggregatedWeather(**values)) for key, values in buckets.items()]
+
+    async def daily_temperatures(self, records: Select, days: int) -> list[dict[str, Any]]:
+        """Compute min/max/avg temperature per UTC day of ``forecast_dt``.
+
+        Args:
+            records: SELECT of WeatherRecord rows
+            days: Return at most this many (earliest) days
+
+        Returns:
+            List of {"date", "temp_min", "temp_max", "temp_avg"} dicts
+        """
+        rows = records.subquery("records")
+        if self._is_postgres:
+            day = func.to_char(
+                func.timezone(_UTC, rows.c.forecast_dt), literal_column("'YYYY-MM-DD'")
+            )
+        else:
+            day = func.date(rows.c.forecast_dt)
+        day = day.label("day")
+
+        query = (
+            select(
+                day,
+                func.min(rows.c.temperature).label("temp_min"),
+                func.max(rows.c.temperature).label("temp_max"),
+                func.avg(rows.c.temperature).label("temp_avg"),
+            )
+            .where(rows.c.forecast_dt.is_not(None))
+            .where(rows.c.temperature.is_not(None))
+            .group_by(day)
+            .order_by(day)
+            .limit(days)
+        )
+        result = await self.db.execute(query)
+        return [
+            {
+                "date": row.day,
+                "temp_min": row.temp_min,
+                "temp_max": row.temp_max,
+                "temp_avg": float(row.temp_avg),
+            }
+            for row in result.all()
+        ]
+
+    async def _categorical(
+        self, rows, bucket: str, weight
+    ) -> dict[datetime, dict[str, Any]]:
+        """Pick categorical and passthrough values per bucket from value counts."""
+        bucket_expr = self._bucket(rows.c.forecast_dt, bucket)
+        selects = [
+            select(
+                literal(field).label("field"),
+                bucket_expr.label("bucket"),
+                rows.c[field].label("value"),
+                func.count().label("count"),
+                func.max(weight).label("max_weight"),
+                func.min(rows.c.source_id).label("first_source"),
+            )
+            .where(rows.c.forecast_dt.is_not(None))
+            .where(rows.c[field].is_not(None))
+            .group_by(bucket_expr, rows.c[field])
+            for field in CATEGORICAL_FIELDS + PASSTHROUGH_FIELDS
+        ]
+        result = await self.db.execute(union_all(*selects))
+
+        candidates: dict[tuple[datetime, str], list] = defaultdict(list)
+        for row in result.all():
+            candidates[(_as_utc(row.bucket), row.field)].append(row)
+
+        chosen: dict[datetime, dict[str, Any]] = defaultdict(dict)
+        for (key, field), values in candidates.items():
+            if field in PASSTHROUGH_FIELDS:
+                best = min(values, key=lambda v: v.first_source)
+            else:
+                # Mode, tie-broken by the highest priority among tied values
+                best = max(values, key=lambda v: (v.count, v.max_weight))
+            chosen[key][field] = best.value
+        return chosen
+
+    def _bucket(self, column, bucket: str):
+        if bucket == "forecast_dt":
+            return column
+        if self._is_postgres:
+            return func.timezone(
+                _UTC, func.date_trunc(literal_column("'hour'"), func.timezone(_UTC, column))
+            )
+        return type_coerce(func.strftime("%Y-%m-%d %H:00:00.000000", column), DateTime())
+
+    @staticmethod
+    def _weight(source_id, priorities: dict[int, int]):
+        if not priorities:
+            return literal(1)
+        return case(priorities, value=source_id, else_=1)
+
+    @staticmethod
+    def _weighted_average(column, weight):
+        weighted_sum = func.sum(cast(column, Float) * weight)
+        total_weight = func.sum(case((column.is_not(None), weight), else_=0))
+        return weighted_sum / func.nullif(total_weight, 0)
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
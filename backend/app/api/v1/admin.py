@@ -2,24 +2,50 @@
 
 import asyncio
 import logging
+from datetime import datetime
+from typing import Literal
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.background import BackgroundTask
 
+from app.core.cache import shared_cache
+from app.core.config import settings
+from app.core.db_metrics import get_pool_stats
+from app.core.responses import ORJSONResponse
+from app.core.scheduler import DEFAULT_BATCH_SIZE, DEFAULT_MAX_CONCURRENCY
 from app.core.security import get_current_admin
-from app.dependencies import get_db
+from app.dependencies import get_db, get_read_db
 from app.models.city import City
 from app.models.source import WeatherSource
+from app.fetchers.circuit_breaker import get_health
+from app.fetchers.rate_limit import get_usage
 from app.schemas.admin import (
     AdminAuthResponse,
+    AdminSourceResponse,
+    DatabasePoolStats,
     FetchNowResponse,
     LogsResponse,
+    ResponseCacheStats,
+    SourcesReloadResponse,
     SourceUpdateRequest,
     StatsRow,
 )
 from app.schemas.admin import LogEntryResponse
 from app.schemas.source import SourceResponse
+from app.services.aggregate_store import AggregateStore
+from app.services.export_service import (
+    EXPORT_FORMATS,
+    ExportBusy,
+    request_logs_query,
+    start_export,
+    weather_records_query,
+)
+from app.services.response_cache import response_cache
+from app.services.source_catalog import source_catalog
+from app.services.source_manager import source_manager
 from app.services.stats_service import StatsService
 from app.services.weather_service import WeatherService
 
@@ -29,8 +55,12 @@ router = APIRouter(
     prefix="/admin",
     tags=["admin"],
     dependencies=[Depends(get_current_admin)],
+    default_response_class=ORJSONResponse,
 )
 
+# Refreshes started by fetch-now, referenced until they finish
+_background_fetches: set[asyncio.Task] = set()
+
 
 @router.post("/auth", response_model=AdminAuthResponse)
 async def admin_auth() -> AdminAuthResponse:
@@ -43,8 +73,8 @@ async def get_stats(
     from_date: str | None = Query(None, description="Start date YYYY-MM-DD"),
     to_date: str | None = Query(None, description="End date YYYY-MM-DD"),
     platform: str | None = Query(None, description="Filter by platform"),
-    db: AsyncSession = Depends(get_db),
-) -> list[StatsRow]:
+    db: AsyncSession = Depends(get_read_db),
+) -> Response:
     """Get daily usage statistics with optional filters."""
     from datetime import date as date_type
 
@@ -53,7 +83,8 @@ async def get_stats(
 
     service = StatsService(db)
     stats = await service.get_stats(from_date_parsed, to_date_parsed, platform)
-    return [StatsRow.model_validate(s) for s in stats]
+    # Validated once here; sent without a second response_model pass
+    return ORJSONResponse([StatsRow.model_validate(s) for s in stats])
 
 
 @router.get("/logs", response_model=LogsResponse)
@@ -62,29 +93,59 @@ async def get_logs(
     offset: int = Query(0, ge=0),
     platform: str | None = Query(None),
     action: str | None = Query(None, description="Partial match on action field"),
-    db: AsyncSession = Depends(get_db),
-) -> LogsResponse:
+    db: AsyncSession = Depends(get_read_db),
+) -> Response:
     """Get paginated request logs with optional filters."""
     service = StatsService(db)
     total, logs = await service.get_logs(limit, offset, platform, action)
-    return LogsResponse(
-        total=total,
-        offset=offset,
-        limit=limit,
-        items=[LogEntryResponse.model_validate(log) for log in logs],
+    return ORJSONResponse(
+        LogsResponse(
+            total=total,
+            offset=offset,
+            limit=limit,
+            items=[LogEntryResponse.model_validate(log) for log in logs],
+        )
     )
 
 
-@router.get("/sources", response_model=list[SourceResponse])
+@router.get("/db/pool", response_model=list[DatabasePoolStats])
+async def get_db_pool_stats() -> list[DatabasePoolStats]:
+    """Connection pool and statement cache usage of this process's database engines.
+
+    Checkout waits include opening new connections and the pre-ping.
+    """
+    return [DatabasePoolStats(**stats) for stats in get_pool_stats()]
+
+
+@router.get("/cache", response_model=ResponseCacheStats)
+async def get_response_cache_stats() -> ResponseCacheStats:
+    """Hit/miss counters and size of this process's aggregated response cache.
+
+    ``shared`` reports this process's use of the cache shared between workers.
+    """
+    return ResponseCacheStats(**response_cache.stats(), shared=shared_cache.stats())
+
+
+@router.get("/sources", response_model=list[AdminSourceResponse])
 async def admin_list_sources(
     db: AsyncSession = Depends(get_db),
-) -> list[SourceResponse]:
-    """List all weather sources including disabled ones."""
+) -> list[AdminSourceResponse]:
+    """List all weather sources including disabled ones.
+
+    Includes per-source rate limit usage and circuit breaker health.
+    """
     result = await db.execute(
         select(WeatherSource).order_by(WeatherSource.priority.desc())
     )
     sources = result.scalars().all()
-    return [SourceResponse.model_validate(s) for s in sources]
+    return [
+        AdminSourceResponse(
+            **SourceResponse.model_validate(s).model_dump(),
+            rate_limit=get_usage(s.display_name),
+            health=get_health(s.display_name),
+        )
+        for s in sources
+    ]
 
 
 @router.patch("/sources/{slug}", response_model=SourceResponse)
@@ -106,28 +167,129 @@ async def update_source(
     if body.priority is not None:
         source.priority = body.priority
 
+    # Precomputed responses are keyed by the priorities; drop the unreachable rows
+    await AggregateStore(db).clear()
     await db.commit()
+    # Other workers drop theirs on the invalidation (or when their TTLs expire)
+    source_catalog.invalidate()
+    response_cache.clear()
+    await shared_cache.namespace("sources").invalidate(slug)
     await db.refresh(source)
     return SourceResponse.model_validate(source)
 
 
+@router.post("/sources/reload", response_model=SourcesReloadResponse)
+async def reload_sources() -> SourcesReloadResponse:
+    """Re-read source YAML configs that changed on disk (by mtime and content hash)."""
+    result = source_manager.reload()
+    return SourcesReloadResponse(
+        added=result.added,
+        updated=result.updated,
+        removed=result.removed,
+        failed=result.failed,
+        total=len(source_manager.get_all()),
+    )
+
+
 @router.post("/fetch-now", response_model=FetchNowResponse)
 async def fetch_now(
     city_id: int | None = Query(None, description="Fetch for specific city; all cities if omitted"),
     db: AsyncSession = Depends(get_db),
 ) -> FetchNowResponse:
-    """Trigger an immediate weather data fetch (background task)."""
-    service = WeatherService(db)
+    """Trigger an immediate weather data fetch (background task).
 
+    Cities are refreshed like a scheduler cycle: in batches of
+    ``scheduler.batch_size``, at most ``scheduler.max_concurrency`` at a time.
+    Cities that are already being refreshed join the in-flight fetch instead
+    of starting a second one.
+    """
     if city_id is not None:
-        asyncio.create_task(service.fetch_and_save(city_id))
-        return FetchNowResponse(triggered=True, cities_count=1)
+        city_ids = [city_id]
+    else:
+        result = await db.execute(select(City))
+        city_ids = [city.id for city in result.scalars().all()]
+        logger.info("fetch-now triggered for %d cities", len(city_ids))
+
+    task = asyncio.create_task(_refresh_in_batches(city_ids))
+    _background_fetches.add(task)
+    task.add_done_callback(_background_fetches.discard)
+    return FetchNowResponse(triggered=True, cities_count=len(city_ids))
 
-    result = await db.execute(select(City))
-    cities = result.scalars().all()
 
-    for city in cities:
-        asyncio.create_task(service.fetch_and_save(city.id))
+async def _refresh_in_batches(city_ids: list[int]) -> None:
+    config = settings.app_config
+    batch_size = max(int(config.get("scheduler", "batch_size", default=DEFAULT_BATCH_SIZE)), 1)
+    concurrency = max(
+        int(config.get("scheduler", "max_concurrency", default=DEFAULT_MAX_CONCURRENCY)), 1
+    )
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def refresh(batch: list[int]) -> None:
+        async with semaphore:
+            try:
+                await WeatherService.refresh_cities(batch)
+            except Exception as exc:
+                logger.error("fetch-now failed for cities %s: %s", batch, exc)
+
+    batches = [city_ids[start : start + batch_size] for start in range(0, len(city_ids), batch_size)]
+    await asyncio.gather(*(refresh(batch) for batch in batches))
+
+
+def _export_response(query: Select, fmt: str, name: str) -> StreamingResponse:
+    try:
+        chunks = start_export(query, fmt)
+    except ExportBusy as exc:
+        raise HTTPException(status_code=503, detail=str(exc)) from exc
+    return StreamingResponse(
+        chunks,
+        media_type=EXPORT_FORMATS[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{fmt}"'},
+        # Gives the export slot back even if streaming never started
+        background=BackgroundTask(chunks.aclose),
+    )
+
+
+@router.get("/export/weather-records", response_class=StreamingResponse)
+async def export_weather_records(
+    fmt: Literal["ndjson", "csv"] = Query("ndjson", alias="format", description="ndjson or csv"),
+    city_id: int | None = Query(None, gt=0, description="Filter by city"),
+    source: str | None = Query(None, description="Filter by source slug"),
+    record_type: Literal["current", "forecast"] | None = Query(None),
+    since: datetime | None = Query(None, description="fetched_at from (inclusive, ISO 8601)"),
+    until: datetime | None = Query(None, description="fetched_at until (exclusive, ISO 8601)"),
+    db: AsyncSession = Depends(get_read_db),
+) -> StreamingResponse:
+    """Stream weather_records as NDJSON or CSV, oldest first.
+
+    Rows come from a server-side cursor in chunks (``admin.export``
+    settings), so any number of rows can be exported in constant memory.
+    Returns 503 when the maximum number of exports is already running.
+    """
+    source_id = None
+    if source is not None:
+        catalog = await source_catalog.get(db)
+        ids = catalog.ids([source])
+        if not ids:
+            raise HTTPException(status_code=404, detail=f"Source '{source}' not found")
+        source_id = ids[0]
+
+    query = weather_records_query(city_id, source_id, record_type, since, until)
+    return _export_response(query, fmt, "weather_records")
+
+
+@router.get("/export/request-logs", response_class=StreamingResponse)
+async def export_request_logs(
+    fmt: Literal["ndjson", "csv"] = Query("ndjson", alias="format", description="ndjson or csv"),
+    platform: str | None = Query(None, description="Filter by platform"),
+    action: str | None = Query(None, description="Partial match on action field"),
+    city_id: int | None = Query(None, gt=0, description="Filter by city"),
+    since: datetime | None = Query(None, description="created_at from (inclusive, ISO 8601)"),
+    until: datetime | None = Query(None, description="created_at until (exclusive, ISO 8601)"),
+) -> StreamingResponse:
+    """Stream request_logs as NDJSON or CSV, oldest first.
 
-    logger.info("fetch-now triggered for %d cities", len(cities))
-    return FetchNowResponse(triggered=True, cities_count=len(cities))
+    Unlike ``/admin/logs`` there is no page size or OFFSET; see
+    ``/admin/export/weather-records``.
+    """
+    query = request_logs_query(platform, action, city_id, since, until)
+    return _export_response(query, fmt, "request_logs")
@@ -5,7 +5,7 @@ import logging
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.dependencies import get_db
+from app.dependencies import get_read_db
 from app.schemas.recommendation import ClothingRecommendationResponse
 from app.services.recommendation_service import RecommendationService
 
@@ -17,7 +17,7 @@ router = APIRouter(prefix="/recommendations", tags=["recommendations"])
 @router.get("/clothing", response_model=ClothingRecommendationResponse)
 async def get_clothing_recommendation(
     city_id: int = Query(..., ge=1, description="City ID to get clothing recommendations for"),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ) -> ClothingRecommendationResponse:
     """Get ML-based clothing recommendations for current weather in a city.
 
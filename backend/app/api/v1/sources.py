@@ -6,7 +6,7 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.dependencies import get_db
+from app.dependencies import get_read_db
 from app.models.source import WeatherSource
 from app.schemas.source import SourceResponse
 
@@ -17,7 +17,7 @@ router = APIRouter(prefix="/sources", tags=["sources"])
 
 @router.get("", response_model=list[SourceResponse])
 async def list_sources(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ) -> list[SourceResponse]:
     """List all weather data sources ordered by priority."""
     result = await db.execute(
@@ -30,7 +30,7 @@ async def list_sources(
 @router.get("/{slug}", response_model=SourceResponse)
 async def get_source(
     slug: str,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ) -> SourceResponse:
     """Get a single weather source by its slug."""
     result = await db.execute(
@@ -2,39 +2,174 @@
 
 import logging
 from datetime import datetime, timezone
+from typing import Any
+from email.utils import format_datetime, parsedate_to_datetime
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.dependencies import get_db
+from app.core.responses import ORJSONResponse
+from app.dependencies import get_read_db
 from app.schemas.weather import (
-    AggregatedWeather,
     AggregatedWeatherResponse,
+    BatchForecastResponse,
+    BatchWeatherResponse,
     ChartPoint,
     DailyChartPoint,
-    ForecastPoint,
     ForecastResponse,
-    SourceWeatherData,
     SourceWeatherResponse,
+    WeatherOverviewResponse,
+)
+from app.services.recommendation_service import RecommendationService
+from app.services.weather_service import (
+    DataFreshness,
+    PrecomputedResponse,
+    ResponseValidator,
+    WeatherService,
 )
-from app.services.weather_service import WeatherService
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/weather", tags=["weather"])
+# Endpoints return ORJSONResponse with the service output as is (already in
+# the response shape); ``response_model`` only documents it
+router = APIRouter(prefix="/weather", tags=["weather"], default_response_class=ORJSONResponse)
+
+# Upper bound on the number of cities in one batch request
+MAX_BATCH_CITIES = 50
+
+
+def _freshness_fields(
+    freshness: DataFreshness | None, response: Response | None = None
+) -> dict:
+    """Build stale/data-age response fields and set the ``X-Data-Age`` header."""
+    if freshness is None:
+        return {"stale": False, "data_age_seconds": None}
+    age = freshness.age_seconds
+    if response is not None:
+        response.headers["X-Data-Age"] = str(age)
+    return {"stale": freshness.stale, "data_age_seconds": age}
+
+
+def _fetched_at(freshness: DataFreshness | None) -> datetime:
+    """Time of the data behind a response (now, if unknown)."""
+    return freshness.fetched_at if freshness is not None else datetime.now(timezone.utc)
+
+
+def _not_modified(request: Request, validator: ResponseValidator | None) -> bool:
+    """Return True if the client's cached copy (If-None-Match / If-Modified-Since) is current."""
+    if validator is None:
+        return False
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # Weak comparison; If-None-Match takes precedence over If-Modified-Since
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or validator.etag.removeprefix("W/") in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if not if_modified_since:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    # HTTP dates have one-second resolution
+    return validator.last_modified.replace(microsecond=0) <= since
+
+
+def _validator_headers(validator: ResponseValidator) -> dict[str, str]:
+    return {
+        "ETag": validator.etag,
+        "Last-Modified": format_datetime(validator.last_modified, usegmt=True),
+        # Clients may store the response but must revalidate it on every use
+        "Cache-Control": "no-cache",
+    }
+
+
+def _not_modified_response(
+    validator: ResponseValidator, freshness: DataFreshness | None = None
+) -> Response:
+    response = Response(status_code=304, headers=_validator_headers(validator))
+    _freshness_fields(freshness, response)
+    return response
+
+
+def _set_validator(response: Response, validator: ResponseValidator | None) -> None:
+    if validator is not None:
+        response.headers.update(_validator_headers(validator))
+
+
+def _precomputed_response(
+    request: Request, precomputed: PrecomputedResponse, freshness: DataFreshness | None = None
+) -> Response:
+    """Send a precomputed JSON body as is (or 304 if the client's copy is current)."""
+    if _not_modified(request, precomputed.validator):
+        return _not_modified_response(precomputed.validator, freshness)
+    response = Response(
+        precomputed.body,
+        media_type="application/json",
+        headers=_validator_headers(precomputed.validator),
+    )
+    _freshness_fields(freshness, response)
+    return response
+
+
+def _json_response(content: Any, response: Response) -> ORJSONResponse:
+    """Send *content* with the headers already set on the endpoint's *response*."""
+    return ORJSONResponse(content, headers=response.headers)
+
+
+def _forecast_points(result: list[dict]) -> list[dict]:
+    """ForecastPoint fields of aggregated forecast points (already validated)."""
+    return [{"forecast_dt": item["forecast_dt"], "weather": item["data"]} for item in result]
+
+
+def _forecast_content(
+    city_id: int,
+    days: int,
+    result: list[dict],
+    freshness: DataFreshness | None,
+    response: Response | None = None,
+) -> dict:
+    """``ForecastResponse`` fields of an aggregated forecast."""
+    return {
+        "city_id": city_id,
+        "days": days,
+        "forecasts": _forecast_points(result),
+        **_freshness_fields(freshness, response),
+    }
 
 
 @router.get("/current", response_model=AggregatedWeatherResponse)
 async def get_current_weather(
+    request: Request,
+    response: Response,
     city_id: int = Query(..., description="City ID", gt=0),
     sources: list[str] | None = Query(None, description="Source slugs to filter by"),
-    db: AsyncSession = Depends(get_db),
-) -> AggregatedWeatherResponse:
+    db: AsyncSession = Depends(get_read_db),
+) -> Response:
     """Get aggregated current weather for a city.
 
-    Triggers on-demand fetch if data is older than 30 minutes.
+    Data older than 30 minutes is refreshed: in the background when
+    stale-while-revalidate is enabled and the data is inside the grace window
+    (the response is then marked ``stale``), otherwise before responding.
+
+    Responses carry an ETag and Last-Modified (the data time); repeat
+    requests with If-None-Match / If-Modified-Since get 304 Not Modified.
+
+    Without a source filter the response precomputed at the last refresh
+    is sent as stored (see ``WeatherService.get_precomputed``).
     """
     service = WeatherService(db)
+    precomputed = await service.get_precomputed("current", city_id, sources)
+    if precomputed is not None:
+        return _precomputed_response(request, precomputed, service.freshness)
+
+    validator = await service.get_validator("current", city_id, sources)
+    if _not_modified(request, validator):
+        return _not_modified_response(validator, service.freshness)
+
     result = await service.get_aggregated_current(city_id, source_slugs=sources)
 
     if result is None:
@@ -43,25 +178,42 @@ async def get_current_weather(
             detail=f"No weather data available for city_id={city_id}",
         )
 
-    return AggregatedWeatherResponse(
-        city_id=city_id,
-        fetched_at=datetime.now(timezone.utc),
-        weather=result,
+    # Data that had to be refreshed first has no validator yet
+    _set_validator(response, validator or await service.get_validator("current", city_id, sources))
+    return _json_response(
+        {
+            "city_id": city_id,
+            "fetched_at": _fetched_at(service.freshness),
+            "weather": result,
+            **_freshness_fields(service.freshness, response),
+        },
+        response,
     )
 
 
 @router.get("/forecast", response_model=ForecastResponse)
 async def get_forecast(
+    request: Request,
+    response: Response,
     city_id: int = Query(..., description="City ID", gt=0),
     days: int = Query(5, description="Number of forecast days", ge=3, le=7),
     sources: list[str] | None = Query(None, description="Source slugs to filter by"),
-    db: AsyncSession = Depends(get_db),
-) -> ForecastResponse:
+    db: AsyncSession = Depends(get_read_db),
+) -> Response:
     """Get weather forecast for a city.
 
-    Returns aggregated forecast data grouped by datetime.
+    Returns aggregated forecast data grouped by datetime.  Supports
+    conditional requests like ``/weather/current``.
     """
     service = WeatherService(db)
+    precomputed = await service.get_precomputed("forecast", city_id, sources, (days,))
+    if precomputed is not None:
+        return _precomputed_response(request, precomputed, service.freshness)
+
+    validator = await service.get_validator("forecast", city_id, sources, (days,))
+    if _not_modified(request, validator):
+        return _not_modified_response(validator, service.freshness)
+
     result = await service.get_aggregated_forecast(city_id, days=days, source_slugs=sources)
 
     if not result:
@@ -70,22 +222,146 @@ async def get_forecast(
             detail=f"No forecast data available for city_id={city_id}",
         )
 
-    forecasts = [
-        ForecastPoint(
-            forecast_dt=item["forecast_dt"],
-            weather=AggregatedWeather(**item["data"]),
+    _set_validator(
+        response, validator or await service.get_validator("forecast", city_id, sources, (days,))
+    )
+    return _json_response(
+        _forecast_content(city_id, days, result, service.freshness, response), response
+    )
+
+
+@router.get("/overview", response_model=WeatherOverviewResponse)
+async def get_overview(
+    request: Request,
+    response: Response,
+    city_id: int = Query(..., description="City ID", gt=0),
+    days: int = Query(7, description="Days of forecast and daily chart", ge=3, le=7),
+    db: AsyncSession = Depends(get_read_db),
+) -> Response:
+    """Get everything the web dashboard shows for a city in one request.
+
+    Current weather, forecast, hourly and daily chart series and the
+    clothing recommendation are built from one read of the city's records
+    (see ``WeatherService.get_overview``).  Parts without data are null or
+    empty; 404 is returned only if the city has no weather data at all.
+
+    Supports conditional requests like ``/weather/current``; the validators
+    cover both the current and the forecast data.
+    """
+    service = WeatherService(db)
+    validator = await service.get_validator("overview", city_id, params=(days,))
+    if _not_modified(request, validator):
+        return _not_modified_response(validator, service.freshness)
+
+    overview = await service.get_overview(city_id, days=days)
+
+    if overview.current is None and not overview.forecast:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No weather data available for city_id={city_id}",
+        )
+
+    current = None
+    recommendation = None
+    if overview.current is not None:
+        current = {
+            "city_id": city_id,
+            "fetched_at": _fetched_at(overview.current_freshness),
+            "weather": overview.current,
+            **_freshness_fields(overview.current_freshness, response),
+        }
+        if RecommendationService.is_available():
+            try:
+                recommendation = RecommendationService(db).recommend(city_id, overview.current)
+            except RuntimeError as exc:
+                logger.error("Recommendation error for city_id=%d: %s", city_id, exc)
+
+    forecast = None
+    if overview.forecast:
+        forecast = _forecast_content(
+            city_id, days, overview.forecast, overview.forecast_freshness
         )
-        for item in result
+
+    _set_validator(
+        response, validator or await service.get_validator("overview", city_id, params=(days,))
+    )
+    return _json_response(
+        {
+            "city_id": city_id,
+            "current": current,
+            "forecast": forecast,
+            "chart_hourly": overview.chart_hourly,
+            "chart_daily": overview.chart_daily,
+            "recommendation": recommendation,
+        },
+        response,
+    )
+
+
+@router.get("/current/batch", response_model=BatchWeatherResponse)
+async def get_current_weather_batch(
+    city_ids: list[int] = Query(
+        ..., description="City IDs", min_length=1, max_length=MAX_BATCH_CITIES
+    ),
+    sources: list[str] | None = Query(None, description="Source slugs to filter by"),
+    db: AsyncSession = Depends(get_read_db),
+) -> Response:
+    """Get aggregated current weather for several cities in one request.
+
+    All cities are read with one query and stale ones are refreshed with one
+    combined upstream refresh.  Cities without data are listed in ``missing``.
+    """
+    service = WeatherService(db)
+    result = await service.get_aggregated_current_many(city_ids, source_slugs=sources)
+
+    items = [
+        {
+            "city_id": city_id,
+            "fetched_at": _fetched_at(service.freshness_by_city.get(city_id)),
+            "weather": result[city_id],
+            **_freshness_fields(service.freshness_by_city.get(city_id)),
+        }
+        for city_id in dict.fromkeys(city_ids)
+        if city_id in result
     ]
+    missing = [city_id for city_id in dict.fromkeys(city_ids) if city_id not in result]
+    return ORJSONResponse({"items": items, "missing": missing})
 
-    return ForecastResponse(city_id=city_id, days=days, forecasts=forecasts)
+
+@router.get("/forecast/batch", response_model=BatchForecastResponse)
+async def get_forecast_batch(
+    city_ids: list[int] = Query(
+        ..., description="City IDs", min_length=1, max_length=MAX_BATCH_CITIES
+    ),
+    days: int = Query(5, description="Number of forecast days", ge=3, le=7),
+    sources: list[str] | None = Query(None, description="Source slugs to filter by"),
+    db: AsyncSession = Depends(get_read_db),
+) -> Response:
+    """Get weather forecasts for several cities in one request.
+
+    Cities without forecast data are listed in ``missing``.
+    """
+    service = WeatherService(db)
+    result = await service.get_aggregated_forecast_many(
+        city_ids, days=days, source_slugs=sources
+    )
+
+    items = [
+        _forecast_content(
+            city_id, days, result[city_id], service.freshness_by_city.get(city_id)
+        )
+        for city_id in dict.fromkeys(city_ids)
+        if result.get(city_id)
+    ]
+    missing = [city_id for city_id in dict.fromkeys(city_ids) if not result.get(city_id)]
+    return ORJSONResponse({"items": items, "missing": missing})
 
 
 @router.get("/current/by-source", response_model=SourceWeatherResponse)
 async def get_current_by_source(
     city_id: int = Query(..., description="City ID", gt=0),
-    db: AsyncSession = Depends(get_db),
-) -> SourceWeatherResponse:
+    db: AsyncSession = Depends(get_read_db),
+) -> Response:
     """Get current weather data broken down by individual source.
 
     Useful for comparing values across different data providers.
@@ -100,25 +376,36 @@ async def get_current_by_source(
         )
 
     sources_data = {
-        slug: SourceWeatherData(
-            source_name=data["source_name"],
-            priority=data["priority"],
-            fetched_at=data["fetched_at"],
-            weather=AggregatedWeather(**data["data"]),
-        )
+        slug: {
+            "source_name": data["source_name"],
+            "priority": data["priority"],
+            "fetched_at": data["fetched_at"],
+            "weather": data["data"],
+        }
         for slug, data in result.items()
     }
 
-    return SourceWeatherResponse(city_id=city_id, sources=sources_data)
+    return ORJSONResponse({"city_id": city_id, "sources": sources_data})
 
 
 @router.get("/chart/hourly", response_model=list[ChartPoint])
 async def get_chart_hourly(
+    request: Request,
+    response: Response,
     city_id: int = Query(..., description="City ID", gt=0),
-    db: AsyncSession = Depends(get_db),
-) -> list[ChartPoint]:
+    db: AsyncSession = Depends(get_read_db),
+) -> Response:
     """Get hourly weather data for charts (next 24 hours)."""
     service = WeatherService(db)
+    precomputed = await service.get_precomputed("chart_hourly", city_id)
+    if precomputed is not None:
+        return _precomputed_response(request, precomputed)
+
+    validator = await service.get_validator("chart_hourly", city_id)
+    if _not_modified(request, validator):
+        return _not_modified_response(validator)
+    _set_validator(response, validator)
+
     result = await service.get_chart_hourly(city_id)
 
     if not result:
@@ -127,27 +414,28 @@ async def get_chart_hourly(
             detail=f"No hourly chart data available for city_id={city_id}",
         )
 
-    return [
-        ChartPoint(
-            hour=item["hour"],
-            temperature=item.get("temperature"),
-            feels_like=item.get("feels_like"),
-            precipitation_amount=item.get("precipitation_amount"),
-            wind_speed=item.get("wind_speed"),
-            humidity=item.get("humidity"),
-        )
-        for item in result
-    ]
+    return _json_response(result, response)
 
 
 @router.get("/chart/daily", response_model=list[DailyChartPoint])
 async def get_chart_daily(
+    request: Request,
+    response: Response,
     city_id: int = Query(..., description="City ID", gt=0),
     days: int = Query(7, description="Number of days", ge=3, le=7),
-    db: AsyncSession = Depends(get_db),
-) -> list[DailyChartPoint]:
+    db: AsyncSession = Depends(get_read_db),
+) -> Response:
     """Get daily weather data for charts with min/max temperatures."""
     service = WeatherService(db)
+    precomputed = await service.get_precomputed("chart_daily", city_id, params=(days,))
+    if precomputed is not None:
+        return _precomputed_response(request, precomputed)
+
+    validator = await service.get_validator("chart_daily", city_id, params=(days,))
+    if _not_modified(request, validator):
+        return _not_modified_response(validator)
+    _set_validator(response, validator)
+
     result = await service.get_chart_daily(city_id, days=days)
 
     if not result:
@@ -156,12 +444,4 @@ async def get_chart_daily(
             detail=f"No daily chart data available for city_id={city_id}",
         )
 
-    return [
-        DailyChartPoint(
-            date=item["date"],
-            temp_min=item["temp_min"],
-            temp_max=item["temp_max"],
-            temp_avg=item["temp_avg"],
-        )
-        for item in result
-    ]
+    return _json_response(result, response)
@@ -0,0 +1,559 @@
+"""Cache shared by all backend processes.
+
+Per-process caches (response cache, source catalog) only help the worker
+that filled them, and their invalidations never reach the other workers.
+``shared_cache`` stores values under namespaced keys (``<prefix>:<namespace>:
+<key>``) in a backend selected by the ``cache`` section of settings.yaml:
+
+* ``memory`` -- a bounded dict inside this process (the default; a single
+  worker needs nothing else);
+* ``redis`` -- any server speaking the Redis protocol at ``REDIS_URL``, so
+  every worker and container shares the same entries.  ``redis://`` and
+  ``rediss://`` (TLS, the server certificate is verified against the system
+  CAs) URLs are accepted, with optional ``user:password@`` and database
+  number; other URL options are not supported.
+
+Besides TTL'd get/set (also in bulk) a namespace can publish invalidations.
+Other processes receive them through ``on_invalidate`` handlers and drop
+their local copies.  The cache is best-effort: backend errors are logged and
+counted, reads then miss and writes are skipped, so an unreachable Redis
+never fails a request.  Values are stored as JSON and validated back into
+the namespace's value type (a pydantic ``TypeAdapter``): nothing read from
+the server is executed, and an entry that does not decode is a miss.
+"""
+
+import asyncio
+import json
+import logging
+import ssl
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Mapping
+from typing import Any
+from urllib.parse import unquote, urlparse
+
+from pydantic import TypeAdapter
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PREFIX = "weather_app"
+DEFAULT_MAX_ENTRIES = 10_000
+DEFAULT_POOL_SIZE = 4
+DEFAULT_TIMEOUT_SECONDS = 2
+# Delay before the invalidation listener reconnects, doubled up to the maximum
+RESUBSCRIBE_DELAY_SECONDS = 1
+MAX_RESUBSCRIBE_DELAY_SECONDS = 30
+_URL_SCHEMES = ("redis", "rediss")
+
+InvalidationHandler = Callable[[list[str]], None]
+
+
+class CacheError(Exception):
+    """The cache backend failed or answered with an error."""
+
+
+class CacheBackend(ABC):
+    """Raw byte storage with TTLs and a broadcast channel."""
+
+    @abstractmethod
+    async def get_many(self, keys: list[str]) -> list[bytes | None]:
+        """Return the values of *keys* in order (None where missing)."""
+
+    @abstractmethod
+    async def set_many(self, items: Mapping[str, bytes], ttl: float | None = None) -> None:
+        """Store *items*, expiring after *ttl* seconds (never if None)."""
+
+    @abstractmethod
+    async def delete(self, keys: list[str]) -> None:
+        """Remove *keys*."""
+
+    @abstractmethod
+    async def delete_prefix(self, prefix: str) -> None:
+        """Remove every key starting with *prefix*."""
+
+    @abstractmethod
+    async def publish(self, channel: str, message: str) -> None:
+        """Send *message* to every subscriber of *channel*."""
+
+    @abstractmethod
+    def subscribe(self, channel: str, callback: Callable[[str], None]) -> None:
+        """Call *callback* with every message published on *channel*."""
+
+    async def start(self) -> None:
+        """Open connections (idempotent)."""
+
+    async def close(self) -> None:
+        """Release connections."""
+
+
+class MemoryBackend(CacheBackend):
+    """Backend local to this process; published messages reach its own subscribers."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        self.max_entries = max_entries
+        # key -> (value, expiry on the monotonic clock or None)
+        self._entries: OrderedDict[str, tuple[bytes, float | None]] = OrderedDict()
+        self._subscribers: dict[str, list[Callable[[str], None]]] = {}
+
+    async def get_many(self, keys: list[str]) -> list[bytes | None]:
+        now = time.monotonic()
+        values: list[bytes | None] = []
+        for key in keys:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] is not None and entry[1] <= now:
+                del self._entries[key]
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+            values.append(entry[0] if entry is not None else None)
+        return values
+
+    async def set_many(self, items: Mapping[str, bytes], ttl: float | None = None) -> None:
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        for key, value in items.items():
+            self._entries.pop(key, None)
+            self._entries[key] = (value, expires_at)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def delete(self, keys: list[str]) -> None:
+        for key in keys:
+            self._entries.pop(key, None)
+
+    async def delete_prefix(self, prefix: str) -> None:
+        for key in [key for key in self._entries if key.startswith(prefix)]:
+            del self._entries[key]
+
+    async def publish(self, channel: str, message: str) -> None:
+        for callback in list(self._subscribers.get(channel, ())):
+            callback(message)
+
+    def subscribe(self, channel: str, callback: Callable[[str], None]) -> None:
+        self._subscribers.setdefault(channel, []).append(callback)
+
+
+# --- Redis protocol (RESP2) ---------------------------------------------------
+
+
+def _encode_command(args: Iterable[Any]) -> bytes:
+    parts = list(args)
+    out = [b"*%d\r\n" % len(parts)]
+    for arg in parts:
+        if isinstance(arg, str):
+            arg = arg.encode()
+        elif not isinstance(arg, bytes):
+            arg = str(arg).encode()
+        out.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+    return b"".join(out)
+
+
+class _ReplyError(str):
+    """An error reply (``-ERR ...``); returned, not raised, so a pipeline is read fully."""
+
+
+async def _read_reply(reader: asyncio.StreamReader) -> Any:
+    line = await reader.readuntil(b"\r\n")
+    kind, payload = line[:1], line[1:-2]
+    if kind == b"+":
+        return payload.decode()
+    if kind == b"-":
+        return _ReplyError(payload.decode())
+    if kind == b":":
+        return int(payload)
+    if kind == b"$":
+        length = int(payload)
+        if length < 0:
+            return None
+        return (await reader.readexactly(length + 2))[:-2]
+    if kind == b"*":
+        length = int(payload)
+        if length < 0:
+            return None
+        return [await _read_reply(reader) for _ in range(length)]
+    raise CacheError(f"Unexpected reply from cache server: {line!r}")
+
+
+def _escape_pattern(text: str) -> str:
+    """Escape glob metacharacters for SCAN MATCH."""
+    for char in "\\*?[]":
+        text = text.replace(char, "\\" + char)
+    return text
+
+
+class _RedisConnection:
+    """One connection executing pipelined commands, one pipeline at a time."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.reader = reader
+        self.writer = writer
+
+    @classmethod
+    async def open(cls, url: str, ssl_context: ssl.SSLContext | None = None) -> "_RedisConnection":
+        parsed = urlparse(url)
+        reader, writer = await asyncio.open_connection(
+            parsed.hostname or "localhost", parsed.port or 6379, ssl=ssl_context
+        )
+        conn = cls(reader, writer)
+        setup: list[tuple[Any, ...]] = []
+        if parsed.password:
+            if parsed.username:
+                setup.append(("AUTH", unquote(parsed.username), unquote(parsed.password)))
+            else:
+                setup.append(("AUTH", unquote(parsed.password)))
+        database = parsed.path.lstrip("/")
+        if database and database != "0":
+            setup.append(("SELECT", database))
+        if setup:
+            try:
+                await conn.execute(*setup)
+            except BaseException:
+                conn.close()
+                raise
+        return conn
+
+    async def execute(self, *commands: tuple[Any, ...]) -> list[Any]:
+        """Send *commands* in one write and return their replies."""
+        self.writer.write(b"".join(_encode_command(command) for command in commands))
+        await self.writer.drain()
+        replies = [await _read_reply(self.reader) for _ in commands]
+        for reply in replies:
+            if isinstance(reply, _ReplyError):
+                raise CacheError(reply)
+        return replies
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+class RedisBackend(CacheBackend):
+    """Backend on a Redis-protocol server, with a small connection pool.
+
+    Commands used: MGET, SET ... PX, DEL, SCAN, PUBLISH, SUBSCRIBE (plus AUTH
+    and SELECT from the URL); ``rediss://`` connects over TLS.  Invalidations are received on a dedicated
+    connection that reconnects after failures; messages published while it
+    is disconnected are lost, so cached values must still carry a TTL.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        timeout: float = DEFAULT_TIMEOUT_SECONDS,
+    ) -> None:
+        scheme = urlparse(url).scheme
+        if scheme not in _URL_SCHEMES:
+            raise ValueError(f"Unsupported cache URL scheme {scheme!r}, use redis:// or rediss://")
+        self.url = url
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self._ssl = ssl.create_default_context() if scheme == "rediss" else None
+        self._idle: list[_RedisConnection] = []
+        self._slots: asyncio.Semaphore | None = None
+        self._subscribers: dict[str, list[Callable[[str], None]]] = {}
+        self._listener: asyncio.Task | None = None
+
+    async def get_many(self, keys: list[str]) -> list[bytes | None]:
+        if not keys:
+            return []
+        (values,) = await self._execute(("MGET", *keys))
+        return values
+
+    async def set_many(self, items: Mapping[str, bytes], ttl: float | None = None) -> None:
+        if not items:
+            return
+        expiry = ("PX", max(int(ttl * 1000), 1)) if ttl is not None else ()
+        await self._execute(*(("SET", key, value, *expiry) for key, value in items.items()))
+
+    async def delete(self, keys: list[str]) -> None:
+        if keys:
+            await self._execute(("DEL", *keys))
+
+    async def delete_prefix(self, prefix: str) -> None:
+        pattern = _escape_pattern(prefix) + "*"
+        cursor = b"0"
+        while True:
+            ((cursor, keys),) = await self._execute(("SCAN", cursor, "MATCH", pattern, "COUNT", 500))
+            if keys:
+                await self._execute(("DEL", *keys))
+            if cursor in (b"0", "0"):
+                return
+
+    async def publish(self, channel: str, message: str) -> None:
+        await self._execute(("PUBLISH", channel, message))
+
+    def subscribe(self, channel: str, callback: Callable[[str], None]) -> None:
+        self._subscribers.setdefault(channel, []).append(callback)
+        if self._listener is not None:
+            # Re-subscribe with the new channel list
+            self._listener.cancel()
+            self._listener = None
+            self._start_listener()
+
+    async def start(self) -> None:
+        self._start_listener()
+
+    async def close(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        while self._idle:
+            self._idle.pop().close()
+
+    async def _execute(self, *commands: tuple[Any, ...]) -> list[Any]:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.pool_size)
+        async with self._slots:
+            conn = self._idle.pop() if self._idle else None
+            try:
+                if conn is None:
+                    conn = await asyncio.wait_for(
+                        _RedisConnection.open(self.url, self._ssl), self.timeout
+                    )
+                replies = await asyncio.wait_for(conn.execute(*commands), self.timeout)
+            except CacheError:
+                # An error reply leaves the connection usable
+                if conn is not None:
+                    self._idle.append(conn)
+                raise
+            except (OSError, EOFError, asyncio.IncompleteReadError, asyncio.TimeoutError) as exc:
+                if conn is not None:
+                    conn.close()
+                raise CacheError(f"Cache server unavailable: {exc!r}") from exc
+            except BaseException:
+                # Cancelled mid-pipeline: unread replies would corrupt the next caller
+                if conn is not None:
+                    conn.close()
+                raise
+            self._idle.append(conn)
+            return replies
+
+    def _start_listener(self) -> None:
+        if self._listener is None and self._subscribers:
+            self._listener = asyncio.create_task(self._listen())
+
+    async def _listen(self) -> None:
+        delay = RESUBSCRIBE_DELAY_SECONDS
+        while True:
+            conn: _RedisConnection | None = None
+            try:
+                conn = await asyncio.wait_for(
+                    _RedisConnection.open(self.url, self._ssl), self.timeout
+                )
+                conn.writer.write(_encode_command(("SUBSCRIBE", *self._subscribers)))
+                await conn.writer.drain()
+                delay = RESUBSCRIBE_DELAY_SECONDS
+                while True:
+                    reply = await _read_reply(conn.reader)
+                    if isinstance(reply, list) and len(reply) == 3 and reply[0] == b"message":
+                        self._dispatch(reply[1].decode(), reply[2].decode())
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("Cache invalidation listener disconnected: %r", exc)
+            finally:
+                if conn is not None:
+                    conn.close()
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, MAX_RESUBSCRIBE_DELAY_SECONDS)
+
+    def _dispatch(self, channel: str, message: str) -> None:
+        for callback in list(self._subscribers.get(channel, ())):
+            try:
+                callback(message)
+            except Exception:
+                logger.exception("Cache invalidation handler failed on %s", channel)
+
+
+# --- Namespaced facade --------------------------------------------------------
+
+
+class CacheNamespace:
+    """Keys of one feature (``weather``, ``geocoding``, ``sources`` ...).
+
+    Values are of *value_type* (anything pydantic can validate from JSON:
+    models, dataclasses, TypedDicts, containers of them ...).
+    """
+
+    def __init__(self, cache: "SharedCache", name: str, value_type: Any = Any) -> None:
+        self.cache = cache
+        self.name = name
+        self._adapter: TypeAdapter[Any] = TypeAdapter(value_type)
+
+    def key(self, key: str) -> str:
+        return f"{self.cache.prefix}:{self.name}:{key}"
+
+    async def get(self, key: str) -> Any | None:
+        return (await self.get_many([key])).get(key)
+
+    async def get_many(self, keys: Iterable[str]) -> dict[str, Any]:
+        """Return the cached values of *keys*; missing keys are left out."""
+        keys = list(keys)
+        try:
+            raw = await self.cache.backend.get_many([self.key(key) for key in keys])
+        except CacheError as exc:
+            self.cache._failed("get", exc)
+            return {}
+        found = {}
+        for key, value in zip(keys, raw):
+            if value is None:
+                continue
+            try:
+                found[key] = self._adapter.validate_json(value)
+            except ValueError as exc:
+                logger.warning("Ignoring undecodable shared cache entry %s: %s", self.key(key), exc)
+        self.cache.hits += len(found)
+        self.cache.misses += len(keys) - len(found)
+        return found
+
+    async def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        await self.set_many({key: value}, ttl)
+
+    async def set_many(self, items: Mapping[str, Any], ttl: float | None = None) -> None:
+        """Store *items* for *ttl* seconds (forever if None)."""
+        payload = {self.key(key): self._adapter.dump_json(value) for key, value in items.items()}
+        try:
+            await self.cache.backend.set_many(payload, ttl)
+        except CacheError as exc:
+            self.cache._failed("set", exc)
+
+    async def delete(self, *keys: str) -> None:
+        try:
+            await self.cache.backend.delete([self.key(key) for key in keys])
+        except CacheError as exc:
+            self.cache._failed("delete", exc)
+
+    async def clear(self, prefix: str = "") -> None:
+        """Delete every key of the namespace that starts with *prefix*."""
+        try:
+            await self.cache.backend.delete_prefix(self.key(prefix))
+        except CacheError as exc:
+            self.cache._failed("clear", exc)
+
+    async def publish(self, *items: str) -> None:
+        """Notify the ``on_invalidate`` handlers of the other processes."""
+        message = json.dumps({"origin": self.cache.origin, "namespace": self.name, "items": items})
+        try:
+            await self.cache.backend.publish(self.cache.channel, message)
+        except CacheError as exc:
+            self.cache._failed("publish", exc)
+
+    async def invalidate(self, *keys: str) -> None:
+        """Delete *keys* here and tell the other processes to drop their copies."""
+        if keys:
+            await self.delete(*keys)
+        await self.publish(*keys)
+
+
+class SharedCache:
+    """Process-wide entry point; the backend is built from settings on first use."""
+
+    def __init__(self, backend: CacheBackend | None = None, prefix: str | None = None) -> None:
+        self._backend = backend
+        self._prefix = prefix
+        # Identifies this process so that it ignores its own invalidations
+        self.origin = uuid.uuid4().hex
+        self._handlers: dict[str, list[InvalidationHandler]] = {}
+        self._subscribed = False
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    @property
+    def backend(self) -> CacheBackend:
+        if self._backend is None:
+            self._backend = self._create_backend()
+        if not self._subscribed:
+            self._backend.subscribe(self.channel, self._on_message)
+            self._subscribed = True
+        return self._backend
+
+    @property
+    def prefix(self) -> str:
+        if self._prefix is None:
+            self._prefix = str(settings.app_config.get("cache", "prefix", default=DEFAULT_PREFIX))
+        return self._prefix
+
+    @property
+    def channel(self) -> str:
+        return f"{self.prefix}:invalidate"
+
+    @property
+    def distributed(self) -> bool:
+        """True if entries are shared with other processes."""
+        return not isinstance(self.backend, MemoryBackend)
+
+    def namespace(self, name: str, value_type: Any = Any) -> CacheNamespace:
+        return CacheNamespace(self, name, value_type)
+
+    def on_invalidate(self, namespace: str, handler: InvalidationHandler) -> None:
+        """Call *handler* with the items of invalidations published by other processes."""
+        self._handlers.setdefault(namespace, []).append(handler)
+
+    async def start(self) -> None:
+        await self.backend.start()
+        logger.info("Shared cache started (%s)", type(self.backend).__name__)
+
+    async def close(self) -> None:
+        if self._backend is not None:
+            await self._backend.close()
+
+    def reset(self) -> None:
+        """Switch to a fresh in-memory backend and zero the counters (used by tests)."""
+        self._backend = MemoryBackend()
+        self._subscribed = False
+        self.hits = self.misses = self.errors = 0
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "backend": type(self.backend).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+        }
+
+    def _on_message(self, message: str) -> None:
+        try:
+            data = json.loads(message)
+        except ValueError:
+            logger.warning("Ignoring malformed cache invalidation: %r", message)
+            return
+        if data.get("origin") == self.origin:
+            return
+        for handler in self._handlers.get(data.get("namespace"), ()):
+            try:
+                handler(list(data.get("items") or ()))
+            except Exception:
+                logger.exception("Invalidation handler for %s failed", data.get("namespace"))
+
+    def _failed(self, operation: str, exc: CacheError) -> None:
+        self.errors += 1
+        logger.warning("Shared cache %s failed: %s", operation, exc)
+
+    @staticmethod
+    def _create_backend() -> CacheBackend:
+        config = settings.app_config
+        kind = config.get("cache", "backend", default="memory")
+        if kind == "redis":
+            return RedisBackend(
+                settings.redis_url,
+                pool_size=int(config.get("cache", "pool_size", default=DEFAULT_POOL_SIZE)),
+                timeout=float(
+                    config.get("cache", "timeout_seconds", default=DEFAULT_TIMEOUT_SECONDS)
+                ),
+            )
+        if kind != "memory":
+            logger.warning("Unknown cache backend %r, using memory", kind)
+        return MemoryBackend(
+            int(config.get("cache", "max_entries", default=DEFAULT_MAX_ENTRIES))
+        )
+
+
+shared_cache = SharedCache()
@@ -13,7 +13,7 @@ _ENV_VAR_PATTERN = re.compile(r"\$\{([^}]+)\}")
 _CONFIG_DIR = Path(__file__).parent.parent.parent / "config"
 
 
-def _substitute_env_vars(value: Any) -> Any:
+def substitute_env_vars(value: Any) -> Any:
     """Recursively substitute ${ENV_VAR} placeholders with environment variable values."""
     if isinstance(value, str):
         def _replace(match: re.Match) -> str:
@@ -28,9 +28,9 @@ def _substitute_env_vars(value: Any) -> Any:
 
         return _ENV_VAR_PATTERN.sub(_replace, value)
     if isinstance(value, dict):
-        return {k: _substitute_env_vars(v) for k, v in value.items()}
+        return {k: substitute_env_vars(v) for k, v in value.items()}
     if isinstance(value, list):
-        return [_substitute_env_vars(item) for item in value]
+        return [substitute_env_vars(item) for item in value]
     return value
 
 
@@ -38,7 +38,7 @@ def _load_yaml(path: Path) -> dict[str, Any]:
     """Load a YAML file and substitute environment variables."""
     with open(path, encoding="utf-8") as f:
         raw = yaml.safe_load(f) or {}
-    return _substitute_env_vars(raw)
+    return substitute_env_vars(raw)
 
 
 def _load_settings_yaml() -> dict[str, Any]:
@@ -70,6 +70,11 @@ class Settings(BaseSettings):
     db_host: str = "localhost"
     db_port: int = 5432
     db_name: str = "weather_db"
+    # Optional read replicas: comma-separated database URLs
+    db_replica_urls: str = ""
+
+    # Shared cache server (cache.backend: redis in settings.yaml)
+    redis_url: str = "redis://localhost:6379/0"
 
     # Auth
     admin_api_key: str = "changeme"
@@ -97,6 +102,12 @@ class Settings(BaseSettings):
             f"@{self.db_host}:{self.db_port}/{self.db_name}"
         )
 
+    @property
+    def replica_database_urls(self) -> list[str]:
+        urls = [url.strip() for url in self.db_replica_urls.split(",") if url.strip()]
+        # Accept plain postgresql:// URLs, the async engine needs the asyncpg driver
+        return [re.sub(r"^postgres(ql)?://", "postgresql+asyncpg://", url) for url in urls]
+
     @property
     def app_config(self) -> AppConfig:
         if not hasattr(self, "_app_config"):
@@ -1,16 +1,81 @@
 from collections.abc import AsyncGenerator
+from typing import Any
 
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
-from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.orm import DeclarativeBase, Session
+from sqlalchemy.sql.dml import UpdateBase
 
 from app.core.config import settings
+from app.core.db_metrics import InstrumentedQueuePool, instrument_engine
 
 
-engine = create_async_engine(settings.async_database_url, echo=False)
+def engine_options() -> dict[str, Any]:
+    """Keyword arguments for ``create_async_engine`` from the ``database`` settings."""
+    config = settings.app_config
+    options: dict[str, Any] = {
+        "echo": False,
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": int(config.get("database", "pool", "size", default=5)),
+        "max_overflow": int(config.get("database", "pool", "max_overflow", default=10)),
+        "pool_timeout": float(config.get("database", "pool", "timeout_seconds", default=30)),
+        "pool_recycle": int(config.get("database", "pool", "recycle_seconds", default=-1)),
+        "pool_pre_ping": bool(config.get("database", "pool", "pre_ping", default=False)),
+    }
+    cache_size = config.get("database", "statement_cache_size")
+    if cache_size is not None:
+        # SQLAlchemy's own prepared statement cache and asyncpg's
+        options["connect_args"] = {
+            "prepared_statement_cache_size": int(cache_size),
+            "statement_cache_size": int(cache_size),
+        }
+    return options
+
+
+engine = instrument_engine(
+    "primary", create_async_engine(settings.async_database_url, **engine_options())
+)
+
+# Read replicas (DB_REPLICA_URLS); empty when all traffic goes to the primary
+replica_engines = [
+    instrument_engine(f"replica-{i}", create_async_engine(url, **engine_options()))
+    for i, url in enumerate(settings.replica_database_urls, start=1)
+]
 
 AsyncSessionLocal = async_sessionmaker(engine, expire_on_commit=False)
 
 
+class RoutingSession(Session):
+    """Session that sends reads to the replica stored in ``info["replica"]``.
+
+    Writes (flushes and INSERT/UPDATE/DELETE statements) always go to the
+    primary, and so does every statement after the first write so that the
+    session reads its own writes.  Without a replica the session behaves
+    like a plain primary session.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        replica = self.info.get("replica")
+        if replica is not None and (self._flushing or isinstance(clause, UpdateBase)):
+            self.info["replica"] = replica = None
+        if replica is None:
+            return engine.sync_engine
+        return replica.sync_engine
+
+
+ReadSessionLocal = async_sessionmaker(
+    engine, expire_on_commit=False, sync_session_class=RoutingSession
+)
+
+
+def use_primary(session: AsyncSession) -> None:
+    """Route the remaining statements of *session* to the primary.
+
+    Needed after data was written through another session (e.g. a foreground
+    refresh) and must be read back immediately.
+    """
+    session.info.pop("replica", None)
+
+
 class Base(DeclarativeBase):
     pass
 
@@ -0,0 +1,143 @@
+"""Connection pool and statement cache instrumentation (per process).
+
+Every engine created by ``app.core.database`` uses ``InstrumentedQueuePool``.
+The pool records how long each checkout waited and when overflow
+connections were opened. It also counts checkouts that timed out.  A
+cursor-execute listener counts compiled-statement cache hits and misses.
+``get_pool_stats()`` returns the snapshots served by ``GET /admin/db/pool``.
+"""
+
+import time
+from collections import deque
+from typing import Any
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import default
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+# Number of recent checkout waits kept for the average / p95
+WAIT_WINDOW = 1000
+
+
+class PoolMetrics:
+    """Counters of one connection pool, kept across pool re-creation."""
+
+    def __init__(self) -> None:
+        self.checkouts = 0
+        self.timeouts = 0
+        self.overflow_opened = 0
+        self.max_wait = 0.0
+        self._waits: deque[float] = deque(maxlen=WAIT_WINDOW)
+
+    def record_checkout(self, wait: float) -> None:
+        self.checkouts += 1
+        self.max_wait = max(self.max_wait, wait)
+        self._waits.append(wait)
+
+    def record_timeout(self, wait: float) -> None:
+        self.timeouts += 1
+        self.max_wait = max(self.max_wait, wait)
+
+    def snapshot(self) -> dict[str, Any]:
+        waits = sorted(self._waits)
+        count = len(waits)
+        return {
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "overflow_opened": self.overflow_opened,
+            "avg_wait_ms": round(sum(waits) / count * 1000, 2) if count else None,
+            "p95_wait_ms": (
+                round(waits[min(int(count * 0.95), count - 1)] * 1000, 2) if count else None
+            ),
+            "max_wait_ms": round(self.max_wait * 1000, 2),
+        }
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """``AsyncAdaptedQueuePool`` that records checkout waits and overflow."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def connect(self):
+        # Covers waiting for a free connection, opening a new one and pre-ping
+        start = time.monotonic()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.metrics.record_timeout(time.monotonic() - start)
+            raise
+        self.metrics.record_checkout(time.monotonic() - start)
+        return connection
+
+    def _create_connection(self):
+        # The overflow counter is incremented before a connection is created
+        # and stays at or below zero while the pool itself is not yet full
+        if self._overflow > 0:
+            self.metrics.overflow_opened += 1
+        return super()._create_connection()
+
+    def recreate(self) -> "InstrumentedQueuePool":
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+class StatementCacheMetrics:
+    """Hits and misses of SQLAlchemy's compiled-statement cache."""
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+
+    def on_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        if context is None:
+            return
+        if context.cache_hit is default.CACHE_HIT:
+            self.hits += 1
+        elif context.cache_hit is default.CACHE_MISS:
+            self.misses += 1
+
+
+# name -> (engine, statement cache metrics)
+_engines: dict[str, tuple[AsyncEngine, StatementCacheMetrics]] = {}
+
+
+def instrument_engine(name: str, engine: AsyncEngine) -> AsyncEngine:
+    """Register *engine* under *name* and start counting statement cache use."""
+    cache_metrics = StatementCacheMetrics()
+    event.listen(engine.sync_engine, "after_cursor_execute", cache_metrics.on_execute)
+    _engines[name] = (engine, cache_metrics)
+    return engine
+
+
+def get_pool_stats() -> list[dict[str, Any]]:
+    """Return pool and statement cache snapshots of all registered engines."""
+    return [_engine_stats(name, engine, cache) for name, (engine, cache) in _engines.items()]
+
+
+def _engine_stats(
+    name: str, engine: AsyncEngine, cache: StatementCacheMetrics
+) -> dict[str, Any]:
+    pool = engine.pool
+    stats: dict[str, Any] = {
+        "name": name,
+        "pool_size": pool.size(),
+        "max_overflow": pool._max_overflow,
+        "checked_out": pool.checkedout(),
+        "idle": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+    }
+    if isinstance(pool, InstrumentedQueuePool):
+        stats.update(pool.metrics.snapshot())
+    compiled_cache = engine.sync_engine._compiled_cache
+    stats.update(
+        {
+            "statement_cache_hits": cache.hits,
+            "statement_cache_misses": cache.misses,
+            "statement_cache_entries": len(compiled_cache) if compiled_cache is not None else 0,
+        }
+    )
+    return stats
@@ -0,0 +1,120 @@
+"""Shared, pooled HTTP client for outbound requests.
+
+A single ``aiohttp.ClientSession`` (and its ``TCPConnector``) is created at
+application startup and reused by every fetcher and by the geocoding search,
+so upstream calls benefit from keep-alive connections and the DNS cache instead
+of paying for a new TCP/TLS handshake on every request.
+
+Per-source headers and timeouts are passed per request; pool limits come from
+the ``http`` section of settings.yaml.
+"""
+
+import asyncio
+import logging
+
+import aiohttp
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Defaults used when settings.yaml has no ``http`` section
+DEFAULT_POOL_LIMIT = 100
+DEFAULT_LIMIT_PER_HOST = 10
+DEFAULT_KEEPALIVE_TIMEOUT = 30
+DEFAULT_DNS_CACHE_TTL = 300
+DEFAULT_TIMEOUT = 10
+
+
+class HttpClient:
+    """Lifecycle-managed wrapper around a shared aiohttp session.
+
+    ``start()`` and ``close()`` are called from the FastAPI lifespan.  If the
+    session is used before ``start()`` (scripts, tests) it is created lazily on
+    first access, and re-created if the running event loop has changed; the
+    session of the previous loop is then closed.
+    """
+
+    def __init__(self) -> None:
+        self._session: aiohttp.ClientSession | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        # Closes queued on stopped loops, referenced until they run
+        self._closing: set[asyncio.Task] = set()
+
+    async def start(self) -> None:
+        """Create the pooled session (idempotent)."""
+        _ = self.session
+        logger.info(
+            "HTTP client pool started (limit=%d, limit_per_host=%d)",
+            self._config("limit", DEFAULT_POOL_LIMIT),
+            self._config("limit_per_host", DEFAULT_LIMIT_PER_HOST),
+        )
+
+    async def close(self) -> None:
+        """Close the session and release all pooled connections."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+            logger.info("HTTP client pool closed")
+        self._session = None
+        self._loop = None
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """Return the shared session, creating it on first use."""
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            if self._session is not None and not self._session.closed:
+                self._close_abandoned(self._session, self._loop)
+            self._session = self._create_session()
+            self._loop = loop
+        return self._session
+
+    def get(self, url: str, **kwargs):
+        """Shortcut for ``session.get`` — returns aiohttp's request context manager."""
+        return self.session.get(url, **kwargs)
+
+    def post(self, url: str, **kwargs):
+        """Shortcut for ``session.post`` — returns aiohttp's request context manager."""
+        return self.session.post(url, **kwargs)
+
+    def _close_abandoned(
+        self, session: aiohttp.ClientSession, loop: asyncio.AbstractEventLoop
+    ) -> None:
+        """Close the session of an event loop that is no longer the running one.
+
+        Its connections belong to that loop: a loop still running in another
+        thread closes the session itself, a stopped one gets the close queued
+        for when it runs again.  A closed loop's transports are gone with it,
+        so the connector is only marked closed and detached, without awaiting
+        anything.
+        """
+        if loop.is_running():
+            asyncio.run_coroutine_threadsafe(session.close(), loop)
+        elif not loop.is_closed():
+            task = loop.create_task(session.close())
+            self._closing.add(task)
+            task.add_done_callback(self._closing.discard)
+        else:
+            if session.connector is not None:
+                session.connector._close()
+            session.detach()
+
+    def _create_session(self) -> aiohttp.ClientSession:
+        connector = aiohttp.TCPConnector(
+            limit=self._config("limit", DEFAULT_POOL_LIMIT),
+            limit_per_host=self._config("limit_per_host", DEFAULT_LIMIT_PER_HOST),
+            keepalive_timeout=self._config("keepalive_timeout", DEFAULT_KEEPALIVE_TIMEOUT),
+            ttl_dns_cache=self._config("dns_cache_ttl", DEFAULT_DNS_CACHE_TTL),
+        )
+        return aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self._config("timeout", DEFAULT_TIMEOUT)),
+        )
+
+    @staticmethod
+    def _config(key: str, default: int) -> int:
+        return int(settings.app_config.get("http", key, default=default))
+
+
+# Global HTTP client instance
+http_client = HttpClient()
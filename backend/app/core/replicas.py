@@ -0,0 +1,137 @@
+"""Read-replica selection with a replication-lag guard.
+
+Read-only endpoints open their session through ``get_read_db``, which asks
+the router for a replica.  The router measures the replay lag of every
+replica at most once per ``database.replicas.lag_check_interval_seconds``
+and hands out the replicas whose lag is within ``max_lag_seconds``, round
+robin.  When no replica is configured or none is healthy the read goes to
+the primary.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+from app.core.database import replica_engines
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_LAG_SECONDS = 10
+DEFAULT_LAG_CHECK_INTERVAL_SECONDS = 5
+
+# Seconds since the last replayed transaction; 0 while the replica has replayed
+# everything it received (an idle primary produces no new transactions).  NULL
+# when no WAL receiver is streaming: a disconnected replica has replayed all it
+# received as well, but it is not getting new WAL.  Reading the receiver status
+# needs the pg_read_all_stats role.  A server that is not in recovery has no lag.
+_LAG_QUERY = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN NOT EXISTS (
+            SELECT 1 FROM pg_stat_wal_receiver WHERE status = 'streaming'
+        ) THEN NULL
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+    """
+)
+
+
+@dataclass
+class ReplicaState:
+    """Last measured state of one replica."""
+
+    engine: AsyncEngine
+    lag_seconds: float | None = None  # None: unreachable, not streaming or not measured yet
+
+    @property
+    def name(self) -> str:
+        return self.engine.url.render_as_string(hide_password=True)
+
+
+class ReplicaRouter:
+    """Chooses the replica for a read-only session."""
+
+    def __init__(self, engines: list[AsyncEngine]) -> None:
+        self._replicas = [ReplicaState(engine) for engine in engines]
+        self._checked_at: float | None = None
+        self._next = 0
+        self._lock = asyncio.Lock()
+
+    @property
+    def replicas(self) -> list[ReplicaState]:
+        return list(self._replicas)
+
+    async def choose(self) -> AsyncEngine | None:
+        """Return a replica within the lag bound, or None to use the primary."""
+        if not self._replicas:
+            return None
+        if self._check_due():
+            async with self._lock:
+                if self._check_due():
+                    await self.check_lag()
+
+        max_lag = float(
+            settings.app_config.get(
+                "database", "replicas", "max_lag_seconds", default=DEFAULT_MAX_LAG_SECONDS
+            )
+        )
+        healthy = [
+            replica
+            for replica in self._replicas
+            if replica.lag_seconds is not None and replica.lag_seconds <= max_lag
+        ]
+        if not healthy:
+            return None
+        self._next = (self._next + 1) % len(healthy)
+        return healthy[self._next].engine
+
+    async def check_lag(self) -> None:
+        """Measure the replication lag of every replica."""
+        await asyncio.gather(*(self._measure(replica) for replica in self._replicas))
+        self._checked_at = time.monotonic()
+
+    async def _measure(self, replica: ReplicaState) -> None:
+        timeout = float(
+            settings.app_config.get(
+                "database", "replicas", "lag_check_interval_seconds",
+                default=DEFAULT_LAG_CHECK_INTERVAL_SECONDS,
+            )
+        )
+        try:
+            async with replica.engine.connect() as conn:
+                lag = await asyncio.wait_for(conn.scalar(_LAG_QUERY), timeout)
+        except Exception as exc:
+            if replica.lag_seconds is not None or self._checked_at is None:
+                logger.warning("Replica %s is unavailable: %s", replica.name, exc)
+            replica.lag_seconds = None
+            return
+
+        if lag is None:
+            if replica.lag_seconds is not None or self._checked_at is None:
+                logger.warning("Replica %s is not streaming from the primary", replica.name)
+            replica.lag_seconds = None
+            return
+
+        replica.lag_seconds = float(lag)
+        logger.debug("Replica %s lag: %.1fs", replica.name, replica.lag_seconds)
+
+    def _check_due(self) -> bool:
+        if self._checked_at is None:
+            return True
+        interval = float(
+            settings.app_config.get(
+                "database", "replicas", "lag_check_interval_seconds",
+                default=DEFAULT_LAG_CHECK_INTERVAL_SECONDS,
+            )
+        )
+        return time.monotonic() - self._checked_at >= interval
+
+
+replica_router = ReplicaRouter(replica_engines)
@@ -2,22 +2,55 @@
 
 The scheduler runs as an asyncio background task and periodically fetches
 weather data for "tracked" cities (cities that were requested in the last 24 hours).
+Cities are refreshed by a bounded pool of workers and each cycle is capped at
+the fetch interval.  The retention job (RetentionService) runs after a cycle
+every ``retention.interval_hours``.
 """
 
 import asyncio
 import logging
+import time
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 
 from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
 from app.core.database import AsyncSessionLocal
 from app.models import City, RequestLog
+from app.services.retention_service import RetentionService
+from app.services.source_manager import source_manager
 from app.services.weather_service import WeatherService
 
 logger = logging.getLogger(__name__)
 
+# Default number of batches refreshed in parallel during a cycle
+DEFAULT_MAX_CONCURRENCY = 10
+
+# Default number of cities handed to the fetchers per batch
+DEFAULT_BATCH_SIZE = 1
+
+
+@dataclass
+class CycleStats:
+    """Timing and outcome of one scheduler cycle."""
+
+    total: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    # Not started before the time budget ran out
+    skipped: int = 0
+    # Started but unfinished at the budget; their refreshes run on in the
+    # background (the single-flight shields them) and finish after the cycle
+    in_flight: int = 0
+    batches: int = 0
+    duration: float = 0.0
+    job_seconds: float = 0.0
+
+    @property
+    def avg_job_seconds(self) -> float:
+        return self.job_seconds / self.batches if self.batches else 0.0
+
 
 class WeatherScheduler:
     """Background scheduler for weather data fetching."""
@@ -26,6 +59,8 @@ class WeatherScheduler:
         """Initialize the scheduler."""
         self.is_running = False
         self._task: asyncio.Task | None = None
+        self.last_cycle: CycleStats | None = None
+        self._last_retention: datetime | None = None
 
     async def start(self) -> None:
         """Start the scheduler background task."""
@@ -75,14 +110,29 @@ class WeatherScheduler:
                 logger.info("Scheduler cycle started")
                 logger.info("=" * 60)
 
-                await self._fetch_tracked_cities()
+                # Pick up edited source configs without re-parsing unchanged ones
+                source_manager.reload()
+
+                # A cycle may not run into the next one
+                stats = await self._fetch_tracked_cities(
+                    time_budget=fetch_interval.total_seconds()
+                )
+                self.last_cycle = stats
+
+                await self._maybe_run_retention()
+
+                # Keep a fixed cadence: sleep only for what is left of the interval
+                sleep_seconds = max(fetch_interval.total_seconds() - stats.duration, 0.0)
 
                 logger.info("=" * 60)
-                logger.info(f"Scheduler cycle completed. Next run in {fetch_interval_minutes} minutes")
+                logger.info(
+                    f"Scheduler cycle completed in {stats.duration:.1f}s. "
+                    f"Next run in {sleep_seconds / 60:.1f} minutes"
+                )
                 logger.info("=" * 60)
 
                 # Wait for next cycle
-                await asyncio.sleep(fetch_interval.total_seconds())
+                await asyncio.sleep(sleep_seconds)
 
             except asyncio.CancelledError:
                 logger.info("Scheduler loop cancelled")
@@ -92,52 +142,144 @@ class WeatherScheduler:
                 # Wait a bit before retrying to avoid rapid error loops
                 await asyncio.sleep(60)
 
-    async def _fetch_tracked_cities(self) -> None:
+    async def _fetch_tracked_cities(self, time_budget: float | None = None) -> CycleStats:
         """Fetch weather data for all tracked cities.
 
         Tracked cities are those that were requested in the last 24 hours.
+        They are split into batches of ``scheduler.batch_size`` and refreshed
+        by a pool of ``scheduler.max_concurrency`` workers; each batch uses the
+        fetchers' batched ``fetch_many`` and its own short-lived session.
+        Cities not reached within *time_budget* seconds are skipped until the
+        next cycle; those whose refresh had already started are counted as
+        in flight, as that refresh still completes.
+
+        Args:
+            time_budget: Maximum duration of the cycle in seconds (None = unbounded)
+
+        Returns:
+            Timing and outcome statistics of the cycle
         """
-        async with AsyncSessionLocal() as db:
-            try:
-                # Find cities requested in the last 24 hours
-                cutoff_time = datetime.now(timezone.utc) - timedelta(hours=24)
-
-                query = (
-                    select(City)
-                    .join(RequestLog, RequestLog.city_id == City.id)
-                    .where(RequestLog.created_at >= cutoff_time)
-                    .distinct()
-                )
+        stats = CycleStats()
+        started = time.monotonic()
+
+        try:
+            tracked_cities = await self._get_tracked_cities()
+        except Exception as e:
+            logger.error(f"Error fetching tracked cities: {e}", exc_info=True)
+            stats.duration = time.monotonic() - started
+            return stats
+
+        stats.total = len(tracked_cities)
+        if not tracked_cities:
+            logger.info("No tracked cities found (no requests in last 24 hours)")
+            stats.duration = time.monotonic() - started
+            return stats
+
+        concurrency = max(
+            int(settings.app_config.get(
+                "scheduler", "max_concurrency", default=DEFAULT_MAX_CONCURRENCY
+            )),
+            1,
+        )
+        batch_size = max(
+            int(settings.app_config.get("scheduler", "batch_size", default=DEFAULT_BATCH_SIZE)),
+            1,
+        )
+        logger.info(
+            f"Found {len(tracked_cities)} tracked city/cities to update "
+            f"(concurrency={concurrency}, batch_size={batch_size})"
+        )
 
-                result = await db.execute(query)
-                tracked_cities = result.scalars().all()
+        queue: asyncio.Queue[list[tuple[int, str, str]]] = asyncio.Queue()
+        running: set[int] = set()
+        for start in range(0, len(tracked_cities), batch_size):
+            queue.put_nowait(tracked_cities[start : start + batch_size])
 
-                if not tracked_cities:
-                    logger.info("No tracked cities found (no requests in last 24 hours)")
+        async def worker() -> None:
+            while True:
+                try:
+                    batch = queue.get_nowait()
+                except asyncio.QueueEmpty:
                     return
+                names = ", ".join(f"{name}, {country}" for _, name, country in batch)
+                city_ids = [city_id for city_id, _, _ in batch]
+                running.update(city_ids)
+                job_started = time.monotonic()
+                try:
+                    await WeatherService.refresh_cities(city_ids)
+                    stats.succeeded += len(batch)
+                    logger.info(
+                        f"Successfully updated weather for: {names} "
+                        f"({time.monotonic() - job_started:.2f}s)"
+                    )
+                except Exception as e:
+                    stats.failed += len(batch)
+                    logger.error(f"Failed to fetch weather for {names}: {e}", exc_info=True)
+                finally:
+                    stats.job_seconds += time.monotonic() - job_started
+                    stats.batches += 1
+                # Not reached when the budget cancels the worker mid-refresh
+                running.difference_update(city_ids)
+
+        workers = [asyncio.create_task(worker()) for _ in range(min(concurrency, queue.qsize()))]
+        try:
+            async with asyncio.timeout(time_budget):
+                await asyncio.gather(*workers)
+        except TimeoutError:
+            stats.in_flight = len(running)
+            stats.skipped = stats.total - stats.succeeded - stats.failed - stats.in_flight
+            logger.warning(
+                f"Scheduler cycle hit its {time_budget:.0f}s budget, "
+                f"{stats.skipped} city/cities deferred to the next cycle, "
+                f"{stats.in_flight} still refreshing"
+            )
+        finally:
+            for task in workers:
+                task.cancel()
+
+        stats.duration = time.monotonic() - started
+        logger.info(
+            f"Completed fetching weather for {stats.total} city/cities: "
+            f"{stats.succeeded} ok, {stats.failed} failed, {stats.skipped} skipped, "
+            f"{stats.in_flight} in flight "
+            f"in {stats.duration:.1f}s (avg {stats.avg_job_seconds:.2f}s per batch)"
+        )
+        return stats
 
-                logger.info(f"Found {len(tracked_cities)} tracked city/cities to update")
-
-                # Fetch weather data for each tracked city
-                weather_service = WeatherService(db)
+    async def _maybe_run_retention(self) -> None:
+        """Run RetentionService if enabled and ``retention.interval_hours`` have passed."""
+        if not settings.app_config.get("retention", "enabled", default=False):
+            return
 
-                for city in tracked_cities:
-                    try:
-                        logger.info(f"Fetching weather data for: {city.name}, {city.country}")
-                        await weather_service.fetch_and_save(city.id)
-                        logger.info(f"Successfully updated weather for: {city.name}")
-                    except Exception as e:
-                        logger.error(
-                            f"Failed to fetch weather for {city.name} (id={city.id}): {e}",
-                            exc_info=True,
-                        )
-                        # Continue with next city even if one fails
-                        continue
+        interval = timedelta(
+            hours=float(settings.app_config.get("retention", "interval_hours", default=6))
+        )
+        now = datetime.now(timezone.utc)
+        if self._last_retention is not None and now - self._last_retention < interval:
+            return
 
-                logger.info(f"Completed fetching weather for {len(tracked_cities)} city/cities")
+        try:
+            async with AsyncSessionLocal() as db:
+                await RetentionService(db).run()
+            self._last_retention = now
+        except Exception as e:
+            logger.error(f"Retention run failed: {e}", exc_info=True)
+
+    @staticmethod
+    async def _get_tracked_cities() -> list[tuple[int, str, str]]:
+        """Return (id, name, country) of cities requested in the last 24 hours."""
+        cutoff_time = datetime.now(timezone.utc) - timedelta(hours=24)
+
+        query = (
+            select(City.id, City.name, City.country)
+            .join(RequestLog, RequestLog.city_id == City.id)
+            .where(RequestLog.created_at >= cutoff_time)
+            .distinct()
+        )
 
-            except Exception as e:
-                logger.error(f"Error fetching tracked cities: {e}", exc_info=True)
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(query)
+            return [tuple(row) for row in result.all()]
 
 
 # Global scheduler instance
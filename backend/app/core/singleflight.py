@@ -0,0 +1,79 @@
+"""Single-flight call coalescing.
+
+Concurrent callers asking for the same key share one in-flight call: the first
+caller starts it and everyone else awaits the same task.  Used to make sure a
+city is never refreshed from upstream twice at the same time.
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable, Sequence
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Deduplicate concurrent async calls by key (within one process)."""
+
+    def __init__(self) -> None:
+        self._in_flight: dict[Hashable, asyncio.Task[Any]] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run ``fn()`` for *key*, or join the call that is already running.
+
+        The shared call runs in its own task and is shielded from the callers,
+        so a cancelled caller (e.g. a client disconnect) does not abort the
+        work for the others.
+
+        Args:
+            key: Deduplication key
+            fn: Zero-argument coroutine factory, only invoked by the first caller
+
+        Returns:
+            The result of the shared call; its exception is re-raised to every
+            waiting caller.
+        """
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._forget([key], done))
+        return await asyncio.shield(task)
+
+    async def do_many(
+        self, keys: Sequence[Hashable], fn: Callable[[list[Hashable]], Awaitable[Any]]
+    ) -> None:
+        """Run ``fn(missing)`` once for the keys not in flight, joining the rest.
+
+        The batch call is registered under each of its keys, so a later
+        ``do`` or ``do_many`` for any of them joins it instead of starting
+        another call.  Shielded from the caller like ``do``.
+
+        Args:
+            keys: Deduplication keys
+            fn: Coroutine factory taking the list of keys with no call running
+
+        Raises:
+            Exception: The first exception of the batch or of a joined call
+        """
+        tasks = {key: self._in_flight[key] for key in keys if key in self._in_flight}
+        missing = [key for key in dict.fromkeys(keys) if key not in tasks]
+        if missing:
+            task = asyncio.ensure_future(fn(missing))
+            for key in missing:
+                self._in_flight[key] = task
+                tasks[key] = task
+            task.add_done_callback(lambda done: self._forget(missing, done))
+        await asyncio.shield(asyncio.gather(*set(tasks.values())))
+
+    def in_flight(self, key: Hashable) -> bool:
+        """Return True if a call for *key* is currently running."""
+        return key in self._in_flight
+
+    def _forget(self, keys: list[Hashable], task: asyncio.Task[Any]) -> None:
+        for key in keys:
+            if self._in_flight.get(key) is task:
+                del self._in_flight[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved when nobody is left waiting
+            task.exception()
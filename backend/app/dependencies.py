@@ -3,7 +3,8 @@ from collections.abc import AsyncGenerator
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import Settings, settings
-from app.core.database import AsyncSessionLocal
+from app.core.database import AsyncSessionLocal, ReadSessionLocal
+from app.core.replicas import replica_router
 
 
 def get_settings() -> Settings:
@@ -13,3 +14,10 @@ def get_settings() -> Settings:
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     async with AsyncSessionLocal() as session:
         yield session
+
+
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """Session for read-only endpoints: a lag-checked replica, else the primary."""
+    replica = await replica_router.choose()
+    async with ReadSessionLocal(info={"replica": replica}) as session:
+        yield session
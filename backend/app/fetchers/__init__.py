@@ -1,6 +1,6 @@
 """Weather data fetchers package."""
 
-from app.fetchers.base import AbstractWeatherFetcher
+from app.fetchers.base import AbstractWeatherFetcher, BadResponseError, Location, UpstreamError
 from app.fetchers.factory import FetcherFactory, load_fetchers_from_config_dir
 
 # Import registry to auto-register all fetchers
@@ -8,6 +8,9 @@ from app.fetchers import registry  # noqa: F401
 
 __all__ = [
     "AbstractWeatherFetcher",
+    "BadResponseError",
     "FetcherFactory",
+    "Location",
+    "UpstreamError",
     "load_fetchers_from_config_dir",
 ]
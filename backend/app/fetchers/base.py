@@ -1,8 +1,63 @@
 """Base abstract class for weather data fetchers."""
 
+import asyncio
+import logging
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator, Hashable, Sequence
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
 from typing import Any
 
+import aiohttp
+
+from app.core.http import HttpClient, http_client
+from app.fetchers.circuit_breaker import get_circuit_breaker
+from app.fetchers.rate_limit import RateLimiter, RateLimitExceeded, get_rate_limiter
+
+logger = logging.getLogger(__name__)
+
+# Default number of locations fetch_many() queries in parallel
+DEFAULT_BATCH_CONCURRENCY = 4
+
+
+class UpstreamError(Exception):
+    """The source failed: connection error, timeout or a 5xx response.
+
+    Fetchers raise it instead of returning empty results, so that a failing
+    source can be told apart from one that has no data for the location
+    (e.g. "city not found"), which is an empty result.
+    """
+
+
+class BadResponseError(UpstreamError):
+    """The source answered, but not with weather data.
+
+    The request was blocked (403/429, e.g. a captcha page) or the response no
+    longer parses, as after a markup change.  Unlike "no data for this city"
+    it affects every location, so it counts against the circuit breaker.
+    """
+
+
+@dataclass(frozen=True)
+class Location:
+    """A place to fetch weather for.
+
+    Attributes:
+        name: City name (used when the provider has no coordinate lookup)
+        lat: Latitude, preferred over the name when set together with lon
+        lon: Longitude
+        key: Caller's identifier for the result (e.g. city id); defaults to name
+    """
+
+    name: str
+    lat: float | None = None
+    lon: float | None = None
+    key: Hashable | None = None
+
+    @property
+    def id(self) -> Hashable:
+        return self.key if self.key is not None else self.name
+
 
 class AbstractWeatherFetcher(ABC):
     """Abstract base class for all weather data fetchers.
@@ -11,12 +66,13 @@ class AbstractWeatherFetcher(ABC):
     Supports both API-based and parser-based (HTML scraping) data sources.
     """
 
-    def __init__(self, config: dict[str, Any]) -> None:
+    def __init__(self, config: dict[str, Any], http: HttpClient | None = None) -> None:
         """Initialize fetcher with configuration dictionary.
 
         Args:
             config: Configuration dictionary loaded from YAML file.
                    Must contain at least: name, type, priority, enabled, connection
+            http: Shared HTTP client pool (defaults to the application-wide one)
         """
         self.config = config
         self.name: str = config.get("name", "Unknown")
@@ -26,16 +82,33 @@ class AbstractWeatherFetcher(ABC):
         self.connection: dict[str, Any] = config.get("connection", {})
         self.field_mapping: dict[str, str] = config.get("field_mapping", {})
         self.unit_conversions: dict[str, dict[str, Any]] = config.get("unit_conversions", {})
+        self.http: HttpClient = http or http_client
+        self.headers: dict[str, str] = self.connection.get("headers", {})
+        self.timeout: int = self.connection.get("timeout", 10)
+        self.batch_concurrency: int = int(
+            self.connection.get("batch_concurrency", DEFAULT_BATCH_CONCURRENCY)
+        )
+        self.rate_limiter: RateLimiter | None = get_rate_limiter(
+            self.name, config.get("rate_limit")
+        )
+        # Registers this source's breaker thresholds; callers look it up by name
+        get_circuit_breaker(self.name, config.get("circuit_breaker", {}))
 
     @abstractmethod
-    async def fetch_current(self, city: str) -> dict[str, Any]:
+    async def fetch_current(
+        self, city: str, *, lat: float | None = None, lon: float | None = None
+    ) -> dict[str, Any]:
         """Fetch current weather data for a given city.
 
         Args:
             city: City name (e.g., "Moscow", "London")
+            lat: Latitude; when given with *lon*, providers that support it
+                 look the location up by coordinates instead of by name
+            lon: Longitude
 
         Returns:
-            Dictionary with weather data in normalized format (SI units):
+            Dictionary with weather data in normalized format (SI units),
+            empty when the source has no data for the city:
             - temperature: float (Celsius)
             - feels_like: float (Celsius)
             - humidity: int (%)
@@ -49,27 +122,96 @@ class AbstractWeatherFetcher(ABC):
             - timestamp: int (Unix epoch)
 
         Raises:
-            Exception: If fetch fails or API returns error
+            UpstreamError: If the source failed (connection, timeout, 5xx)
         """
         pass
 
     @abstractmethod
-    async def fetch_forecast(self, city: str, days: int = 5) -> list[dict[str, Any]]:
+    async def fetch_forecast(
+        self,
+        city: str,
+        days: int = 5,
+        *,
+        lat: float | None = None,
+        lon: float | None = None,
+    ) -> list[dict[str, Any]]:
         """Fetch weather forecast for a given city.
 
         Args:
             city: City name
             days: Number of days to fetch (default: 5, max depends on source)
+            lat: Latitude (see ``fetch_current``)
+            lon: Longitude
 
         Returns:
             List of dictionaries with forecast data (same format as fetch_current).
             Each item includes an additional 'forecast_time' field.
 
         Raises:
-            Exception: If fetch fails or API returns error
+            UpstreamError: If the source failed (connection, timeout, 5xx)
         """
         pass
 
+    async def fetch_many(
+        self, locations: Sequence[Location], days: int = 5
+    ) -> dict[Hashable, tuple[dict[str, Any], list[dict[str, Any]]]]:
+        """Fetch current weather and forecast for several locations.
+
+        The default implementation issues the per-location calls concurrently,
+        at most ``connection.batch_concurrency`` locations at a time.  Providers
+        with a multi-location endpoint override this to save round trips.
+
+        Args:
+            locations: Locations to fetch
+            days: Number of forecast days
+
+        Returns:
+            Mapping of ``Location.id`` to (current data, forecast data); a
+            location that failed maps to empty results.
+
+        Raises:
+            UpstreamError: If no location returned data because the source
+                failed.
+            RateLimitExceeded: If the source's budget was exhausted before any
+                location could be fetched.
+        """
+        semaphore = asyncio.Semaphore(max(self.batch_concurrency, 1))
+        rate_limited: list[RateLimitExceeded] = []
+        failed: list[UpstreamError] = []
+
+        async def fetch_one(location: Location) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+            async with semaphore:
+                current, forecast = await asyncio.gather(
+                    self.fetch_current(location.name, lat=location.lat, lon=location.lon),
+                    self.fetch_forecast(
+                        location.name, days, lat=location.lat, lon=location.lon
+                    ),
+                    return_exceptions=True,
+                )
+            for result in (current, forecast):
+                if isinstance(result, RateLimitExceeded):
+                    rate_limited.append(result)
+                elif isinstance(result, BaseException):
+                    if isinstance(result, UpstreamError):
+                        failed.append(result)
+                    logger.error("%s failed for '%s': %s", self.name, location.name, result)
+            return (
+                current if isinstance(current, dict) else {},
+                forecast if isinstance(forecast, list) else [],
+            )
+
+        results = await asyncio.gather(*(fetch_one(location) for location in locations))
+        if not any(current or forecast for current, forecast in results):
+            if failed:
+                raise failed[0]
+            if rate_limited:
+                raise rate_limited[0]
+        if rate_limited:
+            logger.warning(
+                "%s: %d call(s) skipped by rate limit during batch", self.name, len(rate_limited)
+            )
+        return {location.id: result for location, result in zip(locations, results)}
+
     @abstractmethod
     async def test_connection(self) -> bool:
         """Test if connection to the data source is working.
@@ -111,6 +253,66 @@ class AbstractWeatherFetcher(ABC):
         """
         return self.source_type
 
+    @asynccontextmanager
+    async def _get(self, url: str, **kwargs: Any) -> AsyncIterator[aiohttp.ClientResponse]:
+        """Issue a GET request through the shared connection pool.
+
+        Applies this source's headers and timeout from the ``connection``
+        section of its YAML config, and takes one call from its
+        ``rate_limit`` budget first.
+
+        Args:
+            url: Full request URL
+            **kwargs: Extra arguments for ``aiohttp.ClientSession.get``
+
+        Yields:
+            aiohttp response (use with ``async with``)
+
+        Raises:
+            RateLimitExceeded: If the source has no budget left; subclasses
+                must let it propagate so callers can wait, defer or skip.
+        """
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire()
+        async with self.http.get(
+            url,
+            headers=self.headers or None,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            **kwargs,
+        ) as response:
+            yield response
+
+    @asynccontextmanager
+    async def _post(
+        self, url: str, cost: int = 1, **kwargs: Any
+    ) -> AsyncIterator[aiohttp.ClientResponse]:
+        """Issue a POST request through the shared connection pool.
+
+        Same as ``_get``, for multi-location endpoints that take a request
+        body.  *cost* is the number of upstream calls the provider bills for
+        the request (e.g. one per location in a bulk query).
+
+        Args:
+            url: Full request URL
+            cost: Calls to take from the ``rate_limit`` budget
+            **kwargs: Extra arguments for ``aiohttp.ClientSession.post``
+
+        Yields:
+            aiohttp response (use with ``async with``)
+
+        Raises:
+            RateLimitExceeded: If the source has no budget left
+        """
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire(cost=cost)
+        async with self.http.post(
+            url,
+            headers=self.headers or None,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            **kwargs,
+        ) as response:
+            yield response
+
     def _get_nested_value(self, data: dict[str, Any], path: str) -> Any:
         """Extract nested value from dictionary using dot notation.
 
@@ -0,0 +1,176 @@
+"""Per-source circuit breaker and health statistics.
+
+Every fetcher gets a breaker that tracks the outcome and latency of its recent
+fetches.  When the failure rate over the sliding window crosses the threshold
+the breaker *opens* and the source is skipped without any network call.  After
+``open_seconds`` it goes *half-open* and lets a single probe through: success
+closes it again, failure re-opens it.
+
+Defaults can be overridden per source in its YAML config::
+
+    circuit_breaker:
+      window_size: 20              # number of recent fetches considered
+      min_calls: 5                 # don't trip before this many fetches
+      failure_rate_threshold: 0.5  # open at >= 50% failures in the window
+      open_seconds: 60             # how long to skip before probing again
+
+Like the rate limiters, breakers are per-process and keyed by source name.
+"""
+
+import logging
+import time
+from collections import deque
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+DEFAULT_WINDOW_SIZE = 20
+DEFAULT_MIN_CALLS = 5
+DEFAULT_FAILURE_RATE_THRESHOLD = 0.5
+DEFAULT_OPEN_SECONDS = 60.0
+
+
+class CircuitBreaker:
+    """Closed / open / half-open breaker for one upstream source."""
+
+    def __init__(self, name: str, config: dict[str, Any] | None = None) -> None:
+        self.name = name
+        self.configure(config or {})
+        self.state = CLOSED
+        self._outcomes: deque[tuple[bool, float]] = deque(maxlen=self.window_size)
+        self._opened_at: float | None = None
+        self._probe_in_flight = False
+        self.consecutive_failures = 0
+        self.last_error: str | None = None
+        self.times_opened = 0
+
+    def configure(self, config: dict[str, Any]) -> None:
+        """Apply (possibly changed) thresholds without resetting the statistics."""
+        self.window_size = int(config.get("window_size", DEFAULT_WINDOW_SIZE))
+        self.min_calls = int(config.get("min_calls", DEFAULT_MIN_CALLS))
+        self.failure_rate_threshold = float(
+            config.get("failure_rate_threshold", DEFAULT_FAILURE_RATE_THRESHOLD)
+        )
+        self.open_seconds = float(config.get("open_seconds", DEFAULT_OPEN_SECONDS))
+        if hasattr(self, "_outcomes") and self._outcomes.maxlen != self.window_size:
+            self._outcomes = deque(self._outcomes, maxlen=self.window_size)
+
+    def allow_request(self) -> bool:
+        """Return True if a fetch may be attempted now.
+
+        In the open state this flips to half-open once ``open_seconds`` have
+        passed and admits exactly one probe; concurrent callers keep being
+        rejected until the probe reports back.
+        """
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN:
+            if time.monotonic() - self._opened_at < self.open_seconds:
+                return False
+            self.state = HALF_OPEN
+            logger.info("Circuit for %s is half-open, probing", self.name)
+        if self._probe_in_flight:
+            return False
+        self._probe_in_flight = True
+        return True
+
+    def record_success(self, latency: float) -> None:
+        """Record a successful fetch that took *latency* seconds."""
+        self._outcomes.append((True, latency))
+        self.consecutive_failures = 0
+        if self.state != CLOSED:
+            logger.info("Circuit for %s closed after successful probe", self.name)
+            self.state = CLOSED
+            self._probe_in_flight = False
+            # Start from a clean window so old failures don't re-trip it
+            self._outcomes.clear()
+            self._outcomes.append((True, latency))
+
+    def record_failure(self, latency: float, error: str | None = None) -> None:
+        """Record a failed fetch (connection error, timeout, 5xx) that took *latency* seconds."""
+        self._outcomes.append((False, latency))
+        self.consecutive_failures += 1
+        self.last_error = error
+        if self.state == HALF_OPEN:
+            self._trip()
+        elif self.state == CLOSED and self._should_trip():
+            self._trip()
+
+    def release(self) -> None:
+        """Give back an admitted call that ended without an outcome (e.g. rate limited)."""
+        self._probe_in_flight = False
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return the breaker state and recent statistics for monitoring."""
+        latencies = sorted(latency for _, latency in self._outcomes)
+        calls = len(self._outcomes)
+        retry_in = None
+        if self.state == OPEN:
+            retry_in = max(self.open_seconds - (time.monotonic() - self._opened_at), 0.0)
+        return {
+            "state": self.state,
+            "recent_calls": calls,
+            "failure_rate": round(self._failure_rate(), 3) if calls else 0.0,
+            "avg_latency_ms": round(sum(latencies) / calls * 1000, 1) if calls else None,
+            "p95_latency_ms": (
+                round(latencies[min(int(calls * 0.95), calls - 1)] * 1000, 1) if calls else None
+            ),
+            "consecutive_failures": self.consecutive_failures,
+            "times_opened": self.times_opened,
+            "last_error": self.last_error,
+            "retry_in_seconds": round(retry_in, 1) if retry_in is not None else None,
+        }
+
+    def _failure_rate(self) -> float:
+        failures = sum(1 for ok, _ in self._outcomes if not ok)
+        return failures / len(self._outcomes)
+
+    def _should_trip(self) -> bool:
+        return (
+            len(self._outcomes) >= self.min_calls
+            and self._failure_rate() >= self.failure_rate_threshold
+        )
+
+    def _trip(self) -> None:
+        self.state = OPEN
+        self._opened_at = time.monotonic()
+        self._probe_in_flight = False
+        self.times_opened += 1
+        logger.warning(
+            "Circuit for %s opened (failure rate %.0f%%), skipping it for %.0fs",
+            self.name,
+            self._failure_rate() * 100,
+            self.open_seconds,
+        )
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+
+
+def get_circuit_breaker(name: str, config: dict[str, Any] | None = None) -> CircuitBreaker:
+    """Return the shared breaker for a source, creating or updating it.
+
+    Args:
+        name: Source name (``name`` in the YAML config)
+        config: The source's ``circuit_breaker`` section; None keeps the
+                current settings (or defaults for a new breaker)
+
+    Returns:
+        The source's circuit breaker
+    """
+    breaker = _breakers.get(name)
+    if breaker is None:
+        breaker = _breakers[name] = CircuitBreaker(name, config)
+    elif config is not None:
+        breaker.configure(config)
+    return breaker
+
+
+def get_health(name: str) -> dict[str, Any] | None:
+    """Return the breaker snapshot for a source, or None if it never ran."""
+    breaker = _breakers.get(name)
+    return breaker.snapshot() if breaker is not None else None
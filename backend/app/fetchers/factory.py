@@ -6,7 +6,7 @@ from typing import Any
 
 import yaml
 
-from app.core.config import _substitute_env_vars
+from app.core.config import substitute_env_vars
 from app.fetchers.base import AbstractWeatherFetcher
 
 logger = logging.getLogger(__name__)
@@ -98,7 +98,7 @@ class FetcherFactory:
             raise ValueError(f"Empty or invalid YAML file: {yaml_path}")
 
         # Substitute environment variables (${VAR_NAME} → value from .env)
-        config = _substitute_env_vars(config)
+        config = substitute_env_vars(config)
 
         # Add source file path to config for debugging
         config["_config_file"] = str(yaml_path)
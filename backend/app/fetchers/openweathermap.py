@@ -10,7 +10,10 @@ from typing import Any
 
 import aiohttp
 
-from .base import AbstractWeatherFetcher
+from app.core.http import HttpClient
+
+from .base import AbstractWeatherFetcher, UpstreamError
+from .rate_limit import RateLimitExceeded
 
 logger = logging.getLogger(__name__)
 
@@ -23,128 +26,143 @@ class OpenWeatherMapFetcher(AbstractWeatherFetcher):
     - Forecast: https://openweathermap.org/forecast5
     """
 
-    def __init__(self, config: dict[str, Any]) -> None:
+    def __init__(self, config: dict[str, Any], http: HttpClient | None = None) -> None:
         """Initialize OpenWeatherMap fetcher.
 
         Args:
             config: Configuration dictionary from YAML file
+            http: Shared HTTP client pool (defaults to the application-wide one)
         """
-        super().__init__(config)
+        super().__init__(config, http)
         self.base_url: str = self.connection.get("base_url", "")
         self.api_key: str = self.connection.get("api_key", "")
-        self.timeout: int = self.connection.get("timeout", 10)
         self.endpoints: dict[str, Any] = config.get("endpoints", {})
 
-    async def fetch_current(self, city: str) -> dict[str, Any]:
+    async def fetch_current(
+        self, city: str, *, lat: float | None = None, lon: float | None = None
+    ) -> dict[str, Any]:
         """Fetch current weather data from OpenWeatherMap API.
 
         Args:
             city: City name (e.g., "Moscow", "London")
+            lat: Latitude; with *lon* queries by coordinates instead of name
+            lon: Longitude
 
         Returns:
-            Dictionary with normalized weather data in SI units
+            Dictionary with normalized weather data in SI units, empty if the
+            city is not found
 
         Raises:
-            Exception: If API request fails or returns invalid data
+            UpstreamError: On a connection error, timeout or 5xx response
         """
         endpoint_config = self.endpoints.get("current", {})
         path = endpoint_config.get("path", "/weather")
-        params = self._prepare_params(endpoint_config.get("params", {}), city)
+        params = self._prepare_params(endpoint_config.get("params", {}), city, lat, lon)
 
         url = f"{self.base_url}{path}"
 
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    url,
-                    params=params,
-                    timeout=aiohttp.ClientTimeout(total=self.timeout)
-                ) as response:
-                    if response.status == 404:
-                        logger.error(f"City '{city}' not found in {self.name}")
-                        return {}
-
-                    if response.status >= 400:
-                        error_text = await response.text()
-                        logger.error(
-                            f"{self.name} API error {response.status}: {error_text}"
-                        )
-                        return {}
-
-                    response.raise_for_status()
-                    data = await response.json()
-
-                    return self._map_fields(data)
+            async with self._get(url, params=params) as response:
+                if response.status == 404:
+                    logger.error(f"City '{city}' not found in {self.name}")
+                    return {}
+
+                if response.status >= 500:
+                    raise UpstreamError(f"{self.name} HTTP {response.status} for city '{city}'")
+
+                if response.status >= 400:
+                    error_text = await response.text()
+                    logger.error(
+                        f"{self.name} API error {response.status}: {error_text}"
+                    )
+                    return {}
+
+                response.raise_for_status()
+                data = await response.json()
 
+                return self._map_fields(data)
+
+        except (RateLimitExceeded, UpstreamError):
+            raise
         except aiohttp.ClientError as e:
-            logger.error(f"{self.name} connection error for city '{city}': {e}")
-            return {}
-        except asyncio.TimeoutError:
-            logger.error(f"{self.name} timeout for city '{city}' after {self.timeout}s")
-            return {}
+            raise UpstreamError(f"{self.name} connection error for city '{city}': {e}") from e
+        except asyncio.TimeoutError as e:
+            raise UpstreamError(
+                f"{self.name} timeout for city '{city}' after {self.timeout}s"
+            ) from e
         except Exception as e:
             logger.error(f"{self.name} unexpected error for city '{city}': {e}")
             return {}
 
-    async def fetch_forecast(self, city: str, days: int = 5) -> list[dict[str, Any]]:
+    async def fetch_forecast(
+        self,
+        city: str,
+        days: int = 5,
+        *,
+        lat: float | None = None,
+        lon: float | None = None,
+    ) -> list[dict[str, Any]]:
         """Fetch 5-day weather forecast from OpenWeatherMap API.
 
         Args:
             city: City name
             days: Number of days (ignored, OpenWeatherMap returns fixed 5 days)
+            lat: Latitude; with *lon* queries by coordinates instead of name
+            lon: Longitude
 
         Returns:
-            List of forecast dictionaries with normalized weather data
+            List of forecast dictionaries with normalized weather data, empty
+            if the city is not found
 
         Raises:
-            Exception: If API request fails or returns invalid data
+            UpstreamError: On a connection error, timeout or 5xx response
         """
         endpoint_config = self.endpoints.get("forecast", {})
         path = endpoint_config.get("path", "/forecast")
-        params = self._prepare_params(endpoint_config.get("params", {}), city)
+        params = self._prepare_params(endpoint_config.get("params", {}), city, lat, lon)
 
         url = f"{self.base_url}{path}"
 
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    url,
-                    params=params,
-                    timeout=aiohttp.ClientTimeout(total=self.timeout)
-                ) as response:
-                    if response.status == 404:
-                        logger.error(f"City '{city}' not found in {self.name}")
-                        return []
-
-                    if response.status >= 400:
-                        error_text = await response.text()
-                        logger.error(
-                            f"{self.name} API error {response.status}: {error_text}"
-                        )
-                        return []
-
-                    response.raise_for_status()
-                    data = await response.json()
-
-                    # OpenWeatherMap returns list of forecasts in 'list' field
-                    forecast_list = data.get("list", [])
-
-                    result = []
-                    for item in forecast_list:
-                        mapped_data = self._map_fields(item)
-                        if mapped_data:
-                            # Add forecast timestamp
-                            mapped_data["forecast_time"] = item.get("dt")
-                            result.append(mapped_data)
-
-                    return result
-
+            async with self._get(url, params=params) as response:
+                if response.status == 404:
+                    logger.error(f"City '{city}' not found in {self.name}")
+                    return []
+
+                if response.status >= 500:
+                    raise UpstreamError(f"{self.name} HTTP {response.status} for city '{city}'")
+
+                if response.status >= 400:
+                    error_text = await response.text()
+                    logger.error(
+                        f"{self.name} API error {response.status}: {error_text}"
+                    )
+                    return []
+
+                response.raise_for_status()
+                data = await response.json()
+
+                # OpenWeatherMap returns list of forecasts in 'list' field
+                forecast_list = data.get("list", [])
+
+                result = []
+                for item in forecast_list:
+                    mapped_data = self._map_fields(item)
+                    if mapped_data:
+                        # Add forecast timestamp
+                        mapped_data["forecast_time"] = item.get("dt")
+                        result.append(mapped_data)
+
+                return result
+
+        except (RateLimitExceeded, UpstreamError):
+            raise
         except aiohttp.ClientError as e:
-            logger.error(f"{self.name} connection error for city '{city}': {e}")
-            return []
-        except asyncio.TimeoutError:
-            logger.error(f"{self.name} timeout for city '{city}' after {self.timeout}s")
-            return []
+            raise UpstreamError(f"{self.name} connection error for city '{city}': {e}") from e
+        except asyncio.TimeoutError as e:
+            raise UpstreamError(
+                f"{self.name} timeout for city '{city}' after {self.timeout}s"
+            ) from e
         except Exception as e:
             logger.error(f"{self.name} unexpected error for city '{city}': {e}")
             return []
@@ -163,41 +181,51 @@ class OpenWeatherMapFetcher(AbstractWeatherFetcher):
         url = f"{self.base_url}{path}"
 
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    url,
-                    params=params,
-                    timeout=aiohttp.ClientTimeout(total=self.timeout)
-                ) as response:
-                    if response.status == 200:
-                        logger.info(f"{self.name} connection test: OK")
-                        return True
-                    else:
-                        logger.warning(
-                            f"{self.name} connection test failed with status {response.status}"
-                        )
-                        return False
+            async with self._get(url, params=params) as response:
+                if response.status == 200:
+                    logger.info(f"{self.name} connection test: OK")
+                    return True
+                else:
+                    logger.warning(
+                        f"{self.name} connection test failed with status {response.status}"
+                    )
+                    return False
 
         except Exception as e:
             logger.error(f"{self.name} connection test failed: {e}")
             return False
 
-    def _prepare_params(self, params_config: dict[str, str], city: str) -> dict[str, str]:
+    def _prepare_params(
+        self,
+        params_config: dict[str, str],
+        city: str,
+        lat: float | None = None,
+        lon: float | None = None,
+    ) -> dict[str, str]:
         """Prepare request parameters by substituting placeholders.
 
+        When coordinates are given, the ``{city}`` parameter is replaced by
+        ``lat``/``lon`` (OpenWeatherMap's geographic lookup), which avoids
+        ambiguous city names and upstream geocoding.
+
         Args:
             params_config: Parameters template from config
             city: City name to substitute
+            lat: Optional latitude
+            lon: Optional longitude
 
         Returns:
             Dictionary with prepared parameters
         """
         params = {}
+        by_coords = lat is not None and lon is not None
 
         for key, value in params_config.items():
             # YAML may parse unquoted numbers as int/float — always work with str
             value_str = str(value)
             if "{city}" in value_str:
+                if by_coords:
+                    continue
                 params[key] = value_str.replace("{city}", city)
             elif value_str.startswith("${") and value_str.endswith("}"):
                 # Environment variable reference - already substituted by config loader
@@ -209,6 +237,10 @@ class OpenWeatherMapFetcher(AbstractWeatherFetcher):
             else:
                 params[key] = value_str
 
+        if by_coords:
+            params["lat"] = str(lat)
+            params["lon"] = str(lon)
+
         return params
 
     def _map_fields(self, data: dict[str, Any]) -> dict[str, Any]:
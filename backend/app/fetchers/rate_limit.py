@@ -0,0 +1,196 @@
+"""Per-source rate limiting and daily quota accounting.
+
+Each source may declare its upstream budget in its YAML config::
+
+    rate_limit:
+      per_minute: 60        # token bucket capacity, refilled continuously
+      daily_quota: 1000     # calls per UTC day (optional)
+      on_exhausted: wait    # "wait" for a token (up to max_wait) or "skip"
+      max_wait: 5           # seconds
+
+Limiters live in a module-level registry keyed by source name, so counters
+survive fetcher re-creation when source configs are reloaded.  They are
+per-process: with several workers each one gets the full budget, so size the
+limits accordingly.
+"""
+
+import asyncio
+import logging
+import time
+from datetime import date, datetime, timedelta, timezone
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_WAIT = 5.0
+
+
+class RateLimitExceeded(Exception):
+    """Raised when a source has no budget left for another upstream call."""
+
+    def __init__(self, source: str, retry_after: float, reason: str = "rate limit") -> None:
+        super().__init__(f"{source}: {reason} exhausted, retry after {retry_after:.1f}s")
+        self.source = source
+        self.retry_after = retry_after
+        self.reason = reason
+
+
+class RateLimiter:
+    """Token bucket plus a daily call counter for one upstream source."""
+
+    def __init__(self, name: str, config: dict[str, Any]) -> None:
+        self.name = name
+        self._lock = asyncio.Lock()
+        self.configure(config)
+        self._tokens = float(self.per_minute or 0)
+        self._updated = time.monotonic()
+        self._day = _utc_today()
+        self.used_today = 0
+        self.rejected_today = 0
+
+    def configure(self, config: dict[str, Any]) -> None:
+        """Apply (possibly changed) limits without resetting the counters."""
+        per_minute = config.get("per_minute")
+        daily_quota = config.get("daily_quota")
+        self.per_minute: int | None = int(per_minute) if per_minute else None
+        self.daily_quota: int | None = int(daily_quota) if daily_quota else None
+        self.on_exhausted: str = str(config.get("on_exhausted", "wait"))
+        self.max_wait: float = float(config.get("max_wait", DEFAULT_MAX_WAIT))
+        if self.on_exhausted not in ("wait", "skip"):
+            logger.warning(
+                "Unknown rate_limit.on_exhausted=%r for %s, using 'wait'",
+                self.on_exhausted,
+                self.name,
+            )
+            self.on_exhausted = "wait"
+        if hasattr(self, "_tokens") and self.per_minute:
+            self._tokens = min(self._tokens, float(self.per_minute))
+
+    async def acquire(self, wait: bool | None = None, cost: int = 1) -> None:
+        """Take *cost* calls from the budget, all or none.
+
+        The token is reserved under the lock and the wait for it happens
+        after the lock is released, so waiters sleep concurrently and each
+        one's ``max_wait`` counts from its own call.  A bucket below zero
+        holds the tokens owed to earlier waiters, which keeps them in FIFO
+        order.
+
+        Args:
+            wait: Override the configured policy: True waits up to
+                  ``max_wait`` seconds for a token, False fails immediately.
+            cost: Number of calls the request is billed as
+
+        Raises:
+            RateLimitExceeded: If the daily quota is used up, or no token
+                would become available in time.
+        """
+        if wait is None:
+            wait = self.on_exhausted == "wait"
+        deadline = time.monotonic() + self.max_wait
+
+        async with self._lock:
+            self._roll_day()
+            if self.daily_quota is not None and self.used_today + cost > self.daily_quota:
+                self.rejected_today += 1
+                raise RateLimitExceeded(self.name, _seconds_until_utc_midnight(), "daily quota")
+
+            delay = 0.0
+            if self.per_minute is not None:
+                delay = self._token_delay(cost)
+                if delay > 0 and (not wait or time.monotonic() + delay > deadline):
+                    self.rejected_today += 1
+                    raise RateLimitExceeded(self.name, delay)
+                self._tokens -= cost
+
+            self.used_today += cost
+            day = self._day
+
+        if delay > 0:
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                # Give the reservation back to the callers queued behind it;
+                # after midnight the counter it was taken from is gone
+                self._tokens += cost
+                if self._day == day:
+                    self.used_today -= cost
+                raise
+
+    def usage(self) -> dict[str, Any]:
+        """Return a snapshot of the current budget for monitoring."""
+        self._roll_day()
+        if self.per_minute is not None:
+            self._refill()
+        return {
+            "per_minute": self.per_minute,
+            "tokens_available": (
+                max(int(self._tokens), 0) if self.per_minute is not None else None
+            ),
+            "daily_quota": self.daily_quota,
+            "used_today": self.used_today,
+            "remaining_today": (
+                max(self.daily_quota - self.used_today, 0) if self.daily_quota is not None else None
+            ),
+            "rejected_today": self.rejected_today,
+            "on_exhausted": self.on_exhausted,
+        }
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        rate = self.per_minute / 60.0
+        self._tokens = min(float(self.per_minute), self._tokens + (now - self._updated) * rate)
+        self._updated = now
+
+    def _token_delay(self, cost: int = 1) -> float:
+        """Refill the bucket and return seconds until *cost* tokens are available."""
+        self._refill()
+        if self._tokens >= cost:
+            return 0.0
+        return (cost - self._tokens) * 60.0 / self.per_minute
+
+    def _roll_day(self) -> None:
+        today = _utc_today()
+        if today != self._day:
+            self._day = today
+            self.used_today = 0
+            self.rejected_today = 0
+
+
+def _utc_today() -> date:
+    return datetime.now(timezone.utc).date()
+
+
+def _seconds_until_utc_midnight() -> float:
+    now = datetime.now(timezone.utc)
+    midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time(), timezone.utc)
+    return (midnight - now).total_seconds()
+
+
+_limiters: dict[str, RateLimiter] = {}
+
+
+def get_rate_limiter(name: str, config: dict[str, Any] | None) -> RateLimiter | None:
+    """Return the shared limiter for a source, creating or updating it.
+
+    Args:
+        name: Source name (``name`` in the YAML config)
+        config: The source's ``rate_limit`` section, or None if it has none
+
+    Returns:
+        The limiter, or None if the source is not rate limited
+    """
+    if not config:
+        _limiters.pop(name, None)
+        return None
+    limiter = _limiters.get(name)
+    if limiter is None:
+        limiter = _limiters[name] = RateLimiter(name, config)
+    else:
+        limiter.configure(config)
+    return limiter
+
+
+def get_usage(name: str) -> dict[str, Any] | None:
+    """Return the usage snapshot for a source, or None if it is not limited."""
+    limiter = _limiters.get(name)
+    return limiter.usage() if limiter is not None else None
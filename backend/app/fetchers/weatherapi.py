@@ -7,14 +7,21 @@ Visibility is returned in km and converted to metres.
 
 import asyncio
 import logging
+from collections.abc import Hashable, Sequence
 from typing import Any
 
 import aiohttp
 
-from .base import AbstractWeatherFetcher
+from app.core.http import HttpClient
+
+from .base import AbstractWeatherFetcher, Location, UpstreamError
+from .rate_limit import RateLimitExceeded
 
 logger = logging.getLogger(__name__)
 
+# WeatherAPI accepts at most 50 locations per bulk request
+BULK_MAX_LOCATIONS = 50
+
 # Field mapping for individual hourly forecast entries.
 # WeatherAPI nests each hour dict directly inside forecastday[].hour[],
 # so paths have no "current." prefix (unlike the current-weather field_mapping).
@@ -33,6 +40,13 @@ _FORECAST_HOUR_MAPPING: dict[str, str] = {
 }
 
 
+def _query(city: str, lat: float | None, lon: float | None) -> str:
+    """Return WeatherAPI's ``q`` value: ``lat,lon`` when known, else the name."""
+    if lat is not None and lon is not None:
+        return f"{lat},{lon}"
+    return city
+
+
 class WeatherAPIFetcher(AbstractWeatherFetcher):
     """Fetcher for WeatherAPI.com Current Weather and Forecast APIs.
 
@@ -41,115 +55,198 @@ class WeatherAPIFetcher(AbstractWeatherFetcher):
     - Forecast: https://www.weatherapi.com/docs/#apis-forecast
     """
 
-    def __init__(self, config: dict[str, Any]) -> None:
-        super().__init__(config)
+    def __init__(self, config: dict[str, Any], http: HttpClient | None = None) -> None:
+        super().__init__(config, http)
         self.base_url: str = self.connection.get("base_url", "")
         self.api_key: str = self.connection.get("api_key", "")
-        self.timeout: int = self.connection.get("timeout", 10)
         self.endpoints: dict[str, Any] = config.get("endpoints", {})
+        bulk_cfg: dict[str, Any] = config.get("bulk", {})
+        self.bulk_enabled: bool = bool(bulk_cfg.get("enabled", False))
+        self.bulk_max_locations: int = int(bulk_cfg.get("max_locations", BULK_MAX_LOCATIONS))
 
     # ------------------------------------------------------------------ #
     # Public interface
     # ------------------------------------------------------------------ #
 
-    async def fetch_current(self, city: str) -> dict[str, Any]:
+    async def fetch_current(
+        self, city: str, *, lat: float | None = None, lon: float | None = None
+    ) -> dict[str, Any]:
         """Fetch current weather from WeatherAPI.com.
 
         Args:
             city: City name or ``lat,lon`` string
+            lat: Latitude; with *lon* queries by coordinates instead of name
+            lon: Longitude
 
         Returns:
-            Normalised weather dict in SI units, or empty dict on error
+            Normalised weather dict in SI units, or empty dict if the city is
+            not found
+
+        Raises:
+            UpstreamError: On a connection error, timeout or 5xx response
         """
         endpoint_cfg = self.endpoints.get("current", {})
         path = endpoint_cfg.get("path", "/current.json")
-        params = self._prepare_params(endpoint_cfg.get("params", {}), city)
+        params = self._prepare_params(endpoint_cfg.get("params", {}), _query(city, lat, lon))
         url = f"{self.base_url}{path}"
 
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    url,
-                    params=params,
-                    timeout=aiohttp.ClientTimeout(total=self.timeout),
-                ) as response:
-                    if response.status == 400:
-                        body = await response.json()
-                        msg = body.get("error", {}).get("message", "unknown")
-                        logger.error("WeatherAPI city '%s' not found: %s", city, msg)
-                        return {}
-                    if response.status >= 400:
-                        logger.error(
-                            "WeatherAPI error %d for city '%s'", response.status, city
-                        )
-                        return {}
-                    response.raise_for_status()
-                    data = await response.json()
-                    return self._map_current(data)
+            async with self._get(url, params=params) as response:
+                if response.status == 400:
+                    body = await response.json()
+                    msg = body.get("error", {}).get("message", "unknown")
+                    logger.error("WeatherAPI city '%s' not found: %s", city, msg)
+                    return {}
+                if response.status >= 500:
+                    raise UpstreamError(f"WeatherAPI HTTP {response.status} for '{city}'")
+                if response.status >= 400:
+                    logger.error(
+                        "WeatherAPI error %d for city '%s'", response.status, city
+                    )
+                    return {}
+                response.raise_for_status()
+                data = await response.json()
+                return self._map_current(data)
 
+        except (RateLimitExceeded, UpstreamError):
+            raise
         except aiohttp.ClientError as exc:
-            logger.error("WeatherAPI connection error for '%s': %s", city, exc)
-            return {}
-        except asyncio.TimeoutError:
-            logger.error("WeatherAPI timeout for '%s' after %ds", city, self.timeout)
-            return {}
+            raise UpstreamError(f"WeatherAPI connection error for '{city}': {exc}") from exc
+        except asyncio.TimeoutError as exc:
+            raise UpstreamError(
+                f"WeatherAPI timeout for '{city}' after {self.timeout}s"
+            ) from exc
         except Exception as exc:
             logger.error("WeatherAPI unexpected error for '%s': %s", city, exc)
             return {}
 
-    async def fetch_forecast(self, city: str, days: int = 7) -> list[dict[str, Any]]:
+    async def fetch_forecast(
+        self,
+        city: str,
+        days: int = 7,
+        *,
+        lat: float | None = None,
+        lon: float | None = None,
+    ) -> list[dict[str, Any]]:
         """Fetch hourly forecast from WeatherAPI.com.
 
         Args:
             city: City name or ``lat,lon`` string
             days: Days to request (1–7 on the free plan)
+            lat: Latitude; with *lon* queries by coordinates instead of name
+            lon: Longitude
 
         Returns:
-            List of hourly forecast dicts in SI units, or empty list on error
+            List of hourly forecast dicts in SI units, or empty list if the
+            city is not found
+
+        Raises:
+            UpstreamError: On a connection error, timeout or 5xx response
         """
         endpoint_cfg = self.endpoints.get("forecast", {})
         path = endpoint_cfg.get("path", "/forecast.json")
-        params = self._prepare_params(endpoint_cfg.get("params", {}), city)
+        params = self._prepare_params(endpoint_cfg.get("params", {}), _query(city, lat, lon))
         params["days"] = str(min(max(days, 1), 7))
         url = f"{self.base_url}{path}"
 
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    url,
-                    params=params,
-                    timeout=aiohttp.ClientTimeout(total=self.timeout),
-                ) as response:
-                    if response.status == 400:
-                        body = await response.json()
-                        msg = body.get("error", {}).get("message", "unknown")
-                        logger.error(
-                            "WeatherAPI forecast city '%s' not found: %s", city, msg
-                        )
-                        return []
-                    if response.status >= 400:
-                        logger.error(
-                            "WeatherAPI forecast error %d for city '%s'",
-                            response.status,
-                            city,
-                        )
-                        return []
-                    response.raise_for_status()
-                    data = await response.json()
-                    return self._extract_forecast_hours(data)
+            async with self._get(url, params=params) as response:
+                if response.status == 400:
+                    body = await response.json()
+                    msg = body.get("error", {}).get("message", "unknown")
+                    logger.error(
+                        "WeatherAPI forecast city '%s' not found: %s", city, msg
+                    )
+                    return []
+                if response.status >= 500:
+                    raise UpstreamError(
+                        f"WeatherAPI forecast HTTP {response.status} for '{city}'"
+                    )
+                if response.status >= 400:
+                    logger.error(
+                        "WeatherAPI forecast error %d for city '%s'",
+                        response.status,
+                        city,
+                    )
+                    return []
+                response.raise_for_status()
+                data = await response.json()
+                return self._extract_forecast_hours(data)
 
+        except (RateLimitExceeded, UpstreamError):
+            raise
         except aiohttp.ClientError as exc:
-            logger.error("WeatherAPI forecast connection error for '%s': %s", city, exc)
-            return []
-        except asyncio.TimeoutError:
-            logger.error(
-                "WeatherAPI forecast timeout for '%s' after %ds", city, self.timeout
-            )
-            return []
+            raise UpstreamError(
+                f"WeatherAPI forecast connection error for '{city}': {exc}"
+            ) from exc
+        except asyncio.TimeoutError as exc:
+            raise UpstreamError(
+                f"WeatherAPI forecast timeout for '{city}' after {self.timeout}s"
+            ) from exc
         except Exception as exc:
             logger.error("WeatherAPI forecast unexpected error for '%s': %s", city, exc)
             return []
 
+    async def fetch_many(
+        self, locations: Sequence[Location], days: int = 5
+    ) -> dict[Hashable, tuple[dict[str, Any], list[dict[str, Any]]]]:
+        """Fetch several locations with WeatherAPI bulk requests.
+
+        Bulk requests (``q=bulk``) need a paid plan, so they are used only when
+        ``bulk.enabled`` is set in the source config; otherwise this falls back
+        to bounded concurrent per-location calls.
+
+        Args:
+            locations: Locations to fetch
+            days: Forecast days (1–7)
+
+        Returns:
+            Mapping of ``Location.id`` to (current data, forecast data)
+
+        Raises:
+            UpstreamError: If no location returned data because the source
+                failed
+        """
+        if not self.bulk_enabled or len(locations) < 2:
+            return await super().fetch_many(locations, days)
+
+        results: dict[Hashable, tuple[dict[str, Any], list[dict[str, Any]]]] = {}
+        rate_limited: RateLimitExceeded | None = None
+        failed: UpstreamError | None = None
+        step = max(min(self.bulk_max_locations, BULK_MAX_LOCATIONS), 1)
+
+        for start in range(0, len(locations), step):
+            chunk = list(locations[start : start + step])
+            current, forecast = await asyncio.gather(
+                self._fetch_bulk("current", chunk, days),
+                self._fetch_bulk("forecast", chunk, days),
+                return_exceptions=True,
+            )
+            for result in (current, forecast):
+                if isinstance(result, RateLimitExceeded):
+                    rate_limited = result
+                elif isinstance(result, BaseException):
+                    if isinstance(result, UpstreamError):
+                        failed = result
+                    logger.error("WeatherAPI bulk request failed: %s", result)
+            current_by_id = current if isinstance(current, dict) else {}
+            forecast_by_id = forecast if isinstance(forecast, dict) else {}
+
+            for index, location in enumerate(chunk):
+                query_current = current_by_id.get(str(index))
+                query_forecast = forecast_by_id.get(str(index))
+                results[location.id] = (
+                    self._map_current(query_current) if query_current else {},
+                    self._extract_forecast_hours(query_forecast) if query_forecast else [],
+                )
+
+        if not any(c or f for c, f in results.values()):
+            if failed is not None:
+                raise failed
+            if rate_limited is not None:
+                raise rate_limited
+        return results
+
     async def test_connection(self) -> bool:
         """Test connectivity by fetching current weather for London."""
         endpoint_cfg = self.endpoints.get("current", {})
@@ -158,19 +255,14 @@ class WeatherAPIFetcher(AbstractWeatherFetcher):
         url = f"{self.base_url}{path}"
 
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    url,
-                    params=params,
-                    timeout=aiohttp.ClientTimeout(total=self.timeout),
-                ) as response:
-                    if response.status == 200:
-                        logger.info("WeatherAPI connection test: OK")
-                        return True
-                    logger.warning(
-                        "WeatherAPI connection test failed: status %d", response.status
-                    )
-                    return False
+            async with self._get(url, params=params) as response:
+                if response.status == 200:
+                    logger.info("WeatherAPI connection test: OK")
+                    return True
+                logger.warning(
+                    "WeatherAPI connection test failed: status %d", response.status
+                )
+                return False
         except Exception as exc:
             logger.error("WeatherAPI connection test failed: %s", exc)
             return False
@@ -195,6 +287,57 @@ class WeatherAPIFetcher(AbstractWeatherFetcher):
                 params[key] = value_str
         return params
 
+    async def _fetch_bulk(
+        self, kind: str, chunk: list[Location], days: int
+    ) -> dict[str, dict[str, Any]]:
+        """Run one bulk request and return the per-location ``query`` objects.
+
+        Locations are tagged with their index in *chunk* as ``custom_id``;
+        entries the API could not resolve are left out.  A connection error,
+        timeout or 5xx response raises ``UpstreamError``.
+        """
+        endpoint_cfg = self.endpoints.get(kind, {})
+        default_path = "/current.json" if kind == "current" else "/forecast.json"
+        path = endpoint_cfg.get("path", default_path)
+        params = self._prepare_params(endpoint_cfg.get("params", {}), "bulk")
+        if kind == "forecast":
+            params["days"] = str(min(max(days, 1), 7))
+        body = {
+            "locations": [
+                {"q": _query(location.name, location.lat, location.lon), "custom_id": str(i)}
+                for i, location in enumerate(chunk)
+            ]
+        }
+
+        try:
+            async with self._post(
+                f"{self.base_url}{path}", cost=len(chunk), params=params, json=body
+            ) as response:
+                if response.status >= 500:
+                    raise UpstreamError(f"WeatherAPI bulk {kind} HTTP {response.status}")
+                if response.status >= 400:
+                    logger.error("WeatherAPI bulk %s error %d", kind, response.status)
+                    return {}
+                data = await response.json()
+        except aiohttp.ClientError as exc:
+            raise UpstreamError(f"WeatherAPI bulk {kind} connection error: {exc}") from exc
+        except asyncio.TimeoutError as exc:
+            raise UpstreamError(f"WeatherAPI bulk {kind} timeout after {self.timeout}s") from exc
+
+        queries: dict[str, dict[str, Any]] = {}
+        for item in data.get("bulk", []):
+            query = item.get("query", {})
+            if "error" in query:
+                logger.error(
+                    "WeatherAPI bulk %s failed for '%s': %s",
+                    kind,
+                    query.get("q"),
+                    query["error"].get("message", "unknown"),
+                )
+                continue
+            queries[str(query.get("custom_id"))] = query
+        return queries
+
     def _apply_conversions(self, data: dict[str, Any]) -> None:
         """Apply unit conversions from config in-place (e.g. kph → m/s)."""
         for field, conv in self.unit_conversions.items():
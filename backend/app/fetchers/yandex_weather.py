@@ -27,7 +27,10 @@ from typing import Any
 import aiohttp
 from bs4 import BeautifulSoup
 
-from .base import AbstractWeatherFetcher
+from app.core.http import HttpClient
+
+from .base import AbstractWeatherFetcher, BadResponseError, UpstreamError
+from .rate_limit import RateLimitExceeded
 
 logger = logging.getLogger(__name__)
 
@@ -120,11 +123,10 @@ class YandexWeatherFetcher(AbstractWeatherFetcher):
     fallback for numeric fields when the JSON is absent.
     """
 
-    def __init__(self, config: dict[str, Any]) -> None:
-        super().__init__(config)
+    def __init__(self, config: dict[str, Any], http: HttpClient | None = None) -> None:
+        super().__init__(config, http)
         self.base_url: str = self.connection.get("base_url", "https://yandex.ru/pogoda")
         self.timeout: int = self.connection.get("timeout", 15)
-        self.headers: dict[str, str] = self.connection.get("headers", {})
         self.css_selectors: dict[str, str] = config.get("css_selectors", {})
         self.endpoints: dict[str, Any] = config.get("endpoints", {})
 
@@ -132,28 +134,51 @@ class YandexWeatherFetcher(AbstractWeatherFetcher):
     # Public interface
     # ------------------------------------------------------------------ #
 
-    async def fetch_current(self, city: str) -> dict[str, Any]:
+    async def fetch_current(
+        self, city: str, *, lat: float | None = None, lon: float | None = None
+    ) -> dict[str, Any]:
         """Fetch current weather for *city* by scraping Yandex.Weather.
 
         Args:
             city: City name (English or Russian)
+            lat: Latitude; with *lon* the page is requested by coordinates,
+                 which also works for cities without a known slug
+            lon: Longitude
 
         Returns:
-            Normalised weather dict in SI units, or empty dict on error.
-            Pressure is converted from mmHg to hPa.
+            Normalised weather dict in SI units, or empty dict if there is no
+            page for the city.  Pressure is converted from mmHg to hPa.
+
+        Raises:
+            BadResponseError: If the request was blocked or the page has no
+                temperature the parser can find (the markup has changed)
+            UpstreamError: On a connection error, timeout or 5xx response
         """
-        slug = _city_to_slug(city)
-        endpoint_path = self.endpoints.get("current", {}).get("path", "/{city}")
-        path = endpoint_path.replace("{city}", slug)
-        url = f"{self.base_url}{path}"
+        if lat is not None and lon is not None:
+            url = f"{self.base_url}/?lat={lat}&lon={lon}"
+        else:
+            slug = _city_to_slug(city)
+            endpoint_path = self.endpoints.get("current", {}).get("path", "/{city}")
+            path = endpoint_path.replace("{city}", slug)
+            url = f"{self.base_url}{path}"
 
         html = await self._fetch_html(url, city)
         if html is None:
             return {}
 
-        return self._parse_current(html, city)
+        result = self._parse_current(html, city)
+        if result.get("temperature") is None:
+            raise BadResponseError(f"{self.name}: no weather data in the page for city '{city}'")
+        return result
 
-    async def fetch_forecast(self, city: str, days: int = 5) -> list[dict[str, Any]]:
+    async def fetch_forecast(
+        self,
+        city: str,
+        days: int = 5,
+        *,
+        lat: float | None = None,
+        lon: float | None = None,
+    ) -> list[dict[str, Any]]:
         """Yandex.Weather forecast scraping is not implemented.
 
         Yandex does not expose a stable parseable forecast page without a paid
@@ -162,6 +187,8 @@ class YandexWeatherFetcher(AbstractWeatherFetcher):
         Args:
             city: City name (unused)
             days: Number of days (unused)
+            lat: Latitude (unused)
+            lon: Longitude (unused)
 
         Returns:
             Empty list
@@ -181,7 +208,11 @@ class YandexWeatherFetcher(AbstractWeatherFetcher):
         Returns:
             True if weather data was found, False otherwise.
         """
-        html = await self._fetch_html(f"{self.base_url}/moscow", "moscow")
+        try:
+            html = await self._fetch_html(f"{self.base_url}/moscow", "moscow")
+        except UpstreamError as exc:
+            logger.error("%s connection test failed: %s", self.name, exc)
+            return False
         if html is None:
             return False
 
@@ -217,39 +248,51 @@ class YandexWeatherFetcher(AbstractWeatherFetcher):
             city: City name used only for log messages
 
         Returns:
-            Raw HTML string, or None on any error.
+            Raw HTML string, or None if there is no page for the city (or
+            another client error).
+
+        Raises:
+            BadResponseError: On 403/429, which Yandex answers to blocked
+                clients (captcha)
+            UpstreamError: On a connection error, timeout or 5xx response
         """
         try:
-            async with aiohttp.ClientSession(headers=self.headers) as session:
-                async with session.get(
-                    url,
-                    timeout=aiohttp.ClientTimeout(total=self.timeout),
-                    allow_redirects=True,
-                ) as response:
-                    if response.status == 404:
-                        logger.error(
-                            "%s: page not found for city '%s' (url: %s)",
-                            self.name, city, url,
-                        )
-                        return None
-
-                    if response.status >= 400:
-                        logger.error(
-                            "%s: HTTP %d for city '%s' (url: %s)",
-                            self.name, response.status, city, url,
-                        )
-                        return None
-
-                    return await response.text(encoding="utf-8", errors="replace")
+            async with self._get(url, allow_redirects=True) as response:
+                if response.status == 404:
+                    logger.error(
+                        "%s: page not found for city '%s' (url: %s)",
+                        self.name, city, url,
+                    )
+                    return None
+
+                if response.status >= 500:
+                    raise UpstreamError(
+                        f"{self.name}: HTTP {response.status} for city '{city}' (url: {url})"
+                    )
+
+                if response.status in (403, 429):
+                    raise BadResponseError(
+                        f"{self.name}: request blocked with HTTP {response.status} "
+                        f"for city '{city}'"
+                    )
+
+                if response.status >= 400:
+                    logger.error(
+                        "%s: HTTP %d for city '%s' (url: %s)",
+                        self.name, response.status, city, url,
+                    )
+                    return None
 
+                return await response.text(encoding="utf-8", errors="replace")
+
+        except (RateLimitExceeded, UpstreamError):
+            raise
         except aiohttp.ClientError as exc:
-            logger.error("%s: connection error for '%s': %s", self.name, city, exc)
-            return None
-        except asyncio.TimeoutError:
-            logger.error(
-                "%s: timeout after %ds for city '%s'", self.name, self.timeout, city
-            )
-            return None
+            raise UpstreamError(f"{self.name}: connection error for '{city}': {exc}") from exc
+        except asyncio.TimeoutError as exc:
+            raise UpstreamError(
+                f"{self.name}: timeout after {self.timeout}s for city '{city}'"
+            ) from exc
         except Exception as exc:
             logger.error("%s: unexpected error for '%s': %s", self.name, city, exc)
             return None
@@ -7,25 +7,52 @@ from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.router import api_router
+from app.core.cache import shared_cache
+from app.core.database import AsyncSessionLocal
+from app.core.http import http_client
 from app.core.scheduler import scheduler
 from app.dependencies import get_db
 from app.middleware.logging import RequestLoggingMiddleware
 from app.services.recommendation_service import RecommendationService
+from app.services.response_cache import response_cache
+from app.services.source_catalog import source_catalog
 from app.services.source_manager import source_manager
+from app.services.weather_service import apply_remote_invalidation
 
 logger = logging.getLogger(__name__)
 
 
+def _drop_source_caches(slugs: list[str]) -> None:
+    """Another worker changed weather sources: reload the catalog, drop responses."""
+    source_catalog.invalidate()
+    response_cache.clear()
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan context manager for startup and shutdown events."""
     # Startup
     logger.info("Application startup")
 
+    # Open the shared HTTP connection pool used by fetchers and geocoding
+    await http_client.start()
+
+    # Shared cache and the invalidations other workers publish through it
+    shared_cache.on_invalidate("weather", apply_remote_invalidation)
+    shared_cache.on_invalidate("sources", _drop_source_caches)
+    await shared_cache.start()
+
     # Load source configurations
     source_manager.load()
     logger.info("Source configs loaded: %d sources", len(source_manager.get_all()))
 
+    # Cache the weather_sources table for the read path (reloaded lazily on failure)
+    try:
+        async with AsyncSessionLocal() as db:
+            await source_catalog.load(db)
+    except Exception as exc:
+        logger.warning("Could not preload source catalog: %s", exc)
+
     # Load ML model for clothing recommendations
     RecommendationService.load_model()
 
@@ -40,6 +67,9 @@ async def lifespan(app: FastAPI):
     await scheduler.stop()
     logger.info("Background scheduler stopped")
 
+    await http_client.close()
+    await shared_cache.close()
+
 
 app = FastAPI(
     title="Weather Aggregator API",
@@ -58,6 +88,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Readable by the frontend for conditional requests and data age
+    expose_headers=["ETag", "Last-Modified", "X-Data-Age"],
 )
 
 app.include_router(api_router)
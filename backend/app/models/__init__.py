@@ -1,3 +1,4 @@
+from .aggregate import WeatherAggregate
 from .city import City
 from .request_log import RequestLog
 from .source import WeatherSource
@@ -5,4 +6,12 @@ from .usage_stats import UsageStat
 from .user import User
 from .weather import WeatherRecord
 
-__all__ = ["City", "WeatherSource", "WeatherRecord", "User", "RequestLog", "UsageStat"]
+__all__ = [
+    "City",
+    "WeatherSource",
+    "WeatherRecord",
+    "WeatherAggregate",
+    "User",
+    "RequestLog",
+    "UsageStat",
+]
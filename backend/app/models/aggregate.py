@@ -0,0 +1,28 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, LargeBinary, SmallInteger, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+# Aggregated responses serialized when a city is refreshed (see
+# app/services/aggregate_store.py); read back with one primary key lookup.
+class WeatherAggregate(Base):
+    __tablename__ = "weather_aggregates"
+
+    city_id: Mapped[int] = mapped_column(
+        ForeignKey("cities.id", ondelete="CASCADE"), primary_key=True
+    )
+    # Endpoint and its parameters, e.g. "current", "forecast:5", "chart_daily:7"
+    endpoint: Mapped[str] = mapped_column(String(32), primary_key=True)
+    # Source set and the priorities the payload was aggregated with
+    sources_hash: Mapped[str] = mapped_column(String(16), primary_key=True)
+    # Payload format version
+    version: Mapped[int] = mapped_column(SmallInteger, primary_key=True)
+    payload: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    # Newest fetched_at of the data behind the payload
+    fetched_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    # Time-windowed payloads (forecast, charts) are only valid until then
+    valid_until: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    computed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=func.now(), server_default=func.now())
@@ -6,6 +6,8 @@ from sqlalchemy.orm import Mapped, mapped_column
 from app.core.database import Base
 
 
+# Partitioned by day on fetched_at in Postgres (migration 002), where the PK is
+# (id, fetched_at); id alone stays unique and is what the ORM maps as identity.
 class WeatherRecord(Base):
     __tablename__ = "weather_records"
 
@@ -30,4 +32,17 @@ class WeatherRecord(Base):
     __table_args__ = (
         Index("ix_weather_records_city_type", "city_id", "record_type"),
         Index("ix_weather_records_city_source_dt", "city_id", "source_id", "forecast_dt"),
+        Index("ix_weather_records_city_type_fetched", "city_id", "record_type", "fetched_at"),
+        # Newest snapshot per source lookups (app/services/record_reader.py);
+        # forecast_dt lets forecast windows be filtered from the index
+        Index(
+            "ix_weather_records_latest",
+            "city_id",
+            "record_type",
+            "source_id",
+            "fetched_at",
+            "forecast_dt",
+        ),
+        # Forecast range scans (charts)
+        Index("ix_weather_records_city_type_forecast", "city_id", "record_type", "forecast_dt"),
     )
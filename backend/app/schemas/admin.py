@@ -54,8 +54,96 @@ class SourceUpdateRequest(BaseModel):
     priority: int | None = Field(None, ge=1)
 
 
+class RateLimitUsage(BaseModel):
+    """Current rate limit / quota usage of a source (per process)."""
+
+    per_minute: int | None
+    tokens_available: int | None
+    daily_quota: int | None
+    used_today: int
+    remaining_today: int | None
+    rejected_today: int
+    on_exhausted: str
+
+
+class SourceHealth(BaseModel):
+    """Circuit breaker state and recent fetch statistics of a source (per process)."""
+
+    state: str = Field(description="closed | open | half_open")
+    recent_calls: int
+    failure_rate: float
+    avg_latency_ms: float | None
+    p95_latency_ms: float | None
+    consecutive_failures: int
+    times_opened: int
+    last_error: str | None
+    retry_in_seconds: float | None = Field(
+        description="Seconds until the next probe while the circuit is open"
+    )
+
+
+class AdminSourceResponse(SourceResponse):
+    """Weather source with runtime usage and health, for GET /admin/sources."""
+
+    rate_limit: RateLimitUsage | None = None
+    health: SourceHealth | None = None
+
+
+class DatabasePoolStats(BaseModel):
+    """Connection pool and statement cache usage of one engine (per process)."""
+
+    name: str = Field(description="primary | replica-N")
+    pool_size: int
+    max_overflow: int
+    checked_out: int = Field(description="Connections currently in use")
+    idle: int = Field(description="Connections waiting in the pool")
+    overflow: int = Field(description="Overflow connections currently open")
+    checkouts: int = 0
+    timeouts: int = Field(0, description="Checkouts that gave up waiting for a connection")
+    overflow_opened: int = Field(0, description="Overflow connections opened since start")
+    avg_wait_ms: float | None = None
+    p95_wait_ms: float | None = None
+    max_wait_ms: float = 0.0
+    statement_cache_hits: int
+    statement_cache_misses: int
+    statement_cache_entries: int
+
+
+class SharedCacheStats(BaseModel):
+    """Counters of the cache shared between workers (per process)."""
+
+    backend: str = Field(description="MemoryBackend (this process only) or RedisBackend")
+    hits: int
+    misses: int
+    errors: int = Field(description="Failed backend calls, served as misses")
+
+
+class ResponseCacheStats(BaseModel):
+    """Aggregated response cache counters (per process)."""
+
+    enabled: bool
+    entries: int
+    bytes: int = Field(description="Approximate size of the cached responses")
+    hits: int
+    misses: int
+    hit_rate: float
+    evictions: int = Field(description="Entries dropped by the LRU size bounds")
+    invalidations: int = Field(description="Entries dropped because new data was saved")
+    shared: SharedCacheStats
+
+
 class FetchNowResponse(BaseModel):
     """Response for POST /admin/fetch-now."""
 
     triggered: bool
     cities_count: int
+
+
+class SourcesReloadResponse(BaseModel):
+    """Response for POST /admin/sources/reload."""
+
+    added: list[str]
+    updated: list[str]
+    removed: list[str]
+    failed: list[str]
+    total: int = Field(description="Number of enabled sources after reload")
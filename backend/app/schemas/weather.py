@@ -4,6 +4,8 @@ from datetime import datetime
 
 from pydantic import BaseModel, Field
 
+from app.schemas.recommendation import ClothingRecommendationResponse
+
 
 class AggregatedWeather(BaseModel):
     """Schema for aggregated weather data from multiple sources.
@@ -74,6 +76,12 @@ class AggregatedWeatherResponse(BaseModel):
     city_id: int
     fetched_at: datetime
     weather: AggregatedWeather
+    stale: bool = Field(
+        default=False, description="True if served from stale data while a refresh runs"
+    )
+    data_age_seconds: int | None = Field(
+        default=None, description="Age of the underlying data in seconds"
+    )
 
 
 class ForecastPoint(BaseModel):
@@ -89,6 +97,30 @@ class ForecastResponse(BaseModel):
     city_id: int
     days: int
     forecasts: list[ForecastPoint]
+    stale: bool = Field(
+        default=False, description="True if served from stale data while a refresh runs"
+    )
+    data_age_seconds: int | None = Field(
+        default=None, description="Age of the underlying data in seconds"
+    )
+
+
+class BatchWeatherResponse(BaseModel):
+    """Response schema for aggregated current weather of several cities."""
+
+    items: list[AggregatedWeatherResponse]
+    missing: list[int] = Field(
+        default_factory=list, description="Requested city IDs without weather data"
+    )
+
+
+class BatchForecastResponse(BaseModel):
+    """Response schema for weather forecasts of several cities."""
+
+    items: list[ForecastResponse]
+    missing: list[int] = Field(
+        default_factory=list, description="Requested city IDs without forecast data"
+    )
 
 
 class SourceWeatherData(BaseModel):
@@ -125,3 +157,16 @@ class DailyChartPoint(BaseModel):
     temp_min: float
     temp_max: float
     temp_avg: float
+
+
+class WeatherOverviewResponse(BaseModel):
+    """Response schema for everything the dashboard shows for one city."""
+
+    city_id: int
+    current: AggregatedWeatherResponse | None = None
+    forecast: ForecastResponse | None = None
+    chart_hourly: list[ChartPoint] = Field(default_factory=list)
+    chart_daily: list[DailyChartPoint] = Field(default_factory=list)
+    recommendation: ClothingRecommendationResponse | None = Field(
+        default=None, description="Clothing recommendation (None if the ML model is unavailable)"
+    )
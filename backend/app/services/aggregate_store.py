@@ -0,0 +1,117 @@
+"""Storage of precomputed aggregated responses (the weather_aggregates table).
+
+After a city is refreshed, ``WeatherService.precompute_aggregates`` builds the
+current / forecast / chart responses for the default source set and stores
+them here as serialized JSON.  The weather endpoints then read a response
+with one primary key lookup and send the bytes as they are: no record rows,
+no ``aggregate()`` and no pydantic models on that path.
+
+Rows are keyed by ``(city_id, endpoint, sources_hash, version)``:
+
+* ``endpoint`` includes the parameters, e.g. ``"forecast:5"``;
+* ``sources_hash`` covers the source set and the priorities of the enabled
+  sources, so a priority change makes existing rows unreachable at once;
+* ``version`` is ``PAYLOAD_VERSION``, bumped whenever the serialized shape of
+  a response changes, so rows written by older code are never served.
+"""
+
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import WeatherAggregate
+
+# Version of the serialized payloads (see module docstring)
+PAYLOAD_VERSION = 1
+
+
+@dataclass(frozen=True)
+class StoredAggregate:
+    """One precomputed response."""
+
+    payload: bytes
+    fetched_at: datetime
+    valid_until: datetime | None
+
+
+def aggregate_endpoint(endpoint: str, params: tuple = ()) -> str:
+    """Return the ``endpoint`` column value of an endpoint and its parameters."""
+    return ":".join([endpoint, *(str(param) for param in params)])
+
+
+def sources_hash(sources: tuple[str, ...], priorities: dict[int, int]) -> str:
+    """Hash a source filter together with the priorities used to aggregate it."""
+    state = (sources, sorted(priorities.items()))
+    return hashlib.sha1(repr(state).encode()).hexdigest()[:16]
+
+
+class AggregateStore:
+    """Reads and writes rows of the weather_aggregates table."""
+
+    def __init__(self, db: AsyncSession) -> None:
+        self.db = db
+
+    async def get(self, city_id: int, endpoint: str, sources: str) -> StoredAggregate | None:
+        """Look up one precomputed response by primary key.
+
+        Args:
+            city_id: ID of the city
+            endpoint: Value from ``aggregate_endpoint``
+            sources: Value from ``sources_hash``
+
+        Returns:
+            The stored response, or None if none was precomputed
+        """
+        table = WeatherAggregate.__table__
+        result = await self.db.execute(
+            select(table.c.payload, table.c.fetched_at, table.c.valid_until).where(
+                table.c.city_id == city_id,
+                table.c.endpoint == endpoint,
+                table.c.sources_hash == sources,
+                table.c.version == PAYLOAD_VERSION,
+            )
+        )
+        row = result.first()
+        return StoredAggregate(*row) if row is not None else None
+
+    async def save(self, rows: list[dict]) -> None:
+        """Insert or replace precomputed responses (not committed).
+
+        A row is only replaced by one built from data at least as new, so a
+        slow writer cannot overwrite a newer payload with an older one.
+
+        Args:
+            rows: Column values of ``WeatherAggregate`` without ``version``
+        """
+        if not rows:
+            return
+        table = WeatherAggregate.__table__
+        dialect = postgresql if self.db.bind.dialect.name == "postgresql" else sqlite
+        stmt = dialect.insert(table).values(
+            [{**row, "version": PAYLOAD_VERSION} for row in rows]
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[column.name for column in table.primary_key],
+            set_={
+                "payload": stmt.excluded.payload,
+                "fetched_at": stmt.excluded.fetched_at,
+                "valid_until": stmt.excluded.valid_until,
+                "computed_at": stmt.excluded.computed_at,
+            },
+            where=table.c.fetched_at <= stmt.excluded.fetched_at,
+        )
+        await self.db.execute(stmt)
+
+    async def delete_cities(self, city_ids: list[int]) -> None:
+        """Delete every precomputed response of *city_ids* (not committed)."""
+        await self.db.execute(
+            delete(WeatherAggregate).where(WeatherAggregate.city_id.in_(city_ids))
+        )
+
+    async def clear(self) -> None:
+        """Delete every precomputed response (not committed)."""
+        await self.db.execute(delete(WeatherAggregate))
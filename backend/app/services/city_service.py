@@ -6,6 +6,9 @@ import aiohttp
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cache import shared_cache
+from app.core.config import settings
+from app.core.http import http_client
 from app.models.city import City
 from app.schemas.city import CityCreate, CitySearchResult
 
@@ -13,6 +16,12 @@ logger = logging.getLogger(__name__)
 
 OWM_GEOCODING_URL = "http://api.openweathermap.org/geo/1.0/direct"
 
+# Default lifetime of a cached geocoding search
+DEFAULT_GEOCODING_TTL_SECONDS = 86400
+
+# Search results shared by all workers, keyed by "<limit>:<normalised query>"
+_geocoding_cache = shared_cache.namespace("geocoding", list[CitySearchResult])
+
 
 class CityService:
     """Service for city search and management."""
@@ -35,17 +44,21 @@ class CityService:
             logger.warning("OWM_API_KEY is not set; geocoding search unavailable")
             return []
 
+        cache_key = f"{limit}:{' '.join(query.casefold().split())}"
+        cached = await _geocoding_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         params = {"q": query, "limit": limit, "appid": self.owm_api_key}
 
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    OWM_GEOCODING_URL, params=params, timeout=aiohttp.ClientTimeout(total=10)
-                ) as resp:
-                    if resp.status != 200:
-                        logger.error("OWM geocoding error: status %d", resp.status)
-                        return []
-                    data: list[dict] = await resp.json()
+            async with http_client.get(
+                OWM_GEOCODING_URL, params=params, timeout=aiohttp.ClientTimeout(total=10)
+            ) as resp:
+                if resp.status != 200:
+                    logger.error("OWM geocoding error: status %d", resp.status)
+                    return []
+                data: list[dict] = await resp.json()
         except Exception as exc:
             logger.error("OWM geocoding request failed: %s", exc)
             return []
@@ -63,6 +76,11 @@ class CityService:
                     lon=item["lon"],
                 )
             )
+        if results:
+            ttl = settings.app_config.get(
+                "cache", "geocoding_ttl_seconds", default=DEFAULT_GEOCODING_TTL_SECONDS
+            )
+            await _geocoding_cache.set(cache_key, results, ttl=float(ttl))
         return results
 
     async def get_by_id(self, city_id: int) -> City | None:
@@ -0,0 +1,219 @@
+"""Streaming bulk exports of weather_records and request_logs (admin).
+
+Rows are read through a server-side cursor (``AsyncSession.stream`` with
+``yield_per``) and encoded to NDJSON or CSV one chunk of
+``admin.export.chunk_size`` rows at a time, so memory use stays the same
+however many rows are exported.  Every export reads in its own session (a
+replica when one is within the lag bound), opened when the response starts
+streaming and closed when it ends or the client goes away.  At most
+``admin.export.max_concurrent`` exports run at once per process, so exports
+cannot take over the connection pool.
+"""
+
+import csv
+import io
+import logging
+from collections.abc import AsyncIterator, Sequence
+from datetime import datetime
+from typing import Any
+
+import orjson
+from sqlalchemy import Select, select
+
+from app.core.config import settings
+from app.core.database import ReadSessionLocal
+from app.core.replicas import replica_router
+from app.models import RequestLog, WeatherRecord
+
+logger = logging.getLogger(__name__)
+
+# Supported formats and their media types
+EXPORT_FORMATS = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+DEFAULT_CHUNK_SIZE = 5000
+DEFAULT_MAX_CONCURRENT = 2
+
+# Exports currently streaming in this process
+_running = 0
+
+
+class ExportBusy(Exception):
+    """Raised when ``admin.export.max_concurrent`` exports are already running."""
+
+
+def weather_records_query(
+    city_id: int | None = None,
+    source_id: int | None = None,
+    record_type: str | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+) -> Select:
+    """Select weather_records columns, oldest first, filtered on fetched_at.
+
+    Args:
+        city_id: Only rows of this city
+        source_id: Only rows of this source
+        record_type: Only "current" or "forecast" rows
+        since: Rows fetched at or after this time
+        until: Rows fetched before this time
+
+    Returns:
+        Core select of every column (no ORM objects are built)
+    """
+    table = WeatherRecord.__table__
+    query = select(table).order_by(table.c.id)
+    if city_id is not None:
+        query = query.where(table.c.city_id == city_id)
+    if source_id is not None:
+        query = query.where(table.c.source_id == source_id)
+    if record_type is not None:
+        query = query.where(table.c.record_type == record_type)
+    if since is not None:
+        query = query.where(table.c.fetched_at >= since)
+    if until is not None:
+        query = query.where(table.c.fetched_at < until)
+    return query
+
+
+def request_logs_query(
+    platform: str | None = None,
+    action: str | None = None,
+    city_id: int | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+) -> Select:
+    """Select request_logs columns, oldest first, filtered on created_at.
+
+    Args:
+        platform: Only rows of this platform
+        action: Partial match on the action field
+        city_id: Only rows about this city
+        since: Rows created at or after this time
+        until: Rows created before this time
+
+    Returns:
+        Core select of every column (no ORM objects are built)
+    """
+    table = RequestLog.__table__
+    query = select(table).order_by(table.c.id)
+    if platform is not None:
+        query = query.where(table.c.platform == platform)
+    if action is not None:
+        query = query.where(table.c.action.contains(action))
+    if city_id is not None:
+        query = query.where(table.c.city_id == city_id)
+    if since is not None:
+        query = query.where(table.c.created_at >= since)
+    if until is not None:
+        query = query.where(table.c.created_at < until)
+    return query
+
+
+def start_export(query: Select, fmt: str) -> AsyncIterator[bytes]:
+    """Reserve an export slot and return the encoded chunks of *query* as a stream.
+
+    The slot is taken here, before the response starts, so concurrent
+    requests cannot all pass the limit check; it is given back when the
+    stream ends, fails or is closed (``aclose``), also if it never started.
+
+    Args:
+        query: Rows to export (see ``weather_records_query``)
+        fmt: Key of ``EXPORT_FORMATS``
+
+    Returns:
+        Async iterator of NDJSON lines or CSV rows (header first), chunk by chunk
+
+    Raises:
+        ExportBusy: If the maximum number of exports is already running
+    """
+    global _running
+    limit = int(
+        settings.app_config.get(
+            "admin", "export", "max_concurrent", default=DEFAULT_MAX_CONCURRENT
+        )
+    )
+    if _running >= limit:
+        raise ExportBusy(f"{_running} exports are already running")
+    _running += 1
+    return _Export(query, fmt)
+
+
+class _Export:
+    """Stream of one export holding its slot until closed."""
+
+    def __init__(self, query: Select, fmt: str) -> None:
+        self._chunks = _stream(query, fmt)
+        self._released = False
+
+    def __aiter__(self) -> "_Export":
+        return self
+
+    async def __anext__(self) -> bytes:
+        try:
+            return await self._chunks.__anext__()
+        except BaseException:
+            # Exhausted, failed or cancelled: the generator has finished
+            self._release()
+            raise
+
+    async def aclose(self) -> None:
+        try:
+            await self._chunks.aclose()
+        finally:
+            self._release()
+
+    def __del__(self) -> None:
+        # Last resort for a response dropped before it started streaming
+        self._release()
+
+    def _release(self) -> None:
+        global _running
+        if not self._released:
+            self._released = True
+            _running -= 1
+
+
+async def _stream(query: Select, fmt: str) -> AsyncIterator[bytes]:
+    chunk_size = int(
+        settings.app_config.get("admin", "export", "chunk_size", default=DEFAULT_CHUNK_SIZE)
+    )
+    exported = 0
+    try:
+        replica = await replica_router.choose()
+        async with ReadSessionLocal(info={"replica": replica}) as session:
+            result = await session.stream(query.execution_options(yield_per=chunk_size))
+            columns = list(result.keys())
+            if fmt == "csv":
+                yield _csv_chunk([columns])
+            async for rows in result.partitions():
+                exported += len(rows)
+                if fmt == "csv":
+                    yield _csv_chunk([_csv_row(row) for row in rows])
+                else:
+                    yield _ndjson_chunk(columns, rows)
+    finally:
+        logger.info("Export ended after %d rows", exported)
+
+
+def _ndjson_chunk(columns: list[str], rows: Sequence[Any]) -> bytes:
+    option = orjson.OPT_UTC_Z | orjson.OPT_APPEND_NEWLINE
+    return b"".join(orjson.dumps(dict(zip(columns, row)), option=option) for row in rows)
+
+
+def _csv_row(row: Sequence[Any]) -> list[Any]:
+    return [_csv_value(value) for value in row]
+
+
+def _csv_value(value: Any) -> Any:
+    """CSV cell of a value: ISO datetimes, JSON for structured values."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (dict, list)):
+        return orjson.dumps(value).decode()
+    return value
+
+
+def _csv_chunk(rows: list[list[Any]]) -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue().encode()
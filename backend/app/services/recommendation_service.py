@@ -196,6 +196,24 @@ class RecommendationService:
         if weather is None:
             return None
 
+        return self.recommend(city_id, weather)
+
+    def recommend(self, city_id: int, weather: Any) -> ClothingRecommendationResponse:
+        """Predict the clothing category for already aggregated weather.
+
+        Args:
+            city_id: Database city ID.
+            weather: AggregatedWeather of the city.
+
+        Returns:
+            ClothingRecommendationResponse for the predicted category.
+
+        Raises:
+            RuntimeError: If the model is not loaded or prediction fails.
+        """
+        if not self.is_available():
+            raise RuntimeError("ML model is not available")
+
         features = self._extract_features(weather)
         feature_array = np.array([features], dtype=float)
 
@@ -0,0 +1,239 @@
+"""Read layer returning only the newest snapshot per source.
+
+Every fetch writes one snapshot per (city, source, record_type): all of its
+rows share a single ``fetched_at`` (see ``WeatherService._build_rows``).
+Readers almost always want just the newest snapshot of each source, so that
+a source fetched twice within the freshness window is not counted twice by
+``aggregate()``, and so that reads do not scan the whole history.
+
+On Postgres the newest ``fetched_at`` per (city, source) is found with a
+LATERAL top-1 lookup, i.e. one short index probe on
+``ix_weather_records_latest`` each, independent of how much history exists.
+Other dialects (SQLite in tests and benchmarks) use the same top-1 lookup as
+a correlated scalar subquery.
+"""
+
+from dataclasses import dataclass, replace
+from datetime import datetime
+
+from sqlalchemy import Select, and_, select, true
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import City, WeatherRecord, WeatherSource
+
+
+@dataclass(frozen=True)
+class ForecastWindow:
+    """Range of ``forecast_dt`` to read, applied in SQL.
+
+    Rows are returned ordered by ``forecast_dt`` and capped at ``limit``.
+    """
+
+    start: datetime
+    end: datetime
+    limit: int | None = None
+
+
+class RecordReader:
+    """Queries for the latest weather snapshots of a city."""
+
+    def __init__(self, db: AsyncSession) -> None:
+        self.db = db
+
+    async def latest(
+        self,
+        city_id: int,
+        record_type: str,
+        source_ids: list[int] | None = None,
+        since: datetime | None = None,
+        window: ForecastWindow | None = None,
+    ) -> list[WeatherRecord]:
+        """Return the rows of the newest snapshot of every source.
+
+        Args:
+            city_id: ID of the city
+            record_type: Type of record ("current" or "forecast")
+            source_ids: Optional list of source IDs to restrict to
+            since: Ignore snapshots fetched before this time
+            window: Only return forecast points inside this window
+
+        Returns:
+            Weather records, one snapshot per source
+        """
+        query = self.latest_query(city_id, record_type, source_ids, since, window)
+        result = await self.db.execute(query)
+        return list(result.scalars().all())
+
+    async def latest_with_sources(
+        self, city_id: int, record_type: str = "current"
+    ) -> list[tuple[WeatherRecord, WeatherSource]]:
+        """Return the newest snapshot of every source together with the source row.
+
+        Args:
+            city_id: ID of the city
+            record_type: Type of record ("current" or "forecast")
+
+        Returns:
+            List of (record, source) tuples
+        """
+        records = await self.latest(city_id, record_type)
+        if not records:
+            return []
+
+        # Sources are looked up separately: joining them into the same
+        # statement lets the planner drive the query from weather_records
+        result = await self.db.execute(
+            select(WeatherSource).where(
+                WeatherSource.id.in_({record.source_id for record in records})
+            )
+        )
+        sources = {source.id: source for source in result.scalars()}
+        return [(record, sources[record.source_id]) for record in records]
+
+    async def latest_fetches(
+        self,
+        city_id: int,
+        record_type: str,
+        source_ids: list[int] | None = None,
+    ) -> dict[int, datetime]:
+        """Return the ``fetched_at`` of the newest snapshot of every source.
+
+        Args:
+            city_id: ID of the city
+            record_type: Type of record ("current" or "forecast")
+            source_ids: Optional list of source IDs to restrict to
+
+        Returns:
+            Dictionary mapping source_id to fetched_at (sources without data are absent)
+        """
+        latest = self._latest_fetches([city_id], record_type, source_ids, None)
+        result = await self.db.execute(
+            select(latest.c.source_id, latest.c.fetched_at).where(latest.c.fetched_at.is_not(None))
+        )
+        return {source_id: fetched_at for source_id, fetched_at in result.all()}
+
+    async def latest_many(
+        self,
+        city_ids: list[int],
+        record_type: str,
+        source_ids: list[int] | None = None,
+        since: datetime | None = None,
+        window: ForecastWindow | None = None,
+    ) -> dict[int, list[WeatherRecord]]:
+        """Return the newest snapshot of every source for several cities at once.
+
+        Args:
+            city_ids: IDs of the cities
+            record_type: Type of record ("current" or "forecast")
+            source_ids: Optional list of source IDs to restrict to
+            since: Ignore snapshots fetched before this time
+            window: Only return forecast points inside this window (its
+                    ``limit`` is ignored)
+
+        Returns:
+            Weather records by city ID (cities without data are absent)
+        """
+        if not city_ids:
+            return {}
+        if window is not None and window.limit is not None:
+            # A single LIMIT cannot be split fairly across cities
+            window = replace(window, limit=None)
+        query = self._latest_records(city_ids, record_type, source_ids, since, window)
+        result = await self.db.execute(query)
+
+        by_city: dict[int, list[WeatherRecord]] = {}
+        for record in result.scalars():
+            by_city.setdefault(record.city_id, []).append(record)
+        return by_city
+
+    def latest_query(
+        self,
+        city_id: int,
+        record_type: str,
+        source_ids: list[int] | None = None,
+        since: datetime | None = None,
+        window: ForecastWindow | None = None,
+    ) -> Select:
+        """Build the SELECT used by ``latest`` (exposed for composition and tests)."""
+        return self._latest_records([city_id], record_type, source_ids, since, window)
+
+    def _latest_records(
+        self,
+        city_ids: list[int],
+        record_type: str,
+        source_ids: list[int] | None,
+        since: datetime | None,
+        window: ForecastWindow | None = None,
+    ) -> Select:
+        latest = self._latest_fetches(city_ids, record_type, source_ids, since)
+        query = (
+            select(WeatherRecord)
+            .join(
+                latest,
+                and_(
+                    WeatherRecord.city_id == latest.c.city_id,
+                    WeatherRecord.source_id == latest.c.source_id,
+                    WeatherRecord.fetched_at == latest.c.fetched_at,
+                ),
+            )
+            .where(WeatherRecord.record_type == record_type)
+        )
+        if window is not None:
+            query = (
+                query.where(WeatherRecord.forecast_dt >= window.start)
+                .where(WeatherRecord.forecast_dt < window.end)
+                .order_by(WeatherRecord.forecast_dt, WeatherRecord.city_id, WeatherRecord.source_id)
+                .limit(window.limit)
+            )
+        return query
+
+    def _latest_fetches(
+        self,
+        city_ids: list[int],
+        record_type: str,
+        source_ids: list[int] | None,
+        since: datetime | None,
+    ):
+        """CTE of (city_id, source_id, fetched_at) of the newest snapshot per source.
+
+        The CTE is materialized so that the outer query is driven by the
+        handful of (city, source) pairs rather than by the cities' history.
+        """
+        newest = (
+            select(WeatherRecord.fetched_at)
+            .where(WeatherRecord.city_id == City.id)
+            .where(WeatherRecord.record_type == record_type)
+            .where(WeatherRecord.source_id == WeatherSource.id)
+            .order_by(WeatherRecord.fetched_at.desc())
+            .limit(1)
+        )
+        if since is not None:
+            newest = newest.where(WeatherRecord.fetched_at >= since)
+
+        if self.db.bind.dialect.name == "postgresql":
+            top = newest.lateral("top_fetch")
+            latest = (
+                select(
+                    City.id.label("city_id"),
+                    WeatherSource.id.label("source_id"),
+                    top.c.fetched_at,
+                )
+                .select_from(City)
+                .join(WeatherSource, true())
+                .join(top, true())
+            )
+        else:
+            latest = (
+                select(
+                    City.id.label("city_id"),
+                    WeatherSource.id.label("source_id"),
+                    newest.scalar_subquery().label("fetched_at"),
+                )
+                .select_from(City)
+                .join(WeatherSource, true())
+            )
+
+        latest = latest.where(City.id.in_(city_ids))
+        if source_ids is not None:
+            latest = latest.where(WeatherSource.id.in_(source_ids))
+        return latest.cte("latest").prefix_with("MATERIALIZED")
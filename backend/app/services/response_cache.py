@@ -0,0 +1,218 @@
+"""In-process cache of aggregated weather responses.
+
+Weather data of a city changes at most once per fetch, yet every request
+re-reads the rows and re-runs aggregation.  ``WeatherService`` keeps its
+aggregated results here, keyed by ``(endpoint, city_id, sorted source slugs,
+params)``.
+
+Entries are versioned by the newest ``fetched_at`` committed for the city in
+this process: ``fetch_and_save`` calls ``invalidate_city`` after every
+commit, which drops the city's entries and rejects results that were
+computed from older data while the commit happened.  Data written by other
+processes is picked up when ``weather.response_cache.ttl_seconds`` expires,
+or as soon as their invalidation arrives when the shared cache
+(``app.core.cache``) is distributed.
+Least recently used entries are evicted beyond ``max_entries`` or
+``max_megabytes``.
+
+Cached values are shared between requests and must not be mutated.
+"""
+
+import logging
+import pickle
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, NamedTuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_SECONDS = 60
+DEFAULT_MAX_ENTRIES = 10_000
+DEFAULT_MAX_MEGABYTES = 64
+
+
+class ResponseKey(NamedTuple):
+    """Identifies one cached response."""
+
+    endpoint: str
+    city_id: int
+    sources: tuple[str, ...]
+    params: tuple = ()
+
+
+# (generation, newest committed fetched_at of the city)
+Version = tuple[int, datetime | None]
+
+
+@dataclass
+class CacheEntry:
+    value: Any
+    version: Version
+    expires_at: float
+    size: int
+    # DataFreshness of the data behind the value, if the endpoint reports one
+    freshness: Any = None
+
+
+class ResponseCache:
+    """LRU + TTL cache of aggregated responses, bounded by count and size."""
+
+    def __init__(self) -> None:
+        self._entries: OrderedDict[ResponseKey, CacheEntry] = OrderedDict()
+        self._by_city: dict[int, set[ResponseKey]] = {}
+        self._versions: dict[int, datetime] = {}
+        # Bumped by clear() so that in-flight results computed before it are dropped
+        self._generation = 0
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(settings.app_config.get("weather", "response_cache", "enabled", default=True))
+
+    @property
+    def ttl_seconds(self) -> float:
+        return self._limits()[2]
+
+    def version(self, city_id: int) -> Version:
+        """Return the current data version of a city.
+
+        Take it *before* reading the data and pass it to ``set``.
+        """
+        return self._generation, self._versions.get(city_id)
+
+    def get(self, key: ResponseKey) -> CacheEntry | None:
+        """Return the live entry for *key*, counting a hit or a miss."""
+        entry = self._entries.get(key)
+        if entry is not None and (
+            entry.expires_at <= time.monotonic() or entry.version != self.version(key.city_id)
+        ):
+            self._remove(key)
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def peek(self, key: ResponseKey) -> CacheEntry | None:
+        """Return the live entry for *key* without counting or reordering it."""
+        entry = self._entries.get(key)
+        if entry is None or entry.expires_at <= time.monotonic():
+            return None
+        if entry.version != self.version(key.city_id):
+            return None
+        return entry
+
+    def set(self, key: ResponseKey, value: Any, version: Version, freshness: Any = None) -> None:
+        """Store *value* unless the city's data changed since *version* was taken."""
+        if version != self.version(key.city_id):
+            return
+        size = len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+        max_bytes, max_entries, ttl = self._limits()
+        if size > max_bytes:
+            return
+
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = CacheEntry(value, version, time.monotonic() + ttl, size, freshness)
+        self._by_city.setdefault(key.city_id, set()).add(key)
+        self._bytes += size
+
+        while self._entries and (len(self._entries) > max_entries or self._bytes > max_bytes):
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+        self._prune_versions(max_entries)
+
+    def discard(self, key: ResponseKey) -> None:
+        if key in self._entries:
+            self._remove(key)
+
+    def invalidate_city(self, city_id: int, fetched_at: datetime) -> None:
+        """Record that data fetched at *fetched_at* was committed for *city_id*."""
+        known = self._versions.get(city_id)
+        if known is None or fetched_at > known:
+            self._versions[city_id] = fetched_at
+        for key in list(self._by_city.get(city_id, ())):
+            self._remove(key)
+            self.invalidations += 1
+        self._prune_versions(self._limits()[1])
+
+    def clear(self) -> None:
+        """Drop every entry (e.g. after source priorities changed)."""
+        self._generation += 1
+        self.invalidations += len(self._entries)
+        self._entries.clear()
+        self._by_city.clear()
+        self._versions.clear()
+        self._bytes = 0
+
+    def reset(self) -> None:
+        """Drop all entries, versions and counters (used by tests)."""
+        self.clear()
+        self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    def stats(self) -> dict[str, Any]:
+        """Return counters and current size for monitoring."""
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+    def _remove(self, key: ResponseKey) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+        keys = self._by_city.get(key.city_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_city[key.city_id]
+
+    def _prune_versions(self, max_entries: int) -> None:
+        """Forget versions of cities without entries once there are too many.
+
+        Forgetting a version could let a result computed before the forgotten
+        commit match again, so the generation is bumped as in ``clear`` and
+        the remaining entries are moved to the new generation.
+        """
+        if len(self._versions) <= max_entries:
+            return
+        self._generation += 1
+        self._versions = {
+            city_id: fetched_at
+            for city_id, fetched_at in self._versions.items()
+            if city_id in self._by_city
+        }
+        for entry in self._entries.values():
+            entry.version = (self._generation, entry.version[1])
+
+    @staticmethod
+    def _limits() -> tuple[int, int, float]:
+        config = settings.app_config
+        max_megabytes = config.get(
+            "weather", "response_cache", "max_megabytes", default=DEFAULT_MAX_MEGABYTES
+        )
+        max_entries = config.get(
+            "weather", "response_cache", "max_entries", default=DEFAULT_MAX_ENTRIES
+        )
+        ttl = config.get("weather", "response_cache", "ttl_seconds", default=DEFAULT_TTL_SECONDS)
+        return int(float(max_megabytes) * 1024 * 1024), int(max_entries), float(ttl)
+
+
+response_cache = ResponseCache()
@@ -0,0 +1,343 @@
+"""Retention and compaction for weather_records.
+
+Run periodically by the scheduler (``retention`` section of settings.yaml):
+
+- superseded forecast snapshots are deleted, keeping only the newest snapshot
+  per city/source (plus, optionally, the last ``keep_superseded_hours``);
+- old ``current`` observations are thinned to one row per city/source per
+  ``thin_interval_minutes`` bucket, keeping a coarse history;
+- everything older than ``raw_days`` is removed.  On Postgres, where the table
+  is partitioned by day (migration 002), this drops whole partitions, expires
+  rows stranded in the DEFAULT partition and creates the partitions for the
+  coming days.
+"""
+
+import logging
+import re
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+
+from sqlalchemy import Integer, and_, cast, delete, exists, func, select, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app.core.config import settings
+from app.models import WeatherRecord
+
+logger = logging.getLogger(__name__)
+
+# Defaults used when settings.yaml has no ``retention`` section
+DEFAULT_RAW_DAYS = 30
+DEFAULT_PARTITION_DAYS_AHEAD = 7
+DEFAULT_KEEP_SUPERSEDED_HOURS = 2
+DEFAULT_THIN_AFTER_HOURS = 24
+DEFAULT_THIN_INTERVAL_MINUTES = 60
+DEFAULT_LOCK_TIMEOUT_SECONDS = 5
+
+_PARTITION_PREFIX = "weather_records_p"
+_DEFAULT_PARTITION = "weather_records_default"
+_PARTITION_RE = re.compile(rf"^{_PARTITION_PREFIX}(\d{{8}})$")
+
+
+@dataclass
+class RetentionResult:
+    """What one retention run removed or created."""
+
+    forecasts_deleted: int = 0
+    currents_thinned: int = 0
+    rows_expired: int = 0
+    partitions_dropped: list[str] | None = None
+    partitions_created: list[str] | None = None
+
+
+def partition_name(day: date) -> str:
+    """Return the name of the daily partition holding *day*."""
+    return f"{_PARTITION_PREFIX}{day:%Y%m%d}"
+
+
+def partition_day(name: str) -> date | None:
+    """Return the day of a daily partition name, or None for other tables."""
+    match = _PARTITION_RE.match(name)
+    if not match:
+        return None
+    return datetime.strptime(match.group(1), "%Y%m%d").date()
+
+
+class RetentionService:
+    """Service that compacts and expires weather_records."""
+
+    def __init__(self, db: AsyncSession) -> None:
+        self.db = db
+
+    async def run(self) -> RetentionResult:
+        """Apply the configured retention policy and commit.
+
+        Returns:
+            Summary of the run
+        """
+        now = datetime.now(timezone.utc)
+        result = RetentionResult()
+
+        keep_hours = self._config("forecast", "keep_superseded_hours", DEFAULT_KEEP_SUPERSEDED_HOURS)
+        result.forecasts_deleted = await self.delete_superseded_forecasts(
+            now - timedelta(hours=keep_hours)
+        )
+
+        thin_after = self._config("current", "thin_after_hours", DEFAULT_THIN_AFTER_HOURS)
+        thin_interval = self._config("current", "thin_interval_minutes", DEFAULT_THIN_INTERVAL_MINUTES)
+        result.currents_thinned = await self.thin_current(
+            now - timedelta(hours=thin_after), int(thin_interval * 60)
+        )
+        await self.db.commit()
+
+        raw_days = self._config(None, "raw_days", DEFAULT_RAW_DAYS)
+        cutoff = now - timedelta(days=raw_days)
+        if await self._is_partitioned():
+            days_ahead = int(self._config(None, "partition_days_ahead", DEFAULT_PARTITION_DAYS_AHEAD))
+            result.partitions_created = await self.ensure_partitions(now.date(), days_ahead)
+            result.rows_expired = await self.delete_default_before(cutoff)
+            await self.db.commit()
+            result.partitions_dropped = await self.drop_partitions_before(cutoff.date())
+        else:
+            result.rows_expired = await self.delete_before(cutoff)
+        await self.db.commit()
+
+        logger.info(
+            "Retention: %d superseded forecast rows, %d thinned current rows, "
+            "%d expired rows, partitions dropped=%s created=%s",
+            result.forecasts_deleted,
+            result.currents_thinned,
+            result.rows_expired,
+            result.partitions_dropped or [],
+            result.partitions_created or [],
+        )
+        return result
+
+    async def delete_superseded_forecasts(self, older_than: datetime) -> int:
+        """Delete forecast rows that a newer snapshot of the same city/source replaces.
+
+        Args:
+            older_than: Only snapshots fetched before this time are deleted
+
+        Returns:
+            Number of deleted rows
+        """
+        newer = aliased(WeatherRecord)
+        has_newer = exists().where(
+            and_(
+                newer.city_id == WeatherRecord.city_id,
+                newer.source_id == WeatherRecord.source_id,
+                newer.record_type == "forecast",
+                newer.fetched_at > WeatherRecord.fetched_at,
+            )
+        )
+        stmt = delete(WeatherRecord).where(
+            WeatherRecord.record_type == "forecast",
+            WeatherRecord.fetched_at < older_than,
+            has_newer,
+        )
+        result = await self.db.execute(stmt)
+        return result.rowcount or 0
+
+    async def thin_current(self, older_than: datetime, interval_seconds: int) -> int:
+        """Keep one ``current`` row per city/source per time bucket before *older_than*.
+
+        Args:
+            older_than: Rows fetched after this time are left untouched
+            interval_seconds: Bucket width
+
+        Returns:
+            Number of deleted rows
+        """
+        if interval_seconds <= 0:
+            return 0
+
+        bucket = self._bucket(WeatherRecord.fetched_at, interval_seconds)
+        keepers = (
+            select(func.min(WeatherRecord.id))
+            .where(WeatherRecord.record_type == "current")
+            .where(WeatherRecord.fetched_at < older_than)
+            .group_by(WeatherRecord.city_id, WeatherRecord.source_id, bucket)
+        )
+        stmt = delete(WeatherRecord).where(
+            WeatherRecord.record_type == "current",
+            WeatherRecord.fetched_at < older_than,
+            WeatherRecord.id.not_in(keepers),
+        )
+        result = await self.db.execute(stmt)
+        return result.rowcount or 0
+
+    async def delete_before(self, cutoff: datetime) -> int:
+        """Delete every row fetched before *cutoff* (non-partitioned databases).
+
+        Returns:
+            Number of deleted rows
+        """
+        result = await self.db.execute(
+            delete(WeatherRecord).where(WeatherRecord.fetched_at < cutoff)
+        )
+        return result.rowcount or 0
+
+    async def delete_default_before(self, cutoff: datetime) -> int:
+        """Delete rows fetched before *cutoff* from the DEFAULT partition.
+
+        Rows land there for days that had no partition yet (before migration
+        002, or written with a skewed clock) and are never dropped with a
+        daily partition.
+
+        Returns:
+            Number of deleted rows
+        """
+        result = await self.db.execute(
+            text(f"DELETE FROM {_DEFAULT_PARTITION} WHERE fetched_at < :cutoff"),
+            {"cutoff": cutoff},
+        )
+        return result.rowcount or 0
+
+    async def ensure_partitions(self, start: date, days_ahead: int) -> list[str]:
+        """Create the daily partitions for *start* and the following days.
+
+        Partitions must exist before rows for their day arrive, otherwise the
+        rows land in the DEFAULT partition.  Rows that already did are moved
+        into the new partition (see ``_create_partition``).  Each partition is
+        created in its own savepoint: one that fails is logged and retried on
+        the next run without affecting the others.
+
+        Returns:
+            Names of the partitions that were created
+        """
+        existing = set(await self._partitions())
+        created = []
+        for offset in range(days_ahead + 1):
+            day = start + timedelta(days=offset)
+            name = partition_name(day)
+            if name in existing:
+                continue
+            try:
+                async with self.db.begin_nested():
+                    await self._create_partition(name, day)
+            except DBAPIError as exc:
+                logger.error("Could not create partition %s: %s", name, exc)
+                continue
+            created.append(name)
+        return created
+
+    async def drop_partitions_before(self, cutoff: date) -> list[str]:
+        """Detach and drop daily partitions whose whole day is before *cutoff*.
+
+        Dropping an attached partition locks weather_records ACCESS EXCLUSIVE,
+        stalling every reader, so partitions are detached first on a separate
+        autocommit connection.  Postgres only allows ``DETACH ... CONCURRENTLY``
+        while the table has no DEFAULT partition; with one, the plain DETACH
+        holds the lock for the detach alone.  Either way the statements give
+        up after ``retention.lock_timeout_seconds`` instead of queueing
+        readers behind them; a partition that fails is logged and retried on
+        the next run.
+
+        Returns:
+            Names of the dropped partitions
+        """
+        partitions = await self._partitions()
+        expired = [
+            name for name in partitions
+            if (day := partition_day(name)) is not None and day < cutoff
+        ]
+        if not expired:
+            return []
+
+        concurrently = " CONCURRENTLY" if _DEFAULT_PARTITION not in partitions else ""
+        lock_timeout = self._config(None, "lock_timeout_seconds", DEFAULT_LOCK_TIMEOUT_SECONDS)
+        dropped = []
+        async with self.db.bind.connect() as conn:
+            conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            await conn.execute(text(f"SET lock_timeout = '{int(lock_timeout * 1000)}ms'"))
+            try:
+                for name in expired:
+                    try:
+                        await conn.execute(
+                            text(f"ALTER TABLE weather_records DETACH PARTITION {name}{concurrently}")
+                        )
+                        await conn.execute(text(f"DROP TABLE IF EXISTS {name}"))
+                    except DBAPIError as exc:
+                        logger.error("Could not drop partition %s: %s", name, exc)
+                        continue
+                    dropped.append(name)
+            finally:
+                await conn.execute(text("RESET lock_timeout"))
+        return dropped
+
+    async def _create_partition(self, name: str, day: date) -> None:
+        """Create the partition of *day*.
+
+        Postgres refuses to create a partition while DEFAULT holds rows of
+        its range.  In that case the rows are moved into a standalone table,
+        which is then attached as the partition; DEFAULT stays locked against
+        inserts until the transaction commits.
+        """
+        lower = f"{day.isoformat()} 00:00:00+00"
+        upper = f"{(day + timedelta(days=1)).isoformat()} 00:00:00+00"
+        bounds = f"FROM ('{lower}') TO ('{upper}')"
+        in_range = f"fetched_at >= '{lower}' AND fetched_at < '{upper}'"
+
+        stranded = await self.db.execute(
+            text(f"SELECT EXISTS (SELECT 1 FROM {_DEFAULT_PARTITION} WHERE {in_range})")
+        )
+        if not stranded.scalar():
+            await self.db.execute(
+                text(
+                    f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF weather_records "
+                    f"FOR VALUES {bounds}"
+                )
+            )
+            return
+
+        await self.db.execute(text(f"LOCK TABLE {_DEFAULT_PARTITION} IN SHARE ROW EXCLUSIVE MODE"))
+        await self.db.execute(
+            text(
+                f"CREATE TABLE {name} "
+                f"(LIKE weather_records INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+            )
+        )
+        moved = await self.db.execute(
+            text(
+                f"WITH moved AS (DELETE FROM {_DEFAULT_PARTITION} WHERE {in_range} RETURNING *) "
+                f"INSERT INTO {name} SELECT * FROM moved"
+            )
+        )
+        await self.db.execute(
+            text(f"ALTER TABLE weather_records ATTACH PARTITION {name} FOR VALUES {bounds}")
+        )
+        logger.info("Moved %d rows from %s into %s", moved.rowcount, _DEFAULT_PARTITION, name)
+
+    async def _partitions(self) -> list[str]:
+        result = await self.db.execute(
+            text(
+                "SELECT c.relname FROM pg_inherits i "
+                "JOIN pg_class c ON c.oid = i.inhrelid "
+                "WHERE i.inhparent = 'weather_records'::regclass"
+            )
+        )
+        return [row[0] for row in result]
+
+    async def _is_partitioned(self) -> bool:
+        if self.db.bind.dialect.name != "postgresql":
+            return False
+        result = await self.db.execute(
+            text(
+                "SELECT 1 FROM pg_partitioned_table "
+                "WHERE partrelid = 'weather_records'::regclass"
+            )
+        )
+        return result.scalar_one_or_none() is not None
+
+    def _bucket(self, column, interval_seconds: int):
+        """Return an SQL expression numbering *interval_seconds*-wide time buckets."""
+        if self.db.bind.dialect.name == "postgresql":
+            return func.floor(func.extract("epoch", column) / interval_seconds)
+        return cast(func.strftime("%s", column), Integer) // interval_seconds
+
+    @staticmethod
+    def _config(section: str | None, key: str, default: float) -> float:
+        keys = ("retention", section, key) if section else ("retention", key)
+        return float(settings.app_config.get(*keys, default=default))
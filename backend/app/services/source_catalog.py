@@ -0,0 +1,118 @@
+"""In-process catalog of the weather_sources table.
+
+The table has a handful of rows that change only through
+``PATCH /admin/sources/{slug}``, yet every weather read needs the slug → id
+mapping and the priorities of enabled sources.  The catalog keeps an
+immutable snapshot of the table in memory so reads can skip those queries.
+
+The snapshot is loaded at startup, dropped by ``invalidate()`` when this
+process changes a source, and reloaded after ``weather.source_catalog.
+ttl_seconds`` so changes made through another worker are picked up too.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models import WeatherSource
+
+logger = logging.getLogger(__name__)
+
+# Default lifetime of a loaded snapshot
+DEFAULT_TTL_SECONDS = 30
+
+
+@dataclass(frozen=True)
+class CatalogSource:
+    """The weather_sources columns needed on the read path."""
+
+    id: int
+    slug: str
+    display_name: str
+    priority: int
+    is_enabled: bool
+
+
+class CatalogSnapshot:
+    """Immutable view of all weather sources at load time."""
+
+    def __init__(self, sources: list[CatalogSource]) -> None:
+        self._by_id = {source.id: source for source in sources}
+        self._by_slug = {source.slug: source for source in sources}
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def get(self, slug: str) -> CatalogSource | None:
+        return self._by_slug.get(slug)
+
+    def get_by_id(self, source_id: int) -> CatalogSource | None:
+        return self._by_id.get(source_id)
+
+    def ids(self, slugs: list[str]) -> list[int]:
+        """Return the IDs of the given slugs, ignoring unknown ones."""
+        return [self._by_slug[slug].id for slug in slugs if slug in self._by_slug]
+
+    def priorities(self, slugs: list[str] | None = None) -> dict[int, int]:
+        """Return source_id → priority of enabled sources, optionally filtered by slug."""
+        return {
+            source.id: source.priority
+            for source in self._by_id.values()
+            if source.is_enabled and (not slugs or source.slug in slugs)
+        }
+
+
+class SourceCatalog:
+    """Process-wide, lazily (re)loaded cache of the weather_sources table."""
+
+    def __init__(self) -> None:
+        self._snapshot: CatalogSnapshot | None = None
+        self._loaded_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def get(self, db: AsyncSession) -> CatalogSnapshot:
+        """Return the current snapshot, loading it with *db* if missing or expired."""
+        snapshot = self._snapshot
+        if snapshot is not None and not self._expired():
+            return snapshot
+
+        async with self._lock:
+            if self._snapshot is None or self._expired():
+                await self.load(db)
+            return self._snapshot
+
+    async def load(self, db: AsyncSession) -> CatalogSnapshot:
+        """Read the weather_sources table into a new snapshot."""
+        result = await db.execute(
+            select(
+                WeatherSource.id,
+                WeatherSource.slug,
+                WeatherSource.display_name,
+                WeatherSource.priority,
+                WeatherSource.is_enabled,
+            )
+        )
+        self._snapshot = CatalogSnapshot([CatalogSource(*row) for row in result.all()])
+        self._loaded_at = time.monotonic()
+        logger.debug("Source catalog loaded: %d sources", len(self._snapshot))
+        return self._snapshot
+
+    def invalidate(self) -> None:
+        """Drop the snapshot; the next ``get`` reloads it."""
+        self._snapshot = None
+
+    def _expired(self) -> bool:
+        ttl = float(
+            settings.app_config.get(
+                "weather", "source_catalog", "ttl_seconds", default=DEFAULT_TTL_SECONDS
+            )
+        )
+        return time.monotonic() - self._loaded_at > ttl
+
+
+source_catalog = SourceCatalog()
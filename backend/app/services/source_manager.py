@@ -1,9 +1,13 @@
+import hashlib
 import logging
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
-from app.core.config import _load_yaml
+import yaml
+
+from app.core.config import substitute_env_vars
+from app.fetchers import AbstractWeatherFetcher, FetcherFactory
 
 logger = logging.getLogger(__name__)
 
@@ -73,42 +77,78 @@ def _parse_source(data: dict[str, Any]) -> SourceConfig:
     )
 
 
+@dataclass
+class _FileState:
+    """Fingerprint of a loaded source YAML file."""
+
+    mtime_ns: int
+    digest: str
+    source_name: str
+
+
+@dataclass
+class ReloadResult:
+    """Outcome of a registry reload."""
+
+    added: list[str] = field(default_factory=list)
+    updated: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    failed: list[str] = field(default_factory=list)
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.added or self.updated or self.removed)
+
+
 class SourceManager:
+    """Compiled registry of weather sources.
+
+    Each YAML file in ``config/sources`` is parsed once into a
+    :class:`SourceConfig` and a ready-to-use fetcher instance.  ``reload()``
+    re-parses only files whose mtime *and* content hash changed, so the fetch
+    hot path never touches YAML.
+    """
+
     def __init__(self, sources_dir: Path = _SOURCES_DIR) -> None:
         self._sources_dir = sources_dir
         self._sources: dict[str, SourceConfig] = {}
+        self._fetchers: dict[str, AbstractWeatherFetcher] = {}
+        self._files: dict[Path, _FileState] = {}
         self._loaded = False
 
     def load(self) -> None:
-        """Load all YAML source configs from the sources directory."""
-        if not self._sources_dir.exists():
-            logger.warning("Sources config directory not found: %s", self._sources_dir)
-            return
-
-        yaml_files = list(self._sources_dir.glob("*.yaml"))
-        if not yaml_files:
-            logger.warning("No source YAML files found in %s", self._sources_dir)
-
-        for yaml_path in sorted(yaml_files):
-            try:
-                data = _load_yaml(yaml_path)
-                config = _parse_source(data)
-                self._sources[config.name] = config
-                logger.info(
-                    "Loaded source config: %s (priority=%d, enabled=%s)",
-                    config.name,
-                    config.priority,
-                    config.enabled,
-                )
-            except ValueError as exc:
-                logger.error("Failed to load source config %s: %s", yaml_path.name, exc)
-                raise
-            except Exception as exc:
-                logger.error("Unexpected error loading %s: %s", yaml_path.name, exc)
-                raise
-
+        """Load all YAML source configs from the sources directory.
+
+        Raises on the first invalid file — used at startup, where a broken
+        config should stop the application.
+        """
+        self._sources.clear()
+        self._fetchers.clear()
+        self._files.clear()
+        self._scan(strict=True)
         self._loaded = True
 
+    def reload(self) -> ReloadResult:
+        """Pick up added, changed and removed YAML files.
+
+        Unchanged files are skipped after a ``stat()`` (and a hash check when
+        only the mtime moved).  A file that fails to parse keeps its previously
+        loaded version and is reported in ``failed``.
+        """
+        if not self._loaded:
+            self.load()
+            return ReloadResult(added=sorted(self._sources))
+
+        result = self._scan(strict=False)
+        if result.changed:
+            logger.info(
+                "Source registry reloaded: added=%s updated=%s removed=%s",
+                result.added,
+                result.updated,
+                result.removed,
+            )
+        return result
+
     def get_all(self) -> list[SourceConfig]:
         """Return all enabled source configs sorted by priority."""
         return sorted(
@@ -119,9 +159,91 @@ class SourceManager:
     def get(self, name: str) -> SourceConfig | None:
         return self._sources.get(name)
 
+    def get_fetchers(self) -> list[AbstractWeatherFetcher]:
+        """Return cached fetcher instances for all enabled sources."""
+        if not self._loaded:
+            self.load()
+        return [
+            self._fetchers[config.name]
+            for config in self.get_all()
+            if config.name in self._fetchers
+        ]
+
     @property
     def is_loaded(self) -> bool:
         return self._loaded
 
+    def _yaml_files(self) -> list[Path]:
+        if not self._sources_dir.exists():
+            logger.warning("Sources config directory not found: %s", self._sources_dir)
+            return []
+
+        yaml_files = sorted(
+            list(self._sources_dir.glob("*.yaml")) + list(self._sources_dir.glob("*.yml"))
+        )
+        if not yaml_files:
+            logger.warning("No source YAML files found in %s", self._sources_dir)
+        return yaml_files
+
+    def _scan(self, strict: bool) -> ReloadResult:
+        result = ReloadResult()
+        seen: set[Path] = set()
+
+        for yaml_path in self._yaml_files():
+            seen.add(yaml_path)
+            previous = self._files.get(yaml_path)
+            try:
+                mtime_ns = yaml_path.stat().st_mtime_ns
+                if previous and previous.mtime_ns == mtime_ns:
+                    continue
+
+                raw = yaml_path.read_bytes()
+                digest = hashlib.sha256(raw).hexdigest()
+                if previous and previous.digest == digest:
+                    previous.mtime_ns = mtime_ns
+                    continue
+
+                config, fetcher = self._compile(yaml_path, raw)
+            except Exception as exc:
+                logger.error("Failed to load source config %s: %s", yaml_path.name, exc)
+                if strict:
+                    raise
+                result.failed.append(yaml_path.name)
+                continue
+
+            if previous and previous.source_name != config.name:
+                self._forget(previous.source_name)
+
+            self._sources[config.name] = config
+            self._fetchers[config.name] = fetcher
+            self._files[yaml_path] = _FileState(mtime_ns, digest, config.name)
+            (result.updated if previous else result.added).append(config.name)
+            logger.info(
+                "Loaded source config: %s (priority=%d, enabled=%s)",
+                config.name,
+                config.priority,
+                config.enabled,
+            )
+
+        for yaml_path in set(self._files) - seen:
+            state = self._files.pop(yaml_path)
+            self._forget(state.source_name)
+            result.removed.append(state.source_name)
+
+        return result
+
+    def _compile(
+        self, yaml_path: Path, raw: bytes
+    ) -> tuple[SourceConfig, AbstractWeatherFetcher]:
+        data = substitute_env_vars(yaml.safe_load(raw) or {})
+        if not data:
+            raise ValueError(f"Empty or invalid YAML file: {yaml_path}")
+        data["_config_file"] = str(yaml_path)
+        return _parse_source(data), FetcherFactory.create_from_config(data)
+
+    def _forget(self, name: str) -> None:
+        self._sources.pop(name, None)
+        self._fetchers.pop(name, None)
+
 
 source_manager = SourceManager()
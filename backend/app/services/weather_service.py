@@ -8,24 +8,155 @@ Provides methods for:
 """
 
 import asyncio
+import hashlib
 import logging
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable, Sequence
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from typing import Any
 
-from sqlalchemy import select
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy import insert, select, text
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.aggregator.engine import aggregate
-from app.fetchers.factory import FetcherFactory, load_fetchers_from_config_dir
-from app.fetchers.registry import register_all_fetchers
+from app.aggregator.sql_engine import SqlAggregator
+from app.core.cache import shared_cache
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, engine, use_primary
+from app.core.singleflight import SingleFlight
+from app.fetchers.base import AbstractWeatherFetcher, Location
+from app.fetchers.circuit_breaker import get_circuit_breaker
+from app.fetchers.rate_limit import RateLimitExceeded
 from app.models import City, WeatherRecord, WeatherSource
-from app.schemas.weather import AggregatedWeather
+from app.schemas.weather import (
+    AggregatedWeather,
+    AggregatedWeatherResponse,
+    ChartPoint,
+    DailyChartPoint,
+    ForecastPoint,
+    ForecastResponse,
+)
+from app.services.aggregate_store import AggregateStore, aggregate_endpoint, sources_hash
+from app.services.record_reader import ForecastWindow, RecordReader
+from app.services.response_cache import ResponseKey, Version, response_cache
+from app.services.source_catalog import source_catalog
+from app.services.source_manager import source_manager
 
 logger = logging.getLogger(__name__)
 
 # Data is considered stale after 30 minutes
 STALE_DATA_THRESHOLD = timedelta(minutes=30)
 
+# Default cap on concurrent upstream calls during one city refresh
+DEFAULT_FETCH_CONCURRENCY = 6
+
+# Namespace (first key) for Postgres advisory locks guarding city refreshes
+_ADVISORY_LOCK_NAMESPACE = 0x5745  # "WE"
+
+# How long a refresh waits for another process's refresh of the same city
+DEFAULT_ADVISORY_LOCK_TIMEOUT = 30
+
+# Aggregated fields returned by the hourly chart
+_CHART_FIELDS = ("temperature", "feels_like", "precipitation_amount", "wind_speed", "humidity")
+
+# Records whose newest fetched_at validates each endpoint (default: forecast)
+_VALIDATED_RECORD_TYPES = {"current": ("current",), "overview": ("current", "forecast")}
+
+# Default stale-while-revalidate grace window (on top of STALE_DATA_THRESHOLD)
+DEFAULT_SWR_GRACE_MINUTES = 90
+
+# Values of the days parameter precomputed for /forecast and /chart/daily
+PRECOMPUTED_DAYS = range(3, 8)
+
+# Response fields that depend on the time of the read; appended to precomputed
+# current / forecast payloads when they are served
+_FRESHNESS_FIELDS = {"stale", "data_age_seconds"}
+
+_CHART_POINTS = TypeAdapter(list[ChartPoint])
+_DAILY_CHART_POINTS = TypeAdapter(list[DailyChartPoint])
+
+# Coalesces concurrent refreshes of the same city within this process
+_city_fetches = SingleFlight()
+
+# Strong references to fire-and-forget background refreshes
+_background_refreshes: set[asyncio.Task] = set()
+
+
+@dataclass(frozen=True)
+class DataFreshness:
+    """Describes how old the data behind an aggregated response is."""
+
+    fetched_at: datetime
+    stale: bool
+
+    @property
+    def age_seconds(self) -> int:
+        return max(int((datetime.now(timezone.utc) - self.fetched_at).total_seconds()), 0)
+
+
+class _ForecastPoint(BaseModel):
+    """One point of an aggregated forecast (``get_aggregated_forecast``)."""
+
+    forecast_dt: datetime
+    data: dict[str, Any]
+
+
+# Aggregated responses shared with other workers (keys start with "<city_id>:"),
+# stored as (value, freshness, data version)
+_shared_responses = shared_cache.namespace(
+    "weather", tuple[Any, DataFreshness | None, datetime | None]
+)
+
+# Types of the shared response values by endpoint, to rebuild them from JSON
+_SHARED_VALUES: dict[str, TypeAdapter[Any]] = {
+    "current": TypeAdapter(AggregatedWeather),
+    "forecast": TypeAdapter(list[_ForecastPoint]),
+    "chart_hourly": _CHART_POINTS,
+    "chart_daily": _DAILY_CHART_POINTS,
+}
+
+
+@dataclass(frozen=True)
+class ResponseValidator:
+    """HTTP cache validators of an aggregated response."""
+
+    etag: str
+    last_modified: datetime
+
+
+@dataclass(frozen=True)
+class PrecomputedResponse:
+    """A precomputed response body, ready to send, and its validators."""
+
+    body: bytes
+    validator: ResponseValidator
+
+
+@dataclass
+class WeatherOverview:
+    """Current weather, forecast and chart series of one city, built together."""
+
+    current: AggregatedWeather | None
+    current_freshness: DataFreshness | None
+    forecast: list[dict[str, Any]]
+    forecast_freshness: DataFreshness | None
+    chart_hourly: list[dict[str, Any]]
+    chart_daily: list[dict[str, Any]]
+
+
+def _swr_grace() -> timedelta:
+    """Return the stale-while-revalidate grace window (zero when disabled)."""
+    if not settings.app_config.get("weather", "stale_while_revalidate", "enabled", default=False):
+        return timedelta(0)
+    minutes = settings.app_config.get(
+        "weather", "stale_while_revalidate", "grace_minutes", default=DEFAULT_SWR_GRACE_MINUTES
+    )
+    return timedelta(minutes=float(minutes))
+
 
 class WeatherService:
     """Service for managing weather data operations."""
@@ -37,13 +168,22 @@ class WeatherService:
             db: SQLAlchemy async database session
         """
         self.db = db
+        # Freshness of the data used by the last aggregated read
+        self.freshness: DataFreshness | None = None
+        # Same, per city, for the last batch read
+        self.freshness_by_city: dict[int, DataFreshness] = {}
+        # Cache version taken after a foreground refresh, before the re-read
+        self._refreshed_version: Version | None = None
 
     async def get_aggregated_current(
         self, city_id: int, source_slugs: list[str] | None = None
     ) -> AggregatedWeather | None:
         """Get aggregated current weather data for a city.
 
-        If data is stale (>30 minutes old), triggers on-demand fetch.
+        If data is stale (>30 minutes old), it is either served as-is while a
+        background refresh runs (stale-while-revalidate) or refreshed in the
+        foreground; see ``_ensure_fresh``.  ``self.freshness`` describes the
+        data that was served.
 
         Args:
             city_id: ID of the city
@@ -52,21 +192,24 @@ class WeatherService:
         Returns:
             Aggregated weather data or None if no data available
         """
-        # Check if data is stale and fetch if needed
-        needs_fetch = await self._is_data_stale(city_id, "current")
-        if needs_fetch:
-            logger.info(f"Data for city {city_id} is stale, triggering on-demand fetch")
-            await self.fetch_and_save(city_id)
+        return await self._cached(
+            ResponseKey("current", city_id, _sources_key(source_slugs)),
+            lambda: self._aggregated_current(city_id, source_slugs),
+        )
 
-        # Get current weather records
-        records = await self._get_records(city_id, "current", source_slugs)
+    async def _aggregated_current(
+        self, city_id: int, source_slugs: list[str] | None = None
+    ) -> AggregatedWeather | None:
+        """Uncached body of ``get_aggregated_current``."""
+        records = await self._read_latest(city_id, "current", source_slugs)
 
         if not records:
             logger.warning(f"No current weather data found for city {city_id}")
             return None
 
         # Get priorities for aggregation
-        priorities = await self._get_source_priorities(source_slugs)
+        catalog = await source_catalog.get(self.db)
+        priorities = catalog.priorities(source_slugs)
 
         # Aggregate the records
         aggregated = aggregate(records, priorities)
@@ -88,41 +231,363 @@ class WeatherService:
         Returns:
             List of aggregated forecast data grouped by datetime
         """
-        # Check if data is stale and fetch if needed
-        needs_fetch = await self._is_data_stale(city_id, "forecast")
-        if needs_fetch:
-            logger.info(f"Forecast for city {city_id} is stale, triggering on-demand fetch")
-            await self.fetch_and_save(city_id)
+        return await self._cached(
+            ResponseKey("forecast", city_id, _sources_key(source_slugs), (days,)),
+            lambda: self._aggregated_forecast(city_id, days, source_slugs),
+        )
+
+    async def _aggregated_forecast(
+        self, city_id: int, days: int, source_slugs: list[str] | None = None
+    ) -> list[dict[str, Any]]:
+        """Uncached body of ``get_aggregated_forecast``."""
+        catalog = await source_catalog.get(self.db)
+        window = _forecast_window(days, len(catalog))
+        if _aggregation_backend("forecast") == "sql":
+            return await self._get_aggregated_forecast_sql(city_id, window, source_slugs)
 
-        # Get forecast records
-        records = await self._get_records(city_id, "forecast", source_slugs)
+        records = await self._read_latest(city_id, "forecast", source_slugs, window=window)
 
         if not records:
             logger.warning(f"No forecast data found for city {city_id}")
             return []
 
-        # Group records by forecast_dt and aggregate each group
-        forecast_groups: dict[datetime, list[WeatherRecord]] = {}
-        for record in records:
-            if record.forecast_dt:
-                forecast_groups.setdefault(record.forecast_dt, []).append(record)
+        return _aggregate_forecast(records, catalog.priorities(source_slugs))
 
-        # Get priorities for aggregation
-        priorities = await self._get_source_priorities(source_slugs)
-
-        # Aggregate each group
-        result = []
-        for forecast_dt, group_records in sorted(forecast_groups.items()):
-            if len(result) >= days * 8:  # Approximate: 3-hour intervals
-                break
-
-            aggregated = aggregate(group_records, priorities)
-            result.append({
-                "forecast_dt": forecast_dt,
-                "data": aggregated.model_dump(),
+    async def _get_aggregated_forecast_sql(
+        self,
+        city_id: int,
+        window: ForecastWindow,
+        source_slugs: list[str] | None = None,
+    ) -> list[dict[str, Any]]:
+        """``get_aggregated_forecast`` with numeric aggregation done in SQL.
+
+        Applies the same freshness policy and newest-snapshot window as
+        ``_read_latest``, based on the snapshot times alone.
+        """
+        catalog = await source_catalog.get(self.db)
+        source_ids = None
+        if source_slugs:
+            source_ids = catalog.ids(source_slugs)
+            if not source_ids:
+                return []
+
+        reader = RecordReader(self.db)
+        fetches = await reader.latest_fetches(city_id, "forecast", source_ids)
+        latest_fetch = _newest(fetches.values())
+        if not await self._ensure_fresh(city_id, "forecast", latest_fetch):
+            fetches = await reader.latest_fetches(city_id, "forecast", source_ids)
+            latest_fetch = _newest(fetches.values())
+            self.freshness = _refreshed_freshness(latest_fetch)
+
+        if latest_fetch is None:
+            logger.warning(f"No forecast data found for city {city_id}")
+            return []
+
+        records = reader.latest_query(
+            city_id,
+            "forecast",
+            source_ids,
+            since=latest_fetch - STALE_DATA_THRESHOLD,
+            window=window,
+        )
+        buckets = await SqlAggregator(self.db).aggregate(
+            records, catalog.priorities(source_slugs)
+        )
+        return [
+            {"forecast_dt": forecast_dt, "data": weather.model_dump()}
+            for forecast_dt, weather in buckets
+        ]
+
+    async def get_validator(
+        self,
+        endpoint: str,
+        city_id: int,
+        source_slugs: list[str] | None = None,
+        params: tuple = (),
+    ) -> ResponseValidator | None:
+        """Return the ETag / Last-Modified of a response without building it.
+
+        Derived from the newest ``fetched_at`` of the data the response would
+        use, taken from the response cache or from one index lookup per
+        source, so conditional requests can be answered before any
+        aggregation.  For "current" and "forecast" the freshness policy is
+        applied as in ``_ensure_fresh``: stale data inside the grace window
+        schedules a background refresh, and missing or expired data returns
+        None because it has to be refreshed by the full read first.
+
+        The overview depends on both the current and the forecast records:
+        its Last-Modified is the newer of the two and its ETag covers both.
+
+        Args:
+            endpoint: "current", "forecast", "chart_hourly", "chart_daily" or
+                "overview"
+            city_id: ID of the city
+            source_slugs: Optional list of source slugs to filter by
+            params: Endpoint parameters, as passed to the response cache
+
+        Returns:
+            Validators, or None when there is nothing to validate against
+        """
+        key = ResponseKey(endpoint, city_id, _sources_key(source_slugs), params)
+        catalog = await source_catalog.get(self.db)
+
+        entry = response_cache.peek(key) if response_cache.enabled else None
+        if entry is not None and entry.freshness is not None:
+            fetch_times = [entry.freshness.fetched_at]
+        else:
+            source_ids = None
+            if source_slugs:
+                source_ids = catalog.ids(source_slugs)
+                if not source_ids:
+                    return None
+            reader = RecordReader(self.db)
+            fetch_times = []
+            for record_type in _VALIDATED_RECORD_TYPES.get(endpoint, ("forecast",)):
+                fetches = await reader.latest_fetches(city_id, record_type, source_ids)
+                fetched_at = _newest(fetches.values())
+                if fetched_at is None:
+                    return None
+                fetch_times.append(fetched_at)
+
+        stale = False
+        if endpoint in ("current", "forecast", "overview"):
+            assessed = [_assess_freshness(fetched_at) for fetched_at in fetch_times]
+            if None in assessed:
+                return None
+            stale = any(freshness.stale for freshness in assessed)
+            if stale:
+                self._schedule_background_refresh(city_id)
+            # The overview reports the age of its current weather
+            self.freshness = assessed[0]
+
+        if len(fetch_times) > 1:
+            # Either record type can change on its own
+            key = key._replace(params=(*params, *(time.isoformat() for time in fetch_times)))
+        return _response_validator(key, max(fetch_times), stale, catalog.priorities())
+
+    async def get_precomputed(
+        self,
+        endpoint: str,
+        city_id: int,
+        source_slugs: list[str] | None = None,
+        params: tuple = (),
+    ) -> PrecomputedResponse | None:
+        """Return a response stored by ``precompute_aggregates``, ready to send.
+
+        One primary key lookup in weather_aggregates.  For "current" and
+        "forecast" the freshness policy is applied as in ``get_validator``
+        and the ``stale`` / ``data_age_seconds`` fields are appended to the
+        stored JSON.
+
+        Args:
+            endpoint: "current", "forecast", "chart_hourly" or "chart_daily"
+            city_id: ID of the city
+            source_slugs: Optional list of source slugs to filter by
+            params: Endpoint parameters, as passed to the response cache
+
+        Returns:
+            The response body and validators, or None when the regular read
+            has to be used: precomputation is disabled, sources are filtered,
+            nothing was stored, the stored window has passed or the data has
+            to be refreshed first
+        """
+        if source_slugs or not _precompute_enabled():
+            return None
+        catalog = await source_catalog.get(self.db)
+        priorities = catalog.priorities()
+        stored = await AggregateStore(self.db).get(
+            city_id, aggregate_endpoint(endpoint, params), sources_hash((), priorities)
+        )
+        if stored is None:
+            return None
+        if stored.valid_until is not None and _as_utc(stored.valid_until) <= datetime.now(
+            timezone.utc
+        ):
+            return None
+
+        fetched_at = _as_utc(stored.fetched_at)
+        body = stored.payload
+        stale = False
+        if endpoint in ("current", "forecast"):
+            freshness = _assess_freshness(fetched_at)
+            if freshness is None:
+                return None
+            if freshness.stale:
+                self._schedule_background_refresh(city_id)
+            self.freshness = freshness
+            stale = freshness.stale
+            body = body[:-1] + b',"stale":%s,"data_age_seconds":%d}' % (
+                b"true" if stale else b"false",
+                freshness.age_seconds,
+            )
+
+        key = ResponseKey(endpoint, city_id, (), params)
+        return PrecomputedResponse(body, _response_validator(key, fetched_at, stale, priorities))
+
+    async def precompute_aggregates(self, city_ids: Sequence[int]) -> None:
+        """Post-commit stage of a refresh: store the cities' responses for fast reads.
+
+        Builds the current weather, the forecasts and daily charts for every
+        supported ``days`` value and the hourly chart of the default source
+        set, serializes them as the endpoints would and upserts them into
+        weather_aggregates (see ``app/services/aggregate_store.py``).
+        Current weather and forecasts are only stored while their data is
+        servable; forecasts and charts start at the current hour, so they
+        are valid until the next one.  Failures are logged and never fail
+        the refresh; the cities' stored responses are then deleted, as they
+        predate the data just saved, and reads use the regular path.
+
+        Args:
+            city_ids: IDs of the refreshed cities
+        """
+        if not _precompute_enabled():
+            return
+        city_ids = list(dict.fromkeys(city_ids))
+        try:
+            rows = []
+            for city_id in city_ids:
+                rows.extend(await self._build_aggregates(city_id))
+            await AggregateStore(self.db).save(rows)
+            await self.db.commit()
+        except Exception as e:
+            logger.error(f"Failed to precompute aggregates for cities {city_ids}: {e}")
+            await self.db.rollback()
+            try:
+                await AggregateStore(self.db).delete_cities(city_ids)
+                await self.db.commit()
+            except Exception as e:
+                logger.error(f"Failed to drop stale aggregates for cities {city_ids}: {e}")
+                await self.db.rollback()
+
+    async def _build_aggregates(self, city_id: int) -> list[dict[str, Any]]:
+        """Serialize the precomputed responses of one city as weather_aggregates rows."""
+        catalog = await source_catalog.get(self.db)
+        priorities = catalog.priorities()
+        key_hash = sources_hash((), priorities)
+        reader = RecordReader(self.db)
+        computed_at = datetime.now(timezone.utc)
+        hour_end = computed_at.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+        rows: list[dict[str, Any]] = []
+
+        def add(
+            endpoint: str,
+            params: tuple,
+            payload: bytes,
+            fetched_at: datetime,
+            valid_until: datetime | None,
+        ) -> None:
+            rows.append({
+                "city_id": city_id,
+                "endpoint": aggregate_endpoint(endpoint, params),
+                "sources_hash": key_hash,
+                "payload": payload,
+                "fetched_at": fetched_at,
+                "valid_until": valid_until,
+                "computed_at": computed_at,
             })
 
-        return result
+        current_fetch = _newest((await reader.latest_fetches(city_id, "current")).values())
+        if _assess_freshness(current_fetch) is not None:
+            records = _newest_window(await reader.latest(city_id, "current"))
+            if records:
+                response = AggregatedWeatherResponse(
+                    city_id=city_id,
+                    fetched_at=current_fetch,
+                    weather=aggregate(records, priorities),
+                )
+                payload = response.model_dump_json(exclude=_FRESHNESS_FIELDS).encode()
+                add("current", (), payload, current_fetch, None)
+
+        forecast_fetch = _newest((await reader.latest_fetches(city_id, "forecast")).values())
+        if forecast_fetch is None:
+            return rows
+
+        if _assess_freshness(forecast_fetch) is not None:
+            for days in PRECOMPUTED_DAYS:
+                window = _forecast_window(days, len(catalog))
+                records = _newest_window(await reader.latest(city_id, "forecast", window=window))
+                forecasts = _aggregate_forecast(records, priorities)
+                if forecasts:
+                    response = ForecastResponse(
+                        city_id=city_id,
+                        days=days,
+                        forecasts=[
+                            ForecastPoint(
+                                forecast_dt=item["forecast_dt"],
+                                weather=AggregatedWeather(**item["data"]),
+                            )
+                            for item in forecasts
+                        ],
+                    )
+                    payload = response.model_dump_json(exclude=_FRESHNESS_FIELDS).encode()
+                    add("forecast", (days,), payload, forecast_fetch, window.start + timedelta(hours=1))
+
+        # Charts are served regardless of the data age, like their regular read
+        hourly = await self._chart_hourly(city_id)
+        if hourly:
+            payload = _CHART_POINTS.dump_json(_CHART_POINTS.validate_python(hourly))
+            add("chart_hourly", (), payload, forecast_fetch, hour_end)
+        for days in PRECOMPUTED_DAYS:
+            daily = await self._chart_daily(city_id, days)
+            if daily:
+                payload = _DAILY_CHART_POINTS.dump_json(_DAILY_CHART_POINTS.validate_python(daily))
+                add("chart_daily", (days,), payload, forecast_fetch, hour_end)
+        return rows
+
+    async def get_aggregated_current_many(
+        self, city_ids: Sequence[int], source_slugs: list[str] | None = None
+    ) -> dict[int, AggregatedWeather]:
+        """Get aggregated current weather for several cities at once.
+
+        Records of all cities are read with one query and stale cities are
+        refreshed with one combined ``refresh_cities`` call (see
+        ``_read_latest_many``).  ``self.freshness_by_city`` describes the data
+        served for each city.
+
+        Args:
+            city_ids: IDs of the cities
+            source_slugs: Optional list of source slugs to filter by
+
+        Returns:
+            Aggregated weather by city ID; cities without data are absent
+        """
+        by_city = await self._read_latest_many(city_ids, "current", source_slugs)
+        if not by_city:
+            return {}
+
+        catalog = await source_catalog.get(self.db)
+        priorities = catalog.priorities(source_slugs)
+        return {city_id: aggregate(records, priorities) for city_id, records in by_city.items()}
+
+    async def get_aggregated_forecast_many(
+        self,
+        city_ids: Sequence[int],
+        days: int = 5,
+        source_slugs: list[str] | None = None,
+    ) -> dict[int, list[dict[str, Any]]]:
+        """Get aggregated weather forecasts for several cities at once.
+
+        Args:
+            city_ids: IDs of the cities
+            days: Number of days to forecast
+            source_slugs: Optional list of source slugs to filter by
+
+        Returns:
+            Forecast data grouped by datetime, by city ID; cities without
+            data are absent
+        """
+        catalog = await source_catalog.get(self.db)
+        by_city = await self._read_latest_many(
+            city_ids, "forecast", source_slugs, window=_forecast_window(days, len(catalog))
+        )
+        if not by_city:
+            return {}
+
+        priorities = catalog.priorities(source_slugs)
+        return {
+            city_id: _aggregate_forecast(records, priorities)
+            for city_id, records in by_city.items()
+        }
 
     async def get_by_source(self, city_id: int) -> dict[str, dict[str, Any]]:
         """Get weather data grouped by source (non-aggregated).
@@ -133,19 +598,9 @@ class WeatherService:
         Returns:
             Dictionary mapping source name to weather data
         """
-        # Get all current weather records for the city
-        query = (
-            select(WeatherRecord, WeatherSource)
-            .join(WeatherSource, WeatherRecord.source_id == WeatherSource.id)
-            .where(WeatherRecord.city_id == city_id)
-            .where(WeatherRecord.record_type == "current")
-            .order_by(WeatherRecord.fetched_at.desc())
-        )
+        # Newest current record of every source
+        rows = await RecordReader(self.db).latest_with_sources(city_id, "current")
 
-        result = await self.db.execute(query)
-        rows = result.all()
-
-        # Group by source
         by_source: dict[str, dict[str, Any]] = {}
         for record, source in rows:
             if source.slug not in by_source:
@@ -179,51 +634,38 @@ class WeatherService:
         Returns:
             List of 24 hourly data points with aggregated values
         """
-        # Get forecast records for next 24 hours
-        now = datetime.now(timezone.utc)
-        end_time = now + timedelta(hours=24)
-
-        query = (
-            select(WeatherRecord)
-            .where(WeatherRecord.city_id == city_id)
-            .where(WeatherRecord.record_type == "forecast")
-            .where(WeatherRecord.forecast_dt.isnot(None))
-            .where(WeatherRecord.forecast_dt >= now)
-            .where(WeatherRecord.forecast_dt <= end_time)
-            .order_by(WeatherRecord.forecast_dt)
+        return await self._cached(
+            ResponseKey("chart_hourly", city_id, ()),
+            lambda: self._chart_hourly(city_id),
         )
 
-        result = await self.db.execute(query)
-        records = result.scalars().all()
-
-        if not records:
-            return []
-
-        # Group by hour and aggregate
-        hourly_groups: dict[datetime, list[WeatherRecord]] = {}
-        for record in records:
-            if record.forecast_dt:
-                # Round to nearest hour
-                hour_key = record.forecast_dt.replace(minute=0, second=0, microsecond=0)
-                hourly_groups.setdefault(hour_key, []).append(record)
+    async def _chart_hourly(self, city_id: int) -> list[dict[str, Any]]:
+        """Uncached body of ``get_chart_hourly``."""
+        # Newest snapshot of every source, forecast points of the next 24 hours
+        query = RecordReader(self.db).latest_query(
+            city_id, "forecast", window=_chart_window(timedelta(hours=24))
+        )
 
         # Get priorities
-        priorities = await self._get_source_priorities(None)
-
-        # Aggregate each hour
-        result_list = []
-        for hour, group_records in sorted(hourly_groups.items())[:24]:
-            aggregated = aggregate(group_records, priorities)
-            result_list.append({
-                "hour": hour,
-                "temperature": aggregated.temperature,
-                "feels_like": aggregated.feels_like,
-                "precipitation_amount": aggregated.precipitation_amount,
-                "wind_speed": aggregated.wind_speed,
-                "humidity": aggregated.humidity,
-            })
+        catalog = await source_catalog.get(self.db)
+        priorities = catalog.priorities()
+
+        if _aggregation_backend("chart_hourly") == "sql":
+            buckets = await SqlAggregator(self.db).aggregate(
+                query,
+                priorities,
+                bucket="hour",
+                fields=list(_CHART_FIELDS),
+                categorical=False,
+                limit=24,
+            )
+            return [
+                {"hour": hour, **weather.model_dump(include=set(_CHART_FIELDS))}
+                for hour, weather in buckets
+            ]
 
-        return result_list
+        result = await self.db.execute(query)
+        return _hourly_chart(result.scalars().all(), priorities)
 
     async def get_chart_daily(self, city_id: int, days: int = 7) -> list[dict[str, Any]]:
         """Get daily weather data for charts with min/max temperatures.
@@ -235,54 +677,118 @@ class WeatherService:
         Returns:
             List of daily data points with min/max temperatures
         """
-        # Get forecast records for next N days
-        now = datetime.now(timezone.utc)
-        end_time = now + timedelta(days=days)
-
-        query = (
-            select(WeatherRecord)
-            .where(WeatherRecord.city_id == city_id)
-            .where(WeatherRecord.record_type == "forecast")
-            .where(WeatherRecord.forecast_dt.isnot(None))
-            .where(WeatherRecord.forecast_dt >= now)
-            .where(WeatherRecord.forecast_dt <= end_time)
-            .order_by(WeatherRecord.forecast_dt)
+        return await self._cached(
+            ResponseKey("chart_daily", city_id, (), (days,)),
+            lambda: self._chart_daily(city_id, days),
+        )
+
+    async def _chart_daily(self, city_id: int, days: int) -> list[dict[str, Any]]:
+        """Uncached body of ``get_chart_daily``."""
+        # Newest snapshot of every source, forecast points of the next N days
+        query = RecordReader(self.db).latest_query(
+            city_id, "forecast", window=_chart_window(timedelta(days=days))
         )
 
+        if _aggregation_backend("chart_daily") == "sql":
+            return await SqlAggregator(self.db).daily_temperatures(query, days)
+
         result = await self.db.execute(query)
-        records = result.scalars().all()
+        return _daily_chart(result.scalars().all(), days)
 
-        if not records:
-            return []
+    async def get_overview(self, city_id: int, days: int = 7) -> WeatherOverview:
+        """Get everything the dashboard shows for a city in one pass.
 
-        # Group by day
-        daily_groups: dict[str, list[WeatherRecord]] = {}
-        for record in records:
-            if record.forecast_dt and record.temperature is not None:
-                day_key = record.forecast_dt.date().isoformat()
-                daily_groups.setdefault(day_key, []).append(record)
-
-        # Calculate min/max for each day
-        result_list = []
-        for day, group_records in sorted(daily_groups.items())[:days]:
-            temperatures = [
-                r.temperature for r in group_records if r.temperature is not None
-            ]
+        The current and forecast snapshots are read once, the freshness
+        policy is applied once for both (at most one foreground refresh), and
+        the hourly and daily charts are built from the same forecast records
+        by the same code as ``get_chart_hourly`` / ``get_chart_daily``.
 
-            if temperatures:
-                result_list.append({
-                    "date": day,
-                    "temp_min": min(temperatures),
-                    "temp_max": max(temperatures),
-                    "temp_avg": sum(temperatures) / len(temperatures),
-                })
+        Args:
+            city_id: ID of the city
+            days: Days of forecast and daily chart
+
+        Returns:
+            The overview; parts without data are None or empty
+        """
+        catalog = await source_catalog.get(self.db)
+        priorities = catalog.priorities()
+        window = _forecast_window(days, len(catalog))
+        reader = RecordReader(self.db)
+
+        current = await reader.latest(city_id, "current")
+        forecast = await reader.latest(city_id, "forecast", window=window)
+        current_freshness = _assess_freshness(_newest_fetch(current))
+        forecast_freshness = _assess_freshness(_newest_fetch(forecast))
+
+        if current_freshness is None or forecast_freshness is None:
+            logger.info(f"Weather data for city {city_id} is stale, triggering on-demand fetch")
+            await self.refresh_city(city_id)
+            use_primary(self.db)
+            current = await reader.latest(city_id, "current")
+            forecast = await reader.latest(city_id, "forecast", window=window)
+            current_freshness = _refreshed_freshness(_newest_fetch(current))
+            forecast_freshness = _refreshed_freshness(_newest_fetch(forecast))
+        elif current_freshness.stale or forecast_freshness.stale:
+            logger.info(f"Serving stale weather data for city {city_id}, refreshing in background")
+            self._schedule_background_refresh(city_id)
+
+        # The charts read the newest snapshot of every source, as /chart/* does
+        chart_hourly = _hourly_chart(
+            _in_window(forecast, _chart_window(timedelta(hours=24))), priorities
+        )
+        chart_daily = _daily_chart(_in_window(forecast, _chart_window(timedelta(days=days))), days)
+
+        current = _newest_window(current)
+        points = _aggregate_forecast(_newest_window(forecast), priorities)
+
+        return WeatherOverview(
+            current=aggregate(current, priorities) if current else None,
+            current_freshness=current_freshness if current else None,
+            forecast=points,
+            forecast_freshness=forecast_freshness if points else None,
+            chart_hourly=chart_hourly,
+            chart_daily=chart_daily,
+        )
+
+    @staticmethod
+    async def refresh_city(city_id: int) -> None:
+        """Refresh a city from upstream, coalescing with any refresh in flight.
+
+        The first caller starts ``fetch_and_save`` in a dedicated session and
+        every concurrent caller for the same city awaits that same call.  When
+        ``fetching.advisory_lock`` is enabled, a Postgres advisory lock also
+        keeps other processes from refreshing the city at the same time: the
+        refresh waits for theirs and skips the fetch if it saved new records.
+        Being session-independent, it can be called on the class as well.
 
-        return result_list
+        Args:
+            city_id: ID of the city to refresh
+        """
+        await _city_fetches.do(city_id, lambda: _refresh_city(city_id))
+
+    @staticmethod
+    async def refresh_cities(city_ids: Sequence[int]) -> None:
+        """Refresh a batch of cities with batched upstream calls.
+
+        Cities that are already being refreshed are joined like in
+        ``refresh_city``; the others are registered with the single-flight
+        and refreshed by one shared call (``fetch_and_save_many``, or
+        ``fetch_and_save`` for a single city) in its own session, under the
+        per-city advisory locks when those are enabled.
+
+        Args:
+            city_ids: IDs of the cities to refresh
+        """
+        await _city_fetches.do_many(city_ids, _refresh_cities)
 
     async def fetch_and_save(self, city_id: int) -> None:
         """Fetch weather data from all sources and save to database.
 
         This is the on-demand fetch function that gets triggered when data is stale.
+        All sources (and the current/forecast calls within each source) are
+        queried concurrently, bounded by ``fetching.max_concurrency`` from
+        settings.yaml, so a refresh takes as long as the slowest source rather
+        than the sum of all of them.
 
         Args:
             city_id: ID of the city to fetch data for
@@ -296,194 +802,878 @@ class WeatherService:
             logger.error(f"City with id {city_id} not found")
             return
 
-        # Get all weather sources
+        jobs = await self._get_fetch_jobs()
+        if not jobs:
+            return
+
+        max_concurrency = settings.app_config.get(
+            "fetching", "max_concurrency", default=DEFAULT_FETCH_CONCURRENCY
+        )
+        semaphore = asyncio.Semaphore(max(int(max_concurrency), 1))
+
+        # Fan out to all sources at once; results are written as they arrive so
+        # each source still commits (or rolls back) on its own.
+        tasks = [
+            asyncio.create_task(self._fetch_from_source(fetcher, source, city, semaphore))
+            for fetcher, source in jobs
+        ]
+
+        saved = False
+        for completed in asyncio.as_completed(tasks):
+            fetcher, source, current_data, forecast_data = await completed
+            try:
+                rows = self._build_rows(city.id, source.id, current_data, forecast_data)
+                await self._bulk_insert(rows)
+                await self.db.commit()
+                await _invalidate_responses(rows)
+                saved = saved or bool(rows)
+                logger.info(f"Successfully saved weather data for {city.name} from {fetcher.get_name()}")
+
+            except Exception as e:
+                logger.error(f"Failed to save data from {fetcher.get_name()}: {e}")
+                await self.db.rollback()
+                continue
+
+        if saved:
+            await self.precompute_aggregates([city.id])
+
+    async def fetch_and_save_many(self, city_ids: Sequence[int]) -> None:
+        """Fetch and save weather for a batch of cities with one call per source.
+
+        Each source's ``fetch_many`` receives all cities (by coordinates) at
+        once, so providers with multi-location endpoints answer the whole batch
+        in a few round trips and the rest run bounded concurrent calls.  All
+        sources run in parallel and every source's rows for the whole batch
+        are written with one bulk insert and commit.
+
+        Args:
+            city_ids: IDs of the cities to refresh
+        """
+        result = await self.db.execute(select(City).where(City.id.in_(list(city_ids))))
+        cities = result.scalars().all()
+        if not cities:
+            logger.error(f"None of the cities {list(city_ids)} were found")
+            return
+
+        jobs = await self._get_fetch_jobs()
+        if not jobs:
+            return
+
+        locations = [Location(c.name, lat=c.lat, lon=c.lon, key=c.id) for c in cities]
+        tasks = [
+            asyncio.create_task(self._fetch_batch_from_source(fetcher, source, locations))
+            for fetcher, source in jobs
+        ]
+
+        saved: set[int] = set()
+        for completed in asyncio.as_completed(tasks):
+            fetcher, source, results = await completed
+            try:
+                rows = []
+                for city_id, (current_data, forecast_data) in results.items():
+                    rows.extend(self._build_rows(city_id, source.id, current_data, forecast_data))
+                await self._bulk_insert(rows)
+                await self.db.commit()
+                await _invalidate_responses(rows)
+                saved.update(row["city_id"] for row in rows)
+                logger.info(
+                    f"Saved {len(rows)} rows for {len(results)} cities from {fetcher.get_name()}"
+                )
+            except Exception as e:
+                logger.error(f"Failed to save batch from {fetcher.get_name()}: {e}")
+                await self.db.rollback()
+
+        if saved:
+            await self.precompute_aggregates(sorted(saved))
+
+    async def _get_fetch_jobs(self) -> list[tuple[AbstractWeatherFetcher, WeatherSource]]:
+        """Pair every loaded fetcher with its enabled WeatherSource row.
+
+        Returns:
+            List of (fetcher, source) tuples; empty if nothing can be fetched
+        """
         sources_query = select(WeatherSource).where(WeatherSource.is_enabled == True)
         sources_result = await self.db.execute(sources_query)
         sources = sources_result.scalars().all()
 
         if not sources:
             logger.warning("No enabled weather sources found")
-            return
-
-        # Ensure fetchers are registered
-        register_all_fetchers()
+            return []
 
-        # Load fetchers
+        # Fetchers are compiled once by the source registry, not per fetch
         try:
-            fetchers = load_fetchers_from_config_dir()
+            fetchers = source_manager.get_fetchers()
         except Exception as e:
             logger.error(f"Failed to load fetchers: {e}")
-            return
+            return []
 
-        # Fetch data from each source
+        jobs: list[tuple[AbstractWeatherFetcher, WeatherSource]] = []
         for fetcher in fetchers:
-            try:
-                # Find corresponding source in database
-                source = next(
-                    (s for s in sources if s.display_name == fetcher.get_name()),
-                    None
-                )
+            source = next(
+                (s for s in sources if s.display_name == fetcher.get_name()),
+                None
+            )
+            if not source:
+                logger.warning(f"Source not found in database: {fetcher.get_name()}")
+                continue
+            jobs.append((fetcher, source))
+        return jobs
 
-                if not source:
-                    logger.warning(f"Source not found in database: {fetcher.get_name()}")
-                    continue
+    async def _fetch_batch_from_source(
+        self,
+        fetcher: AbstractWeatherFetcher,
+        source: WeatherSource,
+        locations: list[Location],
+    ) -> tuple[AbstractWeatherFetcher, WeatherSource, dict[Any, tuple[dict, list]]]:
+        """Run one source's ``fetch_many`` behind its circuit breaker.
 
-                # Fetch current weather
-                logger.info(f"Fetching current weather for {city.name} from {fetcher.get_name()}")
-                current_data = await fetcher.fetch_current(city.name)
-
-                if current_data:
-                    # Save current weather to database
-                    current_record = WeatherRecord(
-                        city_id=city.id,
-                        source_id=source.id,
-                        record_type="current",
-                        forecast_dt=None,
-                        temperature=current_data.get("temperature"),
-                        feels_like=current_data.get("feels_like"),
-                        wind_speed=current_data.get("wind_speed"),
-                        wind_direction=current_data.get("wind_direction"),
-                        humidity=current_data.get("humidity"),
-                        pressure=current_data.get("pressure"),
-                        precipitation_type=current_data.get("precipitation_type"),
-                        precipitation_amount=current_data.get("precipitation_amount"),
-                        cloudiness=current_data.get("cloudiness"),
-                        description=current_data.get("description"),
-                        icon_code=current_data.get("icon_code"),
-                    )
-                    self.db.add(current_record)
-
-                # Fetch forecast
-                logger.info(f"Fetching forecast for {city.name} from {fetcher.get_name()}")
-                forecast_data = await fetcher.fetch_forecast(city.name, days=5)
-
-                if forecast_data:
-                    for forecast_item in forecast_data:
-                        # Convert forecast_time (Unix timestamp) to datetime
-                        forecast_dt = None
-                        if "forecast_time" in forecast_item:
-                            forecast_dt = datetime.fromtimestamp(
-                                forecast_item["forecast_time"], tz=timezone.utc
-                            )
+        Args:
+            fetcher: Fetcher for the source
+            source: Matching WeatherSource row
+            locations: Cities of the batch, keyed by city id
 
-                        forecast_record = WeatherRecord(
-                            city_id=city.id,
-                            source_id=source.id,
-                            record_type="forecast",
-                            forecast_dt=forecast_dt,
-                            temperature=forecast_item.get("temperature"),
-                            feels_like=forecast_item.get("feels_like"),
-                            wind_speed=forecast_item.get("wind_speed"),
-                            wind_direction=forecast_item.get("wind_direction"),
-                            humidity=forecast_item.get("humidity"),
-                            pressure=forecast_item.get("pressure"),
-                            precipitation_type=forecast_item.get("precipitation_type"),
-                            precipitation_amount=forecast_item.get("precipitation_amount"),
-                            cloudiness=forecast_item.get("cloudiness"),
-                            description=forecast_item.get("description"),
-                            icon_code=forecast_item.get("icon_code"),
-                        )
-                        self.db.add(forecast_record)
+        Returns:
+            Tuple of (fetcher, source, {city_id: (current, forecast)})
+        """
+        name = fetcher.get_name()
+        breaker = get_circuit_breaker(name)
+        if not breaker.allow_request():
+            logger.info(f"Skipping {name} for batch: circuit is {breaker.state}")
+            return fetcher, source, {}
 
-                await self.db.commit()
-                logger.info(f"Successfully saved weather data for {city.name} from {fetcher.get_name()}")
+        started = time.monotonic()
+        try:
+            results = await fetcher.fetch_many(locations, days=5)
+        except RateLimitExceeded as e:
+            logger.warning(f"Skipping {name} for batch: {e}")
+            breaker.release()
+            return fetcher, source, {}
+        except Exception as e:
+            logger.error(f"Batch fetch from {name} failed: {e}")
+            breaker.record_failure(time.monotonic() - started, str(e))
+            return fetcher, source, {}
 
-            except Exception as e:
-                logger.error(f"Failed to fetch data from {fetcher.get_name()}: {e}")
-                await self.db.rollback()
-                continue
+        # An empty result means the source has no data for these cities;
+        # fetch_many raises when the source itself failed
+        breaker.record_success(time.monotonic() - started)
+        return fetcher, source, results
 
-    async def _is_data_stale(self, city_id: int, record_type: str) -> bool:
-        """Check if weather data for a city is stale.
+    async def _fetch_from_source(
+        self,
+        fetcher: AbstractWeatherFetcher,
+        source: WeatherSource,
+        city: City,
+        semaphore: asyncio.Semaphore,
+    ) -> tuple[AbstractWeatherFetcher, WeatherSource, dict[str, Any], list[dict[str, Any]]]:
+        """Fetch current weather and forecast from one source concurrently.
+
+        Each upstream call takes a slot from *semaphore*, so the total number of
+        in-flight requests for one refresh never exceeds the configured cap.
+        Errors are logged and turned into empty results so that one failing
+        source never cancels the others; a source whose ``rate_limit`` budget
+        is exhausted is skipped this time and retried on the next refresh.
+        A source whose circuit breaker is open is skipped without a network
+        call; every attempt's outcome and latency is fed to the breaker.
 
         Args:
-            city_id: ID of the city
-            record_type: Type of record ("current" or "forecast")
+            fetcher: Fetcher for the source
+            source: Matching WeatherSource row
+            city: City to fetch data for
+            semaphore: Shared concurrency limiter
 
         Returns:
-            True if data is stale or missing, False otherwise
+            Tuple of (fetcher, source, current data, forecast data)
         """
-        query = (
-            select(WeatherRecord.fetched_at)
-            .where(WeatherRecord.city_id == city_id)
-            .where(WeatherRecord.record_type == record_type)
-            .order_by(WeatherRecord.fetched_at.desc())
-            .limit(1)
+
+        async def _limited(coro_factory):
+            async with semaphore:
+                return await coro_factory()
+
+        name = fetcher.get_name()
+        breaker = get_circuit_breaker(name)
+        if not breaker.allow_request():
+            logger.info(f"Skipping {name} for {city.name}: circuit is {breaker.state}")
+            return fetcher, source, {}, []
+
+        logger.info(f"Fetching weather for {city.name} from {name}")
+        started = time.monotonic()
+        current_result, forecast_result = await asyncio.gather(
+            _limited(lambda: fetcher.fetch_current(city.name, lat=city.lat, lon=city.lon)),
+            _limited(
+                lambda: fetcher.fetch_forecast(city.name, days=5, lat=city.lat, lon=city.lon)
+            ),
+            return_exceptions=True,
         )
+        latency = time.monotonic() - started
+
+        errors = []
+        rate_limited = False
+        if isinstance(current_result, RateLimitExceeded):
+            logger.warning(f"Skipping current weather from {name}: {current_result}")
+            current_result = {}
+            rate_limited = True
+        elif isinstance(current_result, BaseException):
+            logger.error(f"Failed to fetch current weather from {name}: {current_result}")
+            errors.append(str(current_result))
+            current_result = {}
+        if isinstance(forecast_result, RateLimitExceeded):
+            logger.warning(f"Skipping forecast from {name}: {forecast_result}")
+            forecast_result = []
+            rate_limited = True
+        elif isinstance(forecast_result, BaseException):
+            logger.error(f"Failed to fetch forecast from {name}: {forecast_result}")
+            errors.append(str(forecast_result))
+            forecast_result = []
+
+        # Fetchers raise on upstream failures (connection, timeout, 5xx, and
+        # BadResponseError for blocked or unparseable responses) and return
+        # empty results when the source has no data for the city, which is a
+        # successful call for the breaker
+        if current_result or forecast_result:
+            breaker.record_success(latency)
+        elif errors:
+            breaker.record_failure(latency, "; ".join(errors))
+        elif rate_limited:
+            breaker.release()
+        else:
+            breaker.record_success(latency)
+
+        return fetcher, source, current_result or {}, forecast_result or []
+
+    @staticmethod
+    def _build_rows(
+        city_id: int,
+        source_id: int,
+        current_data: dict[str, Any],
+        forecast_data: list[dict[str, Any]],
+    ) -> list[dict[str, Any]]:
+        """Turn one source's fetch result into plain column dicts for insertion.
 
-        result = await self.db.execute(query)
-        latest_fetch = result.scalar_one_or_none()
+        All rows of the batch share a single ``fetched_at`` so that the batch
+        can later be identified as one snapshot.
+        """
+        fetched_at = datetime.now(timezone.utc)
+        rows: list[dict[str, Any]] = []
 
-        if not latest_fetch:
-            return True
+        if current_data:
+            rows.append(
+                _record_values(city_id, source_id, "current", current_data, None, fetched_at)
+            )
 
-        # Check if data is older than threshold
-        now = datetime.now(timezone.utc)
-        # Make latest_fetch timezone-aware if it's naive
-        if latest_fetch.tzinfo is None:
-            latest_fetch = latest_fetch.replace(tzinfo=timezone.utc)
+        for forecast_item in forecast_data:
+            # Convert forecast_time (Unix timestamp) to datetime
+            forecast_dt = None
+            if "forecast_time" in forecast_item:
+                forecast_dt = datetime.fromtimestamp(
+                    forecast_item["forecast_time"], tz=timezone.utc
+                )
+            rows.append(
+                _record_values(city_id, source_id, "forecast", forecast_item, forecast_dt, fetched_at)
+            )
 
-        return (now - latest_fetch) > STALE_DATA_THRESHOLD
+        return rows
 
-    async def _get_records(
+    async def _bulk_insert(self, rows: list[dict[str, Any]]) -> None:
+        """Insert weather rows with a single executemany Core INSERT.
+
+        Bypasses ORM object construction, the identity map and per-row unit of
+        work bookkeeping.  SQLAlchemy's "insertmanyvalues" mode renders the
+        batch as multi-row ``INSERT ... VALUES`` statements (split to respect
+        the driver's bind-parameter limit), so a 7-day hourly forecast is a
+        handful of round trips instead of ~170 single-row INSERTs.
+        See ``benchmarks/bench_bulk_insert.py``.
+        """
+        if rows:
+            await self.db.execute(insert(WeatherRecord.__table__), rows)
+
+    async def _read_latest(
         self,
         city_id: int,
         record_type: str,
         source_slugs: list[str] | None = None,
+        window: ForecastWindow | None = None,
     ) -> list[WeatherRecord]:
-        """Get weather records from database.
+        """Read the newest snapshot per source, applying the freshness policy.
+
+        With the source catalog cached this is a single query when the data
+        is fresh (or served stale); only a foreground refresh adds a re-read.
+        Snapshots more than ``STALE_DATA_THRESHOLD`` older than the newest
+        one are dropped, as they describe a different point in time.
 
         Args:
             city_id: ID of the city
             record_type: Type of record ("current" or "forecast")
             source_slugs: Optional list of source slugs to filter by
+            window: Forecast points to read (forecasts only)
 
         Returns:
-            List of weather records
+            Records to aggregate; ``self.freshness`` describes them
         """
-        query = (
-            select(WeatherRecord)
-            .where(WeatherRecord.city_id == city_id)
-            .where(WeatherRecord.record_type == record_type)
-        )
+        source_ids = None
+        if source_slugs:
+            catalog = await source_catalog.get(self.db)
+            source_ids = catalog.ids(source_slugs)
+            if not source_ids:
+                return []
+
+        reader = RecordReader(self.db)
+        records = await reader.latest(city_id, record_type, source_ids=source_ids, window=window)
+        if not await self._ensure_fresh(city_id, record_type, _newest_fetch(records)):
+            records = await reader.latest(city_id, record_type, source_ids=source_ids, window=window)
+            self.freshness = _refreshed_freshness(_newest_fetch(records))
+
+        return _newest_window(records)
 
-        # Filter by source slugs if provided
+    async def _read_latest_many(
+        self,
+        city_ids: Sequence[int],
+        record_type: str,
+        source_slugs: list[str] | None = None,
+        window: ForecastWindow | None = None,
+    ) -> dict[int, list[WeatherRecord]]:
+        """Batch version of ``_read_latest``.
+
+        All cities are read with one query.  Cities inside the
+        stale-while-revalidate grace window are served and refreshed together
+        in the background; missing or expired ones are refreshed together in
+        the foreground and read again with a second query.
+
+        Args:
+            city_ids: IDs of the cities
+            record_type: Type of record ("current" or "forecast")
+            source_slugs: Optional list of source slugs to filter by
+            window: Forecast points to read (forecasts only)
+
+        Returns:
+            Records to aggregate by city ID; ``self.freshness_by_city``
+            describes them
+        """
+        self.freshness_by_city = {}
+        city_ids = list(dict.fromkeys(city_ids))
+
+        source_ids = None
         if source_slugs:
-            source_ids_query = select(WeatherSource.id).where(
-                WeatherSource.slug.in_(source_slugs)
+            catalog = await source_catalog.get(self.db)
+            source_ids = catalog.ids(source_slugs)
+            if not source_ids:
+                return {}
+
+        reader = RecordReader(self.db)
+        by_city = await reader.latest_many(
+            city_ids, record_type, source_ids=source_ids, window=window
+        )
+
+        revalidate: list[int] = []
+        expired: list[int] = []
+        for city_id in city_ids:
+            freshness = _assess_freshness(_newest_fetch(by_city.get(city_id, [])))
+            if freshness is None:
+                expired.append(city_id)
+                continue
+            self.freshness_by_city[city_id] = freshness
+            if freshness.stale:
+                revalidate.append(city_id)
+
+        if revalidate:
+            logger.info(
+                f"Serving stale {record_type} data for {len(revalidate)} cities, "
+                f"refreshing in background"
             )
-            source_ids_result = await self.db.execute(source_ids_query)
-            source_ids = [row[0] for row in source_ids_result.all()]
+            self._schedule_background_refresh_many(revalidate)
 
-            if source_ids:
-                query = query.where(WeatherRecord.source_id.in_(source_ids))
-            else:
-                return []
+        if expired:
+            logger.info(
+                f"{record_type.capitalize()} data for {len(expired)} cities is stale, "
+                f"triggering on-demand fetch"
+            )
+            await self.refresh_cities(expired)
+            use_primary(self.db)
+            refreshed = await reader.latest_many(
+                expired, record_type, source_ids=source_ids, window=window
+            )
+            for city_id, records in refreshed.items():
+                freshness = _refreshed_freshness(_newest_fetch(records))
+                if freshness is not None:
+                    by_city[city_id] = records
+                    self.freshness_by_city[city_id] = freshness
+
+        return {
+            city_id: _newest_window(records)
+            for city_id, records in by_city.items()
+            if records and city_id in self.freshness_by_city
+        }
+
+    async def _cached(
+        self, key: ResponseKey, compute: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Serve *key* from the response cache, or compute and store it.
+
+        A cached response whose data has since become stale is still served
+        (with a background refresh) inside the stale-while-revalidate grace
+        window, exactly like ``_ensure_fresh`` does for data read from the
+        database; past that window it is recomputed.  Empty results are not
+        cached.
 
-        # Get most recent records (within stale threshold)
-        cutoff_time = datetime.now(timezone.utc) - STALE_DATA_THRESHOLD
-        query = query.where(WeatherRecord.fetched_at >= cutoff_time)
+        Args:
+            key: Cache key of the response
+            compute: Produces the response (and sets ``self.freshness``)
 
-        result = await self.db.execute(query)
-        return list(result.scalars().all())
+        Returns:
+            The cached or freshly computed response
+        """
+        if not response_cache.enabled:
+            return await compute()
+
+        entry = response_cache.get(key)
+        cached = (entry.value, entry.freshness) if entry is not None else None
+        if cached is None and shared_cache.distributed:
+            cached = await _load_shared_response(key)
+        if cached is not None:
+            value, freshness = cached
+            if freshness is None:
+                return value
+            freshness = _assess_freshness(freshness.fetched_at)
+            if freshness is not None:
+                if freshness.stale:
+                    self._schedule_background_refresh(key.city_id)
+                self.freshness = freshness
+                return value
+            response_cache.discard(key)
+
+        version = response_cache.version(key.city_id)
+        self.freshness = None
+        self._refreshed_version = None
+        value = await compute()
+        # A foreground refresh inside compute() moved the version on
+        version = self._refreshed_version or version
+        if value:
+            response_cache.set(key, value, version, freshness=self.freshness)
+            if shared_cache.distributed:
+                await _shared_responses.set(
+                    _shared_key(key),
+                    (value, self.freshness, version[1]),
+                    ttl=response_cache.ttl_seconds,
+                )
+        return value
+
+    async def _ensure_fresh(
+        self, city_id: int, record_type: str, latest_fetch: datetime | None
+    ) -> bool:
+        """Apply the freshness policy to data fetched at *latest_fetch*.
 
-    async def _get_source_priorities(
-        self, source_slugs: list[str] | None = None
-    ) -> dict[int, int]:
-        """Get source priorities for aggregation.
+        - Fresh data (younger than ``STALE_DATA_THRESHOLD``) is used as-is.
+        - With ``weather.stale_while_revalidate.enabled``, data that is stale
+          but still inside the grace window is served immediately while a
+          background refresh is scheduled.
+        - Missing data, or data past the grace window, is refreshed in the
+          foreground.
 
         Args:
-            source_slugs: Optional list of source slugs to filter by
+            city_id: ID of the city
+            record_type: Type of record ("current" or "forecast")
+            latest_fetch: ``fetched_at`` of the newest record, if any
 
         Returns:
-            Dictionary mapping source_id to priority value
+            True if the data can be served (``self.freshness`` is set), False
+            if it was refreshed in the foreground and must be read again.
         """
-        query = select(WeatherSource.id, WeatherSource.priority).where(
-            WeatherSource.is_enabled == True
+        freshness = _assess_freshness(latest_fetch)
+        if freshness is not None:
+            if freshness.stale:
+                logger.info(
+                    f"Serving stale {record_type} data for city {city_id} "
+                    f"({freshness.age_seconds}s old), refreshing in background"
+                )
+                self._schedule_background_refresh(city_id)
+            self.freshness = freshness
+            return True
+
+        logger.info(f"{record_type.capitalize()} data for city {city_id} is stale, triggering on-demand fetch")
+        await self.refresh_city(city_id)
+        # The refresh invalidated the city's responses; what is read next is
+        # the data of the new version
+        self._refreshed_version = response_cache.version(city_id)
+        # The refresh was committed on the primary; a replica may lag behind
+        use_primary(self.db)
+        return False
+
+    def _schedule_background_refresh(self, city_id: int) -> None:
+        """Start refresh_city without awaiting it (single-flight dedupes repeats)."""
+        task = asyncio.create_task(self.refresh_city(city_id))
+        _background_refreshes.add(task)
+        task.add_done_callback(_background_refreshes.discard)
+
+    def _schedule_background_refresh_many(self, city_ids: list[int]) -> None:
+        """Start one refresh_cities call for *city_ids* without awaiting it."""
+        task = asyncio.create_task(self.refresh_cities(city_ids))
+        _background_refreshes.add(task)
+        task.add_done_callback(_background_refreshes.discard)
+
+
+def _assess_freshness(latest_fetch: datetime | None) -> DataFreshness | None:
+    """Decide how data fetched at *latest_fetch* may be served.
+
+    Returns:
+        Fresh or stale (stale-while-revalidate) freshness, or None when the
+        data is missing or past the grace window and must be refreshed first.
+    """
+    if latest_fetch is None:
+        return None
+    age = datetime.now(timezone.utc) - latest_fetch
+    if age <= STALE_DATA_THRESHOLD:
+        return DataFreshness(latest_fetch, stale=False)
+    if age <= STALE_DATA_THRESHOLD + _swr_grace():
+        return DataFreshness(latest_fetch, stale=True)
+    return None
+
+
+def _refreshed_freshness(latest_fetch: datetime | None) -> DataFreshness | None:
+    """Freshness of data read again right after a foreground refresh.
+
+    The refresh may have failed or reached only some sources, so the data is
+    judged by its own ``fetched_at``: data still past the grace window is all
+    there is to serve, and is served marked stale rather than as fresh.
+    """
+    if latest_fetch is None:
+        return None
+    return _assess_freshness(latest_fetch) or DataFreshness(latest_fetch, stale=True)
+
+
+def _newest_window(records: list[WeatherRecord]) -> list[WeatherRecord]:
+    """Drop snapshots more than ``STALE_DATA_THRESHOLD`` older than the newest one."""
+    if not records:
+        return []
+    since = _newest_fetch(records) - STALE_DATA_THRESHOLD
+    return [record for record in records if _as_utc(record.fetched_at) >= since]
+
+
+def _sources_key(source_slugs: list[str] | None) -> tuple[str, ...]:
+    """Normalise a source filter for use in a response cache key."""
+    return tuple(sorted(set(source_slugs or ())))
+
+
+async def _invalidate_responses(rows: list[dict[str, Any]]) -> None:
+    """Drop cached responses of the cities whose *rows* were just committed.
+
+    With a distributed shared cache the cities' shared responses are deleted
+    as well and the other workers are told to drop their local copies.
+    """
+    newest: dict[int, datetime] = {}
+    for row in rows:
+        city_id = row["city_id"]
+        if city_id not in newest or row["fetched_at"] > newest[city_id]:
+            newest[city_id] = row["fetched_at"]
+    for city_id, fetched_at in newest.items():
+        response_cache.invalidate_city(city_id, fetched_at)
+
+    if not newest or not shared_cache.distributed:
+        return
+    for city_id in newest:
+        await _shared_responses.clear(f"{city_id}:")
+    await _shared_responses.publish(
+        *(f"{city_id}@{fetched_at.isoformat()}" for city_id, fetched_at in newest.items())
+    )
+
+
+def apply_remote_invalidation(items: list[str]) -> None:
+    """Handle a ``weather`` invalidation published by another worker.
+
+    Args:
+        items: ``"<city_id>@<newest fetched_at>"`` of every city that worker
+            saved new data for
+    """
+    for item in items:
+        city_id, _, fetched_at = item.partition("@")
+        response_cache.invalidate_city(int(city_id), datetime.fromisoformat(fetched_at))
+
+
+def _shared_key(key: ResponseKey) -> str:
+    """Shared-cache key of *key*; prefixed with the city so a city can be cleared."""
+    digest = hashlib.sha1(repr(tuple(key)).encode()).hexdigest()
+    return f"{key.city_id}:{key.endpoint}:{digest}"
+
+
+async def _load_shared_response(key: ResponseKey) -> tuple[Any, Any] | None:
+    """Return ``(value, freshness)`` stored by another worker, copying it locally.
+
+    Rejected if this worker has committed newer data for the city than the
+    worker that computed it had seen.
+    """
+    shared = await _shared_responses.get(_shared_key(key))
+    if shared is None:
+        return None
+    value, freshness, data_version = shared
+    version = response_cache.version(key.city_id)
+    if version[1] is not None and (data_version is None or data_version < version[1]):
+        return None
+    adapter = _SHARED_VALUES[key.endpoint]
+    try:
+        value = adapter.validate_python(value)
+    except ValueError as exc:
+        logger.warning(f"Ignoring malformed shared {key.endpoint} response: {exc}")
+        return None
+    if isinstance(value, list):
+        # Forecast and chart points are plain dicts, like freshly computed ones
+        value = adapter.dump_python(value)
+    response_cache.set(key, value, version, freshness=freshness)
+    return value, freshness
+
+
+def _response_validator(
+    key: ResponseKey, fetched_at: datetime, stale: bool, priorities: dict[int, int]
+) -> ResponseValidator:
+    """Build the validators of a response from the time and state of its data."""
+    # Priorities are part of the tag: changing them changes the aggregate
+    state = (tuple(key), fetched_at.isoformat(), stale, sorted(priorities.items()))
+    digest = hashlib.sha1(repr(state).encode()).hexdigest()[:20]
+    return ResponseValidator(etag=f'W/"{digest}"', last_modified=fetched_at)
+
+
+def _precompute_enabled() -> bool:
+    return bool(settings.app_config.get("weather", "precomputed", "enabled", default=True))
+
+
+def _aggregation_backend(endpoint: str) -> str:
+    """Return "python" or "sql" for *endpoint* (``weather.aggregation`` in settings.yaml)."""
+    backend = settings.app_config.get("weather", "aggregation", "endpoints", endpoint)
+    if backend is None:
+        backend = settings.app_config.get("weather", "aggregation", "backend", default="python")
+    return backend
+
+
+def _chart_window(ahead: timedelta) -> ForecastWindow:
+    """Forecast points from now up to *ahead* (the charts' horizon)."""
+    now = datetime.now(timezone.utc)
+    return ForecastWindow(start=now, end=now + ahead)
+
+
+def _in_window(records: Sequence[WeatherRecord], window: ForecastWindow) -> list[WeatherRecord]:
+    """Records whose ``forecast_dt`` is inside *window*, as ``latest_query`` filters them."""
+    return [
+        record
+        for record in records
+        if record.forecast_dt and window.start <= _as_utc(record.forecast_dt) < window.end
+    ]
+
+
+def _hourly_chart(
+    records: Sequence[WeatherRecord], priorities: dict[int, int]
+) -> list[dict[str, Any]]:
+    """Aggregate forecast records per hour: the first 24 hours of chart points."""
+    hourly_groups: dict[datetime, list[WeatherRecord]] = {}
+    for record in records:
+        if record.forecast_dt:
+            # Round to nearest hour
+            hour_key = _as_utc(record.forecast_dt).replace(minute=0, second=0, microsecond=0)
+            hourly_groups.setdefault(hour_key, []).append(record)
+
+    return [
+        {"hour": hour, **aggregate(group, priorities).model_dump(include=set(_CHART_FIELDS))}
+        for hour, group in sorted(hourly_groups.items())[:24]
+    ]
+
+
+def _daily_chart(records: Sequence[WeatherRecord], days: int) -> list[dict[str, Any]]:
+    """Min/max/avg temperature per UTC day of the forecast records, first *days* days."""
+    daily_groups: dict[str, list[float]] = {}
+    for record in records:
+        if record.forecast_dt and record.temperature is not None:
+            day_key = _as_utc(record.forecast_dt).date().isoformat()
+            daily_groups.setdefault(day_key, []).append(record.temperature)
+
+    return [
+        {
+            "date": day,
+            "temp_min": min(temperatures),
+            "temp_max": max(temperatures),
+            "temp_avg": sum(temperatures) / len(temperatures),
+        }
+        for day, temperatures in sorted(daily_groups.items())[:days]
+    ]
+
+
+def _newest(times) -> datetime | None:
+    """Return the newest of *times* (UTC-aware), or None if there are none."""
+    return max((_as_utc(value) for value in times), default=None)
+
+
+def _forecast_window(days: int, source_count: int) -> ForecastWindow:
+    """Forecast points from the start of the current hour up to *days* ahead.
+
+    Sources report at most hourly points, so the row limit is a safety cap
+    of one point per hour per source.
+    """
+    start = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+    return ForecastWindow(
+        start=start,
+        end=start + timedelta(days=days),
+        limit=days * 24 * max(source_count, 1),
+    )
+
+
+def _aggregate_forecast(
+    records: list[WeatherRecord], priorities: dict[int, int]
+) -> list[dict[str, Any]]:
+    """Group forecast records by forecast_dt and aggregate each group.
+
+    The records are already limited to the requested horizon and ordered by
+    forecast_dt (see ``_forecast_window``).
+    """
+    forecast_groups: dict[datetime, list[WeatherRecord]] = {}
+    for record in records:
+        if record.forecast_dt:
+            forecast_groups.setdefault(_as_utc(record.forecast_dt), []).append(record)
+
+    return [
+        {
+            "forecast_dt": forecast_dt,
+            "data": aggregate(group_records, priorities).model_dump(),
+        }
+        for forecast_dt, group_records in forecast_groups.items()
+    ]
+
+
+def _as_utc(value: datetime) -> datetime:
+    """Make a datetime read back from the database timezone-aware (SQLite drops tzinfo)."""
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+def _newest_fetch(records: list[WeatherRecord]) -> datetime | None:
+    """Return the newest ``fetched_at`` among *records* (UTC-aware)."""
+    return _newest(record.fetched_at for record in records)
+
+
+def _record_values(
+    city_id: int,
+    source_id: int,
+    record_type: str,
+    data: dict[str, Any],
+    forecast_dt: datetime | None,
+    fetched_at: datetime,
+) -> dict[str, Any]:
+    """Map a normalized fetcher payload to weather_records column values."""
+    return {
+        "city_id": city_id,
+        "source_id": source_id,
+        "record_type": record_type,
+        "forecast_dt": forecast_dt,
+        "temperature": data.get("temperature"),
+        "feels_like": data.get("feels_like"),
+        "wind_speed": data.get("wind_speed"),
+        "wind_direction": data.get("wind_direction"),
+        "humidity": data.get("humidity"),
+        "pressure": data.get("pressure"),
+        "precipitation_type": data.get("precipitation_type"),
+        "precipitation_amount": data.get("precipitation_amount"),
+        "cloudiness": data.get("cloudiness"),
+        "description": data.get("description"),
+        "icon_code": data.get("icon_code"),
+        "fetched_at": fetched_at,
+    }
+
+
+async def _refresh_city(city_id: int) -> None:
+    """Run fetch_and_save for one city in its own session (single-flight body)."""
+    await _refresh_cities([city_id])
+
+
+async def _refresh_cities(city_ids: list[int]) -> None:
+    """Refresh *city_ids* in one batch with its own session (single-flight body)."""
+    async with _city_locks(city_ids) as pending:
+        if not pending:
+            return
+        async with AsyncSessionLocal() as db:
+            service = WeatherService(db)
+            if len(pending) == 1:
+                await service.fetch_and_save(pending[0])
+            else:
+                await service.fetch_and_save_many(pending)
+
+
+@asynccontextmanager
+async def _city_locks(city_ids: list[int]) -> AsyncIterator[list[int]]:
+    """Hold the refresh advisory locks of *city_ids* (``fetching.advisory_lock``).
+
+    A city that another process is refreshing is waited for, up to
+    ``fetching.advisory_lock_timeout_seconds`` in total, and then left out
+    if that refresh saved new records in the meantime.  Without the setting
+    every city is yielded as is.
+
+    Yields:
+        The cities to refresh: those locked and not refreshed by another
+        process while waiting
+    """
+    if not settings.app_config.get("fetching", "advisory_lock", default=False):
+        yield city_ids
+        return
+
+    timeout = float(
+        settings.app_config.get(
+            "fetching", "advisory_lock_timeout_seconds", default=DEFAULT_ADVISORY_LOCK_TIMEOUT
         )
+    )
+    deadline = time.monotonic() + timeout
+    locked: list[int] = []
+    # When each contended city started waiting for its lock
+    waited: dict[int, datetime] = {}
+    # Session-level advisory locks belong to a connection, so hold a
+    # dedicated one for the duration (the fetch commits per source and
+    # would otherwise hand its connection back to the pool).
+    async with engine.connect() as lock_conn:
+        try:
+            # Sorted, so that batches locking overlapping cities cannot deadlock
+            for city_id in sorted(city_ids):
+                lock_args = {"ns": _ADVISORY_LOCK_NAMESPACE, "key": city_id}
+                acquired = (
+                    await lock_conn.execute(
+                        text("SELECT pg_try_advisory_lock(:ns, :key)"), lock_args
+                    )
+                ).scalar()
+                if acquired:
+                    locked.append(city_id)
+                    continue
 
-        if source_slugs:
-            query = query.where(WeatherSource.slug.in_(source_slugs))
+                waited[city_id] = datetime.now(timezone.utc)
+                # lock_timeout = 0 would mean "wait forever"
+                remaining_ms = max(int((deadline - time.monotonic()) * 1000), 1)
+                try:
+                    await lock_conn.execute(
+                        text("SELECT set_config('lock_timeout', :timeout, false)"),
+                        {"timeout": f"{remaining_ms}ms"},
+                    )
+                    await lock_conn.execute(text("SELECT pg_advisory_lock(:ns, :key)"), lock_args)
+                    locked.append(city_id)
+                except DBAPIError:
+                    # Session-level locks taken so far survive the rollback
+                    await lock_conn.rollback()
+                    logger.info(
+                        f"City {city_id} is still being refreshed by another process, skipping"
+                    )
 
-        result = await self.db.execute(query)
-        return {source_id: priority for source_id, priority in result.all()}
+            # A city whose lock was held by another refresh got new records
+            # while waiting; fetching it again would only repeat that work
+            refreshed: set[int] = set()
+            for city_id, since in waited.items():
+                if city_id not in locked:
+                    continue
+                result = await lock_conn.execute(
+                    select(WeatherRecord.id)
+                    .where(WeatherRecord.city_id == city_id)
+                    .where(WeatherRecord.fetched_at >= since)
+                    .limit(1)
+                )
+                if result.first() is not None:
+                    logger.info(f"City {city_id} was refreshed by another process meanwhile")
+                    refreshed.add(city_id)
+            await lock_conn.commit()
+
+            yield [city_id for city_id in city_ids if city_id in locked and city_id not in refreshed]
+        finally:
+            for city_id in locked:
+                await lock_conn.execute(
+                    text("SELECT pg_advisory_unlock(:ns, :key)"),
+                    {"ns": _ADVISORY_LOCK_NAMESPACE, "key": city_id},
+                )
+            if waited:
+                await lock_conn.execute(text("RESET lock_timeout"))
+            await lock_conn.commit()
@@ -0,0 +1,117 @@
+"""Benchmark: forecast response serialization before and after the orjson path.
+
+Serves the same aggregated forecast (one point per hour) through two
+in-process endpoints and reports the time per request:
+
+* before: the previous endpoint code, which rebuilt an ``AggregatedWeather``
+  per point, wrapped them in a ``ForecastResponse`` and let FastAPI validate
+  and serialize it again against ``response_model``;
+* after: the current endpoint code, which sends the service output as is
+  with ``ORJSONResponse``.
+
+No database is involved, so the difference is serialization alone (plus
+the same ASGI overhead on both sides).
+
+Usage (from backend/):
+    python -m benchmarks.bench_serialization
+    python -m benchmarks.bench_serialization --days 3 7 --requests 500
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+import httpx
+from fastapi import FastAPI
+
+from app.api.v1.weather import _forecast_content
+from app.core.responses import ORJSONResponse
+from app.schemas.weather import AggregatedWeather, ForecastPoint, ForecastResponse
+from app.services.weather_service import DataFreshness
+
+
+def _forecast(days: int) -> list[dict[str, Any]]:
+    """Aggregated forecast points as returned by ``get_aggregated_forecast``."""
+    start = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+    return [
+        {
+            "forecast_dt": start + timedelta(hours=i),
+            "data": AggregatedWeather(
+                temperature=10.0 + (i % 24) * 0.5,
+                feels_like=8.0,
+                wind_speed=3.5,
+                wind_direction=180,
+                humidity=70,
+                pressure=1012.0,
+                precipitation_type="none",
+                precipitation_amount=0.0,
+                cloudiness=40,
+                description="Partly cloudy",
+                icon_code="02d",
+            ).model_dump(),
+        }
+        for i in range(days * 24)
+    ]
+
+
+def _app(days: int, result: list[dict[str, Any]], freshness: DataFreshness) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/before", response_model=ForecastResponse)
+    async def before() -> ForecastResponse:
+        return ForecastResponse(
+            city_id=1,
+            days=days,
+            forecasts=[
+                ForecastPoint(
+                    forecast_dt=item["forecast_dt"],
+                    weather=AggregatedWeather(**item["data"]),
+                )
+                for item in result
+            ],
+            stale=freshness.stale,
+            data_age_seconds=freshness.age_seconds,
+        )
+
+    @app.get("/after", response_model=ForecastResponse)
+    async def after() -> ORJSONResponse:
+        return ORJSONResponse(_forecast_content(1, days, result, freshness))
+
+    return app
+
+
+async def _time(client: httpx.AsyncClient, path: str, requests: int) -> tuple[float, int]:
+    """Return the mean seconds per request and the body size."""
+    response = await client.get(path)  # warm up
+    started = time.perf_counter()
+    for _ in range(requests):
+        await client.get(path)
+    return (time.perf_counter() - started) / requests, len(response.content)
+
+
+async def _run(days_list: list[int], requests: int) -> None:
+    freshness = DataFreshness(datetime.now(timezone.utc), stale=False)
+    for days in days_list:
+        result = _forecast(days)
+        transport = httpx.ASGITransport(app=_app(days, result, freshness))
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            before, size = await _time(client, "/before", requests)
+            after, _ = await _time(client, "/after", requests)
+        print(f"{days} days ({len(result)} points, {size / 1024:.0f} KiB)")
+        print(f"  before (models + response_model)  {before * 1000:7.2f} ms/request")
+        print(f"  after  (ORJSONResponse)           {after * 1000:7.2f} ms/request")
+        print(f"  speedup                           {before / after:7.1f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=int, nargs="+", default=[3, 7])
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(_run(args.days, args.requests))
+
+
+if __name__ == "__main__":
+    main()
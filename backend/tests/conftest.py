@@ -0,0 +1,62 @@
+"""Shared pytest configuration.
+
+settings.yaml references environment variables (``${DB_USER}`` etc.) that are
+normally provided by docker-compose.  Provide harmless defaults so code paths
+that read ``settings.app_config`` can run under pytest.
+"""
+
+import os
+
+import pytest
+
+for _name, _value in {
+    "DB_USER": "weather",
+    "DB_PASSWORD": "weather_secret",
+    "DB_HOST": "localhost",
+    "DB_PORT": "5432",
+    "DB_NAME": "weather_db",
+    "ADMIN_API_KEY": "test-admin-key",
+}.items():
+    os.environ.setdefault(_name, _value)
+
+
+@pytest.fixture(autouse=True)
+def _reset_source_guards():
+    """Per-source rate limiters and circuit breakers are process-wide; isolate tests."""
+    from app.fetchers import circuit_breaker, rate_limit
+
+    circuit_breaker._breakers.clear()
+    rate_limit._limiters.clear()
+    yield
+    circuit_breaker._breakers.clear()
+    rate_limit._limiters.clear()
+
+
+@pytest.fixture(autouse=True)
+def _reset_source_catalog():
+    """The source catalog caches weather_sources per process; tests use fresh databases."""
+    from app.services.source_catalog import source_catalog
+
+    source_catalog.invalidate()
+    yield
+    source_catalog.invalidate()
+
+
+@pytest.fixture(autouse=True)
+def _reset_response_cache():
+    """Aggregated responses are cached per process; tests use fresh databases."""
+    from app.services.response_cache import response_cache
+
+    response_cache.reset()
+    yield
+    response_cache.reset()
+
+
+@pytest.fixture(autouse=True)
+def _reset_shared_cache():
+    """The shared cache falls back to a per-process memory backend; isolate tests."""
+    from app.core.cache import shared_cache
+
+    shared_cache.reset()
+    yield
+    shared_cache.reset()
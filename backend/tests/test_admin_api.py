@@ -1,14 +1,18 @@
 """Micro-tests for admin API endpoints."""
 
+import asyncio
 from datetime import date, datetime, timezone
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from fastapi.testclient import TestClient
 
+from app.api.v1 import admin
 from app.core.security import get_current_admin
 from app.dependencies import get_db
+from app.fetchers.circuit_breaker import get_circuit_breaker
 from app.main import app
+from app.services.export_service import ExportBusy
 
 VALID_KEY = "test-admin-key"
 HEADERS = {"X-Admin-API-Key": VALID_KEY}
@@ -173,6 +177,43 @@ class TestAdminSources:
         assert resp.status_code == 200
         assert resp.json()[0]["slug"] == "openweathermap"
 
+    def test_includes_rate_limit_usage(self):
+        session = _db_scalars([_make_source_orm()])
+
+        async def override():
+            yield session
+
+        usage = {
+            "per_minute": 60, "tokens_available": 58, "daily_quota": 1000,
+            "used_today": 2, "remaining_today": 998, "rejected_today": 0,
+            "on_exhausted": "wait",
+        }
+        app.dependency_overrides[get_db] = override
+        with patch("app.api.v1.admin.get_usage", return_value=usage) as mock_usage:
+            resp = client.get("/api/v1/admin/sources", headers=HEADERS)
+        app.dependency_overrides.pop(get_db, None)
+
+        mock_usage.assert_called_once_with("OWM")
+        assert resp.json()[0]["rate_limit"]["remaining_today"] == 998
+
+    def test_includes_circuit_breaker_health(self):
+        session = _db_scalars([_make_source_orm()])
+
+        async def override():
+            yield session
+
+        breaker = get_circuit_breaker("OWM", {"min_calls": 1})
+        breaker.record_failure(15.0, "timeout")
+
+        app.dependency_overrides[get_db] = override
+        resp = client.get("/api/v1/admin/sources", headers=HEADERS)
+        app.dependency_overrides.pop(get_db, None)
+
+        health = resp.json()[0]["health"]
+        assert health["state"] == "open"
+        assert health["last_error"] == "timeout"
+        assert health["avg_latency_ms"] == 15000.0
+
     def test_patch_source_updates_fields(self):
         source_orm = _make_source_orm()
         session = _db_scalar_one(source_orm)
@@ -190,6 +231,23 @@ class TestAdminSources:
 
         assert resp.status_code == 200
 
+    def test_patch_source_invalidates_source_catalog(self):
+        session = _db_scalar_one(_make_source_orm())
+
+        async def override():
+            yield session
+
+        app.dependency_overrides[get_db] = override
+        with patch("app.api.v1.admin.source_catalog.invalidate") as mock_invalidate:
+            client.patch(
+                "/api/v1/admin/sources/openweathermap",
+                json={"priority": 1},
+                headers=HEADERS,
+            )
+        app.dependency_overrides.pop(get_db, None)
+
+        mock_invalidate.assert_called_once()
+
     def test_patch_source_returns_404_for_unknown(self):
         session = _db_scalar_one(None)
 
@@ -214,7 +272,7 @@ class TestAdminSources:
 class TestAdminFetchNow:
     def test_triggers_fetch_for_specific_city(self):
         with patch(
-            "app.api.v1.admin.WeatherService.fetch_and_save",
+            "app.api.v1.admin.WeatherService.refresh_cities",
             new=AsyncMock(),
         ):
             resp = client.post(
@@ -235,10 +293,161 @@ class TestAdminFetchNow:
 
         app.dependency_overrides[get_db] = override
 
-        with patch("app.api.v1.admin.WeatherService.fetch_and_save", new=AsyncMock()):
+        with patch("app.api.v1.admin.WeatherService.refresh_cities", new=AsyncMock()):
             resp = client.post("/api/v1/admin/fetch-now", headers=HEADERS)
 
         app.dependency_overrides.pop(get_db, None)
 
         assert resp.status_code == 200
         assert resp.json()["cities_count"] == 2
+
+    @pytest.mark.asyncio
+    async def test_refreshes_in_bounded_batches(self):
+        running = 0
+        peak = 0
+        batches = []
+
+        async def refresh_cities(city_ids):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            batches.append(list(city_ids))
+            await asyncio.sleep(0.01)
+            running -= 1
+            if city_ids == [5]:
+                raise RuntimeError("upstream down")
+
+        config = {("scheduler", "batch_size"): 2, ("scheduler", "max_concurrency"): 2}
+        with (
+            patch(
+                "app.api.v1.admin.settings.app_config.get",
+                side_effect=lambda *keys, default=None: config.get(keys, default),
+            ),
+            patch(
+                "app.api.v1.admin.WeatherService.refresh_cities", side_effect=refresh_cities
+            ),
+        ):
+            await admin._refresh_in_batches([1, 2, 3, 4, 5])
+
+        assert batches == [[1, 2], [3, 4], [5]]
+        assert peak == 2
+
+
+# ---------------------------------------------------------------------------
+# POST /api/v1/admin/sources/reload
+# ---------------------------------------------------------------------------
+
+class TestAdminSourcesReload:
+    def test_returns_reload_summary(self):
+        from app.services.source_manager import ReloadResult
+
+        with patch(
+            "app.api.v1.admin.source_manager.reload",
+            return_value=ReloadResult(updated=["OpenWeatherMap"]),
+        ), patch("app.api.v1.admin.source_manager.get_all", return_value=[object()] * 3):
+            resp = client.post("/api/v1/admin/sources/reload", headers=HEADERS)
+
+        assert resp.status_code == 200
+        body = resp.json()
+        assert body["updated"] == ["OpenWeatherMap"]
+        assert body["added"] == []
+        assert body["total"] == 3
+
+
+# ---------------------------------------------------------------------------
+# GET /api/v1/admin/db/pool
+# ---------------------------------------------------------------------------
+
+class TestAdminDbPool:
+    def test_returns_primary_engine_stats(self):
+        resp = client.get("/api/v1/admin/db/pool", headers=HEADERS)
+
+        assert resp.status_code == 200
+        primary = resp.json()[0]
+        assert primary["name"] == "primary"
+        assert primary["checked_out"] == 0
+        assert "p95_wait_ms" in primary
+        assert "statement_cache_hits" in primary
+
+
+# ---------------------------------------------------------------------------
+# GET /api/v1/admin/cache
+# ---------------------------------------------------------------------------
+
+class TestAdminResponseCache:
+    def test_returns_counters(self):
+        resp = client.get("/api/v1/admin/cache", headers=HEADERS)
+
+        assert resp.status_code == 200
+        body = resp.json()
+        assert body["enabled"] is True
+        assert body["hits"] == 0
+        assert body["entries"] == 0
+        assert body["shared"]["backend"] == "MemoryBackend"
+
+
+# ---------------------------------------------------------------------------
+# GET /api/v1/admin/export/*
+# ---------------------------------------------------------------------------
+
+async def _chunks(*chunks):
+    for chunk in chunks:
+        yield chunk
+
+
+class TestAdminExport:
+    def test_streams_weather_records(self):
+        catalog = MagicMock()
+        catalog.ids.return_value = [3]
+        with (
+            patch("app.api.v1.admin.source_catalog.get", new=AsyncMock(return_value=catalog)),
+            patch(
+                "app.api.v1.admin.start_export",
+                return_value=_chunks(b'{"id":1}\n', b'{"id":2}\n'),
+            ) as start,
+        ):
+            resp = client.get(
+                "/api/v1/admin/export/weather-records?source=yandex&record_type=forecast"
+                "&since=2026-03-01T00:00:00Z",
+                headers=HEADERS,
+            )
+
+        assert resp.status_code == 200
+        assert resp.headers["content-type"] == "application/x-ndjson"
+        assert 'filename="weather_records.ndjson"' in resp.headers["content-disposition"]
+        assert resp.content == b'{"id":1}\n{"id":2}\n'
+        query, fmt = start.call_args.args
+        assert fmt == "ndjson"
+        assert query.compile().params["source_id_1"] == 3
+
+    def test_request_logs_as_csv(self):
+        with patch(
+            "app.api.v1.admin.start_export", return_value=_chunks(b"id,platform\r\n")
+        ) as start:
+            resp = client.get(
+                "/api/v1/admin/export/request-logs?format=csv&platform=web", headers=HEADERS
+            )
+
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("text/csv")
+        assert start.call_args.args[1] == "csv"
+
+    def test_returns_503_when_busy(self):
+        with patch(
+            "app.api.v1.admin.start_export", side_effect=ExportBusy("2 exports are already running")
+        ):
+            resp = client.get("/api/v1/admin/export/request-logs", headers=HEADERS)
+
+        assert resp.status_code == 503
+
+    def test_returns_404_for_unknown_source(self):
+        catalog = MagicMock()
+        catalog.ids.return_value = []
+        with patch("app.api.v1.admin.source_catalog.get", new=AsyncMock(return_value=catalog)):
+            resp = client.get("/api/v1/admin/export/weather-records?source=nope", headers=HEADERS)
+
+        assert resp.status_code == 404
+
+    def test_returns_422_for_unknown_format(self):
+        resp = client.get("/api/v1/admin/export/request-logs?format=xml", headers=HEADERS)
+        assert resp.status_code == 422
@@ -0,0 +1,80 @@
+"""Unit tests for the per-source circuit breaker."""
+
+from unittest.mock import patch
+
+from app.fetchers.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    get_circuit_breaker,
+    get_health,
+)
+
+CONFIG = {"window_size": 4, "min_calls": 4, "failure_rate_threshold": 0.5, "open_seconds": 30}
+
+
+class TestCircuitBreaker:
+    def test_opens_at_failure_rate_threshold(self):
+        breaker = CircuitBreaker("src", CONFIG)
+        breaker.record_success(0.1)
+        breaker.record_success(0.1)
+        breaker.record_failure(1.0)
+        assert breaker.state == CLOSED  # below min_calls
+
+        breaker.record_failure(1.0)
+
+        assert breaker.state == OPEN
+        assert breaker.allow_request() is False
+
+    def test_half_open_admits_single_probe(self):
+        breaker = CircuitBreaker("src", {**CONFIG, "min_calls": 1})
+        with patch("app.fetchers.circuit_breaker.time.monotonic", return_value=100.0):
+            breaker.record_failure(1.0)
+        assert breaker.state == OPEN
+
+        with patch("app.fetchers.circuit_breaker.time.monotonic", return_value=131.0):
+            assert breaker.allow_request() is True
+            assert breaker.state == HALF_OPEN
+            assert breaker.allow_request() is False
+
+    def test_successful_probe_closes(self):
+        breaker = CircuitBreaker("src", {**CONFIG, "min_calls": 1, "open_seconds": 0})
+        breaker.record_failure(1.0)
+        assert breaker.allow_request() is True
+
+        breaker.record_success(0.2)
+
+        assert breaker.state == CLOSED
+        assert breaker.snapshot()["failure_rate"] == 0.0
+
+    def test_failed_probe_reopens(self):
+        breaker = CircuitBreaker("src", {**CONFIG, "min_calls": 1, "open_seconds": 0})
+        breaker.record_failure(1.0)
+        assert breaker.allow_request() is True
+
+        breaker.record_failure(1.0, "parse error")
+
+        assert breaker.state == OPEN
+        assert breaker.times_opened == 2
+        assert breaker.snapshot()["last_error"] == "parse error"
+
+    def test_snapshot_statistics(self):
+        breaker = CircuitBreaker("src", CONFIG)
+        breaker.record_success(0.1)
+        breaker.record_success(0.3)
+
+        snapshot = breaker.snapshot()
+
+        assert snapshot["state"] == CLOSED
+        assert snapshot["recent_calls"] == 2
+        assert snapshot["avg_latency_ms"] == 200.0
+        assert snapshot["retry_in_seconds"] is None
+
+    def test_registry_keeps_config_when_looked_up_by_name(self):
+        breaker = get_circuit_breaker("src", {"open_seconds": 300})
+
+        assert get_circuit_breaker("src") is breaker
+        assert breaker.open_seconds == 300
+        assert get_health("src")["state"] == CLOSED
+        assert get_health("unknown") is None
@@ -1,12 +1,15 @@
 """Micro-tests for cities API endpoints."""
 
 from datetime import datetime, timezone
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
 
 from fastapi.testclient import TestClient
 
 from app.main import app
 from app.schemas.city import CitySearchResult
+from app.services.city_service import CityService
 
 client = TestClient(app)
 
@@ -117,3 +120,24 @@ class TestCreateCity:
             "lon": 37.61,
         })
         assert resp.status_code == 422
+
+
+class TestGeocodingCache:
+    @pytest.mark.asyncio
+    async def test_repeated_search_is_served_from_shared_cache(self):
+        resp = MagicMock(status=200)
+        resp.json = AsyncMock(
+            return_value=[{"name": "Moscow", "country": "RU", "lat": 55.75, "lon": 37.61}]
+        )
+        request = MagicMock()
+        request.__aenter__ = AsyncMock(return_value=resp)
+        request.__aexit__ = AsyncMock(return_value=False)
+        service = CityService(db=MagicMock(), owm_api_key="key")
+
+        with patch("app.services.city_service.http_client.get", return_value=request) as get:
+            first = await service.search("Moscow")
+            second = await service.search("  moscow ")
+
+        assert get.call_count == 1
+        assert second == first
+        assert first[0].name == "Moscow"
@@ -0,0 +1,152 @@
+"""Tests for connection pool and statement cache instrumentation."""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core import db_metrics
+from app.core.database import engine_options
+from app.core.db_metrics import InstrumentedQueuePool, get_pool_stats, instrument_engine
+
+
+@pytest.fixture(autouse=True)
+def _isolated_registry():
+    with patch.dict(db_metrics._engines, clear=True):
+        yield
+
+
+@pytest_asyncio.fixture
+async def make_engine(tmp_path):
+    engines = []
+
+    def make(**pool_options):
+        engine = create_async_engine(
+            f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+            poolclass=InstrumentedQueuePool,
+            **pool_options,
+        )
+        engines.append(engine)
+        return engine
+
+    yield make
+    for engine in engines:
+        await engine.dispose()
+
+
+class TestInstrumentedQueuePool:
+    @pytest.mark.asyncio
+    async def test_counts_checkouts_and_waits(self, make_engine):
+        engine = make_engine(pool_size=2)
+
+        for _ in range(3):
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+
+        stats = engine.pool.metrics.snapshot()
+        assert stats["checkouts"] == 3
+        assert stats["avg_wait_ms"] is not None
+        assert stats["overflow_opened"] == 0
+
+    @pytest.mark.asyncio
+    async def test_counts_overflow_connections(self, make_engine):
+        engine = make_engine(pool_size=1, max_overflow=2)
+
+        async with engine.connect() as first, engine.connect() as second:
+            await first.execute(text("SELECT 1"))
+            await second.execute(text("SELECT 1"))
+            assert engine.pool.checkedout() == 2
+
+        assert engine.pool.metrics.overflow_opened == 1
+
+    @pytest.mark.asyncio
+    async def test_counts_checkout_timeouts(self, make_engine):
+        engine = make_engine(pool_size=1, max_overflow=0, pool_timeout=0.05)
+
+        async with engine.connect() as held:
+            await held.execute(text("SELECT 1"))
+            with pytest.raises(exc.TimeoutError):
+                async with engine.connect():
+                    pass
+
+        metrics = engine.pool.metrics.snapshot()
+        assert metrics["timeouts"] == 1
+        assert metrics["max_wait_ms"] >= 50
+
+    @pytest.mark.asyncio
+    async def test_metrics_survive_dispose(self, make_engine):
+        engine = make_engine()
+        async with engine.connect():
+            pass
+
+        await engine.dispose()
+        async with engine.connect():
+            pass
+
+        assert engine.pool.metrics.checkouts == 2
+
+
+class TestPoolStats:
+    @pytest.mark.asyncio
+    async def test_reports_pool_and_statement_cache(self, make_engine):
+        engine = instrument_engine("primary", make_engine(pool_size=3))
+        query = text("SELECT :value")
+
+        async with engine.connect() as conn:
+            for value in range(3):
+                await conn.execute(query, {"value": value})
+            (stats,) = get_pool_stats()
+            assert stats["checked_out"] == 1
+
+        assert stats["name"] == "primary"
+        assert stats["pool_size"] == 3
+        assert stats["statement_cache_misses"] == 1
+        assert stats["statement_cache_hits"] == 2
+        assert stats["statement_cache_entries"] >= 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_checkouts_report_in_use(self, make_engine):
+        engine = instrument_engine("primary", make_engine(pool_size=2, max_overflow=0))
+        in_use = []
+
+        async def hold():
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+                await asyncio.sleep(0.05)
+                in_use.append(get_pool_stats()[0]["checked_out"])
+
+        await asyncio.gather(hold(), hold())
+
+        assert max(in_use) == 2
+
+
+class TestEngineOptions:
+    def test_reads_database_settings(self):
+        config = {
+            ("database", "pool", "size"): 20,
+            ("database", "pool", "max_overflow"): 5,
+            ("database", "pool", "timeout_seconds"): 3,
+            ("database", "pool", "recycle_seconds"): 600,
+            ("database", "pool", "pre_ping"): True,
+            ("database", "statement_cache_size"): 0,
+        }
+
+        with patch(
+            "app.core.database.settings.app_config.get",
+            side_effect=lambda *keys, default=None: config.get(keys, default),
+        ):
+            options = engine_options()
+
+        assert options["poolclass"] is InstrumentedQueuePool
+        assert options["pool_size"] == 20
+        assert options["max_overflow"] == 5
+        assert options["pool_timeout"] == 3.0
+        assert options["pool_recycle"] == 600
+        assert options["pool_pre_ping"] is True
+        assert options["connect_args"] == {
+            "prepared_statement_cache_size": 0,
+            "statement_cache_size": 0,
+        }
@@ -0,0 +1,126 @@
+"""Tests for the streaming weather_records / request_logs exports."""
+
+import csv
+import io
+import json
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core.database import Base
+from app.models import RequestLog, WeatherRecord
+from app.services import export_service
+from app.services.export_service import (
+    ExportBusy,
+    request_logs_query,
+    start_export,
+    weather_records_query,
+)
+
+START = datetime(2026, 3, 1, tzinfo=timezone.utc)
+
+
+def _config(chunk_size: int = 2, max_concurrent: int = 1):
+    def get(*keys, default=None):
+        return {
+            ("admin", "export", "chunk_size"): chunk_size,
+            ("admin", "export", "max_concurrent"): max_concurrent,
+        }.get(keys, default)
+
+    return get
+
+
+@pytest_asyncio.fixture
+async def sessions(tmp_path):
+    """Exports read through their own sessions; point them at a test database."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'export.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(
+            WeatherRecord.__table__.insert(),
+            [
+                {
+                    "city_id": 1 + i % 2,
+                    "source_id": 1,
+                    "record_type": "current",
+                    "temperature": float(i),
+                    "fetched_at": START + timedelta(hours=i),
+                }
+                for i in range(10)
+            ],
+        )
+        await conn.execute(
+            RequestLog.__table__.insert(),
+            [
+                {"platform": "web", "action": "weather_current", "request_meta": {"q": "a,b"},
+                 "created_at": START},
+                {"platform": "telegram", "action": "city_search", "request_meta": None,
+                 "created_at": START},
+            ],
+        )
+
+    with (
+        patch.object(export_service, "ReadSessionLocal", async_sessionmaker(engine)),
+        patch("app.services.export_service.settings.app_config.get", side_effect=_config()),
+    ):
+        yield
+    await engine.dispose()
+
+
+async def _collect(chunks) -> list[bytes]:
+    return [chunk async for chunk in chunks]
+
+
+class TestExport:
+    @pytest.mark.asyncio
+    async def test_ndjson_in_chunks(self, sessions):
+        query = weather_records_query(
+            city_id=1, since=START + timedelta(hours=2), until=START + timedelta(hours=8)
+        )
+        chunks = await _collect(start_export(query, "ndjson"))
+
+        rows = [json.loads(line) for chunk in chunks for line in chunk.splitlines()]
+        assert [row["temperature"] for row in rows] == [2.0, 4.0, 6.0]
+        assert rows[0]["city_id"] == 1 and rows[0]["record_type"] == "current"
+        # chunk_size=2: one chunk per cursor partition
+        assert len(chunks) == 2
+
+    @pytest.mark.asyncio
+    async def test_csv_has_header_and_json_cells(self, sessions):
+        chunks = await _collect(start_export(request_logs_query(), "csv"))
+
+        rows = list(csv.reader(io.StringIO(b"".join(chunks).decode())))
+        header = rows[0]
+        assert header[:3] == ["id", "user_id", "platform"]
+        first = dict(zip(header, rows[1]))
+        assert first["action"] == "weather_current"
+        assert json.loads(first["request_meta"]) == {"q": "a,b"}
+        assert dict(zip(header, rows[2]))["request_meta"] == ""
+
+    @pytest.mark.asyncio
+    async def test_concurrency_limit(self, sessions):
+        running = start_export(weather_records_query(), "ndjson")
+        await running.__anext__()
+
+        with pytest.raises(ExportBusy):
+            start_export(weather_records_query(), "ndjson")
+
+        await running.aclose()
+        assert await _collect(start_export(weather_records_query(record_type="forecast"), "csv"))
+
+    @pytest.mark.asyncio
+    async def test_slot_is_taken_before_streaming_starts(self, sessions):
+        pending = start_export(weather_records_query(), "ndjson")
+
+        # Not iterated yet, but the slot is already reserved
+        with pytest.raises(ExportBusy):
+            start_export(weather_records_query(), "ndjson")
+
+        # Closing a stream that never started gives the slot back
+        await pending.aclose()
+        assert export_service._running == 0
+        assert await _collect(start_export(weather_records_query(), "ndjson"))
+        assert export_service._running == 0
@@ -0,0 +1,80 @@
+"""Unit tests for the shared HTTP client pool."""
+
+import asyncio
+
+import pytest
+
+from app.core.http import HttpClient
+
+
+class TestHttpClient:
+    @pytest.mark.asyncio
+    async def test_session_is_reused(self):
+        client = HttpClient()
+        await client.start()
+        try:
+            assert client.session is client.session
+            assert not client.session.closed
+        finally:
+            await client.close()
+
+    @pytest.mark.asyncio
+    async def test_connector_uses_pool_limits(self):
+        client = HttpClient()
+        try:
+            connector = client.session.connector
+            assert connector.limit == 100
+            assert connector.limit_per_host == 10
+        finally:
+            await client.close()
+
+    @pytest.mark.asyncio
+    async def test_close_releases_session_and_recreates_lazily(self):
+        client = HttpClient()
+        first = client.session
+        await client.close()
+
+        assert first.closed
+        second = client.session
+        assert second is not first
+        assert not second.closed
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_close_without_start_is_noop(self):
+        client = HttpClient()
+        await client.close()
+
+    def test_session_of_a_previous_loop_is_closed(self):
+        client = HttpClient()
+
+        async def use_session():
+            session = client.session
+            await asyncio.sleep(0)
+            return session
+
+        first = asyncio.run(use_session())
+        second = asyncio.run(use_session())
+
+        assert second is not first
+        assert first.closed
+        asyncio.run(client.close())
+
+    def test_session_of_a_stopped_loop_is_closed_when_it_runs(self):
+        client = HttpClient()
+        loop = asyncio.new_event_loop()
+
+        async def use_session():
+            return client.session
+
+        try:
+            first = loop.run_until_complete(use_session())
+            asyncio.run(use_session())
+
+            assert len(client._closing) == 1
+            loop.run_until_complete(asyncio.sleep(0))
+            assert first.closed
+            assert not client._closing
+        finally:
+            loop.close()
+            asyncio.run(client.close())
@@ -1,10 +1,12 @@
 """Unit tests for OpenWeatherMap fetcher."""
 
 import asyncio
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, PropertyMock, patch
 
 import pytest
 
+from app.core.http import HttpClient
+from app.fetchers.base import Location, UpstreamError
 from app.fetchers.openweathermap import OpenWeatherMapFetcher
 
 
@@ -166,6 +168,36 @@ class TestOpenWeatherMapFetcher:
         assert result["appid"] == "test_api_key_12345"
         assert result["units"] == "metric"
 
+    def test_prepare_params_with_coordinates(self, fetcher):
+        """Coordinates replace the city name query."""
+        params_config = {"q": "{city}", "appid": "${OWM_API_KEY}", "units": "metric"}
+
+        result = fetcher._prepare_params(params_config, "Moscow", 55.75, 37.62)
+
+        assert "q" not in result
+        assert result["lat"] == "55.75"
+        assert result["lon"] == "37.62"
+        assert result["units"] == "metric"
+
+    @pytest.mark.asyncio
+    async def test_fetch_many_returns_results_by_key(
+        self, fetcher, mock_current_weather_response
+    ):
+        """Default fetch_many issues per-location calls and keys results."""
+        mock_session = _mock_http(200, mock_current_weather_response)
+        locations = [
+            Location("Moscow", lat=55.75, lon=37.62, key=1),
+            Location("London", lat=51.51, lon=-0.13, key=2),
+        ]
+        with patch.object(HttpClient, "session", new_callable=PropertyMock, return_value=mock_session):
+            result = await fetcher.fetch_many(locations)
+
+        assert set(result) == {1, 2}
+        assert result[1][0]["temperature"] == 15.5
+        # current + forecast per location
+        assert mock_session.get.call_count == 4
+        assert mock_session.get.call_args.kwargs["params"]["lat"] in ("55.75", "51.51")
+
     def test_map_fields(self, fetcher, mock_current_weather_response):
         """Test field mapping from API response to normalized format."""
         result = fetcher._map_fields(mock_current_weather_response)
@@ -188,7 +220,7 @@ class TestOpenWeatherMapFetcher:
     ):
         """Test successful current weather fetch."""
         mock_session = _mock_http(200, mock_current_weather_response)
-        with patch("aiohttp.ClientSession", return_value=mock_session):
+        with patch.object(HttpClient, "session", new_callable=PropertyMock, return_value=mock_session):
             result = await fetcher.fetch_current("Moscow")
 
         assert result["temperature"] == 15.5
@@ -197,16 +229,8 @@ class TestOpenWeatherMapFetcher:
     @pytest.mark.asyncio
     async def test_fetch_current_city_not_found(self, fetcher):
         """Test fetch_current with non-existent city (404)."""
-        mock_response = AsyncMock()
-        mock_response.status = 404
-
-        mock_session = AsyncMock()
-        mock_session.__aenter__.return_value = mock_session
-        mock_session.__aexit__.return_value = None
-        mock_session.get.return_value.__aenter__.return_value = mock_response
-        mock_session.get.return_value.__aexit__.return_value = None
-
-        with patch("aiohttp.ClientSession", return_value=mock_session):
+        mock_session = _mock_http(404, {})
+        with patch.object(HttpClient, "session", new_callable=PropertyMock, return_value=mock_session):
             result = await fetcher.fetch_current("NonExistentCity")
 
         assert result == {}
@@ -214,26 +238,16 @@ class TestOpenWeatherMapFetcher:
     @pytest.mark.asyncio
     async def test_fetch_current_api_error(self, fetcher):
         """Test fetch_current with API error (500)."""
-        mock_response = AsyncMock()
-        mock_response.status = 500
-        mock_response.text = AsyncMock(return_value="Internal Server Error")
-
-        mock_session = AsyncMock()
-        mock_session.__aenter__.return_value = mock_session
-        mock_session.__aexit__.return_value = None
-        mock_session.get.return_value.__aenter__.return_value = mock_response
-        mock_session.get.return_value.__aexit__.return_value = None
-
-        with patch("aiohttp.ClientSession", return_value=mock_session):
-            result = await fetcher.fetch_current("Moscow")
-
-        assert result == {}
+        mock_session = _mock_http(500, {})
+        with patch.object(HttpClient, "session", new_callable=PropertyMock, return_value=mock_session):
+            with pytest.raises(UpstreamError):
+                await fetcher.fetch_current("Moscow")
 
     @pytest.mark.asyncio
     async def test_fetch_forecast_success(self, fetcher, mock_forecast_response):
         """Test successful forecast fetch."""
         mock_session = _mock_http(200, mock_forecast_response)
-        with patch("aiohttp.ClientSession", return_value=mock_session):
+        with patch.object(HttpClient, "session", new_callable=PropertyMock, return_value=mock_session):
             result = await fetcher.fetch_forecast("London")
 
         assert len(result) == 2
@@ -245,18 +259,8 @@ class TestOpenWeatherMapFetcher:
     @pytest.mark.asyncio
     async def test_fetch_forecast_empty_list(self, fetcher):
         """Test forecast with empty list response."""
-        mock_response = AsyncMock()
-        mock_response.status = 200
-        mock_response.json = AsyncMock(return_value={"list": []})
-        mock_response.raise_for_status = MagicMock()
-
-        mock_session = AsyncMock()
-        mock_session.__aenter__.return_value = mock_session
-        mock_session.__aexit__.return_value = None
-        mock_session.get.return_value.__aenter__.return_value = mock_response
-        mock_session.get.return_value.__aexit__.return_value = None
-
-        with patch("aiohttp.ClientSession", return_value=mock_session):
+        mock_session = _mock_http(200, {"list": []})
+        with patch.object(HttpClient, "session", new_callable=PropertyMock, return_value=mock_session):
             result = await fetcher.fetch_forecast("Moscow")
 
         assert result == []
@@ -265,7 +269,7 @@ class TestOpenWeatherMapFetcher:
     async def test_test_connection_success(self, fetcher, mock_current_weather_response):
         """Test successful connection test."""
         mock_session = _mock_http(200, mock_current_weather_response)
-        with patch("aiohttp.ClientSession", return_value=mock_session):
+        with patch.object(HttpClient, "session", new_callable=PropertyMock, return_value=mock_session):
             result = await fetcher.test_connection()
 
         assert result is True
@@ -273,16 +277,8 @@ class TestOpenWeatherMapFetcher:
     @pytest.mark.asyncio
     async def test_test_connection_failure(self, fetcher):
         """Test connection test failure."""
-        mock_response = AsyncMock()
-        mock_response.status = 401  # Unauthorized
-
-        mock_session = AsyncMock()
-        mock_session.__aenter__.return_value = mock_session
-        mock_session.__aexit__.return_value = None
-        mock_session.get.return_value.__aenter__.return_value = mock_response
-        mock_session.get.return_value.__aexit__.return_value = None
-
-        with patch("aiohttp.ClientSession", return_value=mock_session):
+        mock_session = _mock_http(401, {})  # Unauthorized
+        with patch.object(HttpClient, "session", new_callable=PropertyMock, return_value=mock_session):
             result = await fetcher.test_connection()
 
         assert result is False
@@ -0,0 +1,154 @@
+"""Unit tests for per-source rate limiting."""
+
+import asyncio
+import time
+from datetime import timedelta
+from unittest.mock import AsyncMock, MagicMock, PropertyMock, patch
+
+import pytest
+
+from app.core.http import HttpClient
+from app.fetchers import rate_limit
+from app.fetchers.openweathermap import OpenWeatherMapFetcher
+from app.fetchers.rate_limit import RateLimiter, RateLimitExceeded, get_rate_limiter
+
+
+class TestRateLimiter:
+    @pytest.mark.asyncio
+    async def test_allows_burst_up_to_bucket_size(self):
+        limiter = RateLimiter("src", {"per_minute": 3, "on_exhausted": "skip"})
+        for _ in range(3):
+            await limiter.acquire()
+
+        with pytest.raises(RateLimitExceeded) as exc_info:
+            await limiter.acquire()
+
+        assert 0 < exc_info.value.retry_after <= 20
+        assert limiter.usage()["used_today"] == 3
+        assert limiter.usage()["rejected_today"] == 1
+
+    @pytest.mark.asyncio
+    async def test_wait_policy_waits_for_refill(self):
+        limiter = RateLimiter("src", {"per_minute": 600, "on_exhausted": "wait", "max_wait": 1})
+        limiter._tokens = 0.0
+
+        await limiter.acquire()
+
+        assert limiter.used_today == 1
+
+    @pytest.mark.asyncio
+    async def test_wait_policy_gives_up_after_max_wait(self):
+        limiter = RateLimiter("src", {"per_minute": 1, "on_exhausted": "wait", "max_wait": 0.1})
+        await limiter.acquire()
+
+        with pytest.raises(RateLimitExceeded):
+            await limiter.acquire()
+
+    @pytest.mark.asyncio
+    async def test_waiters_do_not_block_the_limiter(self):
+        limiter = RateLimiter("src", {"per_minute": 60, "on_exhausted": "wait", "max_wait": 1.5})
+        limiter._tokens = 0.0
+
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+
+        # The next token is reserved by the waiter: 2s away, past this call's
+        # max_wait, so it is rejected now instead of after the waiter's sleep
+        started = time.monotonic()
+        with pytest.raises(RateLimitExceeded) as exc_info:
+            await limiter.acquire()
+        assert time.monotonic() - started < 0.5
+        assert exc_info.value.retry_after > 1.5
+
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert limiter.used_today == 0
+        assert limiter._token_delay() <= 1
+
+    @pytest.mark.asyncio
+    async def test_cost_is_taken_all_or_none(self):
+        limiter = RateLimiter("src", {"per_minute": 5, "daily_quota": 10, "on_exhausted": "skip"})
+        await limiter.acquire(cost=3)
+
+        with pytest.raises(RateLimitExceeded):
+            await limiter.acquire(cost=3)
+
+        assert limiter.used_today == 3
+        assert limiter._tokens == pytest.approx(2, abs=0.1)
+
+        limiter._tokens = 5.0
+        await limiter.acquire(cost=5)
+        with pytest.raises(RateLimitExceeded) as exc_info:
+            await limiter.acquire(cost=3)
+        assert exc_info.value.reason == "daily quota"
+        assert limiter.used_today == 8
+
+    @pytest.mark.asyncio
+    async def test_cancelled_wait_after_midnight_keeps_new_day_count(self):
+        limiter = RateLimiter("src", {"per_minute": 60, "on_exhausted": "wait", "max_wait": 5})
+        limiter._tokens = 0.0
+
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        # Midnight passes while the call waits for its token
+        limiter._day += timedelta(days=1)
+        limiter.used_today = 0
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+        assert limiter.used_today == 0
+
+    @pytest.mark.asyncio
+    async def test_daily_quota(self):
+        limiter = RateLimiter("src", {"daily_quota": 2})
+        await limiter.acquire()
+        await limiter.acquire()
+
+        with pytest.raises(RateLimitExceeded) as exc_info:
+            await limiter.acquire()
+
+        assert exc_info.value.reason == "daily quota"
+        assert limiter.usage()["remaining_today"] == 0
+
+    @pytest.mark.asyncio
+    async def test_registry_keeps_counters_across_reconfigure(self):
+        limiter = get_rate_limiter("src", {"daily_quota": 10})
+        await limiter.acquire()
+
+        same = get_rate_limiter("src", {"daily_quota": 20})
+
+        assert same is limiter
+        assert same.daily_quota == 20
+        assert same.used_today == 1
+
+    def test_no_config_means_no_limiter(self):
+        assert get_rate_limiter("src", None) is None
+        assert rate_limit.get_usage("src") is None
+
+
+class TestFetcherRateLimit:
+    @pytest.mark.asyncio
+    async def test_fetcher_raises_when_budget_exhausted(self):
+        config = {
+            "name": "Limited",
+            "connection": {"base_url": "https://example.test", "timeout": 5},
+            "endpoints": {"current": {"path": "/weather", "params": {"q": "{city}"}}},
+            "rate_limit": {"per_minute": 60, "daily_quota": 1},
+        }
+        fetcher = OpenWeatherMapFetcher(config)
+
+        mock_response = MagicMock(status=404)
+        mock_session = MagicMock()
+        mock_session.get.return_value.__aenter__.return_value = mock_response
+
+        with patch.object(
+            HttpClient, "session", new_callable=PropertyMock, return_value=mock_session
+        ):
+            assert await fetcher.fetch_current("London") == {}
+            with pytest.raises(RateLimitExceeded):
+                await fetcher.fetch_current("London")
+
+        assert mock_session.get.call_count == 1
+
@@ -0,0 +1,140 @@
+"""Unit tests for the newest-snapshot-per-source read layer."""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.models import City, WeatherRecord, WeatherSource
+from app.services.record_reader import ForecastWindow, RecordReader
+
+NOW = datetime.now(timezone.utc).replace(microsecond=0)
+
+
+@pytest_asyncio.fixture
+async def db_session():
+    """In-memory SQLite database with one city and two sources."""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", echo=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with async_session() as session:
+        session.add(City(id=1, name="Moscow", country="RU", lat=55.75, lon=37.62))
+        for source_id in (1, 2):
+            session.add(
+                WeatherSource(
+                    id=source_id,
+                    slug=f"source{source_id}",
+                    display_name=f"Source {source_id}",
+                    source_type="rest",
+                    config_file=f"source{source_id}.yaml",
+                )
+            )
+        await session.commit()
+        yield session
+
+    await engine.dispose()
+
+
+def _snapshot(
+    record_type: str, fetched_at: datetime, source_id: int = 1, points: int = 1
+) -> list[WeatherRecord]:
+    return [
+        WeatherRecord(
+            city_id=1,
+            source_id=source_id,
+            record_type=record_type,
+            forecast_dt=fetched_at + timedelta(hours=3 * (i + 1))
+            if record_type == "forecast"
+            else None,
+            temperature=fetched_at.hour + i / 10,
+            fetched_at=fetched_at,
+        )
+        for i in range(points)
+    ]
+
+
+class TestRecordReader:
+    @pytest.mark.asyncio
+    async def test_returns_only_newest_current_per_source(self, db_session):
+        for minutes in (25, 10, 0):
+            db_session.add_all(_snapshot("current", NOW - timedelta(minutes=minutes)))
+        db_session.add_all(_snapshot("current", NOW - timedelta(minutes=40), source_id=2))
+        await db_session.commit()
+
+        records = await RecordReader(db_session).latest(1, "current")
+
+        by_source = {r.source_id: r.fetched_at.replace(tzinfo=timezone.utc) for r in records}
+        assert by_source == {1: NOW, 2: NOW - timedelta(minutes=40)}
+
+    @pytest.mark.asyncio
+    async def test_returns_whole_newest_forecast_snapshot(self, db_session):
+        db_session.add_all(_snapshot("forecast", NOW - timedelta(hours=3), points=4))
+        db_session.add_all(_snapshot("forecast", NOW, points=4))
+        await db_session.commit()
+
+        records = await RecordReader(db_session).latest(1, "forecast")
+
+        assert len(records) == 4
+        assert {r.fetched_at.replace(tzinfo=timezone.utc) for r in records} == {NOW}
+
+    @pytest.mark.asyncio
+    async def test_forecast_window_is_applied_in_sql(self, db_session):
+        db_session.add_all(_snapshot("forecast", NOW, points=8))
+        db_session.add_all(_snapshot("forecast", NOW, source_id=2, points=8))
+        await db_session.commit()
+
+        window = ForecastWindow(
+            start=NOW + timedelta(hours=6), end=NOW + timedelta(hours=18), limit=5
+        )
+        records = await RecordReader(db_session).latest(1, "forecast", window=window)
+
+        hours = [
+            (r.forecast_dt.replace(tzinfo=timezone.utc) - NOW) // timedelta(hours=1)
+            for r in records
+        ]
+        # Points at +6h, +9h, +12h, +15h for both sources, capped at five rows
+        assert hours == [6, 6, 9, 9, 12]
+
+    @pytest.mark.asyncio
+    async def test_filters_by_source_and_since(self, db_session):
+        db_session.add_all(_snapshot("current", NOW))
+        db_session.add_all(_snapshot("current", NOW - timedelta(hours=2), source_id=2))
+        await db_session.commit()
+
+        reader = RecordReader(db_session)
+        only_two = await reader.latest(1, "current", source_ids=[2])
+        recent = await reader.latest(1, "current", since=NOW - timedelta(minutes=30))
+
+        assert [r.source_id for r in only_two] == [2]
+        assert [r.source_id for r in recent] == [1]
+
+    @pytest.mark.asyncio
+    async def test_latest_with_sources(self, db_session):
+        db_session.add_all(_snapshot("current", NOW - timedelta(hours=1)))
+        db_session.add_all(_snapshot("current", NOW, source_id=2))
+        await db_session.commit()
+
+        rows = await RecordReader(db_session).latest_with_sources(1)
+
+        assert sorted(source.slug for _, source in rows) == ["source1", "source2"]
+        assert all(record.source_id == source.id for record, source in rows)
+
+    @pytest.mark.asyncio
+    async def test_no_records(self, db_session):
+        assert await RecordReader(db_session).latest_with_sources(1) == []
+
+    def test_postgres_uses_lateral_lookup(self):
+        db = MagicMock()
+        db.bind.dialect.name = "postgresql"
+
+        sql = str(RecordReader(db).latest_query(1, "current").compile(dialect=postgresql.dialect()))
+
+        assert "LATERAL" in sql
+        assert "AS MATERIALIZED" in sql
@@ -0,0 +1,176 @@
+"""Tests for read-replica routing and the replication-lag guard."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core.database import Base, RoutingSession, use_primary
+from app.core.replicas import ReplicaRouter
+from app.models import City
+from app.services.weather_service import WeatherService
+
+
+@pytest_asyncio.fixture
+async def engines(tmp_path):
+    """A primary and a replica database holding different copies of the city table."""
+    primary = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'primary.db'}")
+    replica = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'replica.db'}")
+    for target, name in ((primary, "Primary"), (replica, "Replica")):
+        async with target.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.execute(
+                City.__table__.insert(),
+                {"id": 1, "name": name, "country": "RU", "lat": 0.0, "lon": 0.0},
+            )
+
+    with patch("app.core.database.engine", primary):
+        yield primary, replica
+
+    await primary.dispose()
+    await replica.dispose()
+
+
+def _sessions(primary):
+    return async_sessionmaker(
+        primary, expire_on_commit=False, sync_session_class=RoutingSession
+    )
+
+
+async def _city_name(session) -> str:
+    return (await session.execute(select(City.name).where(City.id == 1))).scalar_one()
+
+
+class TestRoutingSession:
+    @pytest.mark.asyncio
+    async def test_reads_go_to_replica(self, engines):
+        primary, replica = engines
+        async with _sessions(primary)(info={"replica": replica}) as session:
+            assert await _city_name(session) == "Replica"
+
+    @pytest.mark.asyncio
+    async def test_without_replica_reads_go_to_primary(self, engines):
+        primary, _ = engines
+        async with _sessions(primary)(info={"replica": None}) as session:
+            assert await _city_name(session) == "Primary"
+
+    @pytest.mark.asyncio
+    async def test_use_primary_pins_session(self, engines):
+        primary, replica = engines
+        async with _sessions(primary)(info={"replica": replica}) as session:
+            use_primary(session)
+            assert await _city_name(session) == "Primary"
+
+    @pytest.mark.asyncio
+    async def test_writes_go_to_primary_and_pin_session(self, engines):
+        primary, replica = engines
+        async with _sessions(primary)(info={"replica": replica}) as session:
+            session.add(City(id=2, name="Kazan", country="RU", lat=55.8, lon=49.1))
+            await session.commit()
+
+            assert await _city_name(session) == "Primary"
+
+        async with replica.connect() as conn:
+            rows = (await conn.execute(select(City.id).where(City.id == 2))).all()
+        assert rows == []
+
+
+def _config(max_lag: float, interval: float = 5):
+    def get(*keys, default=None):
+        return {
+            ("database", "replicas", "max_lag_seconds"): max_lag,
+            ("database", "replicas", "lag_check_interval_seconds"): interval,
+        }.get(keys, default)
+
+    return get
+
+
+def _engine(lag=None, error: Exception | None = None):
+    """Mock AsyncEngine whose connection reports *lag* (or raises *error*)."""
+    conn = MagicMock()
+    conn.scalar = AsyncMock(return_value=lag, side_effect=error)
+    engine = MagicMock()
+    engine.connect.return_value.__aenter__ = AsyncMock(return_value=conn)
+    engine.connect.return_value.__aexit__ = AsyncMock(return_value=False)
+    engine.url.render_as_string.return_value = "replica"
+    return engine
+
+
+class TestReplicaRouter:
+    @pytest.mark.asyncio
+    async def test_no_replicas_uses_primary(self):
+        assert await ReplicaRouter([]).choose() is None
+
+    @pytest.mark.asyncio
+    async def test_round_robin_over_healthy_replicas(self):
+        first, second = _engine(lag=0), _engine(lag=2.5)
+        router = ReplicaRouter([first, second])
+
+        with patch("app.core.replicas.settings.app_config.get", side_effect=_config(10)):
+            chosen = [await router.choose() for _ in range(4)]
+
+        assert set(chosen) == {first, second}
+        assert chosen[0] is not chosen[1]
+
+    @pytest.mark.asyncio
+    async def test_lagging_replica_is_skipped(self):
+        lagging, healthy = _engine(lag=30), _engine(lag=1)
+        router = ReplicaRouter([lagging, healthy])
+
+        with patch("app.core.replicas.settings.app_config.get", side_effect=_config(10)):
+            chosen = {await router.choose() for _ in range(3)}
+
+        assert chosen == {healthy}
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_primary_when_all_lag(self):
+        router = ReplicaRouter([_engine(lag=30)])
+
+        with patch("app.core.replicas.settings.app_config.get", side_effect=_config(10)):
+            assert await router.choose() is None
+
+    @pytest.mark.asyncio
+    async def test_unreachable_replica_is_skipped(self):
+        router = ReplicaRouter([_engine(error=OSError("connection refused"))])
+
+        with patch("app.core.replicas.settings.app_config.get", side_effect=_config(10)):
+            assert await router.choose() is None
+        assert router.replicas[0].lag_seconds is None
+
+    @pytest.mark.asyncio
+    async def test_replica_not_streaming_is_skipped(self):
+        """The lag query returns NULL when the WAL receiver is disconnected."""
+        disconnected, healthy = _engine(lag=None), _engine(lag=0)
+        router = ReplicaRouter([disconnected, healthy])
+
+        with patch("app.core.replicas.settings.app_config.get", side_effect=_config(10)):
+            chosen = {await router.choose() for _ in range(3)}
+
+        assert chosen == {healthy}
+        assert router.replicas[0].lag_seconds is None
+
+    @pytest.mark.asyncio
+    async def test_lag_is_measured_once_per_interval(self):
+        replica = _engine(lag=0)
+        router = ReplicaRouter([replica])
+
+        with patch("app.core.replicas.settings.app_config.get", side_effect=_config(10, 60)):
+            for _ in range(5):
+                await router.choose()
+
+        assert replica.connect.call_count == 1
+
+
+class TestReadYourWrites:
+    @pytest.mark.asyncio
+    async def test_foreground_refresh_switches_to_primary(self):
+        db = MagicMock()
+        db.info = {"replica": object()}
+        service = WeatherService(db)
+
+        with patch.object(WeatherService, "refresh_city", new=AsyncMock()):
+            assert await service._ensure_fresh(1, "current", None) is False
+
+        assert "replica" not in db.info
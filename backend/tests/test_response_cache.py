@@ -0,0 +1,140 @@
+"""Unit tests for the aggregated response cache."""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+
+from app.services.response_cache import ResponseCache, ResponseKey
+
+NOW = datetime.now(timezone.utc)
+
+
+def _config(ttl: float = 60, max_entries: int = 100, max_megabytes: float = 1):
+    def get(*keys, default=None):
+        return {
+            ("weather", "response_cache", "ttl_seconds"): ttl,
+            ("weather", "response_cache", "max_entries"): max_entries,
+            ("weather", "response_cache", "max_megabytes"): max_megabytes,
+        }.get(keys, default)
+
+    return get
+
+
+@pytest.fixture
+def cache():
+    with patch("app.services.response_cache.settings.app_config.get", side_effect=_config()):
+        yield ResponseCache()
+
+
+def _key(city_id: int = 1, endpoint: str = "current") -> ResponseKey:
+    return ResponseKey(endpoint, city_id, ())
+
+
+def _store(cache: ResponseCache, key: ResponseKey, value) -> None:
+    cache.set(key, value, cache.version(key.city_id))
+
+
+class TestResponseCache:
+    def test_hit_and_miss_counters(self, cache):
+        assert cache.get(_key()) is None
+        _store(cache, _key(), {"temperature": 20.0})
+
+        assert cache.get(_key()).value == {"temperature": 20.0}
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+        assert cache.stats()["hit_rate"] == 0.5
+
+    def test_entries_expire_after_ttl(self, cache):
+        _store(cache, _key(), "value")
+
+        with patch("app.services.response_cache.time.monotonic", return_value=1e12):
+            assert cache.get(_key()) is None
+        assert cache.stats()["entries"] == 0
+
+    def test_evicts_least_recently_used_beyond_max_entries(self):
+        with patch(
+            "app.services.response_cache.settings.app_config.get",
+            side_effect=_config(max_entries=2),
+        ):
+            cache = ResponseCache()
+            _store(cache, _key(1), "one")
+            _store(cache, _key(2), "two")
+            cache.get(_key(1))
+            _store(cache, _key(3), "three")
+
+            assert cache.get(_key(2)) is None
+            assert cache.get(_key(1)).value == "one"
+            assert cache.stats()["evictions"] == 1
+
+    def test_evicts_beyond_memory_bound(self):
+        with patch(
+            "app.services.response_cache.settings.app_config.get",
+            side_effect=_config(max_megabytes=0.01),
+        ):
+            cache = ResponseCache()
+            for city_id in range(1, 6):
+                _store(cache, _key(city_id), "x" * 4000)
+
+            stats = cache.stats()
+            assert stats["bytes"] <= 0.01 * 1024 * 1024
+            assert stats["entries"] == 2
+            assert cache.get(_key(5)) is not None
+
+    def test_invalidate_city_drops_only_that_city(self, cache):
+        _store(cache, _key(1), "moscow")
+        _store(cache, _key(1, "forecast"), "moscow forecast")
+        _store(cache, _key(2), "kazan")
+
+        cache.invalidate_city(1, NOW)
+
+        assert cache.get(_key(1)) is None
+        assert cache.get(_key(1, "forecast")) is None
+        assert cache.get(_key(2)).value == "kazan"
+        assert cache.stats()["invalidations"] == 2
+
+    def test_result_computed_before_new_data_is_not_stored(self, cache):
+        version = cache.version(1)
+        cache.invalidate_city(1, NOW)
+
+        cache.set(_key(1), "computed from old data", version)
+
+        assert cache.get(_key(1)) is None
+
+    def test_older_fetch_does_not_roll_version_back(self, cache):
+        cache.invalidate_city(1, NOW)
+        cache.invalidate_city(1, NOW - timedelta(minutes=5))
+
+        assert cache.version(1)[1] == NOW
+
+    def test_clear_drops_entries_and_in_flight_results(self, cache):
+        _store(cache, _key(1), "one")
+        version = cache.version(2)
+
+        cache.clear()
+        cache.set(_key(2), "two", version)
+
+        assert cache.stats()["entries"] == 0
+
+    def test_versions_are_bounded_by_max_entries(self):
+        with patch(
+            "app.services.response_cache.settings.app_config.get",
+            side_effect=_config(max_entries=2),
+        ):
+            cache = ResponseCache()
+            _store(cache, _key(1), "one")
+            stale = cache.version(2)
+            for city_id in range(2, 6):
+                cache.invalidate_city(city_id, NOW)
+
+            assert len(cache._versions) <= 2
+            assert cache.get(_key(1)).value == "one"
+            cache.set(_key(2), "computed before the forgotten commit", stale)
+            assert cache.get(_key(2)) is None
+
+    def test_clear_forgets_versions(self, cache):
+        cache.invalidate_city(1, NOW)
+
+        cache.clear()
+
+        assert cache.version(1)[1] is None
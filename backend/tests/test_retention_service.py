@@ -0,0 +1,244 @@
+"""Unit tests for weather_records retention and compaction."""
+
+from datetime import date, datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.models import City, WeatherRecord, WeatherSource
+from app.services.retention_service import RetentionService, partition_day, partition_name
+
+NOW = datetime.now(timezone.utc).replace(microsecond=0)
+
+
+@pytest_asyncio.fixture
+async def db_session():
+    """In-memory SQLite database with one city and two sources."""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", echo=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with async_session() as session:
+        session.add(City(id=1, name="Moscow", country="RU", lat=55.75, lon=37.62))
+        for source_id in (1, 2):
+            session.add(
+                WeatherSource(
+                    id=source_id,
+                    slug=f"source{source_id}",
+                    display_name=f"Source {source_id}",
+                    source_type="rest",
+                    config_file=f"source{source_id}.yaml",
+                )
+            )
+        await session.commit()
+        yield session
+
+    await engine.dispose()
+
+
+def _record(record_type: str, fetched_at: datetime, source_id: int = 1) -> WeatherRecord:
+    return WeatherRecord(
+        city_id=1,
+        source_id=source_id,
+        record_type=record_type,
+        forecast_dt=fetched_at + timedelta(hours=3) if record_type == "forecast" else None,
+        temperature=10.0,
+        fetched_at=fetched_at,
+    )
+
+
+async def _fetched_times(db: AsyncSession, record_type: str, source_id: int = 1) -> list[datetime]:
+    result = await db.execute(
+        select(WeatherRecord.fetched_at)
+        .where(WeatherRecord.record_type == record_type)
+        .where(WeatherRecord.source_id == source_id)
+        .order_by(WeatherRecord.fetched_at)
+    )
+    return [dt.replace(tzinfo=timezone.utc) for dt in result.scalars()]
+
+
+class TestRetentionService:
+    @pytest.mark.asyncio
+    async def test_deletes_superseded_forecast_snapshots(self, db_session):
+        snapshots = [NOW - timedelta(hours=h) for h in (10, 5, 1)]
+        for fetched_at in snapshots:
+            db_session.add_all([_record("forecast", fetched_at) for _ in range(3)])
+        # The other source's only snapshot is old but not superseded
+        db_session.add(_record("forecast", NOW - timedelta(hours=10), source_id=2))
+        await db_session.commit()
+
+        deleted = await RetentionService(db_session).delete_superseded_forecasts(
+            NOW - timedelta(hours=2)
+        )
+        await db_session.commit()
+
+        assert deleted == 6
+        assert set(await _fetched_times(db_session, "forecast")) == {snapshots[-1]}
+        assert len(await _fetched_times(db_session, "forecast", source_id=2)) == 1
+
+    @pytest.mark.asyncio
+    async def test_keeps_recent_superseded_snapshots(self, db_session):
+        db_session.add(_record("forecast", NOW - timedelta(hours=1)))
+        db_session.add(_record("forecast", NOW - timedelta(minutes=30)))
+        await db_session.commit()
+
+        deleted = await RetentionService(db_session).delete_superseded_forecasts(
+            NOW - timedelta(hours=2)
+        )
+
+        assert deleted == 0
+
+    @pytest.mark.asyncio
+    async def test_thins_old_current_rows_to_one_per_interval(self, db_session):
+        day_ago = (NOW - timedelta(days=2)).replace(minute=0, second=0)
+        # Four observations every 15 minutes within one hour, two hours in a row
+        old = [day_ago + timedelta(minutes=15 * i) for i in range(8)]
+        recent = [NOW - timedelta(minutes=15 * i) for i in range(4)]
+        db_session.add_all([_record("current", dt) for dt in old + recent])
+        await db_session.commit()
+
+        deleted = await RetentionService(db_session).thin_current(
+            NOW - timedelta(hours=24), interval_seconds=3600
+        )
+        await db_session.commit()
+
+        assert deleted == 6
+        remaining = await _fetched_times(db_session, "current")
+        assert [dt for dt in remaining if dt < NOW - timedelta(hours=24)] == [old[0], old[4]]
+        assert len(remaining) == 2 + len(recent)
+
+    @pytest.mark.asyncio
+    async def test_run_expires_old_rows_without_partitions(self, db_session):
+        db_session.add(_record("current", NOW - timedelta(days=40)))
+        db_session.add(_record("current", NOW - timedelta(minutes=5)))
+        await db_session.commit()
+
+        result = await RetentionService(db_session).run()
+
+        assert result.rows_expired == 1
+        assert result.partitions_dropped is None
+        assert len(await _fetched_times(db_session, "current")) == 1
+
+
+class TestPartitionNames:
+    def test_round_trip(self):
+        assert partition_name(date(2026, 3, 1)) == "weather_records_p20260301"
+        assert partition_day("weather_records_p20260301") == date(2026, 3, 1)
+
+    def test_ignores_other_tables(self):
+        assert partition_day("weather_records_default") is None
+
+
+def _partitioned_db(stranded: bool = False, failing: str | None = None) -> MagicMock:
+    """Mock Postgres session recording statements; *failing* SQL raises."""
+    db = MagicMock()
+    db.statements = []
+
+    async def execute(statement, params=None):
+        sql = str(statement)
+        db.statements.append(sql)
+        if failing is not None and failing in sql:
+            raise DBAPIError(sql, None, Exception("boom"))
+        result = MagicMock(rowcount=3)
+        result.scalar.return_value = stranded
+        return result
+
+    db.execute = execute
+    db.begin_nested.return_value.__aenter__ = AsyncMock()
+    db.begin_nested.return_value.__aexit__ = AsyncMock(return_value=False)
+    # Autocommit connection used for detaching partitions
+    conn = MagicMock()
+    conn.execute = execute
+    conn.execution_options = AsyncMock(return_value=conn)
+    db.bind.connect.return_value.__aenter__ = AsyncMock(return_value=conn)
+    db.bind.connect.return_value.__aexit__ = AsyncMock(return_value=False)
+    return db
+
+
+class TestPartitions:
+    @pytest.mark.asyncio
+    async def test_rows_in_default_are_moved_into_the_new_partition(self):
+        db = _partitioned_db(stranded=True)
+        service = RetentionService(db)
+
+        with patch.object(service, "_partitions", AsyncMock(return_value=[])):
+            created = await service.ensure_partitions(date(2026, 3, 1), 0)
+
+        assert created == ["weather_records_p20260301"]
+        moves = [sql for sql in db.statements if sql.startswith(("WITH moved", "ALTER TABLE"))]
+        assert "DELETE FROM weather_records_default" in moves[0]
+        assert "INSERT INTO weather_records_p20260301" in moves[0]
+        assert "ATTACH PARTITION weather_records_p20260301" in moves[1]
+        assert not any("PARTITION OF" in sql for sql in db.statements)
+
+    @pytest.mark.asyncio
+    async def test_failed_creation_does_not_stop_drops(self):
+        db = _partitioned_db(failing="CREATE TABLE")
+        service = RetentionService(db)
+        old = ["weather_records_p20200101", "weather_records_p20200102"]
+
+        with patch.object(service, "_partitions", AsyncMock(return_value=old)):
+            created = await service.ensure_partitions(date(2026, 3, 1), 1)
+            dropped = await service.drop_partitions_before(date(2026, 1, 1))
+
+        assert created == []
+        assert dropped == old
+
+    @pytest.mark.asyncio
+    async def test_partitions_are_detached_before_drop(self):
+        db = _partitioned_db()
+        service = RetentionService(db)
+        partitions = ["weather_records_p20200101", "weather_records_p20260301"]
+
+        with patch.object(service, "_partitions", AsyncMock(return_value=partitions)):
+            dropped = await service.drop_partitions_before(date(2026, 1, 1))
+
+        assert dropped == ["weather_records_p20200101"]
+        statements = [sql for sql in db.statements if "weather_records_p" in sql]
+        assert statements == [
+            "ALTER TABLE weather_records DETACH PARTITION weather_records_p20200101 CONCURRENTLY",
+            "DROP TABLE IF EXISTS weather_records_p20200101",
+        ]
+        db.bind.connect.return_value.__aenter__.return_value.execution_options.assert_awaited_once_with(
+            isolation_level="AUTOCOMMIT"
+        )
+        assert db.statements[-1] == "RESET lock_timeout"
+
+    @pytest.mark.asyncio
+    async def test_default_partition_rules_out_concurrent_detach(self):
+        db = _partitioned_db()
+        service = RetentionService(db)
+        partitions = ["weather_records_default", "weather_records_p20200101"]
+
+        with patch.object(service, "_partitions", AsyncMock(return_value=partitions)):
+            await service.drop_partitions_before(date(2026, 1, 1))
+
+        assert (
+            "ALTER TABLE weather_records DETACH PARTITION weather_records_p20200101"
+            in db.statements
+        )
+
+    @pytest.mark.asyncio
+    async def test_run_expires_rows_stranded_in_default(self):
+        db = _partitioned_db()
+        db.commit = AsyncMock()
+        service = RetentionService(db)
+
+        with (
+            patch.object(service, "_is_partitioned", AsyncMock(return_value=True)),
+            patch.object(service, "_partitions", AsyncMock(return_value=[])),
+        ):
+            result = await service.run()
+
+        assert any(
+            sql.startswith("DELETE FROM weather_records_default WHERE fetched_at <")
+            for sql in db.statements
+        )
+        assert result.rows_expired == 3
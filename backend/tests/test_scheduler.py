@@ -0,0 +1,130 @@
+"""Unit tests for the weather scheduler worker pool."""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.core.scheduler import WeatherScheduler
+
+CITIES = [(i, f"City {i}", "RU") for i in range(1, 21)]
+
+
+def _config(max_concurrency: int, batch_size: int = 1):
+    def get(*keys, default=None):
+        if keys == ("scheduler", "max_concurrency"):
+            return max_concurrency
+        if keys == ("scheduler", "batch_size"):
+            return batch_size
+        return default
+
+    return get
+
+
+class TestFetchTrackedCities:
+    @pytest.mark.asyncio
+    async def test_refreshes_cities_with_bounded_concurrency(self):
+        active = 0
+        peak = 0
+        refreshed = []
+
+        async def refresh(city_ids):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            refreshed.extend(city_ids)
+            active -= 1
+
+        with (
+            patch.object(WeatherScheduler, "_get_tracked_cities", return_value=CITIES),
+            patch("app.core.scheduler.WeatherService.refresh_cities", side_effect=refresh),
+            patch("app.core.scheduler.settings.app_config.get", side_effect=_config(4)),
+        ):
+            stats = await WeatherScheduler()._fetch_tracked_cities()
+
+        assert sorted(refreshed) == [c[0] for c in CITIES]
+        assert peak == 4
+        assert stats.total == 20
+        assert stats.succeeded == 20
+        assert stats.failed == 0
+
+    @pytest.mark.asyncio
+    async def test_failing_city_does_not_stop_the_cycle(self):
+        async def refresh(city_ids):
+            if 3 in city_ids:
+                raise RuntimeError("upstream down")
+
+        with (
+            patch.object(WeatherScheduler, "_get_tracked_cities", return_value=CITIES[:5]),
+            patch("app.core.scheduler.settings.app_config.get", side_effect=_config(2)),
+            patch("app.core.scheduler.WeatherService.refresh_cities", side_effect=refresh),
+        ):
+            stats = await WeatherScheduler()._fetch_tracked_cities()
+
+        assert stats.succeeded == 4
+        assert stats.failed == 1
+
+    @pytest.mark.asyncio
+    async def test_cycle_stops_at_time_budget(self):
+        async def refresh(city_ids):
+            await asyncio.sleep(0.2)
+
+        with (
+            patch.object(WeatherScheduler, "_get_tracked_cities", return_value=CITIES),
+            patch("app.core.scheduler.WeatherService.refresh_cities", side_effect=refresh),
+            patch("app.core.scheduler.settings.app_config.get", side_effect=_config(2)),
+        ):
+            stats = await WeatherScheduler()._fetch_tracked_cities(time_budget=0.3)
+
+        assert stats.duration < 1.0
+        assert stats.succeeded == 2
+        # The second pair was cut off mid-refresh, which still completes
+        assert stats.in_flight == 2
+        assert stats.skipped == 16
+
+    @pytest.mark.asyncio
+    async def test_hands_cities_to_fetchers_in_batches(self):
+        batches = []
+
+        async def refresh(city_ids):
+            batches.append(list(city_ids))
+
+        with (
+            patch.object(WeatherScheduler, "_get_tracked_cities", return_value=CITIES),
+            patch("app.core.scheduler.WeatherService.refresh_cities", side_effect=refresh),
+            patch("app.core.scheduler.settings.app_config.get", side_effect=_config(2, 8)),
+        ):
+            stats = await WeatherScheduler()._fetch_tracked_cities()
+
+        assert sorted(len(b) for b in batches) == [4, 8, 8]
+        assert stats.batches == 3
+        assert stats.succeeded == 20
+
+    @pytest.mark.asyncio
+    async def test_no_tracked_cities(self):
+        with patch.object(WeatherScheduler, "_get_tracked_cities", return_value=[]):
+            stats = await WeatherScheduler()._fetch_tracked_cities()
+
+        assert stats.total == 0
+
+
+class TestRetentionHook:
+    @pytest.mark.asyncio
+    async def test_runs_retention_once_per_interval(self):
+        def config(*keys, default=None):
+            return {("retention", "enabled"): True, ("retention", "interval_hours"): 6}.get(
+                keys, default
+            )
+
+        scheduler = WeatherScheduler()
+        with (
+            patch("app.core.scheduler.settings.app_config.get", side_effect=config),
+            patch("app.core.scheduler.AsyncSessionLocal", return_value=AsyncMock()),
+            patch("app.core.scheduler.RetentionService") as mock_service,
+        ):
+            mock_service.return_value.run = AsyncMock()
+            await scheduler._maybe_run_retention()
+            await scheduler._maybe_run_retention()
+
+        mock_service.return_value.run.assert_awaited_once()
@@ -0,0 +1,232 @@
+"""Unit tests for single-flight call coalescing."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy.exc import DBAPIError
+
+from app.core.singleflight import SingleFlight
+
+
+class TestSingleFlight:
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_one_call(self):
+        flight = SingleFlight()
+        release = asyncio.Event()
+        calls = 0
+
+        async def work():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return "done"
+
+        waiters = [asyncio.create_task(flight.do("moscow", work)) for _ in range(5)]
+        await asyncio.sleep(0)
+        assert flight.in_flight("moscow")
+
+        release.set()
+        results = await asyncio.gather(*waiters)
+
+        assert calls == 1
+        assert results == ["done"] * 5
+        assert not flight.in_flight("moscow")
+
+    @pytest.mark.asyncio
+    async def test_different_keys_run_independently(self):
+        flight = SingleFlight()
+        work = AsyncMock(side_effect=["a", "b"])
+
+        results = await asyncio.gather(flight.do(1, work), flight.do(2, work))
+
+        assert sorted(results) == ["a", "b"]
+        assert work.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_exception_is_raised_to_every_caller(self):
+        flight = SingleFlight()
+        release = asyncio.Event()
+
+        async def work():
+            await release.wait()
+            raise RuntimeError("upstream down")
+
+        waiters = [asyncio.create_task(flight.do("k", work)) for _ in range(3)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*waiters, return_exceptions=True)
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert not flight.in_flight("k")
+
+    @pytest.mark.asyncio
+    async def test_new_call_starts_after_previous_finished(self):
+        flight = SingleFlight()
+        work = AsyncMock(return_value=None)
+
+        await flight.do("k", work)
+        await flight.do("k", work)
+
+        assert work.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_abort_shared_call(self):
+        flight = SingleFlight()
+        release = asyncio.Event()
+
+        async def work():
+            await release.wait()
+            return 42
+
+        first = asyncio.create_task(flight.do("k", work))
+        second = asyncio.create_task(flight.do("k", work))
+        await asyncio.sleep(0)
+
+        first.cancel()
+        release.set()
+
+        assert await second == 42
+        with pytest.raises(asyncio.CancelledError):
+            await first
+
+    @pytest.mark.asyncio
+    async def test_batch_joins_running_calls_and_registers_the_rest(self):
+        flight = SingleFlight()
+        release = asyncio.Event()
+        batches = []
+
+        async def single():
+            await release.wait()
+
+        async def batch(keys):
+            batches.append(keys)
+            await release.wait()
+
+        running = asyncio.create_task(flight.do(1, single))
+        await asyncio.sleep(0)
+        batch_call = asyncio.create_task(flight.do_many([1, 2, 3], batch))
+        await asyncio.sleep(0)
+        assert flight.in_flight(2) and flight.in_flight(3)
+
+        # A later single call joins the batch
+        joined = asyncio.create_task(flight.do(3, AsyncMock()))
+        release.set()
+        await asyncio.gather(running, batch_call, joined)
+
+        assert batches == [[2, 3]]
+        assert not any(flight.in_flight(key) for key in (1, 2, 3))
+
+
+class TestRefreshCityCoalescing:
+    @pytest.mark.asyncio
+    async def test_concurrent_refreshes_of_same_city_fetch_once(self):
+        from app.services.weather_service import WeatherService
+
+        release = asyncio.Event()
+        calls = 0
+
+        async def fake_refresh(city_id):
+            nonlocal calls
+            calls += 1
+            await release.wait()
+
+        service = WeatherService(db=AsyncMock())
+        with patch("app.services.weather_service._refresh_city", new=fake_refresh):
+            waiters = [asyncio.create_task(service.refresh_city(7)) for _ in range(4)]
+            await asyncio.sleep(0)
+            release.set()
+            await asyncio.gather(*waiters)
+
+        assert calls == 1
+
+    @pytest.mark.asyncio
+    async def test_batch_refresh_joins_single_refresh_in_flight(self):
+        from app.services.weather_service import WeatherService
+
+        release = asyncio.Event()
+        refreshed = []
+
+        async def fake_refresh(city_ids):
+            refreshed.append(city_ids)
+            await release.wait()
+
+        with patch("app.services.weather_service._refresh_cities", new=fake_refresh):
+            single = asyncio.create_task(WeatherService.refresh_city(1))
+            await asyncio.sleep(0)
+            batch = asyncio.create_task(WeatherService.refresh_cities([1, 2]))
+            await asyncio.sleep(0)
+            release.set()
+            await asyncio.gather(single, batch)
+
+        assert refreshed == [[1], [2]]
+
+
+class _LockConnection:
+    """Stand-in for the advisory lock connection (Postgres only)."""
+
+    def __init__(self, held: set[int], timed_out: set[int], refreshed: set[int]):
+        self.held = held
+        self.timed_out = timed_out
+        self.refreshed = refreshed
+        self.locked: set[int] = set()
+        self.rollback = AsyncMock()
+        self.commit = AsyncMock()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, statement, params=None):
+        sql = str(statement)
+        result = MagicMock()
+        if "pg_try_advisory_lock" in sql:
+            acquired = params["key"] not in self.held
+            if acquired:
+                self.locked.add(params["key"])
+            result.scalar.return_value = acquired
+        elif "pg_advisory_lock" in sql:
+            if params["key"] in self.timed_out:
+                raise DBAPIError(sql, params, Exception("lock timeout"))
+            self.locked.add(params["key"])
+        elif "pg_advisory_unlock" in sql:
+            self.locked.discard(params["key"])
+        elif "weather_records" in sql:
+            city_id = next(iter(statement.compile().params.values()))
+            result.first.return_value = (1,) if city_id in self.refreshed else None
+        return result
+
+
+class TestCityLocks:
+    @pytest.mark.asyncio
+    async def test_waits_for_held_locks_and_skips_cities_refreshed_meanwhile(self):
+        from app.services import weather_service
+
+        conn = _LockConnection(held={2, 3}, timed_out={3}, refreshed={2})
+        config = {("fetching", "advisory_lock"): True}
+        with (
+            patch.object(weather_service, "engine", MagicMock(connect=MagicMock(return_value=conn))),
+            patch(
+                "app.services.weather_service.settings.app_config.get",
+                side_effect=lambda *keys, default=None: config.get(keys, default),
+            ),
+        ):
+            async with weather_service._city_locks([1, 2, 3]) as pending:
+                # 2 was refreshed by the lock holder, 3 never got its lock
+                assert pending == [1]
+                assert conn.locked == {1, 2}
+
+        assert conn.locked == set()
+        conn.rollback.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_without_advisory_lock_every_city_is_pending(self):
+        from app.services import weather_service
+
+        with patch.object(weather_service, "engine", MagicMock()) as engine:
+            async with weather_service._city_locks([4, 5]) as pending:
+                assert pending == [4, 5]
+
+        engine.connect.assert_not_called()
@@ -0,0 +1,102 @@
+"""Unit tests for the in-process weather_sources catalog."""
+
+from unittest.mock import patch
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.models import WeatherSource
+from app.services.source_catalog import SourceCatalog
+
+
+@pytest_asyncio.fixture
+async def engine():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", echo=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def db_session(engine):
+    """Session with one enabled and one disabled source."""
+    async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with async_session() as session:
+        session.add_all([
+            WeatherSource(
+                id=1, slug="openweathermap", display_name="OpenWeatherMap",
+                source_type="rest", priority=3, is_enabled=True,
+                config_file="openweathermap.yaml",
+            ),
+            WeatherSource(
+                id=2, slug="yandex", display_name="Yandex",
+                source_type="parser", priority=1, is_enabled=False,
+                config_file="yandex.yaml",
+            ),
+        ])
+        await session.commit()
+        yield session
+
+
+@pytest.fixture
+def statements(engine):
+    """Collect the SQL statements executed on *engine*."""
+    executed = []
+
+    def record(conn, cursor, statement, *args):
+        executed.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    yield executed
+    event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+
+def _ttl(seconds):
+    return patch(
+        "app.services.source_catalog.settings.app_config.get", return_value=seconds
+    )
+
+
+class TestSourceCatalog:
+    @pytest.mark.asyncio
+    async def test_maps_slugs_and_priorities(self, db_session):
+        snapshot = await SourceCatalog().get(db_session)
+
+        assert snapshot.ids(["yandex", "unknown", "openweathermap"]) == [2, 1]
+        assert snapshot.priorities() == {1: 3}
+        assert snapshot.priorities(["yandex"]) == {}
+        assert snapshot.get("yandex").is_enabled is False
+        assert snapshot.get_by_id(1).display_name == "OpenWeatherMap"
+
+    @pytest.mark.asyncio
+    async def test_served_from_memory_until_invalidated(self, db_session, statements):
+        catalog = SourceCatalog()
+        with _ttl(60):
+            await catalog.get(db_session)
+            await catalog.get(db_session)
+            assert len(statements) == 1
+
+            source = await db_session.get(WeatherSource, 2)
+            source.is_enabled = True
+            await db_session.commit()
+            catalog.invalidate()
+            statements.clear()
+
+            snapshot = await catalog.get(db_session)
+
+        assert len(statements) == 1
+        assert snapshot.priorities() == {1: 3, 2: 1}
+
+    @pytest.mark.asyncio
+    async def test_reloads_after_ttl(self, db_session, statements):
+        catalog = SourceCatalog()
+        with _ttl(0):
+            await catalog.get(db_session)
+            await catalog.get(db_session)
+
+        assert len(statements) == 2
@@ -0,0 +1,116 @@
+"""Unit tests for the compiled source registry."""
+
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from app.fetchers.openweathermap import OpenWeatherMapFetcher
+from app.services.source_manager import SourceManager
+
+_OWM_YAML = """
+name: "OpenWeatherMap"
+type: "rest"
+priority: {priority}
+enabled: true
+connection:
+  base_url: "https://api.openweathermap.org/data/2.5"
+  api_key: "key"
+  timeout: 10
+"""
+
+
+def _write(path: Path, priority: int = 1) -> None:
+    path.write_text(_OWM_YAML.format(priority=priority), encoding="utf-8")
+
+
+def _bump_mtime(path: Path) -> None:
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.fixture
+def sources_dir(tmp_path):
+    _write(tmp_path / "openweathermap.yaml")
+    return tmp_path
+
+
+class TestSourceManager:
+    def test_load_builds_configs_and_fetchers(self, sources_dir):
+        manager = SourceManager(sources_dir)
+        manager.load()
+
+        assert [s.name for s in manager.get_all()] == ["OpenWeatherMap"]
+        fetchers = manager.get_fetchers()
+        assert len(fetchers) == 1
+        assert isinstance(fetchers[0], OpenWeatherMapFetcher)
+
+    def test_get_fetchers_returns_cached_instances(self, sources_dir):
+        manager = SourceManager(sources_dir)
+        manager.load()
+
+        assert manager.get_fetchers()[0] is manager.get_fetchers()[0]
+
+    def test_reload_skips_unchanged_files(self, sources_dir):
+        manager = SourceManager(sources_dir)
+        manager.load()
+
+        with patch("app.services.source_manager.yaml.safe_load") as safe_load:
+            result = manager.reload()
+
+        safe_load.assert_not_called()
+        assert not result.changed
+
+    def test_reload_skips_touched_but_identical_file(self, sources_dir):
+        manager = SourceManager(sources_dir)
+        manager.load()
+        fetcher = manager.get_fetchers()[0]
+
+        _bump_mtime(sources_dir / "openweathermap.yaml")
+        result = manager.reload()
+
+        assert not result.changed
+        assert manager.get_fetchers()[0] is fetcher
+
+    def test_reload_picks_up_changed_file(self, sources_dir):
+        manager = SourceManager(sources_dir)
+        manager.load()
+
+        path = sources_dir / "openweathermap.yaml"
+        _write(path, priority=5)
+        _bump_mtime(path)
+        result = manager.reload()
+
+        assert result.updated == ["OpenWeatherMap"]
+        assert manager.get("OpenWeatherMap").priority == 5
+        assert manager.get_fetchers()[0].priority == 5
+
+    def test_reload_detects_removed_file(self, sources_dir):
+        manager = SourceManager(sources_dir)
+        manager.load()
+
+        (sources_dir / "openweathermap.yaml").unlink()
+        result = manager.reload()
+
+        assert result.removed == ["OpenWeatherMap"]
+        assert manager.get_fetchers() == []
+
+    def test_reload_keeps_previous_version_of_broken_file(self, sources_dir):
+        manager = SourceManager(sources_dir)
+        manager.load()
+
+        path = sources_dir / "openweathermap.yaml"
+        path.write_text("name: [unclosed", encoding="utf-8")
+        _bump_mtime(path)
+        result = manager.reload()
+
+        assert result.failed == ["openweathermap.yaml"]
+        assert len(manager.get_fetchers()) == 1
+
+    def test_load_raises_on_broken_file(self, tmp_path):
+        (tmp_path / "broken.yaml").write_text("name: [unclosed", encoding="utf-8")
+        manager = SourceManager(tmp_path)
+
+        with pytest.raises(Exception):
+            manager.load()
@@ -6,7 +6,7 @@ import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy.engine import Result
 
-from app.dependencies import get_db
+from app.dependencies import get_read_db
 from app.main import app
 
 
@@ -54,7 +54,7 @@ class TestListSources:
         async def override():
             yield session
 
-        app.dependency_overrides[get_db] = override
+        app.dependency_overrides[get_read_db] = override
         resp = TestClient(app).get("/api/v1/sources")
 
         assert resp.status_code == 200
@@ -69,7 +69,7 @@ class TestListSources:
         async def override():
             yield session
 
-        app.dependency_overrides[get_db] = override
+        app.dependency_overrides[get_read_db] = override
         resp = TestClient(app).get("/api/v1/sources")
 
         assert resp.status_code == 200
@@ -83,7 +83,7 @@ class TestGetSource:
         async def override():
             yield session
 
-        app.dependency_overrides[get_db] = override
+        app.dependency_overrides[get_read_db] = override
         resp = TestClient(app).get("/api/v1/sources/openweathermap")
 
         assert resp.status_code == 200
@@ -98,7 +98,7 @@ class TestGetSource:
         async def override():
             yield session
 
-        app.dependency_overrides[get_db] = override
+        app.dependency_overrides[get_read_db] = override
         resp = TestClient(app).get("/api/v1/sources/unknown")
 
         assert resp.status_code == 404
@@ -0,0 +1,255 @@
+"""Tests for the SQL-side aggregation engine.
+
+Every test aggregates the same rows twice, with ``SqlAggregator`` and with the
+Python ``aggregate()``, and expects the same result.
+"""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.aggregator.engine import aggregate
+from app.aggregator.sql_engine import SqlAggregator
+from app.core.database import Base
+from app.models import City, WeatherRecord, WeatherSource
+from app.services.response_cache import response_cache
+from app.services.weather_service import WeatherService
+
+PRIORITIES = {1: 3, 2: 2, 3: 1}
+
+# Start of the next hour, so that every point lies in the future
+BASE = (datetime.now(timezone.utc) + timedelta(hours=1)).replace(
+    minute=0, second=0, microsecond=0
+)
+
+# Per-source values; None marks a value the source does not report
+TEMPERATURES = {1: 10.0, 2: 14.5, 3: None}
+DESCRIPTIONS = {1: "Rain", 2: "Clouds", 3: "Clouds"}
+PRECIPITATION = {1: "rain", 2: "none", 3: None}
+ICONS = {1: None, 2: "04d", 3: "10d"}
+
+
+@pytest_asyncio.fixture
+async def db_session():
+    """In-memory SQLite database with one city and three sources."""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", echo=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with async_session() as session:
+        session.add(City(id=1, name="Moscow", country="RU", lat=55.75, lon=37.62))
+        for source_id, priority in PRIORITIES.items():
+            session.add(
+                WeatherSource(
+                    id=source_id,
+                    slug=f"source{source_id}",
+                    display_name=f"Source {source_id}",
+                    source_type="rest",
+                    config_file=f"source{source_id}.yaml",
+                    priority=priority,
+                )
+            )
+        await session.commit()
+        yield session
+
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def forecast(db_session):
+    """Two days of 3-hourly forecasts; source 3 is offset by 30 minutes."""
+    fetched_at = datetime.now(timezone.utc)
+    for step in range(16):
+        for source_id in PRIORITIES:
+            offset = timedelta(minutes=30) if source_id == 3 else timedelta()
+            temperature = TEMPERATURES[source_id]
+            db_session.add(
+                WeatherRecord(
+                    city_id=1,
+                    source_id=source_id,
+                    record_type="forecast",
+                    forecast_dt=BASE + timedelta(hours=3 * step) + offset,
+                    temperature=None if temperature is None else temperature + step,
+                    feels_like=8.0 + source_id,
+                    wind_speed=2.0 * source_id,
+                    wind_direction=90 * source_id - step,
+                    humidity=50 + source_id * 7,
+                    pressure=1000.0 + source_id,
+                    precipitation_type=PRECIPITATION[source_id],
+                    precipitation_amount=0.1 * source_id * (step % 3),
+                    cloudiness=None if source_id == 1 else 33 * source_id,
+                    description=DESCRIPTIONS[source_id],
+                    icon_code=ICONS[source_id],
+                    fetched_at=fetched_at,
+                )
+            )
+    await db_session.commit()
+    return db_session
+
+
+def _records_query():
+    return (
+        select(WeatherRecord)
+        .where(WeatherRecord.record_type == "forecast")
+        .order_by(WeatherRecord.forecast_dt, WeatherRecord.source_id)
+    )
+
+
+async def _python_groups(db, key) -> dict[datetime, list[WeatherRecord]]:
+    groups: dict[datetime, list[WeatherRecord]] = {}
+    for record in (await db.execute(_records_query())).scalars():
+        forecast_dt = record.forecast_dt.replace(tzinfo=timezone.utc)
+        groups.setdefault(key(forecast_dt), []).append(record)
+    return groups
+
+
+def _assert_same(actual, expected) -> None:
+    actual, expected = actual.model_dump(), expected.model_dump()
+    for field, value in expected.items():
+        if isinstance(value, float):
+            assert actual[field] == pytest.approx(value), field
+        else:
+            assert actual[field] == value, field
+
+
+class TestSqlAggregator:
+    @pytest.mark.asyncio
+    async def test_forecast_buckets_match_python_aggregate(self, forecast):
+        result = await SqlAggregator(forecast).aggregate(_records_query(), PRIORITIES)
+
+        groups = await _python_groups(forecast, lambda dt: dt)
+        assert [key for key, _ in result] == sorted(groups)
+        for key, weather in result:
+            _assert_same(weather, aggregate(groups[key], PRIORITIES))
+
+    @pytest.mark.asyncio
+    async def test_hour_buckets_match_python_aggregate(self, forecast):
+        result = await SqlAggregator(forecast).aggregate(
+            _records_query(), PRIORITIES, bucket="hour"
+        )
+
+        groups = await _python_groups(
+            forecast, lambda dt: dt.replace(minute=0, second=0, microsecond=0)
+        )
+        assert [key for key, _ in result] == sorted(groups)
+        for key, weather in result:
+            _assert_same(weather, aggregate(groups[key], PRIORITIES))
+
+    @pytest.mark.asyncio
+    async def test_categorical_tie_goes_to_highest_priority(self, forecast):
+        # "Rain" (priority 3) vs "Clouds" (priorities 2 and 1) without source 3
+        query = _records_query().where(WeatherRecord.source_id != 3)
+
+        result = await SqlAggregator(forecast).aggregate(query, PRIORITIES)
+
+        assert {weather.description for _, weather in result} == {"Rain"}
+        assert {weather.icon_code for _, weather in result} == {"04d"}
+
+    @pytest.mark.asyncio
+    async def test_unknown_sources_weigh_one(self, forecast):
+        query = _records_query().where(WeatherRecord.forecast_dt == BASE)
+
+        (_, weather), = await SqlAggregator(forecast).aggregate(query, {})
+
+        assert weather.temperature == pytest.approx((10.0 + 14.5) / 2)
+
+    @pytest.mark.asyncio
+    async def test_fields_and_limit(self, forecast):
+        query = _records_query().where(WeatherRecord.source_id != 3)
+
+        result = await SqlAggregator(forecast).aggregate(
+            query, PRIORITIES, fields=["temperature"], categorical=False, limit=3
+        )
+
+        assert [key for key, _ in result] == [BASE + timedelta(hours=3 * i) for i in range(3)]
+        assert result[0][1].temperature == pytest.approx((10.0 * 3 + 14.5 * 2) / 5)
+        assert result[0][1].humidity is None
+        assert result[0][1].description is None
+
+    @pytest.mark.asyncio
+    async def test_unknown_bucket(self, db_session):
+        with pytest.raises(ValueError):
+            await SqlAggregator(db_session).aggregate(_records_query(), PRIORITIES, bucket="day")
+
+    @pytest.mark.asyncio
+    async def test_daily_temperatures(self, forecast):
+        result = await SqlAggregator(forecast).daily_temperatures(_records_query(), days=2)
+
+        groups = await _python_groups(forecast, lambda dt: dt.date().isoformat())
+        assert [row["date"] for row in result] == sorted(groups)[:2]
+        for row in result:
+            temperatures = [
+                r.temperature for r in groups[row["date"]] if r.temperature is not None
+            ]
+            assert row["temp_min"] == min(temperatures)
+            assert row["temp_max"] == max(temperatures)
+            assert row["temp_avg"] == pytest.approx(sum(temperatures) / len(temperatures))
+
+    def test_postgres_hour_bucket_has_no_bind_parameters(self, db_session):
+        aggregator = SqlAggregator(db_session)
+        with patch.object(SqlAggregator, "_is_postgres", True):
+            bucket = aggregator._bucket(WeatherRecord.forecast_dt, "hour")
+
+        sql = str(bucket.compile(dialect=postgresql.dialect()))
+        assert "date_trunc('hour'" in sql
+        assert "%(" not in sql
+
+
+class TestWeatherServiceSqlBackend:
+    """The SQL backend must not change what the endpoints return."""
+
+    async def _both(self, db, call):
+        service = WeatherService(db)
+        with patch(
+            "app.services.weather_service._aggregation_backend", return_value="python"
+        ):
+            expected = await call(service)
+        response_cache.clear()
+        with patch("app.services.weather_service._aggregation_backend", return_value="sql"):
+            actual = await call(service)
+        return actual, expected
+
+    @staticmethod
+    def _assert_rows_equal(actual, expected):
+        assert len(actual) == len(expected)
+        for got, want in zip(actual, expected):
+            assert got.keys() == want.keys()
+            for key, value in want.items():
+                if isinstance(value, float):
+                    assert got[key] == pytest.approx(value), key
+                else:
+                    assert got[key] == value, key
+
+    @pytest.mark.asyncio
+    async def test_forecast(self, forecast):
+        with patch.object(WeatherService, "_ensure_fresh", return_value=True):
+            actual, expected = await self._both(
+                forecast, lambda s: s.get_aggregated_forecast(1, days=2)
+            )
+
+        assert expected
+        self._assert_rows_equal(
+            [{"forecast_dt": r["forecast_dt"], **r["data"]} for r in actual],
+            [{"forecast_dt": r["forecast_dt"], **r["data"]} for r in expected],
+        )
+
+    @pytest.mark.asyncio
+    async def test_chart_hourly(self, forecast):
+        actual, expected = await self._both(forecast, lambda s: s.get_chart_hourly(1))
+
+        assert expected
+        self._assert_rows_equal(actual, expected)
+
+    @pytest.mark.asyncio
+    async def test_chart_daily(self, forecast):
+        actual, expected = await self._both(forecast, lambda s: s.get_chart_daily(1, days=2))
+
+        assert expected
+        self._assert_rows_equal(actual, expected)
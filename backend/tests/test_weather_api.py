@@ -1,16 +1,46 @@
 """Micro-tests for weather API endpoints."""
 
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from unittest.mock import AsyncMock, patch
 
 import pytest
 from fastapi.testclient import TestClient
+from pydantic import TypeAdapter
 
 from app.main import app
-from app.schemas.weather import AggregatedWeather
+from app.schemas.recommendation import ClothingRecommendationResponse
+from app.schemas.weather import AggregatedWeather, ChartPoint, ForecastPoint, ForecastResponse
+from app.services.weather_service import (
+    DataFreshness,
+    PrecomputedResponse,
+    ResponseValidator,
+    WeatherOverview,
+)
 
 client = TestClient(app)
 
+DATA_TIME = datetime(2026, 2, 26, 10, 0, 30, 123000, tzinfo=timezone.utc)
+VALIDATOR = ResponseValidator(etag='W/"abc123"', last_modified=DATA_TIME)
+
+
+@pytest.fixture(autouse=True)
+def no_validator():
+    """Endpoints look up validators in the database; tests opt in to one."""
+    with patch(
+        "app.api.v1.weather.WeatherService.get_validator", new=AsyncMock(return_value=None)
+    ) as mock:
+        yield mock
+
+
+@pytest.fixture(autouse=True)
+def no_precomputed():
+    """Endpoints look up precomputed responses in the database; tests opt in to one."""
+    with patch(
+        "app.api.v1.weather.WeatherService.get_precomputed", new=AsyncMock(return_value=None)
+    ) as mock:
+        yield mock
+
+
 SAMPLE_WEATHER = AggregatedWeather(
     temperature=15.0,
     feels_like=13.0,
@@ -74,6 +104,23 @@ class TestGetCurrentWeather:
         assert body["city_id"] == 1
         assert body["weather"]["temperature"] == 15.0
         assert "fetched_at" in body
+        assert body["stale"] is False
+
+    def test_marks_stale_response_with_data_age(self):
+        async def serve_stale(self, city_id, source_slugs=None):
+            self.freshness = DataFreshness(
+                datetime.now(timezone.utc) - timedelta(minutes=45), stale=True
+            )
+            return SAMPLE_WEATHER
+
+        with patch("app.api.v1.weather.WeatherService.get_aggregated_current", new=serve_stale):
+            resp = client.get("/api/v1/weather/current?city_id=1")
+
+        assert resp.status_code == 200
+        body = resp.json()
+        assert body["stale"] is True
+        assert body["data_age_seconds"] >= 45 * 60
+        assert int(resp.headers["X-Data-Age"]) == body["data_age_seconds"]
 
     def test_returns_404_when_no_data(self):
         with patch(
@@ -89,6 +136,188 @@ class TestGetCurrentWeather:
         assert resp.status_code == 422
 
 
+# ---------------------------------------------------------------------------
+# Conditional requests (ETag / Last-Modified)
+# ---------------------------------------------------------------------------
+
+class TestPrecomputedResponses:
+    BODY = b'{"city_id":1,"weather":{"temperature":15.0},"stale":false,"data_age_seconds":5}'
+
+    def test_body_is_sent_as_stored(self, no_precomputed):
+        no_precomputed.return_value = PrecomputedResponse(self.BODY, VALIDATOR)
+        with patch(
+            "app.api.v1.weather.WeatherService.get_aggregated_current", new=AsyncMock()
+        ) as mock_current:
+            resp = client.get("/api/v1/weather/current?city_id=1")
+
+        assert resp.status_code == 200
+        assert resp.content == self.BODY
+        assert resp.headers["content-type"] == "application/json"
+        assert resp.headers["ETag"] == 'W/"abc123"'
+        no_precomputed.assert_awaited_once_with("current", 1, None)
+        mock_current.assert_not_awaited()
+
+    def test_matching_etag_returns_304(self, no_precomputed):
+        no_precomputed.return_value = PrecomputedResponse(self.BODY, VALIDATOR)
+
+        resp = client.get(
+            "/api/v1/weather/chart/daily?city_id=1&days=5",
+            headers={"If-None-Match": 'W/"abc123"'},
+        )
+
+        assert resp.status_code == 304
+        no_precomputed.assert_awaited_once_with("chart_daily", 1, params=(5,))
+
+
+class TestConditionalRequests:
+    def test_fetched_at_is_data_time(self):
+        async def serve(self, city_id, source_slugs=None):
+            self.freshness = DataFreshness(DATA_TIME, stale=False)
+            return SAMPLE_WEATHER
+
+        with patch("app.api.v1.weather.WeatherService.get_aggregated_current", new=serve):
+            resp = client.get("/api/v1/weather/current?city_id=1")
+
+        assert datetime.fromisoformat(resp.json()["fetched_at"]) == DATA_TIME
+
+    def test_sets_validators(self, no_validator):
+        no_validator.return_value = VALIDATOR
+        with patch(
+            "app.api.v1.weather.WeatherService.get_aggregated_current",
+            new=AsyncMock(return_value=SAMPLE_WEATHER),
+        ):
+            resp = client.get("/api/v1/weather/current?city_id=1&sources=b&sources=a")
+
+        assert resp.headers["ETag"] == 'W/"abc123"'
+        assert resp.headers["Last-Modified"] == "Thu, 26 Feb 2026 10:00:30 GMT"
+        assert resp.headers["Cache-Control"] == "no-cache"
+        no_validator.assert_awaited_once_with("current", 1, ["b", "a"])
+
+    def test_matching_etag_returns_304_without_aggregating(self, no_validator):
+        no_validator.return_value = VALIDATOR
+        with patch(
+            "app.api.v1.weather.WeatherService.get_aggregated_current", new=AsyncMock()
+        ) as mock_current:
+            resp = client.get(
+                "/api/v1/weather/current?city_id=1",
+                headers={"If-None-Match": '"other", W/"abc123"'},
+            )
+
+        assert resp.status_code == 304
+        assert resp.content == b""
+        assert resp.headers["ETag"] == 'W/"abc123"'
+        mock_current.assert_not_awaited()
+
+    def test_changed_etag_returns_full_body(self, no_validator):
+        no_validator.return_value = VALIDATOR
+        with patch(
+            "app.api.v1.weather.WeatherService.get_aggregated_forecast",
+            new=AsyncMock(return_value=[SAMPLE_FORECAST_ITEM]),
+        ):
+            resp = client.get(
+                "/api/v1/weather/forecast?city_id=1&days=3",
+                headers={"If-None-Match": 'W/"old"'},
+            )
+
+        assert resp.status_code == 200
+        no_validator.assert_awaited_once_with("forecast", 1, None, (3,))
+
+    def test_if_modified_since(self, no_validator):
+        no_validator.return_value = VALIDATOR
+        with patch(
+            "app.api.v1.weather.WeatherService.get_chart_hourly",
+            new=AsyncMock(return_value=SAMPLE_HOURLY),
+        ) as mock_hourly:
+            current = client.get(
+                "/api/v1/weather/chart/hourly?city_id=1",
+                headers={"If-Modified-Since": "Thu, 26 Feb 2026 10:00:30 GMT"},
+            )
+            older = client.get(
+                "/api/v1/weather/chart/hourly?city_id=1",
+                headers={"If-Modified-Since": "Thu, 26 Feb 2026 10:00:29 GMT"},
+            )
+
+        assert current.status_code == 304
+        assert older.status_code == 200
+        mock_hourly.assert_awaited_once()
+
+    def test_daily_chart_304(self, no_validator):
+        no_validator.return_value = VALIDATOR
+        with patch(
+            "app.api.v1.weather.WeatherService.get_chart_daily", new=AsyncMock()
+        ) as mock_daily:
+            resp = client.get(
+                "/api/v1/weather/chart/daily?city_id=1&days=5",
+                headers={"If-None-Match": 'W/"abc123"'},
+            )
+
+        assert resp.status_code == 304
+        mock_daily.assert_not_awaited()
+        no_validator.assert_awaited_once_with("chart_daily", 1, params=(5,))
+
+
+# ---------------------------------------------------------------------------
+# GET /api/v1/weather/current/batch
+# ---------------------------------------------------------------------------
+
+class TestGetCurrentWeatherBatch:
+    def test_returns_items_and_missing_cities(self):
+        with patch(
+            "app.api.v1.weather.WeatherService.get_aggregated_current_many",
+            new=AsyncMock(return_value={1: SAMPLE_WEATHER, 3: SAMPLE_WEATHER}),
+        ) as mock_many:
+            resp = client.get("/api/v1/weather/current/batch?city_ids=3&city_ids=1&city_ids=2")
+
+        assert resp.status_code == 200
+        body = resp.json()
+        assert [item["city_id"] for item in body["items"]] == [3, 1]
+        assert body["items"][0]["weather"]["temperature"] == 15.0
+        assert body["missing"] == [2]
+        mock_many.assert_awaited_once_with([3, 1, 2], source_slugs=None)
+
+    def test_reports_freshness_per_city(self):
+        async def fake_many(self, city_ids, source_slugs=None):
+            self.freshness_by_city = {
+                1: DataFreshness(datetime.now(timezone.utc) - timedelta(minutes=50), stale=True)
+            }
+            return {1: SAMPLE_WEATHER}
+
+        with patch(
+            "app.api.v1.weather.WeatherService.get_aggregated_current_many", new=fake_many
+        ):
+            resp = client.get("/api/v1/weather/current/batch?city_ids=1")
+
+        item = resp.json()["items"][0]
+        assert item["stale"] is True
+        assert item["data_age_seconds"] >= 50 * 60
+
+    def test_returns_422_for_too_many_cities(self):
+        query = "&".join(f"city_ids={i}" for i in range(1, 52))
+        resp = client.get(f"/api/v1/weather/current/batch?{query}")
+        assert resp.status_code == 422
+
+
+# ---------------------------------------------------------------------------
+# GET /api/v1/weather/forecast/batch
+# ---------------------------------------------------------------------------
+
+class TestGetForecastBatch:
+    def test_returns_forecasts_per_city(self):
+        with patch(
+            "app.api.v1.weather.WeatherService.get_aggregated_forecast_many",
+            new=AsyncMock(return_value={2: [SAMPLE_FORECAST_ITEM]}),
+        ):
+            resp = client.get("/api/v1/weather/forecast/batch?city_ids=1&city_ids=2&days=3")
+
+        assert resp.status_code == 200
+        body = resp.json()
+        assert len(body["items"]) == 1
+        assert body["items"][0]["city_id"] == 2
+        assert body["items"][0]["days"] == 3
+        assert len(body["items"][0]["forecasts"]) == 1
+        assert body["missing"] == [1]
+
+
 # ---------------------------------------------------------------------------
 # GET /api/v1/weather/forecast
 # ---------------------------------------------------------------------------
@@ -215,3 +444,139 @@ class TestGetChartDaily:
     def test_returns_422_when_days_too_small(self):
         resp = client.get("/api/v1/weather/chart/daily?city_id=1&days=2")
         assert resp.status_code == 422
+
+
+# ---------------------------------------------------------------------------
+# GET /api/v1/weather/overview
+# ---------------------------------------------------------------------------
+
+SAMPLE_OVERVIEW = WeatherOverview(
+    current=SAMPLE_WEATHER,
+    current_freshness=DataFreshness(DATA_TIME, stale=False),
+    forecast=[SAMPLE_FORECAST_ITEM],
+    forecast_freshness=DataFreshness(DATA_TIME, stale=True),
+    chart_hourly=SAMPLE_HOURLY,
+    chart_daily=SAMPLE_DAILY,
+)
+
+
+class TestGetOverview:
+    def test_returns_all_dashboard_parts(self):
+        recommendation = ClothingRecommendationResponse(
+            city_id=1, category="light_jacket", description="Прохладно", items=["ветровка"]
+        )
+        with (
+            patch(
+                "app.api.v1.weather.WeatherService.get_overview",
+                new=AsyncMock(return_value=SAMPLE_OVERVIEW),
+            ) as get_overview,
+            patch(
+                "app.api.v1.weather.RecommendationService.is_available", return_value=True
+            ),
+            patch(
+                "app.api.v1.weather.RecommendationService.recommend", return_value=recommendation
+            ),
+        ):
+            resp = client.get("/api/v1/weather/overview?city_id=1&days=3")
+
+        assert resp.status_code == 200
+        get_overview.assert_awaited_once_with(1, days=3)
+        body = resp.json()
+        assert body["current"]["weather"]["temperature"] == 15.0
+        assert body["current"]["stale"] is False
+        assert body["forecast"]["days"] == 3
+        assert body["forecast"]["stale"] is True
+        assert len(body["forecast"]["forecasts"]) == 1
+        assert len(body["chart_hourly"]) == 3
+        assert body["chart_daily"][0]["date"] == "2026-02-26"
+        assert body["recommendation"]["category"] == "light_jacket"
+
+    def test_recommendation_is_null_without_model(self):
+        with (
+            patch(
+                "app.api.v1.weather.WeatherService.get_overview",
+                new=AsyncMock(return_value=SAMPLE_OVERVIEW),
+            ),
+            patch(
+                "app.api.v1.weather.RecommendationService.is_available", return_value=False
+            ),
+        ):
+            resp = client.get("/api/v1/weather/overview?city_id=1")
+
+        assert resp.status_code == 200
+        assert resp.json()["recommendation"] is None
+
+    def test_returns_404_when_no_data(self):
+        empty = WeatherOverview(None, None, [], None, [], [])
+        with patch(
+            "app.api.v1.weather.WeatherService.get_overview",
+            new=AsyncMock(return_value=empty),
+        ):
+            resp = client.get("/api/v1/weather/overview?city_id=999")
+
+        assert resp.status_code == 404
+
+    def test_sets_validators(self, no_validator):
+        no_validator.return_value = VALIDATOR
+        with (
+            patch(
+                "app.api.v1.weather.WeatherService.get_overview",
+                new=AsyncMock(return_value=SAMPLE_OVERVIEW),
+            ),
+            patch(
+                "app.api.v1.weather.RecommendationService.is_available", return_value=False
+            ),
+        ):
+            resp = client.get("/api/v1/weather/overview?city_id=1&days=5")
+
+        assert resp.status_code == 200
+        assert resp.headers["ETag"] == 'W/"abc123"'
+        assert resp.headers["Last-Modified"] == "Thu, 26 Feb 2026 10:00:30 GMT"
+        no_validator.assert_awaited_once_with("overview", 1, params=(5,))
+
+    def test_matching_etag_returns_304_without_reading(self, no_validator):
+        no_validator.return_value = VALIDATOR
+        with patch(
+            "app.api.v1.weather.WeatherService.get_overview", new=AsyncMock()
+        ) as get_overview:
+            resp = client.get(
+                "/api/v1/weather/overview?city_id=1",
+                headers={"If-None-Match": 'W/"abc123"'},
+            )
+
+        assert resp.status_code == 304
+        assert resp.headers["ETag"] == 'W/"abc123"'
+        get_overview.assert_not_awaited()
+
+
+# ---------------------------------------------------------------------------
+# Serialization (service output sent without a response_model pass)
+# ---------------------------------------------------------------------------
+
+class TestResponseSerialization:
+    def test_forecast_body_matches_response_model(self):
+        with patch(
+            "app.api.v1.weather.WeatherService.get_aggregated_forecast",
+            new=AsyncMock(return_value=[SAMPLE_FORECAST_ITEM]),
+        ):
+            resp = client.get("/api/v1/weather/forecast?city_id=1&days=5")
+
+        expected = ForecastResponse(
+            city_id=1,
+            days=5,
+            forecasts=[
+                ForecastPoint(forecast_dt=SAMPLE_FORECAST_ITEM["forecast_dt"], weather=SAMPLE_WEATHER)
+            ],
+        )
+        assert resp.content == expected.model_dump_json().encode()
+        assert resp.headers["content-type"] == "application/json"
+
+    def test_chart_body_matches_response_model(self):
+        with patch(
+            "app.api.v1.weather.WeatherService.get_chart_hourly",
+            new=AsyncMock(return_value=SAMPLE_HOURLY),
+        ):
+            resp = client.get("/api/v1/weather/chart/hourly?city_id=1")
+
+        adapter = TypeAdapter(list[ChartPoint])
+        assert resp.content == adapter.dump_json(adapter.validate_python(SAMPLE_HOURLY))
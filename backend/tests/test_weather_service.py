@@ -1,17 +1,33 @@
 """Unit tests for weather service."""
 
+import asyncio
+import json
 from datetime import datetime, timedelta, timezone
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, PropertyMock, patch
 
 import pytest
 import pytest_asyncio
-from sqlalchemy import select
+from sqlalchemy import event, select
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
+from app.core.cache import SharedCache, shared_cache
 from app.core.database import Base
+from app.core.http import HttpClient
+from app.fetchers.base import UpstreamError
+from app.fetchers.circuit_breaker import get_circuit_breaker
+from app.fetchers.yandex_weather import YandexWeatherFetcher
 from app.models import City, WeatherRecord, WeatherSource
-from app.schemas.weather import AggregatedWeather
+from app.schemas.weather import (
+    AggregatedWeather,
+    AggregatedWeatherResponse,
+    ChartPoint,
+    ForecastPoint,
+)
+from app.services.aggregate_store import AggregateStore
+from app.services.response_cache import response_cache
+from app.services.source_catalog import source_catalog
+from app.services.source_manager import source_manager
 from app.services.weather_service import WeatherService
 
 
@@ -111,7 +127,7 @@ class TestWeatherService:
     @pytest.mark.asyncio
     async def test_get_aggregated_current_no_data(self, weather_service):
         """Test getting aggregated current weather when no data exists."""
-        with patch.object(weather_service, "fetch_and_save", new_callable=AsyncMock) as mock_fetch:
+        with patch.object(weather_service, "refresh_city", new_callable=AsyncMock) as mock_fetch:
             result = await weather_service.get_aggregated_current(city_id=1)
 
             # Should trigger fetch since no data exists
@@ -135,7 +151,7 @@ class TestWeatherService:
         await db_session.commit()
 
         # Get aggregated data
-        with patch.object(weather_service, "fetch_and_save", new_callable=AsyncMock) as mock_fetch:
+        with patch.object(weather_service, "refresh_city", new_callable=AsyncMock) as mock_fetch:
             result = await weather_service.get_aggregated_current(city_id=1)
 
             # Should not trigger fetch since data is fresh
@@ -147,6 +163,246 @@ class TestWeatherService:
             # Weighted average: (20*3 + 22*2) / (3+2) = 104/5 = 20.8
             assert result.temperature == pytest.approx(20.8, rel=0.01)
 
+    @pytest.mark.asyncio
+    async def test_get_aggregated_current_counts_each_source_once(
+        self, db_session, weather_service
+    ):
+        """A source fetched twice within the window only contributes its newest record."""
+        now = datetime.now(timezone.utc)
+        db_session.add_all([
+            create_weather_record(
+                city_id=1, source_id=1, record_type="current", temperature=10.0,
+                fetched_at=now - timedelta(minutes=20),
+            ),
+            create_weather_record(
+                city_id=1, source_id=1, record_type="current", temperature=20.0, fetched_at=now
+            ),
+            create_weather_record(
+                city_id=1, source_id=2, record_type="current", temperature=22.0, fetched_at=now
+            ),
+        ])
+        await db_session.commit()
+
+        with patch.object(weather_service, "refresh_city", new_callable=AsyncMock):
+            result = await weather_service.get_aggregated_current(city_id=1)
+
+        assert result.temperature == pytest.approx(20.8, rel=0.01)
+
+    @pytest.mark.asyncio
+    async def test_fresh_reads_take_one_query(self, db_session, weather_service):
+        """With the source catalog loaded, a fresh read is a single SQL round trip."""
+        now = datetime.now(timezone.utc)
+        db_session.add_all([
+            create_weather_record(
+                city_id=1, source_id=1, record_type="current", temperature=20.0, fetched_at=now
+            ),
+            create_weather_record(
+                city_id=1, source_id=1, record_type="forecast", temperature=18.0,
+                fetched_at=now, forecast_dt=now + timedelta(hours=3),
+            ),
+        ])
+        await db_session.commit()
+        await weather_service.get_aggregated_current(city_id=1)
+
+        statements = []
+        listener = lambda conn, cursor, statement, *args: statements.append(statement)
+        event.listen(db_session.bind.sync_engine, "before_cursor_execute", listener)
+        try:
+            await weather_service.get_aggregated_current(
+                city_id=1, source_slugs=["openweathermap"]
+            )
+            await weather_service.get_aggregated_forecast(city_id=1)
+        finally:
+            event.remove(db_session.bind.sync_engine, "before_cursor_execute", listener)
+
+        assert len(statements) == 2
+
+    @pytest.mark.asyncio
+    async def test_repeated_reads_are_served_from_response_cache(
+        self, db_session, weather_service
+    ):
+        """A second identical read touches neither the database nor aggregate()."""
+        now = datetime.now(timezone.utc)
+        db_session.add(
+            create_weather_record(
+                city_id=1, source_id=1, record_type="current", temperature=20.0, fetched_at=now
+            )
+        )
+        await db_session.commit()
+        first = await weather_service.get_aggregated_current(city_id=1)
+
+        statements = []
+        listener = lambda conn, cursor, statement, *args: statements.append(statement)
+        event.listen(db_session.bind.sync_engine, "before_cursor_execute", listener)
+        try:
+            service = WeatherService(db_session)
+            second = await service.get_aggregated_current(city_id=1)
+        finally:
+            event.remove(db_session.bind.sync_engine, "before_cursor_execute", listener)
+
+        assert statements == []
+        assert second is first
+        assert service.freshness.fetched_at == now
+        assert response_cache.stats()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_response_after_foreground_refresh_is_cached(
+        self, db_session, weather_service
+    ):
+        """The read that refreshed a cold city caches what it read back."""
+        fetcher = MagicMock()
+        fetcher.get_name.return_value = "OpenWeatherMap"
+        fetcher.fetch_current = AsyncMock(return_value={"temperature": 25.0})
+        fetcher.fetch_forecast = AsyncMock(return_value=[])
+
+        async def refresh(city_id):
+            await WeatherService(db_session).fetch_and_save(city_id)
+
+        with (
+            patch.object(source_manager, "get_fetchers", return_value=[fetcher]),
+            patch.object(WeatherService, "refresh_city", side_effect=refresh),
+        ):
+            first = await weather_service.get_aggregated_current(city_id=1)
+            second = await WeatherService(db_session).get_aggregated_current(city_id=1)
+
+        assert first.temperature == 25.0
+        assert second is first
+        assert fetcher.fetch_current.await_count == 1
+        assert response_cache.stats()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_saving_new_data_invalidates_cached_responses(
+        self, db_session, weather_service
+    ):
+        """fetch_and_save drops the city's cached responses as soon as it commits."""
+        db_session.add(
+            create_weather_record(
+                city_id=1, source_id=1, record_type="current", temperature=10.0,
+                fetched_at=datetime.now(timezone.utc) - timedelta(minutes=1),
+            )
+        )
+        await db_session.commit()
+        assert (await weather_service.get_aggregated_current(city_id=1)).temperature == 10.0
+
+        fetcher = MagicMock()
+        fetcher.get_name.return_value = "OpenWeatherMap"
+        fetcher.fetch_current = AsyncMock(return_value={"temperature": 30.0})
+        fetcher.fetch_forecast = AsyncMock(return_value=[])
+        with patch.object(source_manager, "get_fetchers", return_value=[fetcher]):
+            await weather_service.fetch_and_save(city_id=1)
+
+        assert (await weather_service.get_aggregated_current(city_id=1)).temperature == 30.0
+        assert response_cache.stats()["invalidations"] == 1
+
+    @pytest.mark.asyncio
+    async def test_responses_are_shared_between_workers(self, db_session, weather_service):
+        """With a distributed shared cache a worker with a cold cache reuses the response."""
+        db_session.add(
+            create_weather_record(
+                city_id=1, source_id=1, record_type="current", temperature=20.0,
+                fetched_at=datetime.now(timezone.utc),
+            )
+        )
+        await db_session.commit()
+        with patch.object(SharedCache, "distributed", new_callable=PropertyMock, return_value=True):
+            first = await weather_service.get_aggregated_current(city_id=1)
+            response_cache.reset()  # another worker
+
+            statements = []
+            listener = lambda conn, cursor, statement, *args: statements.append(statement)
+            event.listen(db_session.bind.sync_engine, "before_cursor_execute", listener)
+            try:
+                second = await WeatherService(db_session).get_aggregated_current(city_id=1)
+            finally:
+                event.remove(db_session.bind.sync_engine, "before_cursor_execute", listener)
+
+        assert statements == []
+        assert second == first
+        assert shared_cache.hits == 1
+
+    @pytest.mark.asyncio
+    async def test_shared_forecast_keeps_its_types(self, db_session, weather_service):
+        """Shared responses travel as JSON and come back as the same values."""
+        now = datetime.now(timezone.utc)
+        db_session.add(
+            create_weather_record(
+                city_id=1, source_id=1, record_type="forecast", temperature=12.0,
+                fetched_at=now, forecast_dt=now + timedelta(hours=3),
+            )
+        )
+        await db_session.commit()
+        with patch.object(SharedCache, "distributed", new_callable=PropertyMock, return_value=True):
+            first = await weather_service.get_aggregated_forecast(city_id=1, days=3)
+            response_cache.reset()  # another worker
+            second = await WeatherService(db_session).get_aggregated_forecast(city_id=1, days=3)
+
+        assert shared_cache.hits == 1
+        assert second == first
+        assert isinstance(second[0]["forecast_dt"], datetime)
+
+    @pytest.mark.asyncio
+    async def test_saving_new_data_clears_shared_responses(self, db_session, weather_service):
+        db_session.add(
+            create_weather_record(
+                city_id=1, source_id=1, record_type="current", temperature=10.0,
+                fetched_at=datetime.now(timezone.utc) - timedelta(minutes=1),
+            )
+        )
+        await db_session.commit()
+
+        fetcher = MagicMock()
+        fetcher.get_name.return_value = "OpenWeatherMap"
+        fetcher.fetch_current = AsyncMock(return_value={"temperature": 30.0})
+        fetcher.fetch_forecast = AsyncMock(return_value=[])
+        with patch.object(SharedCache, "distributed", new_callable=PropertyMock, return_value=True):
+            await weather_service.get_aggregated_current(city_id=1)
+            with patch.object(source_manager, "get_fetchers", return_value=[fetcher]):
+                await weather_service.fetch_and_save(city_id=1)
+            response_cache.reset()  # another worker
+
+            current = await WeatherService(db_session).get_aggregated_current(city_id=1)
+
+        assert current.temperature == 30.0
+
+    @pytest.mark.asyncio
+    async def test_validator_follows_newest_fetch(self, db_session, weather_service):
+        """The ETag stays the same until a newer snapshot is saved."""
+        assert await weather_service.get_validator("current", 1) is None
+
+        first_fetch = datetime.now(timezone.utc) - timedelta(minutes=5)
+        db_session.add(
+            create_weather_record(
+                city_id=1, source_id=1, record_type="current", fetched_at=first_fetch
+            )
+        )
+        await db_session.commit()
+        first = await weather_service.get_validator("current", 1)
+        assert first.last_modified == first_fetch
+        assert await weather_service.get_validator("current", 1) == first
+        assert (await weather_service.get_validator("current", 1, ["weatherapi"])) is None
+
+        db_session.add(create_weather_record(city_id=1, source_id=2, record_type="current"))
+        await db_session.commit()
+        second = await weather_service.get_validator("current", 1)
+        assert second.etag != first.etag
+        assert second.last_modified > first.last_modified
+
+    @pytest.mark.asyncio
+    async def test_validator_is_none_when_data_must_be_refreshed(
+        self, db_session, weather_service
+    ):
+        old = datetime.now(timezone.utc) - timedelta(hours=6)
+        db_session.add(
+            create_weather_record(city_id=1, source_id=1, record_type="forecast",
+                                  fetched_at=old, forecast_dt=old + timedelta(days=1))
+        )
+        await db_session.commit()
+
+        assert await weather_service.get_validator("forecast", 1, params=(5,)) is None
+        # Charts serve whatever forecast exists, so they still validate
+        chart = await weather_service.get_validator("chart_daily", 1, params=(5,))
+        assert chart.last_modified == old
+
     @pytest.mark.asyncio
     async def test_get_aggregated_current_stale_data(self, db_session, weather_service):
         """Test getting aggregated current weather with stale data."""
@@ -160,12 +416,95 @@ class TestWeatherService:
         await db_session.commit()
 
         # Get aggregated data
-        with patch.object(weather_service, "fetch_and_save", new_callable=AsyncMock) as mock_fetch:
+        with patch.object(weather_service, "refresh_city", new_callable=AsyncMock) as mock_fetch:
             result = await weather_service.get_aggregated_current(city_id=1)
 
             # Should trigger fetch since data is stale
             mock_fetch.assert_called_once_with(1)
 
+    @pytest.mark.asyncio
+    async def test_get_aggregated_current_serves_stale_within_grace(
+        self, db_session, weather_service
+    ):
+        """Stale data inside the SWR grace window is served and refreshed in background."""
+        stale_time = datetime.now(timezone.utc) - timedelta(minutes=45)
+        db_session.add(
+            create_weather_record(
+                city_id=1, source_id=1, record_type="current", temperature=20.0, fetched_at=stale_time
+            )
+        )
+        await db_session.commit()
+
+        refresh_started = asyncio.Event()
+        release = asyncio.Event()
+
+        async def slow_refresh(city_id):
+            refresh_started.set()
+            await release.wait()
+
+        with (
+            patch("app.services.weather_service._swr_grace", return_value=timedelta(minutes=90)),
+            patch.object(weather_service, "refresh_city", side_effect=slow_refresh) as mock_refresh,
+        ):
+            result = await asyncio.wait_for(weather_service.get_aggregated_current(city_id=1), 1)
+
+            assert result is not None
+            assert result.temperature == 20.0
+            assert weather_service.freshness.stale is True
+            assert weather_service.freshness.age_seconds >= 45 * 60
+
+            # Refresh runs in the background, not on the request path
+            await asyncio.wait_for(refresh_started.wait(), 1)
+            mock_refresh.assert_called_once_with(1)
+            release.set()
+
+    @pytest.mark.asyncio
+    async def test_get_aggregated_current_past_grace_fetches_in_foreground(
+        self, db_session, weather_service
+    ):
+        """Data older than the grace window is refreshed before responding."""
+        old_time = datetime.now(timezone.utc) - timedelta(hours=3)
+        db_session.add(
+            create_weather_record(
+                city_id=1, source_id=1, record_type="current", temperature=20.0, fetched_at=old_time
+            )
+        )
+        await db_session.commit()
+
+        async def refresh(city_id):
+            db_session.add(create_weather_record(city_id=1, source_id=1, record_type="current", temperature=25.0))
+            await db_session.commit()
+
+        with (
+            patch("app.services.weather_service._swr_grace", return_value=timedelta(minutes=90)),
+            patch.object(weather_service, "refresh_city", side_effect=refresh) as mock_refresh,
+        ):
+            result = await weather_service.get_aggregated_current(city_id=1)
+
+        mock_refresh.assert_awaited_once_with(1)
+        assert result.temperature == 25.0
+        assert weather_service.freshness.stale is False
+
+    @pytest.mark.asyncio
+    async def test_failed_foreground_refresh_serves_old_data_as_stale(
+        self, db_session, weather_service
+    ):
+        """Data still past the grace window after the refresh is not reported fresh."""
+        old_time = datetime.now(timezone.utc) - timedelta(hours=3)
+        db_session.add(
+            create_weather_record(
+                city_id=1, source_id=1, record_type="current", temperature=20.0, fetched_at=old_time
+            )
+        )
+        await db_session.commit()
+
+        with patch.object(weather_service, "refresh_city", new_callable=AsyncMock):
+            result = await weather_service.get_aggregated_current(city_id=1)
+
+        assert result.temperature == 20.0
+        assert weather_service.freshness.stale is True
+        assert weather_service.freshness.age_seconds >= 3 * 3600
+
     @pytest.mark.asyncio
     async def test_get_aggregated_forecast(self, db_session, weather_service):
         """Test getting aggregated forecast data."""
@@ -195,7 +534,7 @@ class TestWeatherService:
         await db_session.commit()
 
         # Get forecast data
-        with patch.object(weather_service, "fetch_and_save", new_callable=AsyncMock):
+        with patch.object(weather_service, "refresh_city", new_callable=AsyncMock):
             result = await weather_service.get_aggregated_forecast(city_id=1, days=5)
 
             assert isinstance(result, list)
@@ -207,6 +546,85 @@ class TestWeatherService:
             assert "data" in first_item
             assert first_item["data"]["temperature"] == pytest.approx(18.8, rel=0.01)
 
+    @pytest.mark.asyncio
+    async def test_get_aggregated_forecast_limits_to_horizon(self, db_session, weather_service):
+        """Past points and points beyond ``days`` are excluded; hourly data is not truncated."""
+        now = datetime.now(timezone.utc)
+        hour = now.replace(minute=0, second=0, microsecond=0)
+        # Hourly source: from 5 hours ago to 5 days ahead
+        db_session.add_all([
+            create_weather_record(
+                city_id=1, source_id=2, record_type="forecast", temperature=10.0,
+                fetched_at=now, forecast_dt=hour + timedelta(hours=h),
+            )
+            for h in range(-5, 5 * 24)
+        ])
+        await db_session.commit()
+
+        with patch.object(weather_service, "refresh_city", new_callable=AsyncMock):
+            result = await weather_service.get_aggregated_forecast(city_id=1, days=3)
+
+        times = [item["forecast_dt"] for item in result]
+        assert len(result) == 3 * 24
+        assert times == sorted(times)
+        assert times[0] == hour
+        assert times[-1] == hour + timedelta(hours=3 * 24 - 1)
+
+    @pytest.mark.asyncio
+    async def test_get_aggregated_current_many(self, db_session, weather_service):
+        """All cities are read together and stale ones refreshed in one call."""
+        now = datetime.now(timezone.utc)
+        db_session.add(City(id=2, name="Kazan", country="RU", lat=55.79, lon=49.12))
+        db_session.add(City(id=3, name="Sochi", country="RU", lat=43.6, lon=39.73))
+        db_session.add_all([
+            create_weather_record(
+                city_id=1, source_id=1, record_type="current", temperature=20.0, fetched_at=now
+            ),
+            create_weather_record(
+                city_id=1, source_id=2, record_type="current", temperature=22.0, fetched_at=now
+            ),
+            create_weather_record(
+                city_id=2, source_id=2, record_type="current", temperature=5.0,
+                fetched_at=now - timedelta(hours=5),
+            ),
+        ])
+        await db_session.commit()
+
+        with patch.object(
+            weather_service, "refresh_cities", new_callable=AsyncMock
+        ) as mock_refresh:
+            result = await weather_service.get_aggregated_current_many([1, 2, 3])
+
+        # City 2 is past the grace window and city 3 has no data; the mocked
+        # refresh adds nothing, so city 2 falls back to what is stored
+        mock_refresh.assert_awaited_once_with([2, 3])
+        assert sorted(result) == [1, 2]
+        assert result[1].temperature == pytest.approx(20.8, rel=0.01)
+        assert weather_service.freshness_by_city[1].stale is False
+        assert weather_service.freshness_by_city[2].stale is True
+
+    @pytest.mark.asyncio
+    async def test_get_aggregated_forecast_many(self, db_session, weather_service):
+        """Forecasts of several cities are aggregated per city."""
+        now = datetime.now(timezone.utc)
+        tomorrow = now + timedelta(days=1)
+        db_session.add(City(id=2, name="Kazan", country="RU", lat=55.79, lon=49.12))
+        for city_id, temperature in ((1, 18.0), (2, 4.0)):
+            db_session.add(
+                create_weather_record(
+                    city_id=city_id, source_id=1, record_type="forecast",
+                    temperature=temperature, fetched_at=now, forecast_dt=tomorrow,
+                )
+            )
+        await db_session.commit()
+
+        with patch.object(weather_service, "refresh_cities", new_callable=AsyncMock) as mock_refresh:
+            result = await weather_service.get_aggregated_forecast_many([1, 2], days=3)
+
+        mock_refresh.assert_not_called()
+        assert result[1][0]["data"]["temperature"] == 18.0
+        assert result[2][0]["data"]["temperature"] == 4.0
+
     @pytest.mark.asyncio
     async def test_get_by_source(self, db_session, weather_service):
         """Test getting weather data grouped by source."""
@@ -237,6 +655,26 @@ class TestWeatherService:
         assert owm_data["priority"] == 3
         assert owm_data["data"]["temperature"] == 20.0
 
+    @pytest.mark.asyncio
+    async def test_get_by_source_returns_newest_record(self, db_session, weather_service):
+        """Test that older records of a source are ignored."""
+        now = datetime.now(timezone.utc)
+        db_session.add_all([
+            create_weather_record(
+                city_id=1, source_id=1, record_type="current", temperature=15.0,
+                fetched_at=now - timedelta(hours=5),
+            ),
+            create_weather_record(
+                city_id=1, source_id=1, record_type="current", temperature=20.0, fetched_at=now
+            ),
+        ])
+        await db_session.commit()
+
+        result = await weather_service.get_by_source(city_id=1)
+
+        assert list(result) == ["openweathermap"]
+        assert result["openweathermap"]["data"]["temperature"] == 20.0
+
     @pytest.mark.asyncio
     async def test_get_chart_hourly(self, db_session, weather_service):
         """Test getting hourly chart data."""
@@ -312,59 +750,24 @@ class TestWeatherService:
         assert first_day["temp_min"] <= first_day["temp_avg"] <= first_day["temp_max"]
 
     @pytest.mark.asyncio
-    async def test_get_source_priorities(self, weather_service):
-        """Test getting source priorities."""
-        priorities = await weather_service._get_source_priorities()
-
-        assert isinstance(priorities, dict)
-        assert len(priorities) == 2
-        assert priorities[1] == 3  # OpenWeatherMap
-        assert priorities[2] == 2  # WeatherAPI
-
-    @pytest.mark.asyncio
-    async def test_get_source_priorities_filtered(self, weather_service):
-        """Test getting source priorities with filtering."""
-        priorities = await weather_service._get_source_priorities(
-            source_slugs=["openweathermap"]
-        )
-
-        assert isinstance(priorities, dict)
-        assert len(priorities) == 1
-        assert priorities[1] == 3
-
-    @pytest.mark.asyncio
-    async def test_is_data_stale_no_data(self, weather_service):
-        """Test checking if data is stale when no data exists."""
-        is_stale = await weather_service._is_data_stale(city_id=1, record_type="current")
-        assert is_stale is True
-
-    @pytest.mark.asyncio
-    async def test_is_data_stale_fresh_data(self, db_session, weather_service):
-        """Test checking if data is stale with fresh data."""
-        # Add fresh record
+    async def test_charts_use_only_the_newest_snapshot(self, db_session, weather_service):
+        """An older snapshot of the same source is not averaged into the charts."""
         now = datetime.now(timezone.utc)
-        record = create_weather_record(
-            city_id=1, source_id=1, record_type="current", fetched_at=now
-        )
-        db_session.add(record)
+        forecast_dt = now + timedelta(hours=2)
+        for fetched_at, temperature in ((now - timedelta(minutes=10), 10.0), (now, 20.0)):
+            db_session.add(
+                create_weather_record(
+                    city_id=1, source_id=1, record_type="forecast", temperature=temperature,
+                    fetched_at=fetched_at, forecast_dt=forecast_dt,
+                )
+            )
         await db_session.commit()
 
-        is_stale = await weather_service._is_data_stale(city_id=1, record_type="current")
-        assert is_stale is False
+        hourly = await weather_service.get_chart_hourly(city_id=1)
+        daily = await weather_service.get_chart_daily(city_id=1, days=1)
 
-    @pytest.mark.asyncio
-    async def test_is_data_stale_old_data(self, db_session, weather_service):
-        """Test checking if data is stale with old data."""
-        # Add old record (45 minutes ago)
-        old_time = datetime.now(timezone.utc) - timedelta(minutes=45)
-        record = create_weather_record(
-            city_id=1, source_id=1, record_type="current", fetched_at=old_time
-        )
-        db_session.add(record)
-        await db_session.commit()
-
-        is_stale = await weather_service._is_data_stale(city_id=1, record_type="current")
-        assert is_stale is True
+        assert [point["temperature"] for point in hourly] == [20.0]
+        assert daily[0]["temp_min"] == daily[0]["temp_max"] == 20.0
 
     @pytest.mark.asyncio
     async def test_fetch_and_save(self, db_session, weather_service):
@@ -406,12 +809,8 @@ class TestWeatherService:
             ]
         )
 
-        with patch(
-            "app.services.weather_service.load_fetchers_from_config_dir",
-            return_value=[mock_fetcher],
-        ):
-            with patch("app.services.weather_service.register_all_fetchers"):
-                await weather_service.fetch_and_save(city_id=1)
+        with patch.object(source_manager, "get_fetchers", return_value=[mock_fetcher]):
+            await weather_service.fetch_and_save(city_id=1)
 
         # Check that records were saved
         query = select(WeatherRecord).where(WeatherRecord.city_id == 1)
@@ -429,3 +828,470 @@ class TestWeatherService:
         forecast_records = [r for r in records if r.record_type == "forecast"]
         assert len(forecast_records) == 1
         assert forecast_records[0].temperature == 22.0
+
+    @pytest.mark.asyncio
+    async def test_fetch_and_save_queries_sources_concurrently(self, db_session, weather_service):
+        """Both sources must be in flight at the same time; each commits on its own."""
+        owm_started = asyncio.Event()
+        weatherapi_started = asyncio.Event()
+
+        def make_fetcher(name, started, other_started, temperature):
+            async def fetch_current(city, **coords):
+                started.set()
+                # Deadlocks (and times out) if sources are fetched sequentially
+                await asyncio.wait_for(other_started.wait(), timeout=2)
+                return {"temperature": temperature}
+
+            fetcher = MagicMock()
+            fetcher.get_name.return_value = name
+            fetcher.fetch_current = fetch_current
+            fetcher.fetch_forecast = AsyncMock(return_value=[])
+            return fetcher
+
+        fetchers = [
+            make_fetcher("OpenWeatherMap", owm_started, weatherapi_started, 20.0),
+            make_fetcher("WeatherAPI", weatherapi_started, owm_started, 22.0),
+        ]
+
+        with patch.object(source_manager, "get_fetchers", return_value=fetchers):
+            await weather_service.fetch_and_save(city_id=1)
+
+        result = await db_session.execute(
+            select(WeatherRecord).where(WeatherRecord.record_type == "current")
+        )
+        temperatures = sorted(r.temperature for r in result.scalars().all())
+        assert temperatures == [20.0, 22.0]
+
+    @pytest.mark.asyncio
+    async def test_fetch_and_save_isolates_failing_source(self, db_session, weather_service):
+        """A source that raises must not prevent the other source from being saved."""
+        failing = MagicMock()
+        failing.get_name.return_value = "OpenWeatherMap"
+        failing.fetch_current = AsyncMock(side_effect=RuntimeError("boom"))
+        failing.fetch_forecast = AsyncMock(side_effect=RuntimeError("boom"))
+
+        working = MagicMock()
+        working.get_name.return_value = "WeatherAPI"
+        working.fetch_current = AsyncMock(return_value={"temperature": 22.0})
+        working.fetch_forecast = AsyncMock(return_value=[])
+
+        with patch.object(source_manager, "get_fetchers", return_value=[failing, working]):
+            await weather_service.fetch_and_save(city_id=1)
+
+        result = await db_session.execute(select(WeatherRecord))
+        records = result.scalars().all()
+        assert [(r.source_id, r.temperature) for r in records] == [(2, 22.0)]
+
+    @pytest.mark.asyncio
+    async def test_fetch_and_save_many_uses_one_batch_call_per_source(
+        self, db_session, weather_service
+    ):
+        """A batch of cities is handed to each fetcher at once, keyed by city id."""
+        db_session.add(City(id=2, name="London", country="GB", lat=51.51, lon=-0.13))
+        await db_session.commit()
+
+        fetcher = MagicMock()
+        fetcher.get_name.return_value = "OpenWeatherMap"
+        fetcher.fetch_many = AsyncMock(
+            return_value={1: ({"temperature": 20.0}, []), 2: ({"temperature": 11.0}, [])}
+        )
+
+        with patch.object(source_manager, "get_fetchers", return_value=[fetcher]):
+            await weather_service.fetch_and_save_many([1, 2])
+
+        locations = fetcher.fetch_many.await_args.args[0]
+        assert sorted((loc.key, loc.lat is not None) for loc in locations) == [(1, True), (2, True)]
+        result = await db_session.execute(select(WeatherRecord))
+        assert sorted((r.city_id, r.temperature) for r in result.scalars()) == [(1, 20.0), (2, 11.0)]
+
+    @pytest.mark.asyncio
+    async def test_fetch_and_save_skips_source_with_open_circuit(self, db_session, weather_service):
+        """A source whose breaker is open is not called; the others are still saved."""
+        breaker = get_circuit_breaker("OpenWeatherMap", {"min_calls": 1})
+        breaker.record_failure(10.0, "timeout")
+        assert breaker.state == "open"
+
+        skipped = MagicMock()
+        skipped.get_name.return_value = "OpenWeatherMap"
+        skipped.fetch_current = AsyncMock(return_value={"temperature": 20.0})
+        skipped.fetch_forecast = AsyncMock(return_value=[])
+
+        working = MagicMock()
+        working.get_name.return_value = "WeatherAPI"
+        working.fetch_current = AsyncMock(return_value={"temperature": 22.0})
+        working.fetch_forecast = AsyncMock(return_value=[])
+
+        with patch.object(source_manager, "get_fetchers", return_value=[skipped, working]):
+            await weather_service.fetch_and_save(city_id=1)
+
+        skipped.fetch_current.assert_not_called()
+        result = await db_session.execute(select(WeatherRecord))
+        assert [(r.source_id, r.temperature) for r in result.scalars()] == [(2, 22.0)]
+        assert get_circuit_breaker("WeatherAPI").snapshot()["recent_calls"] == 1
+
+    @pytest.mark.asyncio
+    async def test_only_upstream_errors_count_as_breaker_failures(
+        self, db_session, weather_service
+    ):
+        """"City not found" is an answer from the source; a 5xx or timeout is a failure."""
+        not_found = MagicMock()
+        not_found.get_name.return_value = "OpenWeatherMap"
+        not_found.fetch_current = AsyncMock(return_value={})
+        not_found.fetch_forecast = AsyncMock(return_value=[])
+
+        failing = MagicMock()
+        failing.get_name.return_value = "WeatherAPI"
+        failing.fetch_current = AsyncMock(side_effect=UpstreamError("HTTP 503"))
+        failing.fetch_forecast = AsyncMock(side_effect=UpstreamError("timeout"))
+
+        with patch.object(source_manager, "get_fetchers", return_value=[not_found, failing]):
+            await weather_service.fetch_and_save(city_id=1)
+
+        assert get_circuit_breaker("OpenWeatherMap").snapshot()["failure_rate"] == 0.0
+        failed = get_circuit_breaker("WeatherAPI").snapshot()
+        assert failed["failure_rate"] == 1.0
+        assert failed["last_error"] == "HTTP 503; timeout"
+
+    @pytest.mark.asyncio
+    async def test_markup_change_opens_the_breaker(self, db_session, weather_service):
+        """A page that no longer parses fails every city: the breaker trips."""
+        db_session.add(
+            WeatherSource(
+                id=3, slug="yandex_weather", display_name="YandexWeather",
+                source_type="parser", priority=1, is_enabled=True,
+                config_file="yandex_weather.yaml",
+            )
+        )
+        await db_session.commit()
+        fetcher = YandexWeatherFetcher({
+            "name": "YandexWeather",
+            "connection": {"base_url": "https://yandex.ru/pogoda"},
+            "circuit_breaker": {"min_calls": 3, "failure_rate_threshold": 0.6},
+        })
+        response = MagicMock(status=200)
+        response.text = AsyncMock(return_value="<html><body>redesigned</body></html>")
+        session = MagicMock()
+        session.get.return_value.__aenter__ = AsyncMock(return_value=response)
+        session.get.return_value.__aexit__ = AsyncMock(return_value=None)
+
+        with (
+            patch.object(source_manager, "get_fetchers", return_value=[fetcher]),
+            patch.object(HttpClient, "session", new_callable=PropertyMock, return_value=session),
+        ):
+            for _ in range(4):
+                await weather_service.fetch_and_save(city_id=1)
+
+        assert get_circuit_breaker("YandexWeather").state == "open"
+        # The fourth refresh skipped the source without a request
+        assert session.get.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_fetch_and_save_bulk_inserts_large_forecast(self, db_session, weather_service):
+        """Forecast batches larger than one INSERT chunk are written completely."""
+        base_ts = int(datetime(2026, 3, 1, tzinfo=timezone.utc).timestamp())
+        forecast = [
+            {"temperature": float(i % 30), "humidity": 50, "forecast_time": base_ts + i * 3600}
+            for i in range(1200)
+        ]
+        fetcher = MagicMock()
+        fetcher.get_name.return_value = "WeatherAPI"
+        fetcher.fetch_current = AsyncMock(return_value={"temperature": 21.0})
+        fetcher.fetch_forecast = AsyncMock(return_value=forecast)
+
+        with patch.object(source_manager, "get_fetchers", return_value=[fetcher]):
+            await weather_service.fetch_and_save(city_id=1)
+
+        result = await db_session.execute(
+            select(WeatherRecord)
+            .where(WeatherRecord.record_type == "forecast")
+            .order_by(WeatherRecord.forecast_dt)
+        )
+        records = result.scalars().all()
+
+        assert len(records) == 1200
+        assert all(r.source_id == 2 for r in records)
+        assert records[-1].temperature == float(1199 % 30)
+        # The whole batch is stamped as one snapshot
+        assert len({r.fetched_at for r in records}) == 1
+
+
+class TestPrecomputedAggregates:
+    """Responses stored by precompute_aggregates match the regular reads."""
+
+    @pytest_asyncio.fixture
+    async def city_data(self, db_session):
+        now = datetime.now(timezone.utc)
+        hour = now.replace(minute=0, second=0, microsecond=0)
+        for source_id, temperature in ((1, 10.0), (2, 14.0)):
+            db_session.add(
+                create_weather_record(
+                    city_id=1, source_id=source_id, record_type="current",
+                    temperature=temperature, fetched_at=now,
+                )
+            )
+            for step in range(1, 30):
+                db_session.add(
+                    create_weather_record(
+                        city_id=1, source_id=source_id, record_type="forecast",
+                        temperature=temperature + step % 5, fetched_at=now,
+                        forecast_dt=hour + timedelta(hours=3 * step),
+                    )
+                )
+        await db_session.commit()
+        return now
+
+    @pytest.mark.asyncio
+    async def test_current_matches_regular_read(self, db_session, weather_service, city_data):
+        await weather_service.precompute_aggregates([1])
+
+        service = WeatherService(db_session)
+        precomputed = await service.get_precomputed("current", 1)
+        live = await WeatherService(db_session).get_aggregated_current(city_id=1)
+
+        body = json.loads(precomputed.body)
+        expected = AggregatedWeatherResponse(
+            city_id=1, fetched_at=city_data, weather=live, data_age_seconds=0
+        ).model_dump(mode="json")
+        assert body.pop("data_age_seconds") <= 1
+        expected.pop("data_age_seconds")
+        assert body == expected
+        assert service.freshness.fetched_at == city_data
+        assert precomputed.validator == await service.get_validator("current", 1)
+
+    @pytest.mark.asyncio
+    async def test_forecast_and_charts_match_regular_reads(
+        self, db_session, weather_service, city_data
+    ):
+        await weather_service.precompute_aggregates([1])
+        service = WeatherService(db_session)
+
+        forecast = json.loads((await service.get_precomputed("forecast", 1, params=(5,))).body)
+        live = await WeatherService(db_session).get_aggregated_forecast(city_id=1, days=5)
+        assert forecast["days"] == 5
+        assert forecast["stale"] is False
+        assert forecast["forecasts"] == [
+            ForecastPoint(
+                forecast_dt=item["forecast_dt"], weather=AggregatedWeather(**item["data"])
+            ).model_dump(mode="json")
+            for item in live
+        ]
+
+        hourly = json.loads((await service.get_precomputed("chart_hourly", 1)).body)
+        live_hourly = await WeatherService(db_session).get_chart_hourly(1)
+        assert hourly == [ChartPoint(**item).model_dump(mode="json") for item in live_hourly]
+
+        daily = json.loads((await service.get_precomputed("chart_daily", 1, params=(3,))).body)
+        assert daily == await WeatherService(db_session).get_chart_daily(1, days=3)
+
+    @pytest.mark.asyncio
+    async def test_read_is_one_statement(self, db_session, weather_service, city_data):
+        await weather_service.precompute_aggregates([1])
+        await source_catalog.get(db_session)
+
+        statements = []
+        listener = lambda conn, cursor, statement, *args: statements.append(statement)
+        event.listen(db_session.bind.sync_engine, "before_cursor_execute", listener)
+        try:
+            assert await WeatherService(db_session).get_precomputed("current", 1) is not None
+        finally:
+            event.remove(db_session.bind.sync_engine, "before_cursor_execute", listener)
+
+        assert len(statements) == 1
+        assert "weather_aggregates" in statements[0]
+
+    @pytest.mark.asyncio
+    async def test_fetch_and_save_precomputes(self, weather_service):
+        fetcher = MagicMock()
+        fetcher.get_name.return_value = "OpenWeatherMap"
+        fetcher.fetch_current = AsyncMock(return_value={"temperature": 30.0})
+        fetcher.fetch_forecast = AsyncMock(return_value=[])
+        with patch.object(source_manager, "get_fetchers", return_value=[fetcher]):
+            await weather_service.fetch_and_save(city_id=1)
+
+        precomputed = await weather_service.get_precomputed("current", 1)
+        assert json.loads(precomputed.body)["weather"]["temperature"] == 30.0
+        # No forecast was returned, so there is nothing to precompute for it
+        assert await weather_service.get_precomputed("forecast", 1, params=(5,)) is None
+
+    @pytest.mark.asyncio
+    async def test_failed_precompute_drops_the_old_payload(self, weather_service, city_data):
+        await weather_service.precompute_aggregates([1])
+        assert await weather_service.get_precomputed("current", 1) is not None
+
+        fetcher = MagicMock()
+        fetcher.get_name.return_value = "OpenWeatherMap"
+        fetcher.fetch_current = AsyncMock(return_value={"temperature": 30.0})
+        fetcher.fetch_forecast = AsyncMock(return_value=[])
+        with (
+            patch.object(source_manager, "get_fetchers", return_value=[fetcher]),
+            patch.object(
+                WeatherService, "_build_aggregates", side_effect=RuntimeError("boom")
+            ),
+        ):
+            await weather_service.fetch_and_save(city_id=1)
+
+        # The payload built before the refresh is not served any more
+        assert await weather_service.get_precomputed("current", 1) is None
+        assert await weather_service.get_precomputed("chart_hourly", 1) is None
+
+    @pytest.mark.asyncio
+    async def test_unusable_rows_fall_back_to_regular_read(
+        self, db_session, weather_service, city_data
+    ):
+        await weather_service.precompute_aggregates([1])
+
+        assert await weather_service.get_precomputed("current", 1, ["weatherapi"]) is None
+
+        # Priorities are part of the key
+        source = await db_session.get(WeatherSource, 2)
+        source.priority = 5
+        await db_session.commit()
+        source_catalog.invalidate()
+        assert await weather_service.get_precomputed("current", 1) is None
+
+    @pytest.mark.asyncio
+    async def test_expired_data_is_not_served(self, db_session, weather_service):
+        db_session.add(
+            create_weather_record(
+                city_id=1, source_id=1, record_type="current",
+                fetched_at=datetime.now(timezone.utc) - timedelta(minutes=10),
+            )
+        )
+        await db_session.commit()
+        await weather_service.precompute_aggregates([1])
+
+        with patch(
+            "app.services.weather_service._assess_freshness", return_value=None
+        ):
+            assert await weather_service.get_precomputed("current", 1) is None
+
+    @pytest.mark.asyncio
+    async def test_older_data_does_not_replace_newer_payload(self, db_session):
+        store = AggregateStore(db_session)
+        newer = datetime.now(timezone.utc)
+        row = {
+            "city_id": 1, "endpoint": "current", "sources_hash": "h",
+            "fetched_at": newer, "valid_until": None, "computed_at": newer,
+        }
+        await store.save([{**row, "payload": b"new"}])
+        await store.save([{**row, "payload": b"old", "fetched_at": newer - timedelta(hours=1)}])
+        await db_session.commit()
+
+        assert (await store.get(1, "current", "h")).payload == b"new"
+
+
+class TestOverview:
+    """get_overview builds the dashboard parts from one read of the records."""
+
+    @pytest_asyncio.fixture
+    async def city_data(self, db_session):
+        now = datetime.now(timezone.utc)
+        hour = now.replace(minute=0, second=0, microsecond=0)
+        for source_id, temperature in ((1, 10.0), (2, 14.0)):
+            db_session.add(
+                create_weather_record(
+                    city_id=1, source_id=source_id, record_type="current",
+                    temperature=temperature, fetched_at=now,
+                )
+            )
+            for step in range(1, 30):
+                db_session.add(
+                    create_weather_record(
+                        city_id=1, source_id=source_id, record_type="forecast",
+                        temperature=temperature + step % 5, fetched_at=now,
+                        forecast_dt=hour + timedelta(hours=3 * step),
+                    )
+                )
+        await db_session.commit()
+        return now
+
+    @pytest.mark.asyncio
+    async def test_matches_regular_reads(self, db_session, weather_service, city_data):
+        overview = await weather_service.get_overview(1, days=5)
+
+        assert overview.current == await WeatherService(db_session).get_aggregated_current(1)
+        assert overview.current_freshness.fetched_at == city_data
+        assert overview.forecast == await WeatherService(db_session).get_aggregated_forecast(
+            1, days=5
+        )
+        assert overview.chart_hourly == await WeatherService(db_session).get_chart_hourly(1)
+        assert overview.chart_daily == await WeatherService(db_session).get_chart_daily(1, days=5)
+
+    @pytest.mark.asyncio
+    async def test_reads_records_once(self, db_session, weather_service, city_data):
+        await source_catalog.get(db_session)
+
+        statements = []
+        listener = lambda conn, cursor, statement, *args: statements.append(statement)
+        event.listen(db_session.bind.sync_engine, "before_cursor_execute", listener)
+        try:
+            with patch.object(weather_service, "refresh_city", new_callable=AsyncMock) as refresh:
+                await weather_service.get_overview(1)
+        finally:
+            event.remove(db_session.bind.sync_engine, "before_cursor_execute", listener)
+
+        refresh.assert_not_called()
+        # One query for the current snapshot, one for the forecast window
+        assert len(statements) == 2
+
+    @pytest.mark.asyncio
+    async def test_charts_match_chart_endpoints_across_snapshots(
+        self, db_session, weather_service
+    ):
+        """A source's older snapshot counts in the charts as it does in /chart/*."""
+        now = datetime.now(timezone.utc)
+        hour = now.replace(minute=0, second=0, microsecond=0)
+        db_session.add(
+            create_weather_record(city_id=1, source_id=1, record_type="current", fetched_at=now)
+        )
+        for source_id, fetched_at, temperature in (
+            (1, now, 10.0),
+            (2, now - timedelta(minutes=50), 30.0),
+        ):
+            for step in range(1, 30):
+                db_session.add(
+                    create_weather_record(
+                        city_id=1, source_id=source_id, record_type="forecast",
+                        temperature=temperature, fetched_at=fetched_at,
+                        forecast_dt=hour + timedelta(hours=source_id + 2 * step),
+                    )
+                )
+        await db_session.commit()
+
+        overview = await weather_service.get_overview(1, days=5)
+
+        assert overview.chart_hourly == await WeatherService(db_session).get_chart_hourly(1)
+        assert overview.chart_daily == await WeatherService(db_session).get_chart_daily(1, days=5)
+        assert {point["temperature"] for point in overview.chart_hourly} == {10.0, 30.0}
+
+    @pytest.mark.asyncio
+    async def test_validator_covers_current_and_forecast(
+        self, db_session, weather_service, city_data
+    ):
+        first = await weather_service.get_validator("overview", 1, params=(5,))
+        assert first.last_modified == city_data
+
+        # A forecast fetched after the current weather changes both validators
+        db_session.add(
+            create_weather_record(
+                city_id=1, source_id=1, record_type="forecast",
+                fetched_at=city_data + timedelta(seconds=1),
+                forecast_dt=city_data + timedelta(hours=1),
+            )
+        )
+        await db_session.commit()
+        second = await weather_service.get_validator("overview", 1, params=(5,))
+
+        assert second.etag != first.etag
+        assert second.last_modified == city_data + timedelta(seconds=1)
+        assert await weather_service.get_validator("overview", 1, params=(3,)) != second
+
+    @pytest.mark.asyncio
+    async def test_missing_data_is_refreshed_once(self, weather_service):
+        with patch.object(weather_service, "refresh_city", new_callable=AsyncMock) as refresh:
+            overview = await weather_service.get_overview(1)
+
+        refresh.assert_awaited_once_with(1)
+        assert overview.current is None
+        assert overview.forecast == []
+        assert overview.chart_hourly == [] and overview.chart_daily == []
@@ -1,11 +1,13 @@
 """Unit tests for WeatherAPI.com fetcher."""
 
 import asyncio
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, PropertyMock, patch
 
 import aiohttp
 import pytest
 
+from app.core.http import HttpClient
+from app.fetchers.base import Location, UpstreamError
 from app.fetchers.weatherapi import WeatherAPIFetcher
 
 
@@ -232,7 +234,7 @@ class TestFetchCurrentAsync:
     @pytest.mark.asyncio
     async def test_returns_weather_on_200(self, fetcher, mock_current_response):
         mock_session = _mock_http(200, mock_current_response)
-        with patch("aiohttp.ClientSession", return_value=mock_session):
+        with patch.object(HttpClient, "session", new_callable=PropertyMock, return_value=mock_session):
             result = await fetcher.fetch_current("Moscow")
         assert result["temperature"] == 18.0
         assert result["description"] == "Partly cloudy"
@@ -240,43 +242,43 @@ class TestFetchCurrentAsync:
     @pytest.mark.asyncio
     async def test_returns_empty_on_400(self, fetcher):
         mock_session = _mock_http(400, {"error": {"message": "No matching location found."}})
-        with patch("aiohttp.ClientSession", return_value=mock_session):
+        with patch.object(HttpClient, "session", new_callable=PropertyMock, return_value=mock_session):
             result = await fetcher.fetch_current("NonExistentXYZ")
         assert result == {}
 
     @pytest.mark.asyncio
-    async def test_returns_empty_on_500(self, fetcher):
+    async def test_raises_on_500(self, fetcher):
         mock_session = _mock_http(500, {})
-        with patch("aiohttp.ClientSession", return_value=mock_session):
-            result = await fetcher.fetch_current("Moscow")
-        assert result == {}
+        with patch.object(HttpClient, "session", new_callable=PropertyMock, return_value=mock_session):
+            with pytest.raises(UpstreamError):
+                await fetcher.fetch_current("Moscow")
 
     @pytest.mark.asyncio
-    async def test_returns_empty_on_network_error(self, fetcher):
+    async def test_raises_on_network_error(self, fetcher):
         mock_session = MagicMock()
         mock_session.__aenter__ = AsyncMock(return_value=mock_session)
         mock_session.__aexit__ = AsyncMock(return_value=None)
         mock_session.get.side_effect = aiohttp.ClientError("connection refused")
-        with patch("aiohttp.ClientSession", return_value=mock_session):
-            result = await fetcher.fetch_current("Moscow")
-        assert result == {}
+        with patch.object(HttpClient, "session", new_callable=PropertyMock, return_value=mock_session):
+            with pytest.raises(UpstreamError):
+                await fetcher.fetch_current("Moscow")
 
     @pytest.mark.asyncio
-    async def test_returns_empty_on_timeout(self, fetcher):
-        mock_session = AsyncMock()
-        mock_session.__aenter__.return_value = mock_session
-        mock_session.__aexit__.return_value = None
+    async def test_raises_on_timeout(self, fetcher):
+        mock_session = MagicMock()
+        mock_session.__aenter__ = AsyncMock(return_value=mock_session)
+        mock_session.__aexit__ = AsyncMock(return_value=None)
         mock_session.get.side_effect = asyncio.TimeoutError()
-        with patch("aiohttp.ClientSession", return_value=mock_session):
-            result = await fetcher.fetch_current("Moscow")
-        assert result == {}
+        with patch.object(HttpClient, "session", new_callable=PropertyMock, return_value=mock_session):
+            with pytest.raises(UpstreamError):
+                await fetcher.fetch_current("Moscow")
 
 
 class TestFetchForecastAsync:
     @pytest.mark.asyncio
     async def test_returns_hourly_list_on_200(self, fetcher, mock_forecast_response):
         mock_session = _mock_http(200, mock_forecast_response)
-        with patch("aiohttp.ClientSession", return_value=mock_session):
+        with patch.object(HttpClient, "session", new_callable=PropertyMock, return_value=mock_session):
             result = await fetcher.fetch_forecast("London")
         assert len(result) == 2
         assert result[0]["temperature"] == 17.0
@@ -284,7 +286,7 @@ class TestFetchForecastAsync:
     @pytest.mark.asyncio
     async def test_returns_empty_on_error(self, fetcher):
         mock_session = _mock_http(400, {"error": {"message": "Invalid city"}})
-        with patch("aiohttp.ClientSession", return_value=mock_session):
+        with patch.object(HttpClient, "session", new_callable=PropertyMock, return_value=mock_session):
             result = await fetcher.fetch_forecast("???")
         assert result == []
 
@@ -292,7 +294,7 @@ class TestFetchForecastAsync:
     async def test_days_capped_at_7(self, fetcher, mock_forecast_response):
         """days param must not exceed 7 (free plan limit)."""
         mock_session = _mock_http(200, mock_forecast_response)
-        with patch("aiohttp.ClientSession", return_value=mock_session):
+        with patch.object(HttpClient, "session", new_callable=PropertyMock, return_value=mock_session):
             result = await fetcher.fetch_forecast("London", days=10)
         # Verify the call was made (days clipped internally — just check no exception)
         assert isinstance(result, list)
@@ -302,11 +304,60 @@ class TestConnectionTest:
     @pytest.mark.asyncio
     async def test_returns_true_on_200(self, fetcher, mock_current_response):
         mock_session = _mock_http(200, mock_current_response)
-        with patch("aiohttp.ClientSession", return_value=mock_session):
+        with patch.object(HttpClient, "session", new_callable=PropertyMock, return_value=mock_session):
             assert await fetcher.test_connection() is True
 
     @pytest.mark.asyncio
     async def test_returns_false_on_401(self, fetcher):
         mock_session = _mock_http(401, {"error": {"message": "API key invalid"}})
-        with patch("aiohttp.ClientSession", return_value=mock_session):
+        with patch.object(HttpClient, "session", new_callable=PropertyMock, return_value=mock_session):
             assert await fetcher.test_connection() is False
+
+
+class TestFetchMany:
+    @pytest.mark.asyncio
+    async def test_uses_per_location_calls_when_bulk_disabled(
+        self, fetcher, mock_current_response
+    ):
+        mock_session = _mock_http(200, mock_current_response)
+        locations = [Location("Moscow", 55.75, 37.62, key=1), Location("Paris", 48.85, 2.35, key=2)]
+        with patch.object(HttpClient, "session", new_callable=PropertyMock, return_value=mock_session):
+            result = await fetcher.fetch_many(locations)
+
+        assert mock_session.get.call_count == 4
+        mock_session.post.assert_not_called()
+        assert result[2][0]["temperature"] == 18.0
+
+    @pytest.mark.asyncio
+    async def test_bulk_request_when_enabled(
+        self, mock_config, mock_current_response, mock_forecast_response
+    ):
+        fetcher = WeatherAPIFetcher({**mock_config, "bulk": {"enabled": True}})
+        current_bulk = {
+            "bulk": [
+                {"query": {"custom_id": "0", "q": "55.75,37.62", **mock_current_response}},
+                {"query": {"custom_id": "1", "q": "0,0", "error": {"message": "No location"}}},
+            ]
+        }
+        forecast_bulk = {
+            "bulk": [{"query": {"custom_id": "0", "q": "55.75,37.62", **mock_forecast_response}}]
+        }
+
+        def post(url, **kwargs):
+            data = current_bulk if url.endswith("/current.json") else forecast_bulk
+            return _mock_http(200, data).get.return_value
+
+        mock_session = MagicMock()
+        mock_session.post.side_effect = post
+        locations = [Location("Moscow", 55.75, 37.62, key=1), Location("Nowhere", 0.0, 0.0, key=2)]
+        with patch.object(HttpClient, "session", new_callable=PropertyMock, return_value=mock_session):
+            result = await fetcher.fetch_many(locations)
+
+        assert mock_session.post.call_count == 2
+        mock_session.get.assert_not_called()
+        body = mock_session.post.call_args.kwargs["json"]
+        assert body["locations"][0] == {"q": "55.75,37.62", "custom_id": "0"}
+        assert mock_session.post.call_args.kwargs["params"]["q"] == "bulk"
+        assert result[1][0]["temperature"] == 18.0
+        assert len(result[1][1]) == 2
+        assert result[2] == ({}, [])
@@ -1,11 +1,13 @@
 """Unit tests for YandexWeatherFetcher."""
 
 import asyncio
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, PropertyMock, patch
 
 import aiohttp
 import pytest
 
+from app.core.http import HttpClient
+from app.fetchers.base import BadResponseError, UpstreamError
 from app.fetchers.yandex_weather import YandexWeatherFetcher, _city_to_slug
 
 
@@ -53,7 +55,7 @@ def fetcher():
 
 
 def _mock_http(status: int, text: str) -> MagicMock:
-    """Build a mock aiohttp.ClientSession returning the given HTML text."""
+    """Build a mock pooled aiohttp session returning the given HTML text."""
     mock_resp = AsyncMock()
     mock_resp.status = status
     mock_resp.text = AsyncMock(return_value=text)
@@ -148,39 +150,50 @@ class TestFetchHtml:
     @pytest.mark.asyncio
     async def test_returns_html_on_200(self, fetcher):
         mock_session = _mock_http(200, "<html>ok</html>")
-        with patch("aiohttp.ClientSession", return_value=mock_session):
+        with patch.object(HttpClient, "session", new_callable=PropertyMock, return_value=mock_session):
             html = await fetcher._fetch_html("https://yandex.ru/pogoda/moscow", "moscow")
         assert html == "<html>ok</html>"
 
     @pytest.mark.asyncio
     async def test_returns_none_on_404(self, fetcher):
         mock_session = _mock_http(404, "")
-        with patch("aiohttp.ClientSession", return_value=mock_session):
+        with patch.object(HttpClient, "session", new_callable=PropertyMock, return_value=mock_session):
             assert await fetcher._fetch_html("https://yandex.ru/pogoda/xyz", "xyz") is None
 
     @pytest.mark.asyncio
-    async def test_returns_none_on_500(self, fetcher):
+    async def test_raises_on_500(self, fetcher):
         mock_session = _mock_http(500, "")
-        with patch("aiohttp.ClientSession", return_value=mock_session):
-            assert await fetcher._fetch_html("https://yandex.ru/pogoda/moscow", "moscow") is None
+        with patch.object(HttpClient, "session", new_callable=PropertyMock, return_value=mock_session):
+            with pytest.raises(UpstreamError):
+                await fetcher._fetch_html("https://yandex.ru/pogoda/moscow", "moscow")
 
     @pytest.mark.asyncio
-    async def test_returns_none_on_client_error(self, fetcher):
+    @pytest.mark.parametrize("status", [403, 429])
+    async def test_raises_bad_response_when_blocked(self, fetcher, status):
+        mock_session = _mock_http(status, "<html>captcha</html>")
+        with patch.object(HttpClient, "session", new_callable=PropertyMock, return_value=mock_session):
+            with pytest.raises(BadResponseError):
+                await fetcher._fetch_html("https://yandex.ru/pogoda/moscow", "moscow")
+
+    @pytest.mark.asyncio
+    async def test_raises_on_client_error(self, fetcher):
         mock_session = MagicMock()
         mock_session.__aenter__ = AsyncMock(return_value=mock_session)
         mock_session.__aexit__ = AsyncMock(return_value=None)
         mock_session.get.side_effect = aiohttp.ClientError("refused")
-        with patch("aiohttp.ClientSession", return_value=mock_session):
-            assert await fetcher._fetch_html("https://yandex.ru/pogoda/moscow", "moscow") is None
+        with patch.object(HttpClient, "session", new_callable=PropertyMock, return_value=mock_session):
+            with pytest.raises(UpstreamError):
+                await fetcher._fetch_html("https://yandex.ru/pogoda/moscow", "moscow")
 
     @pytest.mark.asyncio
-    async def test_returns_none_on_timeout(self, fetcher):
+    async def test_raises_on_timeout(self, fetcher):
         mock_session = MagicMock()
         mock_session.__aenter__ = AsyncMock(return_value=mock_session)
         mock_session.__aexit__ = AsyncMock(return_value=None)
         mock_session.get.side_effect = asyncio.TimeoutError()
-        with patch("aiohttp.ClientSession", return_value=mock_session):
-            assert await fetcher._fetch_html("https://yandex.ru/pogoda/moscow", "moscow") is None
+        with patch.object(HttpClient, "session", new_callable=PropertyMock, return_value=mock_session):
+            with pytest.raises(UpstreamError):
+                await fetcher._fetch_html("https://yandex.ru/pogoda/moscow", "moscow")
 
 
 # ---------------------------------------------------------------------------
@@ -349,7 +362,7 @@ class TestFetchCurrentAsync:
     @pytest.mark.asyncio
     async def test_returns_data_from_json_on_200(self, fetcher):
         mock_session = _mock_http(200, _NEXTJS_HTML)
-        with patch("aiohttp.ClientSession", return_value=mock_session):
+        with patch.object(HttpClient, "session", new_callable=PropertyMock, return_value=mock_session):
             result = await fetcher.fetch_current("Санкт-Петербург")
         assert result["temperature"] == 1.0
         assert result["description"] == "Пасмурно"
@@ -357,34 +370,41 @@ class TestFetchCurrentAsync:
     @pytest.mark.asyncio
     async def test_returns_empty_on_404(self, fetcher):
         mock_session = _mock_http(404, "")
-        with patch("aiohttp.ClientSession", return_value=mock_session):
+        with patch.object(HttpClient, "session", new_callable=PropertyMock, return_value=mock_session):
             result = await fetcher.fetch_current("Moscow")
         assert result == {}
 
     @pytest.mark.asyncio
-    async def test_returns_empty_on_network_error(self, fetcher):
+    async def test_raises_on_network_error(self, fetcher):
         mock_session = MagicMock()
         mock_session.__aenter__ = AsyncMock(return_value=mock_session)
         mock_session.__aexit__ = AsyncMock(return_value=None)
         mock_session.get.side_effect = aiohttp.ClientError("refused")
-        with patch("aiohttp.ClientSession", return_value=mock_session):
-            result = await fetcher.fetch_current("Moscow")
-        assert result == {}
+        with patch.object(HttpClient, "session", new_callable=PropertyMock, return_value=mock_session):
+            with pytest.raises(UpstreamError):
+                await fetcher.fetch_current("Moscow")
 
     @pytest.mark.asyncio
-    async def test_returns_empty_on_timeout(self, fetcher):
+    async def test_raises_on_timeout(self, fetcher):
         mock_session = MagicMock()
         mock_session.__aenter__ = AsyncMock(return_value=mock_session)
         mock_session.__aexit__ = AsyncMock(return_value=None)
         mock_session.get.side_effect = asyncio.TimeoutError()
-        with patch("aiohttp.ClientSession", return_value=mock_session):
-            result = await fetcher.fetch_current("Moscow")
-        assert result == {}
+        with patch.object(HttpClient, "session", new_callable=PropertyMock, return_value=mock_session):
+            with pytest.raises(UpstreamError):
+                await fetcher.fetch_current("Moscow")
 
     @pytest.mark.asyncio
-    async def test_uses_correct_slug_in_url(self, fetcher):
+    async def test_raises_bad_response_when_page_does_not_parse(self, fetcher):
         mock_session = _mock_http(200, _EMPTY_HTML)
-        with patch("aiohttp.ClientSession", return_value=mock_session):
+        with patch.object(HttpClient, "session", new_callable=PropertyMock, return_value=mock_session):
+            with pytest.raises(BadResponseError):
+                await fetcher.fetch_current("Moscow")
+
+    @pytest.mark.asyncio
+    async def test_uses_correct_slug_in_url(self, fetcher):
+        mock_session = _mock_http(200, _NEXTJS_HTML)
+        with patch.object(HttpClient, "session", new_callable=PropertyMock, return_value=mock_session):
             await fetcher.fetch_current("Москва")
         call_url = mock_session.get.call_args[0][0]
         assert call_url == "https://yandex.ru/pogoda/moscow"
@@ -412,25 +432,25 @@ class TestConnectionTest:
     @pytest.mark.asyncio
     async def test_returns_true_when_json_present(self, fetcher):
         mock_session = _mock_http(200, _NEXTJS_HTML)
-        with patch("aiohttp.ClientSession", return_value=mock_session):
+        with patch.object(HttpClient, "session", new_callable=PropertyMock, return_value=mock_session):
             assert await fetcher.test_connection() is True
 
     @pytest.mark.asyncio
     async def test_returns_true_when_css_fallback_matches(self, fetcher):
         mock_session = _mock_http(200, _CSS_ONLY_HTML)
-        with patch("aiohttp.ClientSession", return_value=mock_session):
+        with patch.object(HttpClient, "session", new_callable=PropertyMock, return_value=mock_session):
             assert await fetcher.test_connection() is True
 
     @pytest.mark.asyncio
     async def test_returns_false_when_no_data(self, fetcher):
         mock_session = _mock_http(200, _EMPTY_HTML)
-        with patch("aiohttp.ClientSession", return_value=mock_session):
+        with patch.object(HttpClient, "session", new_callable=PropertyMock, return_value=mock_session):
             assert await fetcher.test_connection() is False
 
     @pytest.mark.asyncio
     async def test_returns_false_on_http_error(self, fetcher):
         mock_session = _mock_http(500, "")
-        with patch("aiohttp.ClientSession", return_value=mock_session):
+        with patch.object(HttpClient, "session", new_callable=PropertyMock, return_value=mock_session):
             assert await fetcher.test_connection() is False
 
     @pytest.mark.asyncio
@@ -439,5 +459,5 @@ class TestConnectionTest:
         mock_session.__aenter__ = AsyncMock(return_value=mock_session)
         mock_session.__aexit__ = AsyncMock(return_value=None)
         mock_session.get.side_effect = aiohttp.ClientError("refused")
-        with patch("aiohttp.ClientSession", return_value=mock_session):
+        with patch.object(HttpClient, "session", new_callable=PropertyMock, return_value=mock_session):
             assert await fetcher.test_connection() is False
@@ -1,12 +1,16 @@
 """HTTP client for the weather aggregator backend API."""
 
 import logging
+from collections import OrderedDict
 from typing import Any
 
 import aiohttp
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on the number of GET responses kept for conditional requests
+MAX_VALIDATED_RESPONSES = 256
+
 
 class BackendAPIClient:
     """Async HTTP client wrapping the backend REST API.
@@ -19,6 +23,9 @@ class BackendAPIClient:
         self.base_url = base_url.rstrip("/")
         self._timeout = aiohttp.ClientTimeout(total=timeout)
         self._session: aiohttp.ClientSession | None = None
+        # (path, params) -> (ETag, Last-Modified, body) of the last GET response;
+        # repeat GETs revalidate it and reuse the body on 304 Not Modified
+        self._validated: OrderedDict[tuple, tuple[str | None, str | None, Any]] = OrderedDict()
 
     async def _session_get(self) -> aiohttp.ClientSession:
         if self._session is None or self._session.closed:
@@ -32,16 +39,41 @@ class BackendAPIClient:
     async def _get(self, path: str, params: dict | None = None) -> Any | None:
         session = await self._session_get()
         url = f"{self.base_url}{path}"
+        key = (path, repr(sorted((params or {}).items())))
+        cached = self._validated.get(key)
+        headers = {}
+        if cached is not None:
+            etag, last_modified, _ = cached
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
         try:
-            async with session.get(url, params=params) as resp:
+            async with session.get(url, params=params, headers=headers) as resp:
+                if resp.status == 304 and cached is not None:
+                    self._validated.move_to_end(key)
+                    return cached[2]
                 if resp.status == 200:
-                    return await resp.json()
+                    data = await resp.json()
+                    self._remember(key, resp.headers, data)
+                    return data
                 logger.warning("GET %s → %d", url, resp.status)
                 return None
         except Exception as exc:
             logger.error("GET %s failed: %s", url, exc)
             return None
 
+    def _remember(self, key: tuple, headers: Any, data: Any) -> None:
+        """Keep *data* for revalidation if the response carried validators."""
+        self._validated.pop(key, None)
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        if not etag and not last_modified:
+            return
+        self._validated[key] = (etag, last_modified, data)
+        if len(self._validated) > MAX_VALIDATED_RESPONSES:
+            self._validated.popitem(last=False)
+
     async def _post(self, path: str, json: dict | None = None) -> Any | None:
         session = await self._session_get()
         url = f"{self.base_url}{path}"
@@ -9,9 +9,10 @@ from app.services.api_client import BackendAPIClient
 BASE_URL = "http://backend:8000"
 
 
-def _mock_response(status: int, data) -> MagicMock:
+def _mock_response(status: int, data, headers: dict | None = None) -> MagicMock:
     resp = AsyncMock()
     resp.status = status
+    resp.headers = headers or {}
     resp.json = AsyncMock(return_value=data)
     resp.__aenter__ = AsyncMock(return_value=resp)
     resp.__aexit__ = AsyncMock(return_value=False)
@@ -46,6 +47,35 @@ class TestGetCurrentWeather:
         assert result is None
 
 
+class TestConditionalGet:
+    @pytest.mark.asyncio
+    async def test_revalidates_and_reuses_body_on_304(self):
+        client = BackendAPIClient(BASE_URL)
+        data = {"city_id": 1, "weather": {"temperature": 15.0}}
+        validators = {"ETag": 'W/"abc"', "Last-Modified": "Thu, 26 Feb 2026 10:00:30 GMT"}
+        session = _patch_session(client, "get", _mock_response(200, data, validators))
+        assert await client.get_current_weather(city_id=1) == data
+
+        session.get.return_value = _mock_response(304, None)
+        assert await client.get_current_weather(city_id=1) == data
+
+        headers = session.get.call_args.kwargs["headers"]
+        assert headers == {
+            "If-None-Match": 'W/"abc"',
+            "If-Modified-Since": "Thu, 26 Feb 2026 10:00:30 GMT",
+        }
+
+    @pytest.mark.asyncio
+    async def test_validators_are_per_request(self):
+        client = BackendAPIClient(BASE_URL)
+        session = _patch_session(client, "get", _mock_response(200, {}, {"ETag": '"1"'}))
+        await client.get_current_weather(city_id=1)
+
+        await client.get_current_weather(city_id=2)
+
+        assert session.get.call_args.kwargs["headers"] == {}
+
+
 class TestGetForecast:
     @pytest.mark.asyncio
     async def test_returns_forecast_on_200(self):
@@ -1,5 +1,8 @@
 const BASE_URL = "http://localhost:8000/api/v1";
 
+// Upper bound on the number of GET responses kept for conditional requests
+const MAX_VALIDATED_RESPONSES = 100;
+
 export class ApiError extends Error {
   constructor(public status: number, public detail: string) {
     super(detail);
@@ -7,6 +10,30 @@ export class ApiError extends Error {
   }
 }
 
+interface ValidatedResponse {
+  etag: string | null;
+  lastModified: string | null;
+  body: unknown;
+}
+
+// Last body of every GET that came with an ETag / Last-Modified, by URL.
+// Repeat polls send If-None-Match / If-Modified-Since and reuse the body
+// when the backend answers 304 Not Modified.
+const validatedResponses = new Map<string, ValidatedResponse>();
+
+function rememberResponse(url: string, response: Response, body: unknown) {
+  const etag = response.headers.get("ETag");
+  const lastModified = response.headers.get("Last-Modified");
+  validatedResponses.delete(url);
+  if (!etag && !lastModified) return;
+
+  validatedResponses.set(url, { etag, lastModified, body });
+  if (validatedResponses.size > MAX_VALIDATED_RESPONSES) {
+    const oldest = validatedResponses.keys().next().value;
+    if (oldest !== undefined) validatedResponses.delete(oldest);
+  }
+}
+
 async function request<T>(
   method: string,
   path: string,
@@ -14,9 +41,18 @@ async function request<T>(
 ): Promise<T> {
   const url = `${BASE_URL}${path}`;
 
+  const headers: Record<string, string> = {
+    "Content-Type": "application/json",
+  };
+  const cached = method === "GET" ? validatedResponses.get(url) : undefined;
+  if (cached?.etag) headers["If-None-Match"] = cached.etag;
+  if (cached?.lastModified) headers["If-Modified-Since"] = cached.lastModified;
+
   const options: RequestInit = {
     method,
-    headers: { "Content-Type": "application/json" },
+    headers,
+    // Revalidation is done here; keep the browser cache from answering 304s itself
+    cache: method === "GET" ? "no-store" : undefined,
   };
 
   if (body !== undefined) {
@@ -25,6 +61,10 @@ async function request<T>(
 
   const response = await fetch(url, options);
 
+  if (response.status === 304 && cached) {
+    return cached.body as T;
+  }
+
   if (!response.ok) {
     const errorBody = await response
       .json()
@@ -36,7 +76,11 @@ async function request<T>(
     );
   }
 
-  return response.json() as Promise<T>;
+  const data = await response.json();
+  if (method === "GET") {
+    rememberResponse(url, response, data);
+  }
+  return data as T;
 }
 
 export const apiClient = {
@@ -47,4 +91,4 @@ export const apiClient = {
     request<T>("PATCH", path, body),
   delete: <T>(path: string) =>
     request<T>("DELETE", path),
-};
\ No newline at end of file
+};
@@ -1,5 +1,8 @@
 import { useEffect, useState } from "react";
 import { Heart, X, MapPin } from "lucide-react";
+import { useCurrentWeatherBatch } from "../hooks/useCurrentWeatherBatch";
+import { useUnits } from "../context/UnitContext";
+import { convertTemperature } from "../utils/unitConversions";
 
 interface City {
   id: number;
@@ -14,6 +17,11 @@ interface CitiesListProps {
 
 export function CitiesList({ onCitySelected }: CitiesListProps) {
   const [cities, setCities] = useState<City[]>([]);
+  const { tempUnit } = useUnits();
+  const { data: weather } = useCurrentWeatherBatch(cities.map((city) => city.id));
+
+  const temperatureOf = (id: number) =>
+    weather?.items.find((item) => item.city_id === id)?.weather.temperature;
 
   const loadCities = () => {
     try {
@@ -89,6 +97,12 @@ export function CitiesList({ onCitySelected }: CitiesListProps) {
                 {city.country}
               </span>
             </div>
+
+            {temperatureOf(city.id) !== undefined && (
+              <span className="text-sm">
+                {Math.round(convertTemperature(temperatureOf(city.id)!, tempUnit))}°{tempUnit}
+              </span>
+            )}
           </button>
 
 
@@ -1,5 +1,4 @@
-import { useQuery } from "@tanstack/react-query";
-import { apiClient } from "../api/apiClient";
+import { useWeatherOverview } from "./useWeatherOverview";
 
 export interface RecommendationData {
   summary: string;
@@ -12,13 +11,19 @@ export interface RecommendationResponse {
   recommendation: RecommendationData;
 }
 
+// The overview has no recommendation when the ML model is unavailable
 export const useClothingRecommendation = (cityId: number) => {
-  return useQuery<RecommendationResponse>({
-    queryKey: ["Рекомендация", cityId],
-    queryFn: () =>
-      apiClient.get<RecommendationResponse>(
-        `/recommendations/clothing?city_id=${cityId}`
-      ),
-    enabled: !!cityId,
-  });
+  return useWeatherOverview(
+    cityId,
+    (overview): RecommendationResponse | undefined =>
+      overview.recommendation
+        ? {
+            city_id: overview.recommendation.city_id,
+            recommendation: {
+              summary: overview.recommendation.description,
+              advice: overview.recommendation.items,
+            },
+          }
+        : undefined
+  );
 };
\ No newline at end of file
@@ -1,5 +1,4 @@
-import { useQuery } from "@tanstack/react-query";
-import { apiClient } from "../api/apiClient";
+import { useWeatherOverview } from "./useWeatherOverview";
 
 export interface AggregatedWeather {
   temperature: number;
@@ -18,13 +17,8 @@ export interface CurrentWeatherResponse {
 }
 
 export const useCurrentWeather = (cityId: number) => {
-  return useQuery<CurrentWeatherResponse>({
-    queryKey: ["Текущая погода", cityId],
-    queryFn: () =>
-      apiClient.get<CurrentWeatherResponse>(
-        `/weather/current?city_id=${cityId}`
-      ),
-    enabled: !!cityId,
-    retry: 1,
-  });
+  return useWeatherOverview(
+    cityId,
+    (overview) => overview.current ?? undefined
+  );
 };
\ No newline at end of file
@@ -0,0 +1,21 @@
+import { useQuery } from "@tanstack/react-query";
+import { apiClient } from "../api/apiClient";
+import type { CurrentWeatherResponse } from "./useCurrentWeather";
+
+export interface BatchWeatherResponse {
+  items: CurrentWeatherResponse[];
+  missing: number[];
+}
+
+// One request for the current weather of every listed city
+export const useCurrentWeatherBatch = (cityIds: number[]) => {
+  const query = cityIds.map((id) => `city_ids=${id}`).join("&");
+
+  return useQuery<BatchWeatherResponse>({
+    queryKey: ["Текущая погода (список)", cityIds],
+    queryFn: () =>
+      apiClient.get<BatchWeatherResponse>(`/weather/current/batch?${query}`),
+    enabled: cityIds.length > 0,
+    retry: 1,
+  });
+};
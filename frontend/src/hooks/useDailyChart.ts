@@ -1,5 +1,4 @@
-import { useQuery } from "@tanstack/react-query";
-import { apiClient } from "../api/apiClient";
+import { useWeatherOverview } from "./useWeatherOverview";
 
 export interface DailyPoint {
   date: string;
@@ -9,12 +8,5 @@ export interface DailyPoint {
 }
 
 export const useDailyChart = (cityId: number) => {
-  return useQuery<DailyPoint[]>({
-    queryKey: ["dailyChart", cityId],
-    queryFn: () =>
-      apiClient.get<DailyPoint[]>(
-        `/weather/chart/daily?city_id=${cityId}&days=7`
-      ),
-    enabled: !!cityId,
-  });
+  return useWeatherOverview(cityId, (overview) => overview.chart_daily);
 };
\ No newline at end of file
@@ -1,5 +1,4 @@
-import { useQuery } from "@tanstack/react-query";
-import { apiClient } from "../api/apiClient";
+import { useWeatherOverview } from "./useWeatherOverview";
 
 interface ForecastItem {
   forecast_dt: string;
@@ -17,13 +16,19 @@ export interface ForecastResponse {
   forecasts: ForecastItem[];
 }
 
+// The overview carries OVERVIEW_DAYS of forecast; like the backend, a
+// shorter forecast ends `days` after the start of the current hour.
 export const useForecast = (cityId: number, days: number) => {
-  return useQuery<ForecastResponse>({
-    queryKey: ["forecast", cityId, days],
-    queryFn: () =>
-      apiClient.get<ForecastResponse>(
-        `/weather/forecast?city_id=${cityId}&days=${days}`
+  return useWeatherOverview(cityId, (overview) => {
+    if (!overview.forecast) return undefined;
+    const hour = 60 * 60 * 1000;
+    const end = Math.floor(Date.now() / hour) * hour + days * 24 * hour;
+    return {
+      ...overview.forecast,
+      days,
+      forecasts: overview.forecast.forecasts.filter(
+        (item) => Date.parse(item.forecast_dt) < end
       ),
-    enabled: !!cityId,
+    };
   });
 };
\ No newline at end of file
@@ -1,5 +1,4 @@
-import { useQuery } from "@tanstack/react-query";
-import { apiClient } from "../api/apiClient";
+import { useWeatherOverview } from "./useWeatherOverview";
 
 export interface HourlyPoint {
   hour: string;
@@ -11,12 +10,5 @@ export interface HourlyPoint {
 }
 
 export const useHourlyChart = (cityId: number) => {
-  return useQuery<HourlyPoint[]>({
-    queryKey: ["hourlyChart", cityId],
-    queryFn: () =>
-      apiClient.get<HourlyPoint[]>(
-        `/weather/chart/hourly?city_id=${cityId}`
-      ),
-    enabled: !!cityId,
-  });
+  return useWeatherOverview(cityId, (overview) => overview.chart_hourly);
 };
\ No newline at end of file
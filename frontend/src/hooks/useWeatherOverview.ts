@@ -0,0 +1,43 @@
+import { useQuery } from "@tanstack/react-query";
+import { apiClient } from "../api/apiClient";
+import type { CurrentWeatherResponse } from "./useCurrentWeather";
+import type { DailyPoint } from "./useDailyChart";
+import type { ForecastResponse } from "./useForecast";
+import type { HourlyPoint } from "./useHourlyChart";
+
+// Days of forecast and daily chart requested; shorter forecasts are sliced
+export const OVERVIEW_DAYS = 7;
+
+export interface ClothingRecommendation {
+  city_id: number;
+  category: string;
+  description: string;
+  items: string[];
+}
+
+export interface WeatherOverviewResponse {
+  city_id: number;
+  current: CurrentWeatherResponse | null;
+  forecast: ForecastResponse | null;
+  chart_hourly: HourlyPoint[];
+  chart_daily: DailyPoint[];
+  recommendation: ClothingRecommendation | null;
+}
+
+// Every dashboard hook is a view over this one query: React Query shares
+// the cache entry, so the dashboard loads a city with a single request.
+export const useWeatherOverview = <T>(
+  cityId: number,
+  select: (overview: WeatherOverviewResponse) => T
+) => {
+  return useQuery<WeatherOverviewResponse, Error, T>({
+    queryKey: ["overview", cityId],
+    queryFn: () =>
+      apiClient.get<WeatherOverviewResponse>(
+        `/weather/overview?city_id=${cityId}&days=${OVERVIEW_DAYS}`
+      ),
+    select,
+    enabled: !!cityId,
+    retry: 1,
+  });
+};